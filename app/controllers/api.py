@@ -0,0 +1,433 @@
+import hashlib
+import json
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from rich.console import Console
+from sqlalchemy.orm import joinedload
+from app.database.db import db_manager
+from app.database.policy import set_policy_subject
+from app.models import Client, Contract, Event, User
+from app.services.audit_service import set_actor
+from app.services.auth_service import AuthService
+from app.services.change_feed import ChangeFeed
+from app.services.query_filter import scope_conditions
+import sentry_sdk
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Ressources exposées : modèle, relations à charger et champs sélectionnables
+# Un champ est un nom d'attribut, éventuellement pointé pour suivre une relation
+RESOURCES = {
+    "clients": {
+        "model": Client,
+        "options": lambda: (),
+        "fields": {
+            "id": "id",
+            "name": "name",
+            "mail": "mail",
+            "phone": "phone",
+            "company_name": "company_name",
+            "commercial_contact_id": "commercial_contact_id",
+            "created_at": "created_at",
+            "last_updated_at": "last_updated_at",
+        },
+    },
+    "contracts": {
+        "model": Contract,
+        "options": lambda: (joinedload(Contract.client), joinedload(Contract.commercial_contact)),
+        "fields": {
+            "id": "id",
+            "client_id": "client_id",
+            "client_name": "client.name",
+            "commercial_contact_id": "commercial_contact_id",
+            "commercial_name": "commercial_contact.name",
+            "total_amount": "total_amount",
+            "remaining_amount": "remaining_amount",
+            "is_signed": "is_signed",
+            "created_at": "created_at",
+            "last_updated_at": "last_updated_at",
+        },
+    },
+    "events": {
+        "model": Event,
+        "options": lambda: (joinedload(Event.support_contact),),
+        "fields": {
+            "id": "id",
+            "name": "name",
+            "contract_id": "contract_id",
+            "date_start": "date_start",
+            "date_end": "date_end",
+            "location": "location",
+            "attendees": "attendees",
+            "notes": "notes",
+            "support_contact_id": "support_contact_id",
+            "support_name": "support_contact.name",
+            "created_at": "created_at",
+            "last_updated_at": "last_updated_at",
+        },
+    },
+    "users": {
+        "model": User,
+        "options": lambda: (joinedload(User.department),),
+        "fields": {
+            "id": "id",
+            "employee_number": "employee_number",
+            "name": "name",
+            "mail": "mail",
+            "username": "username",
+            "department": "department.name",
+            "created_at": "created_at",
+            "last_updated_at": "last_updated_at",
+        },
+    },
+}
+
+# Champs modifiables via l'API
+WRITABLE_FIELDS = {
+    "clients": {"name", "mail", "phone", "company_name"},
+    "contracts": {"client_id", "commercial_contact_id", "total_amount", "remaining_amount", "is_signed"},
+    "events": {"name", "contract_id", "date_start", "date_end", "location", "attendees", "notes", "support_contact_id"},
+}
+
+DATE_FIELDS = {"date_start", "date_end"}
+
+
+class ApiError(Exception):
+    """Erreur renvoyée au client HTTP avec son code de statut"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def get_user_role(user):
+    """Nom du département de l'utilisateur"""
+    return user.department.name if user.department else None
+
+
+def scope_query(resource, query, user, role):
+    """Applique les mêmes règles d'accès que les commandes du menu"""
+    if resource == "users" and role != "gestion":
+        raise ApiError(403, "Seule l'équipe gestion peut consulter les collaborateurs")
+    return query.filter(*scope_conditions(resource, user.id, role))
+
+
+def parse_fields(resource, raw_fields):
+    """Valide la sélection de champs (?fields=id,name)"""
+    available = RESOURCES[resource]["fields"]
+    if not raw_fields:
+        return list(available)
+
+    fields = [field.strip() for field in raw_fields.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise ApiError(400, f"Champs inconnus : {', '.join(unknown)}")
+    return fields
+
+
+def serialize(resource, obj, fields):
+    """Convertit un objet en dictionnaire JSON limité aux champs demandés"""
+    data = {}
+    for field in fields:
+        value = obj
+        for attribute in RESOURCES[resource]["fields"][field].split("."):
+            value = getattr(value, attribute, None) if value is not None else None
+        data[field] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def compute_etag(resource, fields, versions):
+    """ETag faible calculé à partir des (id, last_updated_at) de la page"""
+    digest = hashlib.sha1(resource.encode())
+    digest.update(",".join(fields).encode())
+    for row_id, updated_at in versions:
+        digest.update(f"|{row_id}:{updated_at.isoformat() if updated_at else ''}".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def list_resource(resource, user, role, params, if_none_match=None):
+    """
+    Liste paginée par jeu de clés (keyset) : ?after=<dernier id>&limit=<n>&fields=<champs>
+
+    Une première requête étroite récupère uniquement (id, last_updated_at) de la page
+    pour calculer l'ETag. Si le client possède déjà cette version, aucune ligne
+    complète n'est chargée. Retourne (statut, corps, etag).
+    """
+    config = RESOURCES[resource]
+    model = config["model"]
+    fields = parse_fields(resource, params.get("fields"))
+
+    try:
+        limit = min(int(params.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        after = int(params["after"]) if params.get("after") else None
+    except ValueError:
+        raise ApiError(400, "Paramètres de pagination invalides")
+    if limit <= 0:
+        raise ApiError(400, "La limite doit être positive")
+
+    session = db_manager.get_read_session()
+    try:
+        versions_query = scope_query(resource, session.query(model.id, model.last_updated_at), user, role)
+        if after is not None:
+            versions_query = versions_query.filter(model.id > after)
+        versions = versions_query.order_by(model.id).limit(limit + 1).all()
+
+        has_more = len(versions) > limit
+        versions = versions[:limit]
+        etag = compute_etag(resource, fields, versions)
+
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return 304, None, etag
+
+        ids = [row_id for row_id, _ in versions]
+        rows = []
+        if ids:
+            rows = session.query(model).options(*config["options"]()).filter(model.id.in_(ids)).order_by(model.id).all()
+
+        body = {
+            "items": [serialize(resource, row, fields) for row in rows],
+            "next_after": ids[-1] if has_more else None
+        }
+        return 200, body, etag
+    finally:
+        session.close()
+
+
+def get_resource(resource, object_id, user, role, params):
+    """Détail d'un objet, soumis aux mêmes règles d'accès que la liste"""
+    config = RESOURCES[resource]
+    model = config["model"]
+    fields = parse_fields(resource, params.get("fields"))
+
+    session = db_manager.get_read_session()
+    try:
+        query = scope_query(resource, session.query(model).options(*config["options"]()), user, role)
+        obj = query.filter(model.id == object_id).first()
+        if not obj:
+            raise ApiError(404, f"{resource} {object_id} introuvable")
+        return serialize(resource, obj, fields), compute_etag(resource, fields, [(obj.id, obj.last_updated_at)])
+    finally:
+        session.close()
+
+
+def clean_payload(resource, payload):
+    """Ne conserve que les champs modifiables et convertit les dates ISO"""
+    if not isinstance(payload, dict):
+        raise ApiError(400, "Le corps de la requête doit être un objet JSON")
+
+    unknown = set(payload) - WRITABLE_FIELDS[resource]
+    if unknown:
+        raise ApiError(400, f"Champs non modifiables : {', '.join(sorted(unknown))}")
+
+    data = dict(payload)
+    for field in DATE_FIELDS & set(data):
+        try:
+            data[field] = datetime.fromisoformat(data[field])
+        except (TypeError, ValueError):
+            raise ApiError(400, f"Date invalide pour {field}")
+    return data
+
+
+def create_resource(resource, user, role, payload):
+    """Création avec les mêmes contrôles de rôle que les commandes"""
+    data = clean_payload(resource, payload)
+
+    if resource == "clients":
+        data['commercial_contact_id'] = user.id
+        return Client.create(role, **data)
+
+    if resource == "contracts":
+        if role != "gestion":
+            raise ApiError(403, "Seule l'équipe gestion peut créer des contrats")
+        if not data.get('commercial_contact_id'):
+            client = Contract.get_client_with_commercial(data.get('client_id'))
+            data['commercial_contact_id'] = client.commercial_contact_id if client else None
+        data['status'] = "signé" if data.pop('is_signed', False) else "non signé"
+        return Contract.create(**data)
+
+    if resource == "events":
+        if not Event.validate_contract_access(data.get('contract_id'), user.id, role):
+            raise ApiError(403, "Contrat introuvable, non signé, ou non autorisé")
+        data.pop('support_contact_id', None)
+        return Event.create(**data)
+
+    raise ApiError(405, "Création non supportée")
+
+
+def update_resource(resource, object_id, user, role, payload):
+    """Mise à jour avec les mêmes contrôles de permissions que les commandes"""
+    data = clean_payload(resource, payload)
+
+    if resource == "clients":
+        obj = Client.get_by_id_with_permissions(object_id, user.id, role)
+    elif resource == "contracts":
+        data.pop('client_id', None)
+        data.pop('commercial_contact_id', None)
+        obj = Contract.get_by_id_with_permissions(object_id, user.id, role)
+    elif resource == "events":
+        if 'support_contact_id' in data:
+            if role != "gestion" or not Event.validate_support_user(data['support_contact_id']):
+                raise ApiError(403, "Assignation du support non autorisée")
+        data.pop('contract_id', None)
+        obj = Event.get_event_with_permissions(object_id, user.id, role)
+    else:
+        raise ApiError(405, "Modification non supportée")
+
+    if not obj:
+        raise ApiError(404, f"{resource} {object_id} introuvable ou non autorisé")
+
+    obj.update(**data)
+    return obj
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Point d'entrée HTTP JSON au-dessus des modèles"""
+    server_version = "EpicEventsAPI/1.0"
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def _handle(self, method):
+        try:
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if method == "POST" and parts == ["auth", "token"]:
+                return self._login()
+
+            user = self._authenticate()
+            role = get_user_role(user)
+
+            if method == "GET" and parts and parts[0] == "changes":
+                return self._changes(parts, params, role)
+
+            if not parts or parts[0] not in RESOURCES:
+                raise ApiError(404, "Ressource inconnue")
+            resource = parts[0]
+            object_id = self._parse_id(parts)
+
+            if method == "GET" and object_id is None:
+                status, body, etag = list_resource(resource, user, role, params, self.headers.get("If-None-Match"))
+                return self._send(status, body, etag)
+
+            if method == "GET":
+                body, etag = get_resource(resource, object_id, user, role, params)
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, None, etag)
+                return self._send(200, body, etag)
+
+            if method == "POST" and object_id is None:
+                obj = create_resource(resource, user, role, self._read_json())
+                return self._send(201, serialize(resource, obj, list(RESOURCES[resource]["fields"])))
+
+            if method == "PATCH" and object_id is not None:
+                obj = update_resource(resource, object_id, user, role, self._read_json())
+                return self._send(200, serialize(resource, obj, list(RESOURCES[resource]["fields"])))
+
+            raise ApiError(405, "Méthode non supportée")
+
+        except ApiError as e:
+            self._send(e.status, {"error": e.message})
+        except PermissionError as e:
+            self._send(403, {"error": str(e)})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            sentry_sdk.set_context("api_request", {
+                "method": method,
+                "path": self.path,
+                "error_type": type(e).__name__
+            })
+            sentry_sdk.capture_exception(e)
+            self._send(500, {"error": "Erreur interne"})
+
+    def _changes(self, parts, params, role):
+        """Flux de changements (GET /changes/<table>?since=...&cursor=...), réservé à la gestion"""
+        if role != "gestion":
+            raise ApiError(403, "Seule l'équipe gestion peut consulter le flux de changements")
+        if len(parts) != 2:
+            raise ApiError(404, "Ressource inconnue")
+
+        try:
+            page = ChangeFeed().read(parts[1], since=params.get("since"), cursor=params.get("cursor"))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        self._send(200, page)
+
+    def _login(self):
+        """Échange identifiant / mot de passe contre un token JWT (même format que le CLI)"""
+        payload = self._read_json()
+        user = User.authenticate(payload.get("username"), payload.get("password"))
+        if not user:
+            raise ApiError(401, "Nom d'utilisateur ou mot de passe incorrect")
+        self._send(200, {"token": AuthService(console=self.server.console).create_token(user)})
+
+    def _authenticate(self):
+        """Vérifie le token Bearer et retourne l'utilisateur"""
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            raise ApiError(401, "Token manquant")
+
+        try:
+            payload = AuthService(console=self.server.console).decode_token(header[len("Bearer "):])
+        except Exception:
+            raise ApiError(401, "Token invalide ou expiré")
+
+        user = User.get_by_id(payload['user_id'])
+        if not user:
+            raise ApiError(401, "Utilisateur inconnu")
+
+        # Chaque requête est traitée dans son propre thread : l'acteur est propre à la requête
+        set_actor(user.id)
+        set_policy_subject(user.id, get_user_role(user))
+        return user
+
+    @staticmethod
+    def _parse_id(parts):
+        if len(parts) == 1:
+            return None
+        if len(parts) == 2 and parts[1].isdigit():
+            return int(parts[1])
+        raise ApiError(404, "Ressource inconnue")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            raise ApiError(400, "JSON invalide")
+
+    def _send(self, status, body=None, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if body is None:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        self.server.console.log(f"{self.address_string()} - {format % args}")
+
+
+def create_api_server(host="127.0.0.1", port=8000, console=None):
+    """Crée le serveur HTTP (un thread par requête)"""
+    server = ThreadingHTTPServer((host, port), ApiRequestHandler)
+    server.console = console or Console()
+    return server
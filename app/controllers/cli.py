@@ -1,12 +1,30 @@
 import click
+import csv
+import json
+import sys
 from rich.console import Console
 from app.services.auth_service import AuthService
 from app.services.menu_service import MenuService
 from app.services.initialization import Initialization
+from app.services.app_context import AppContext
+from app.services.archive_service import ArchiveService
+from app.services.change_feed import ChangeFeed, FEED_MODELS
+from app.services.dedup_service import DedupService
+from app.services.audit_service import audit_writer, set_actor
+from app.services.reminder_service import ReminderScheduler, drain_outbox
+from app.services.query_filter import FilterError, scope_conditions, search
+from app.controllers.api import RESOURCES, create_api_server, get_user_role, serialize
+from app.database.db import db_manager
+from app.database.partitioning import ensure_monthly_partitions
+from app.database.policy import install_row_level_security, set_policy_subject
+from app.database.schema_upgrade import upgrade_schema
+from app.models import Client, Contract, Event
+from app.views.inputs import EndOfInput, ScriptedInput
 from app.utils.constants import MESSAGES, DIRECT_ACTIONS
 
 
 console = Console()
+app_context = AppContext(console=console)
 
 
 def main_loop():
@@ -17,12 +35,18 @@ def main_loop():
             break
 
 
+def use_replay_script(path):
+    """Réponses lues dans un fichier au lieu du clavier : les menus sont rejoués sans terminal"""
+    global app_context
+    app_context = AppContext(console=console, profiler=app_context.profiler, inputs=ScriptedInput(path))
+
+
 def show_menu():
     """Menu principal de l'application"""
     console.print(MESSAGES["welcome"])
 
     # Authentification
-    auth_service = AuthService()
+    auth_service = AuthService(console=console, inputs=app_context.inputs)
 
     # Sinon, demander les identifiants
     user = auth_service.authenticate_user()
@@ -33,8 +57,12 @@ def show_menu():
 
     console.print(f"[green]Connexion réussie ! Bienvenue {user.name}[/green]\n")
 
+    # Les modifications suivantes sont attribuées à l'utilisateur connecté, dont les droits filtrent les lectures
+    set_actor(user.id)
+    set_policy_subject(user.id, get_user_role(user))
+
     # Navigation dans les menus
-    menu_service = MenuService()
+    menu_service = MenuService(context=app_context)
 
     while True:
         result = menu_service.handle_main_menu(user)
@@ -42,8 +70,9 @@ def show_menu():
         if result in list(DIRECT_ACTIONS.values()):
             menu_service.router.execute_direct_action(result)
         elif result == "logout":
-            auth_service = AuthService()
             auth_service.logout()
+            set_actor(None)
+            set_policy_subject(None)
             return "continue"
         elif result == "exit":
             return "exit"
@@ -64,16 +93,230 @@ def initialize_database():
             console.print(f"  - {error}")
         return False
 
+    # Base créée par une version précédente : colonnes ajoutées aux modèles (clés de regroupement des clients)
+    try:
+        upgrade_schema(db_manager.engine, [Client.__table__])
+        DedupService().backfill_keys()
+    except Exception as e:
+        console.print(f"[red]Erreur lors de la mise à jour du schéma : {e}[/red]")
+        return False
+
+    # Politiques PostgreSQL (ROW_LEVEL_SECURITY=1) : mêmes règles de lecture que les requêtes de l'application
+    try:
+        install_row_level_security(db_manager.engine, [Client, Contract, Event])
+    except Exception as e:
+        console.print(f"[red]Erreur lors de la création des politiques d'accès : {e}[/red]")
+        return False
+
     console.print("\n[green]✓ Initialisation terminée avec succès ![/green]")
     return True
 
 
+def run_archive():
+    """
+    Maintenance périodique :
+    - création des partitions mensuelles à venir de la table events (PostgreSQL)
+    - déplacement des événements terminés et des contrats soldés vers les tables d'archive
+
+    Réservé à l'équipe gestion (session enregistrée par la dernière connexion interactive)
+    """
+    if not saved_gestion_user(console, "Seule l'équipe gestion peut lancer l'archivage"):
+        return False
+
+    service = ArchiveService()
+    console.print(f"[yellow]Archivage (rétention : {service.retention_days} jours)...[/yellow]")
+
+    # Une partition impossible à créer est signalée sans bloquer l'archivage
+    try:
+        ensure_monthly_partitions(db_manager.engine, Event.__table__)
+    except Exception as e:
+        console.print(f"[red]Erreur lors de la création des partitions : {e}[/red]")
+
+    try:
+        results = service.run()
+    except Exception as e:
+        console.print(f"[red]Erreur lors de l'archivage : {e}[/red]")
+        return False
+
+    console.print(f"[green]✓ {results['events']} événement(s) et {results['contracts']} contrat(s) archivé(s)[/green]")
+    return True
+
+
+def saved_gestion_user(output, refusal):
+    """
+    Utilisateur de la session enregistrée par la dernière connexion interactive,
+    s'il appartient à l'équipe gestion ; sinon None, avec le message d'erreur sur output
+    """
+    user = AuthService(console=output).get_saved_user()
+    if not user:
+        output.print("[red]Aucune session enregistrée : connectez-vous d'abord en mode interactif[/red]")
+        return None
+
+    role = get_user_role(user)
+    if role != "gestion":
+        output.print(f"[red]{refusal}[/red]")
+        return None
+    set_policy_subject(user.id, role)
+    set_actor(user.id)
+    return user
+
+
+def run_dedup_report():
+    """
+    Rapport des clients en double probable
+
+    Réservé à l'équipe gestion (écrit les clés de regroupement, affiche les coordonnées des clients)
+    """
+    if not saved_gestion_user(console, "Seule l'équipe gestion peut consulter le rapport des doublons"):
+        return False
+
+    service = DedupService()
+    try:
+        service.backfill_keys()
+        app_context.client_view.display_duplicate_report(service.report())
+    except Exception as e:
+        console.print(f"[red]Erreur lors de la recherche de doublons : {e}[/red]")
+        return False
+    return True
+
+
+def run_reminders(interval=60):
+    """
+    Planificateur de rappels des événements à venir
+    Le relais d'envoi affiche les messages de la boîte d'envoi (remplace l'envoi de mails)
+    """
+    def send(message):
+        console.print(f"[cyan]✉ {message.subject}[/cyan] (support #{message.recipient_id or '-'}) {message.body}")
+
+    def on_tick(added):
+        drain_outbox(send)
+
+    console.print("[green]Planificateur de rappels démarré (Ctrl+C pour arrêter)[/green]")
+    try:
+        ReminderScheduler().run_forever(interval=interval, on_tick=on_tick)
+    except KeyboardInterrupt:
+        console.print("[yellow]Arrêt du planificateur[/yellow]")
+
+
+def run_changes(entity, since=None, cursor=None):
+    """
+    Flux de changements sur la sortie standard, une ligne JSON par page
+    La dernière page contient le filigrane à passer en --since au prochain appel
+
+    Réservé à l'équipe gestion (comme GET /changes) : utilise la session enregistrée
+    par la dernière connexion interactive. Les messages sont écrits sur la sortie d'erreur.
+    """
+    errors = Console(stderr=True)
+    if not saved_gestion_user(errors, "Seule l'équipe gestion peut consulter le flux de changements"):
+        return False
+
+    feed = ChangeFeed()
+    try:
+        page = feed.read(entity, since=since, cursor=cursor)
+        click.echo(json.dumps(page))
+        while page["next_cursor"]:
+            page = feed.read(entity, cursor=page["next_cursor"])
+            click.echo(json.dumps(page))
+    except ValueError as e:
+        errors.print(f"[red]{e}[/red]")
+        return False
+    return True
+
+
+def run_command(command):
+    """
+    Mode batch : liste filtrée au format CSV sur la sortie standard
+    ex : --command "contracts signed:false remaining>0 sort:-remaining"
+
+    Utilise la session enregistrée par la dernière connexion interactive.
+    Les messages sont écrits sur la sortie d'erreur pour ne pas polluer le CSV.
+    """
+    errors = Console(stderr=True)
+    resource, _, expression = command.strip().partition(" ")
+    if resource not in RESOURCES:
+        errors.print(f"[red]Table inconnue : {resource} ({', '.join(RESOURCES)})[/red]")
+        return False
+
+    user = AuthService(console=errors).get_saved_user()
+    if not user:
+        errors.print("[red]Aucune session enregistrée : connectez-vous d'abord en mode interactif[/red]")
+        return False
+
+    role = get_user_role(user)
+    set_policy_subject(user.id, role)
+    if resource == "users" and role != "gestion":
+        errors.print("[red]Seule l'équipe gestion peut consulter les collaborateurs[/red]")
+        return False
+
+    try:
+        rows = search(resource, expression, *scope_conditions(resource, user.id, role))
+        fields = list(RESOURCES[resource]["fields"])
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(serialize(resource, row, fields))
+    except FilterError as e:
+        errors.print(f"[red]{e}[/red]")
+        return False
+    return True
+
+
+def run_api(host, port):
+    """Lancer l'API HTTP JSON locale"""
+    server = create_api_server(host, port, console=console)
+    console.print(f"[green]API disponible sur http://{host}:{port}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[yellow]Arrêt de l'API[/yellow]")
+    finally:
+        server.server_close()
+
+
 @click.command()
 @click.option('--dev-init', is_flag=True, hidden=True, help="[DEV] Initialiser la base de données")
-@click.option('--command', '-c', help="Commande à exécuter")
-def main_cli(dev_init, command):
+@click.option('--command', '-c', help='Liste filtrée en CSV, ex : "contracts signed:false remaining>0 sort:-remaining"')
+@click.option('--archive', is_flag=True, help="Archiver les événements terminés et les contrats soldés")
+@click.option('--dedup-report', is_flag=True, help="Lister les clients en double probable")
+@click.option('--reminders', is_flag=True, help="Lancer le planificateur de rappels des événements")
+@click.option('--changes', type=click.Choice(sorted(FEED_MODELS)), help="Flux des changements d'une table (JSON)")
+@click.option('--since', help="Filigrane ISO 8601 du flux de changements")
+@click.option('--cursor', help="Curseur de reprise du flux de changements")
+@click.option('--api', is_flag=True, help="Lancer l'API HTTP JSON locale")
+@click.option('--host', default="127.0.0.1", show_default=True, help="Adresse d'écoute de l'API")
+@click.option('--port', default=8000, show_default=True, help="Port d'écoute de l'API")
+@click.option('--profile', is_flag=True, help="Profiler chaque commande du menu (rapports dans PROFILE_DIR)")
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False), help="Rejouer les saisies d'un fichier (une réponse par ligne)")
+def main_cli(dev_init, command, archive, dedup_report, reminders, changes, since, cursor, api, host, port, profile, replay):
     """Interface en ligne de commande pour Epic Events CRM"""
-    if dev_init:
-        initialize_database()
-    else:
-        main_loop()
+    if replay:
+        use_replay_script(replay)
+    if profile:
+        app_context.profiler.enabled = True
+        console.print(f"[yellow]Profilage activé : rapports dans {app_context.profiler.directory}[/yellow]")
+
+    # Écriture du journal d'audit en arrière-plan, vidé à la sortie
+    audit_writer.start()
+    try:
+        if dev_init:
+            initialize_database()
+        elif archive:
+            run_archive()
+        elif dedup_report:
+            run_dedup_report()
+        elif reminders:
+            run_reminders()
+        elif changes:
+            run_changes(changes, since, cursor)
+        elif api:
+            run_api(host, port)
+        elif command:
+            run_command(command)
+        else:
+            try:
+                main_loop()
+            except EndOfInput:
+                # Fin du fichier rejoué (--replay)
+                console.print("[yellow]Fin des saisies rejouées[/yellow]")
+    finally:
+        audit_writer.stop()
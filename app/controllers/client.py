@@ -1,15 +1,18 @@
 from app.models import Client
 from app.views.client import ClientView
+from app.views.filter import FilterView
+from app.services.query_filter import scope_conditions, search
 from rich.console import Console
 import sentry_sdk
 
 
 class ClientCommands:
     """Commandes liées aux clients"""
-    def __init__(self, current_user=None, role=None):
+    def __init__(self, current_user=None, role=None, console=None, view=None, filter_view=None):
         """Initialisation"""
-        self.console = Console()
-        self.view = ClientView()
+        self.console = console or Console()
+        self.view = view or ClientView(console=self.console)
+        self.filter_view = filter_view or FilterView(console=self.console)
         self.current_user = current_user
         self.role = role
 
@@ -21,6 +24,14 @@ class ClientCommands:
             """Assigner le commercial courant comme contact principal"""
             client_data['commercial_contact_id'] = self.current_user.id
 
+            # Doublons probables (fautes de frappe, téléphone reformaté...)
+            duplicates = Client.find_duplicates(**client_data)
+            if duplicates:
+                self.view.display_duplicate_candidates(duplicates)
+                if not self.view.confirm_duplicate_creation():
+                    self.console.print("[yellow]Création annulée.[/yellow]")
+                    return
+
             client = Client.create('commercial', **client_data)
             self.console.print(f"[green]Client {client.name} créé ![green]")
 
@@ -55,11 +66,13 @@ class ClientCommands:
             self.console.print(f"[red]Erreur lors de la mise à jour : {e}[red]")
             sentry_sdk.capture_exception(e)
 
-    def list_clients(self, role="gestion"):
-        """Lister tous les clients"""
+    def list_clients(self, role, expression=None):
+        """Lister tous les clients, éventuellement filtrés par une expression (ex : "company:acme sort:-created")"""
         try:
-            if role in ["gestion", "support"]:
-                clients = Client.get_all()
+            if expression:
+                clients = search("clients", expression, *scope_conditions("clients", self.current_user.id, role), rows=True)
+            elif role in ["gestion", "support"]:
+                clients = Client.get_all_paged()
             else:
                 clients = Client.get_by_commercial(self.current_user.id)
 
@@ -68,6 +81,11 @@ class ClientCommands:
             self.console.print(f"[red]Erreur lors de l'affichage des clients : {e}[red]")
             sentry_sdk.capture_exception(e)
 
+    def search_clients(self, role):
+        """Lister les clients correspondant à une expression de filtre saisie"""
+        expression = self.filter_view.get_filter_expression("clients")
+        self.list_clients(role, expression=expression)
+
     def research_client(self):
         """Rechercher un client par nom"""
         try:
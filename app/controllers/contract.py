@@ -1,20 +1,23 @@
 from app.views.contract import ContractView
+from app.views.filter import FilterView
+from app.services.query_filter import scope_conditions, search
 from app.models.contract import Contract
 from rich.console import Console
 import sentry_sdk
 
 
 class ContractCommands:
-    def __init__(self, current_user=None):
-        self.contract_view = ContractView()
-        self.console = Console()
+    def __init__(self, current_user=None, console=None, view=None, filter_view=None):
+        self.console = console or Console()
+        self.contract_view = view or ContractView(console=self.console)
+        self.filter_view = filter_view or FilterView(console=self.console)
         self.current_user = current_user
 
     def create_contract(self):
         """Créer un contrat"""
         contract_data = None
         try:
-            contract_data = self.contract_view.get_contract_creation_form()
+            contract_data = self.contract_view.get_contract_creation_form(self.current_user.id, "gestion")
 
             if not contract_data:
                 return
@@ -69,12 +72,14 @@ class ContractCommands:
             self.console.print(f"[red]Erreur : {e}[/red]")
             sentry_sdk.capture_exception(e)
 
-    def list_contracts(self, role):
-        """Lister tous les contrats"""
+    def list_contracts(self, role, expression=None):
+        """Lister tous les contrats, éventuellement filtrés par une expression (ex : "signed:false remaining>0")"""
         try:
             # Utiliser le modèle
-            if role in ["gestion", "support"]:
-                contracts = Contract.get_all()
+            if expression:
+                contracts = search("contracts", expression, *scope_conditions("contracts", self.current_user.id, role), rows=True)
+            elif role in ["gestion", "support"]:
+                contracts = Contract.get_all_paged()
             else:
                 contracts = Contract.get_by_commercial(self.current_user.id)
 
@@ -84,6 +89,11 @@ class ContractCommands:
             self.console.print(f"[red]Erreur : {e}[/red]")
             sentry_sdk.capture_exception(e)
 
+    def search_contracts(self, role):
+        """Lister les contrats correspondant à une expression de filtre saisie"""
+        expression = self.filter_view.get_filter_expression("contracts")
+        self.list_contracts(role, expression=expression)
+
     def filter_unsigned_contracts(self):
         """Filtrer les contrats non signés"""
         self.filter_contracts("unsigned")
@@ -96,6 +106,27 @@ class ContractCommands:
         """Filtrer les contrats avec montant restant"""
         self.filter_contracts("unpaid")
 
+    def filter_contracts_by_criteria(self, role):
+        """Filtrer les contrats sur des critères combinés (date, montants, client, statut)"""
+        criteria = None
+        try:
+            criteria = self.contract_view.get_contract_filter_form(self.current_user.id, role)
+            if criteria is None:
+                return
+
+            # Limité aux contrats lisibles par le rôle (un commercial : ceux de ses clients)
+            contracts = Contract.filter_by_criteria(self.current_user.id, role, **criteria)
+            self.contract_view.display_contract_list(contracts)
+
+        except Exception as e:
+            self.console.print(f"[red]Erreur : {e}[/red]")
+            sentry_sdk.set_context("contract_filter", {
+                "current_user_id": self.current_user.id if self.current_user else None,
+                "role": role,
+                "criteria": {key: str(value) for key, value in criteria.items()} if criteria else None
+            })
+            sentry_sdk.capture_exception(e)
+
     def filter_contracts(self, filter_type):
         """Filtrer les contrats selon différents critères"""
         try:
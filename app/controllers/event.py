@@ -1,16 +1,36 @@
 from rich.console import Console
+from sqlalchemy.exc import OperationalError
 from app.controllers import ContractCommands
 from app.views.event import EventView
+from app.views.filter import FilterView
+from app.views.inputs import InteractiveInput
 from app.models.event import Event
 from app.models.contract import Contract
+from app.services.offline_service import OfflineReplica
+from app.services.query_filter import scope_conditions, search
+from app.utils.cache import CommandMemo
 import sentry_sdk
 
 
 class EventCommands:
-    def __init__(self, current_user):
+    def __init__(self, current_user, console=None, view=None, contract_cmd=None, filter_view=None, memo=None, inputs=None):
         self.current_user = current_user
-        self.console = Console()
-        self.event_view = EventView(contract_id=None)
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
+        self.event_view = view or EventView(console=self.console)
+        self.filter_view = filter_view or FilterView(console=self.console)
+        # Résultats partagés par les étapes d'une même commande (vidé par le routeur)
+        self.memo = memo or CommandMemo()
+        self.contract_cmd = contract_cmd or ContractCommands(current_user, console=self.console)
+
+        # Réplique locale utilisée quand la base principale est injoignable (support)
+        self.offline_replica = None
+        self.offline = False
+
+    def _get_offline_replica(self):
+        if self.offline_replica is None:
+            self.offline_replica = OfflineReplica(self.current_user)
+        return self.offline_replica
 
     def create_event(self):
         """Créer un nouvel événement"""
@@ -29,10 +49,10 @@ class EventCommands:
 
             # Afficher seulement s'il y en a
             self.console.print("Contrats signés disponibles :")
-            ContractCommands(self.current_user).filter_signed_contracts()
+            self.contract_cmd.filter_signed_contracts()
 
             # Choix du contrat
-            choice_contract = self.console.input("Entrez l'ID du contrat : ")
+            choice_contract = self.inputs.text("Entrez l'ID du contrat : ")
 
             # Vérifier que le contrat existe et est signé et appartient au commercial
             if not Event.validate_contract_access(choice_contract, self.current_user.id):
@@ -41,7 +61,7 @@ class EventCommands:
 
             self.console.print(f"[green]Vous avez choisi le contrat ID {choice_contract}[/green]")
 
-            event_data = EventView(choice_contract).get_event_creation_form()
+            event_data = self.event_view.get_event_creation_form(choice_contract)
 
             if event_data:
                 event = Event.create(**event_data)
@@ -73,7 +93,7 @@ class EventCommands:
             # Liste des événements
             self.list_events(role=user_role)
 
-            choice_event = self.console.input("Entrez l'ID de l'événement à modifier : ")
+            choice_event = self.inputs.text("Entrez l'ID de l'événement à modifier : ")
 
             # Validation de l'ID
             try:
@@ -87,13 +107,17 @@ class EventCommands:
                 self.console.print("[red]Vous n'êtes pas autorisé à modifier les événements.[/red]")
                 return
 
+            # Hors ligne : modification de la réplique locale, rejouée à la prochaine synchronisation
+            if self.offline and user_role == "support":
+                return self._update_event_offline(event_id)
+
             # Récupérer l'événement avec permissions
             event = Event.get_event_with_permissions(event_id, self.current_user.id, user_role)
             if not event:
                 self.console.print(f"[red]Événement {event_id} introuvable ou vous n'y êtes pas assigné.[/red]")
                 return
 
-            updated_event_data = EventView(choice_event).get_event_update_form(event)
+            updated_event_data = self.event_view.get_event_update_form(event)
 
             if not updated_event_data:
                 return
@@ -111,18 +135,77 @@ class EventCommands:
             })
             sentry_sdk.capture_exception(e)
 
-    def list_events(self, role=None, filter_no_support=False):
-        """Lister les événements"""
+    def _update_event_offline(self, event_id):
+        """Mettre à jour un événement dans la réplique locale"""
+        replica = self._get_offline_replica()
+        event = replica.get_event(event_id)
+        if not event:
+            self.console.print(f"[red]Événement {event_id} introuvable dans la copie locale.[/red]")
+            return
+
+        updated_event_data = self.event_view.get_event_update_form(event)
+        if not updated_event_data:
+            return
+
+        replica.update_event(event_id, **updated_event_data)
+        self.console.print(
+            f"[yellow]Hors ligne : modification de l'événement {event_id} enregistrée, "
+            f"elle sera envoyée à la prochaine synchronisation.[/yellow]"
+        )
+
+    def _list_support_events(self):
+        """Événements assignés, depuis la réplique locale si la base est injoignable"""
+        try:
+            events = Event.get_by_support_user(self.current_user.id)
+            self.offline = False
+            return events
+        except OperationalError:
+            replica = self._get_offline_replica()
+            if not replica.exists():
+                raise
+            self.offline = True
+            last_sync = replica.last_sync_at()
+            self.console.print(
+                f"[yellow]Base injoignable : affichage de la copie locale du {last_sync:%d/%m/%Y à %H:%M}.[/yellow]"
+            )
+            return replica.get_assigned_events()
+
+    def sync_offline(self):
+        """Synchroniser la copie locale (mode hors ligne) avec la base principale"""
         try:
-            if role == "gestion":
-                events = Event.get_all()
+            self.console.print("[yellow]Synchronisation de la copie locale...[/yellow]")
+            result = self._get_offline_replica().sync()
+            self.offline = False
+
+            pulled = sum(result["pulled"].values())
+            self.console.print(
+                f"[green]Synchronisation terminée : {result['pushed']} modification(s) envoyée(s), "
+                f"{pulled} ligne(s) reçue(s).[/green]"
+            )
+            for conflict in result["conflicts"]:
+                self.console.print(f"[red]Conflit sur l'événement {conflict['event_id']} : {conflict['reason']}[/red]")
+
+        except OperationalError:
+            self.console.print("[red]Base injoignable : synchronisation impossible, les modifications restent en attente.[/red]")
+        except Exception as e:
+            self.console.print(f"[red]Erreur lors de la synchronisation : {e}[/red]")
+            sentry_sdk.set_context("event_offline_sync", {
+                "current_user_id": self.current_user.id if self.current_user else None,
+                "action": "sync_error"
+            })
+            sentry_sdk.capture_exception(e)
+
+    def list_events(self, role=None, filter_no_support=False, expression=None):
+        """Lister les événements, éventuellement filtrés par une expression (ex : "support:null start>=2026-06-01")"""
+        try:
+            if expression:
+                events = search("events", expression, *scope_conditions("events", self.current_user.id, role), rows=True)
+            elif filter_no_support:
+                events = self._events_without_support()
             elif role == "support":
-                events = Event.get_by_support_user(self.current_user.id)
+                events = self._list_support_events()
             else:
-                events = Event.get_all()
-
-            if filter_no_support:
-                events = [event for event in events if not event.support_contact]
+                events = Event.get_all_paged()
 
             return self.event_view.display_event_list(events)
 
@@ -136,13 +219,18 @@ class EventCommands:
             })
             sentry_sdk.capture_exception(e)
 
+    def search_events(self, role=None):
+        """Lister les événements correspondant à une expression de filtre saisie"""
+        expression = self.filter_view.get_filter_expression("events")
+        self.list_events(role, expression=expression)
+
     def assign_support(self):
         """Assigner un support à un événement sans support"""
         try:
             self.console.print("[yellow]Assigner un support à un événement...[/yellow]")
 
-            # Vérifier s'il y a des événements sans support
-            events_without_support = Event.get_events_without_support()
+            # Vérifier s'il y a des événements sans support (chargés une seule fois pour toute la commande)
+            events_without_support = self._events_without_support()
 
             if not events_without_support:
                 self.console.print("[yellow]Aucun événement sans support trouvé.[/yellow]")
@@ -151,14 +239,12 @@ class EventCommands:
             # Afficher les événements sans support
             self.filter_events_without_support()
 
-            choice_event = self.console.input("Entrez l'ID de l'événement à assigner : ")
+            choice_event = self.inputs.text("Entrez l'ID de l'événement à assigner : ")
 
-            # Récupérer l'événement
-            try:
-                event = Event.get_by_id(choice_event)
-            except ValueError as e:
-                sentry_sdk.capture_exception(e)
-                self.console.print(f"[red]Événement avec l'ID {choice_event} introuvable.[/red]")
+            # L'événement choisi fait partie de la liste déjà chargée
+            event = next((event for event in events_without_support if str(event.id) == choice_event.strip()), None)
+            if not event:
+                self.console.print(f"[red]Événement avec l'ID {choice_event} introuvable ou déjà assigné.[/red]")
                 return
 
             # Récupérer et afficher les supports disponibles
@@ -170,7 +256,7 @@ class EventCommands:
             self.console.print("Supports disponibles :")
             self.event_view.display_supports_available(supports)
 
-            choice_support = self.console.input("Entrez l'ID du support à assigner : ")
+            choice_support = self.inputs.text("Entrez l'ID du support à assigner : ")
 
             # Valider le support
             support = Event.validate_support_user(choice_support)
@@ -179,7 +265,7 @@ class EventCommands:
                 return
 
             # Assigner le support
-            event.assign_support(support.id)
+            Event.assign_support_by_id(event.id, support.id)
             self.console.print(f"[green]Support {support.name} assigné à l'événement {event.id} ![/green]")
 
         except Exception as e:
@@ -192,10 +278,14 @@ class EventCommands:
             })
             sentry_sdk.capture_exception(e)
 
+    def _events_without_support(self):
+        """Événements sans support (filtre SQL), une seule requête par commande"""
+        return self.memo.get_or_load("events_without_support", Event.get_events_without_support)
+
     def filter_events_without_support(self):
         """Filtrer les événements sans support assigné"""
         try:
-            events = Event.get_events_without_support()
+            events = self._events_without_support()
 
             if not events:
                 self.console.print("[green]Tous les événements ont un support assigné.[/green]")
@@ -1,13 +1,16 @@
 from app.views.user import userView
+from app.views.filter import FilterView
+from app.services.query_filter import search
 from app.models.user import User
 from rich.console import Console
 import sentry_sdk
 
 
 class UserCommands:
-    def __init__(self, current_user=None):
-        self.user_view = userView()
-        self.console = Console()
+    def __init__(self, current_user=None, console=None, view=None, filter_view=None):
+        self.console = console or Console()
+        self.user_view = view or userView(console=self.console)
+        self.filter_view = filter_view or FilterView(console=self.console)
         self.current_user = current_user
 
     def create_user(self):
@@ -90,15 +93,22 @@ class UserCommands:
             self.console.print(f"[red]Erreur : {e}[red]")
             sentry_sdk.capture_exception(e)
 
-    def list_users(self, filter_by_department=None):
-        """Lister tous les collaborateurs"""
+    def list_users(self, filter_by_department=None, expression=None):
+        """Lister tous les collaborateurs, éventuellement filtrés par une expression (ex : "department:2 sort:name")"""
         try:
-            if filter_by_department:
-                users = User.get_by_department(filter_by_department)
+            if expression:
+                users = search("users", expression, rows=True)
+            elif filter_by_department:
+                users = User.get_rows_by_department(filter_by_department)
             else:
-                users = User.get_all()
+                users = User.get_all_paged()
 
             self.user_view.display_user_list(users)
         except Exception as e:
             self.console.print(f"[red]Erreur : {e}[/red]")
             sentry_sdk.capture_exception(e)
+
+    def search_users(self):
+        """Lister les collaborateurs correspondant à une expression de filtre saisie"""
+        expression = self.filter_view.get_filter_expression("users")
+        self.list_users(expression=expression)
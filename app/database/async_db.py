@@ -0,0 +1,49 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.database.db import Base
+import os
+
+
+class AsyncDatabaseManager:
+    def __init__(self, database_url=None, **engine_options):
+        """
+        Définir l'URL de connexion PostgreSQL asynchrone (pilote asyncpg)
+        Création du moteur asynchrone
+        Création de la fabrique de sessions asynchrones
+
+        Une autre URL peut être fournie (ex: sqlite+aiosqlite:// pour les tests)
+        """
+        self.database_url = database_url or (
+            f"postgresql+asyncpg://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+            f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT', 5432)}"
+            f"/{os.getenv('DB_NAME')}"
+        )
+        self.engine = create_async_engine(self.database_url, echo=os.getenv('MODE') == 'dev', **engine_options)
+
+        # Les objets restent utilisables après le commit : pas de chargement implicite en async
+        self.SessionLocal = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def get_session(self):
+        """
+        Obtenir une session asynchrone (à utiliser avec "async with")
+        """
+        return self.SessionLocal()
+
+    async def create_tables(self):
+        """
+        Créer toutes les tables définies dans le dossier models
+        """
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def drop_tables(self):
+        """
+        Supprimer toutes les tables (pour les tests)
+        """
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def dispose(self):
+        """
+        Fermer les connexions du pool
+        """
+        await self.engine.dispose()
@@ -1,8 +1,11 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, inspect, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 import os
 import logging
+import time
 
 # Cache les warnings dans la console
 logging.getLogger('sqlalchemy').setLevel(logging.WARNING)
@@ -14,12 +17,80 @@ load_dotenv()
 Base = declarative_base()
 
 
+class UnitOfWorkSession(Session):
+    """
+    Session partagée par toutes les opérations d'une commande (unité de travail)
+
+    Les modèles l'utilisent comme une session ordinaire. Chaque opération (get_session)
+    ouvre son point de sauvegarde (SAVEPOINT) : commit() se contente d'envoyer les changements
+    (flush), rollback() n'annule que les écritures de l'opération en cours (les opérations
+    précédentes de la commande sont conservées) et close() libère le point de sauvegarde.
+    La validation et la fermeture réelles sont faites par finish() à la fin de la commande,
+    suivies des actions différées (session.info["after_commit"], ex : invalidation d'un cache).
+    """
+    def begin_operation(self, savepoint=True):
+        """Début d'une opération d'un modèle ; une lecture seule n'a pas besoin de point de sauvegarde"""
+        self.info.setdefault("operations", []).append(self.begin_nested() if savepoint else None)
+        return self
+
+    def _open_savepoint(self, savepoint):
+        """Le point de sauvegarde est-il encore ouvert (éventuellement sous d'autres) ?"""
+        transaction = self.get_nested_transaction()
+        while transaction is not None:
+            if transaction is savepoint:
+                return True
+            transaction = transaction.parent
+        return False
+
+    def commit(self):
+        self.flush()
+
+    def rollback(self):
+        """Annule l'opération en cours jusqu'à son point de sauvegarde"""
+        operations = self.info.get("operations")
+        if not operations:
+            return
+        savepoint = operations[-1]
+        if savepoint is not None and self._open_savepoint(savepoint):
+            savepoint.rollback()
+        operations[-1] = None
+
+    def close(self):
+        """Termine l'opération en cours en libérant son point de sauvegarde"""
+        operations = self.info.get("operations")
+        if not operations:
+            return
+        savepoint = operations.pop()
+        if savepoint is not None and self._open_savepoint(savepoint):
+            savepoint.commit()
+
+    def finish(self, commit=True):
+        """Valide (ou annule) la transaction de la commande, ferme la session puis exécute les actions différées"""
+        callbacks = self.info.pop("after_commit", [])
+        self.info.pop("operations", None)
+        try:
+            if commit:
+                super().commit()
+            else:
+                super().rollback()
+        finally:
+            super().close()
+
+        if commit:
+            for callback in callbacks:
+                callback()
+
+
 class DatabaseManager:
-    def __init__(self):
+    # Durée (secondes) pendant laquelle les lectures restent sur le primaire après une écriture
+    READ_YOUR_WRITES_WINDOW = 5
+
+    def __init__(self, replica_url=None):
         """
         Définir l'URL de connexion PostgreSQL
         Création du moteur de la base de donnée
         Création de la session
+        Création du moteur de lecture si une réplique est configurée (DB_REPLICA_URL)
         """
         self.database_url = (
             f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
@@ -29,6 +100,21 @@ class DatabaseManager:
         self.engine = create_engine(self.database_url, echo=os.getenv('MODE') == 'dev')
         self.SessionLocal = sessionmaker(bind=self.engine)
 
+        # Réplique en lecture seule (optionnelle)
+        self.replica_url = replica_url or os.getenv('DB_REPLICA_URL')
+        self.replica_engine = None
+        self.ReplicaSessionLocal = None
+        self._last_write_at = ContextVar(f"last_write_at_{id(self)}", default=None)
+        self._force_primary = ContextVar(f"force_primary_{id(self)}", default=False)
+        self._unit_of_work = ContextVar(f"unit_of_work_{id(self)}", default=None)
+
+        if self.replica_url:
+            self.replica_engine = create_engine(self.replica_url, echo=os.getenv('MODE') == 'dev')
+            self.ReplicaSessionLocal = sessionmaker(bind=self.replica_engine)
+            # Toute écriture sur le primaire ouvre la fenêtre "read-your-writes"
+            event.listen(self.SessionLocal, "after_flush", lambda session, context: self.mark_write())
+            event.listen(UnitOfWorkSession, "after_flush", lambda session, context: self.mark_write())
+
     def tables_exist(self):
         """
         Vérifier si les tables existent dans la base de données
@@ -51,10 +137,100 @@ class DatabaseManager:
 
     def get_session(self):
         """
-        Obtenir une session de base de données
+        Obtenir une session de base de données (primaire, lecture et écriture)
+        Dans une unité de travail, retourne la session partagée de la commande
+        avec un point de sauvegarde propre à l'opération
         """
+        session = self._unit_of_work.get()
+        if session is not None:
+            return session.begin_operation()
         return self.SessionLocal()
 
+    def get_read_session(self):
+        """
+        Obtenir une session pour les lectures seules
+
+        Utilise la réplique si elle est configurée, sauf juste après une écriture
+        (read-your-writes) ou à l'intérieur de read_from_primary()
+        """
+        session = self._unit_of_work.get()
+        if session is not None:
+            return session.begin_operation(savepoint=False)
+        if self.ReplicaSessionLocal is None or self._primary_reads_required():
+            return self.get_session()
+        return self.ReplicaSessionLocal()
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Une session et une transaction pour toute une commande
+
+        Toutes les lectures et écritures des modèles dans ce bloc passent par la même
+        session (une connexion, une carte d'identité) : les objets restent attachés
+        d'une étape à l'autre au lieu d'être rechargés ou fusionnés (merge).
+        Validation à la sortie du bloc, annulation si une exception le traverse.
+        Un bloc imbriqué réutilise l'unité de travail en cours.
+        """
+        current = self._unit_of_work.get()
+        if current is not None:
+            yield current
+            return
+
+        # Les objets restent lisibles après la commande (pas d'expiration à la validation)
+        factory = sessionmaker(class_=UnitOfWorkSession, **{**self.SessionLocal.kw, "expire_on_commit": False})
+        session = factory()
+        token = self._unit_of_work.set(session)
+        try:
+            yield session
+        except BaseException:
+            self._unit_of_work.reset(token)
+            session.finish(commit=False)
+            raise
+        self._unit_of_work.reset(token)
+        session.finish(commit=True)
+
+    @contextmanager
+    def outside_unit_of_work(self):
+        """Ouvrir des sessions indépendantes de l'unité de travail en cours (ex : cache partagé entre commandes)"""
+        token = self._unit_of_work.set(None)
+        try:
+            yield
+        finally:
+            self._unit_of_work.reset(token)
+
+    def after_commit(self, session, callback):
+        """
+        Exécute callback une fois les écritures de la session réellement validées
+
+        Dans une unité de travail, session.commit() n'est qu'un flush : l'action est différée
+        jusqu'à la validation de la commande (annulée avec elle). Sinon elle est exécutée tout de suite.
+        """
+        if isinstance(session, UnitOfWorkSession):
+            session.info.setdefault("after_commit", []).append(callback)
+        else:
+            callback()
+
+    def mark_write(self):
+        """Signale une écriture : les lectures suivantes restent sur le primaire un court instant"""
+        self._last_write_at.set(time.monotonic())
+
+    @contextmanager
+    def read_from_primary(self):
+        """Forcer les lectures sur le primaire dans ce bloc"""
+        token = self._force_primary.set(True)
+        try:
+            yield
+        finally:
+            self._force_primary.reset(token)
+
+    def _primary_reads_required(self):
+        """Vérifie si les lectures doivent rester sur le primaire"""
+        if self._force_primary.get():
+            return True
+
+        last_write_at = self._last_write_at.get()
+        return last_write_at is not None and time.monotonic() - last_write_at < self.READ_YOUR_WRITES_WINDOW
+
     def drop_tables(self):
         """
         Supprimer toutes les tables (pour les tests)
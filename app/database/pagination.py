@@ -0,0 +1,77 @@
+from sqlalchemy import Select, func, select
+from app.database.db import db_manager
+
+
+class PagedQuery:
+    """
+    Séquence paresseuse construite sur une requête SQLAlchemy
+
+    Seules les lignes demandées sont chargées :
+    - len() exécute un COUNT (mis en cache)
+    - le découpage [début:fin] exécute un OFFSET/LIMIT dans une session dédiée
+    Les vues peuvent ainsi la manipuler comme une liste classique.
+
+    La requête peut être une Query (entités) ou un select() 2.0 (lignes Row, ex : row_select des modèles).
+    """
+    CHUNK_SIZE = 500
+
+    def __init__(self, build_query):
+        """
+        build_query : fonction recevant une session et retournant la requête ordonnée (Query ou select())
+        """
+        self.build_query = build_query
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            session = db_manager.get_read_session()
+            try:
+                query = self.build_query(session)
+                if isinstance(query, Select):
+                    self._count = session.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar()
+                else:
+                    self._count = query.enable_eagerloads(False).order_by(None).count()
+            finally:
+                session.close()
+        return self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                raise ValueError("Le pas de découpage n'est pas supporté")
+            return self.fetch(start, max(stop - start, 0))
+
+        if item < 0:
+            item += len(self)
+        rows = self.fetch(item, 1)
+        if not rows:
+            raise IndexError("Index hors limites")
+        return rows[0]
+
+    def __iter__(self):
+        """Parcourt toute la requête par blocs pour borner la mémoire"""
+        offset = 0
+        while True:
+            rows = self.fetch(offset, self.CHUNK_SIZE)
+            yield from rows
+            if len(rows) < self.CHUNK_SIZE:
+                return
+            offset += self.CHUNK_SIZE
+
+    def fetch(self, offset, limit):
+        """Charger une page de résultats"""
+        if limit <= 0:
+            return []
+
+        session = db_manager.get_read_session()
+        try:
+            query = self.build_query(session).offset(offset).limit(limit)
+            if isinstance(query, Select):
+                return session.execute(query).all()
+            return query.all()
+        finally:
+            session.close()
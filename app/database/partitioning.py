@@ -0,0 +1,139 @@
+from datetime import datetime
+from sqlalchemy import PrimaryKeyConstraint, event, text
+from sqlalchemy.ext.compiler import compiles
+import os
+import sentry_sdk
+
+
+# Nombre de mois futurs pour lesquels une partition est créée à l'avance
+MONTHS_AHEAD = int(os.getenv('EVENT_PARTITIONS_AHEAD', 3))
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _partitioned_primary_key(constraint, compiler, **kw):
+    """
+    PostgreSQL impose que la clé primaire d'une table partitionnée contienne
+    la clé de partitionnement : elle est ajoutée à la DDL uniquement.
+    Côté ORM la clé primaire reste l'ID seul.
+    """
+    partition_key = constraint.table.info.get("partition_key")
+    columns = [column.name for column in constraint.columns]
+    if not partition_key or partition_key in columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+
+    preparer = compiler.preparer
+    ddl = ""
+    if constraint.name is not None:
+        ddl += f"CONSTRAINT {preparer.format_constraint(constraint)} "
+    ddl += f"PRIMARY KEY ({', '.join(preparer.quote(name) for name in columns + [partition_key])})"
+    return ddl
+
+
+def month_start(value):
+    """Premier jour du mois de la date donnée"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """Décale un début de mois de n mois"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name, month):
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def monthly_partition_ddl(table_name, month):
+    """DDL d'une partition mensuelle [début du mois, début du mois suivant)"""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, start)} PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def default_partition_ddl(table_name):
+    """Partition par défaut : reçoit les lignes hors des mois déjà créés"""
+    return f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"
+
+
+def partition_statements(table_name, now=None, months_ahead=None):
+    """Partitions du mois courant et des mois suivants"""
+    months_ahead = MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(now or datetime.now())
+    return [monthly_partition_ddl(table_name, add_months(current, offset)) for offset in range(months_ahead + 1)]
+
+
+def default_partition_move_statements(table_name, partition_key, month):
+    """
+    Création d'une partition mensuelle quand la partition par défaut contient déjà des lignes de ce mois
+    (ex : événement réservé plus de MONTHS_AHEAD mois à l'avance)
+
+    PostgreSQL refuse de créer la partition tant que ces lignes sont dans la partition par défaut :
+    elles sont mises de côté, retirées, puis réinsérées dans la nouvelle partition (même transaction).
+    """
+    start = month_start(month)
+    end = add_months(start, 1)
+    pending = f"{partition_name(table_name, start)}_pending"
+    condition = f"{partition_key} >= '{start:%Y-%m-%d}' AND {partition_key} < '{end:%Y-%m-%d}'"
+    return [
+        f"CREATE TEMP TABLE {pending} ON COMMIT DROP AS SELECT * FROM {table_name}_default WHERE {condition}",
+        f"DELETE FROM {table_name}_default WHERE {condition}",
+        monthly_partition_ddl(table_name, start),
+        f"INSERT INTO {table_name} SELECT * FROM {pending}",
+    ]
+
+
+def ensure_monthly_partitions(engine, table, now=None, months_ahead=None):
+    """
+    Crée les partitions manquantes (mois courant + mois à venir)
+
+    Les lignes du mois déjà reçues par la partition par défaut sont déplacées dans la nouvelle partition.
+    Sans effet hors PostgreSQL : les tests SQLite gardent une table unique.
+    Retourne la liste des DDL exécutées.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    months_ahead = MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(now or datetime.now())
+    partition_key = table.info.get("partition_key", "date_start")
+    statements = []
+    try:
+        with engine.begin() as connection:
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                exists = connection.execute(
+                    text("SELECT to_regclass(:name)"), {"name": partition_name(table.name, month)}
+                ).scalar()
+                if exists:
+                    continue
+                for statement in default_partition_move_statements(table.name, partition_key, month):
+                    connection.exec_driver_sql(statement)
+                    statements.append(statement)
+        return statements
+    except Exception as e:
+        sentry_sdk.set_context("partitioning", {
+            "table": table.name,
+            "error_type": type(e).__name__
+        })
+        sentry_sdk.capture_exception(e)
+        raise e
+
+
+def enable_monthly_partitions(table):
+    """
+    À la création de la table (create_all), créer aussi la partition par défaut
+    et les partitions des prochains mois
+    """
+    @event.listens_for(table, "after_create")
+    def _create_partitions(target, connection, **kw):
+        if connection.dialect.name != "postgresql":
+            return
+        connection.exec_driver_sql(default_partition_ddl(target.name))
+        for statement in partition_statements(target.name):
+            connection.exec_driver_sql(statement)
+
+    return table
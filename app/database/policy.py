@@ -0,0 +1,155 @@
+from contextvars import ContextVar
+from sqlalchemy import Integer, and_, event, false, func, literal_column, or_, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+import os
+import sentry_sdk
+
+
+# Sécurité au niveau des lignes PostgreSQL (ROW_LEVEL_SECURITY=1) : mêmes règles, appliquées par la base
+ROW_LEVEL_SECURITY = os.getenv('ROW_LEVEL_SECURITY') == '1'
+
+# Nom des politiques créées sur les tables
+RLS_POLICY_NAME = "epic_events_access"
+
+# Utilisateur et rôle dont les droits filtrent les requêtes (CLI : utilisateur connecté, API : porteur du token)
+_current_subject = ContextVar("policy_subject", default=None)
+
+
+def _all(model, user_id):
+    """Aucune restriction"""
+    return []
+
+
+def _own_clients(model, user_id):
+    return [model.commercial_contact_id == user_id]
+
+
+def _own_events(model, user_id):
+    return [model.support_contact_id == user_id]
+
+
+def _client_owner(model, user_id):
+    """Contrat d'un client suivi par l'utilisateur (EXISTS sur la clé primaire du client)"""
+    return [model.client.has(commercial_contact_id=user_id)]
+
+
+def _signed_client_owner(model, user_id):
+    return [model.is_signed, *_client_owner(model, user_id)]
+
+
+# (table, action) -> {rôle: règle} ; une règle retourne les conditions WHERE à ajouter à la requête.
+# Un rôle absent n'a aucun droit : la requête ne retourne aucune ligne.
+# Les lignes modifiables par un rôle doivent rester lisibles par ce rôle : la politique PostgreSQL
+# (ROW_LEVEL_SECURITY=1) applique les règles de lecture à l'UPDATE, qui sinon ne toucherait aucune ligne.
+POLICIES = {
+    ("clients", "read"): {"gestion": _all, "support": _all, "commercial": _own_clients},
+    ("clients", "update"): {"commercial": _own_clients},
+    ("contracts", "read"): {"gestion": _all, "support": _all, "commercial": _client_owner},
+    ("contracts", "update"): {"gestion": _all, "commercial": _client_owner},
+    ("contracts", "create_event"): {"commercial": _signed_client_owner},
+    ("events", "read"): {"gestion": _all, "commercial": _all, "support": _own_events},
+    ("events", "update"): {"gestion": _all, "support": _own_events},
+    ("users", "read"): {"gestion": _all},
+}
+
+
+def policy_conditions(model, user_id, role, action="read"):
+    """
+    Conditions WHERE traduisant les droits d'un rôle sur une table
+
+    Ex : policy_conditions(Client, 3, "commercial") -> [Client.commercial_contact_id == 3]
+    Retourne [] sans restriction, [false()] si le rôle n'a aucun droit.
+    """
+    rule = POLICIES.get((model.__tablename__, action), {}).get(role)
+    if rule is None:
+        return [false()]
+    return rule(model, user_id)
+
+
+def apply_policy(query, model, user_id, role, action="read"):
+    """Restreint une requête (Query ou select) aux lignes autorisées"""
+    return query.where(*policy_conditions(model, user_id, role, action))
+
+
+def set_policy_subject(user_id, role=None):
+    """Définit l'utilisateur dont les droits sont transmis à PostgreSQL (None : aucun)"""
+    _current_subject.set((user_id, role) if user_id is not None else None)
+
+
+def get_policy_subject():
+    return _current_subject.get()
+
+
+def rls_predicate(model):
+    """
+    Règles de lecture d'une table compilées en expression SQL PostgreSQL
+
+    L'utilisateur et le rôle sont lus dans les paramètres de la transaction (app.user_id, app.role).
+    Sans utilisateur défini (maintenance, authentification), aucune restriction ne s'applique.
+    """
+    current_role = func.nullif(func.current_setting("app.role", True), "")
+    current_user_id = func.nullif(func.current_setting("app.user_id", True), "").cast(Integer)
+    rules = POLICIES[(model.__tablename__, "read")]
+
+    predicate = or_(
+        current_role.is_(None),
+        *[and_(current_role == role, *rule(model, current_user_id)) for role, rule in rules.items()]
+    )
+    # Compilée dans un SELECT sur la table : les sous-requêtes EXISTS (ex : client du contrat)
+    # restent corrélées à la ligne contrôlée au lieu de relire toute la table
+    statement = select(literal_column("1")).select_from(model.__table__).where(predicate)
+    compiled = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return compiled.split("\nWHERE ", 1)[1]
+
+
+def rls_statements(model):
+    """DDL activant la sécurité au niveau des lignes d'une table avec ses règles de lecture"""
+    table = model.__tablename__
+    return [
+        f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY",
+        # Le propriétaire des tables (compte de l'application) est lui aussi soumis aux politiques
+        f"ALTER TABLE {table} FORCE ROW LEVEL SECURITY",
+        f"DROP POLICY IF EXISTS {RLS_POLICY_NAME} ON {table}",
+        f"CREATE POLICY {RLS_POLICY_NAME} ON {table} USING ({rls_predicate(model)})",
+    ]
+
+
+def install_row_level_security(engine, models):
+    """
+    Crée les politiques PostgreSQL des tables données
+
+    Sans effet hors PostgreSQL ou si ROW_LEVEL_SECURITY n'est pas activé.
+    Retourne la liste des DDL exécutées.
+    """
+    if engine.dialect.name != "postgresql" or not ROW_LEVEL_SECURITY:
+        return []
+
+    statements = [statement for model in models for statement in rls_statements(model)]
+    try:
+        with engine.begin() as connection:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+        return statements
+    except Exception as e:
+        sentry_sdk.set_context("row_level_security", {
+            "tables": [model.__tablename__ for model in models],
+            "error_type": type(e).__name__
+        })
+        sentry_sdk.capture_exception(e)
+        raise e
+
+
+@event.listens_for(Session, "after_begin")
+def _transmit_policy_subject(session, transaction, connection):
+    """Transmet l'utilisateur courant à PostgreSQL au début de chaque transaction (portée : la transaction)"""
+    subject = _current_subject.get()
+    if not ROW_LEVEL_SECURITY or subject is None or connection.dialect.name != "postgresql":
+        return
+
+    user_id, role = subject
+    connection.execute(
+        text("SELECT set_config('app.user_id', :user_id, true), set_config('app.role', :role, true)"),
+        # Un utilisateur sans département n'a aucun droit (un rôle vide lèverait les restrictions)
+        {"user_id": str(user_id), "role": role or "aucun"}
+    )
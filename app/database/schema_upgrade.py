@@ -0,0 +1,51 @@
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
+import sentry_sdk
+
+
+def missing_column_statements(engine, table):
+    """
+    DDL ajoutant à une table existante les colonnes du modèle qu'elle n'a pas encore
+
+    create_all ne modifie pas les tables déjà créées : les colonnes ajoutées au modèle
+    après coup (ex. clés de regroupement des clients) doivent l'être par ALTER TABLE.
+    Les colonnes ajoutées sont nullables ; les index qui les portent sont créés ensuite.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return []
+
+    existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    added = [column for column in table.columns if column.name not in existing_columns]
+    added_names = {column.name for column in added}
+    statements = [
+        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+        for column in added
+    ]
+
+    for index in table.indexes:
+        if any(column.name in added_names for column in index.columns):
+            statements.append(str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect)))
+
+    return statements
+
+
+def upgrade_schema(engine, tables):
+    """
+    Met les tables existantes au niveau des modèles (colonnes et index ajoutés)
+
+    Retourne la liste des DDL exécutées.
+    """
+    statements = [statement for table in tables for statement in missing_column_statements(engine, table)]
+    try:
+        with engine.begin() as connection:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+        return statements
+    except Exception as e:
+        sentry_sdk.set_context("schema_upgrade", {
+            "tables": [table.name for table in tables],
+            "error_type": type(e).__name__
+        })
+        sentry_sdk.capture_exception(e)
+        raise e
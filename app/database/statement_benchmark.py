@@ -0,0 +1,152 @@
+"""
+Microbenchmark des requêtes chaudes : coût Python par appel avant / après la mise en cache des requêtes
+
+    poetry run python -m app.database.statement_benchmark [--calls 2000]
+
+- avant : chaîne session.query(...) et joinedload reconstruite à chaque appel
+- select() : lignes projetées, requête reconstruite à chaque appel
+- en cache : méthode actuelle du modèle (lambda_stmt, compilée une seule fois)
+
+Base SQLite en mémoire avec peu de lignes : le temps mesuré est essentiellement celui de la
+construction, de la compilation et de l'hydratation côté Python, pas celui de la base.
+"""
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+from app.database.db import Base, db_manager
+from app.models import Client, Contract, Department, Event, User
+import argparse
+import time
+
+
+def _legacy_filtered_contracts(user_id):
+    """Version précédente de Contract.get_filtered_contracts(user_id, "signed")"""
+    session = db_manager.get_read_session()
+    try:
+        return session.query(Contract).options(
+            joinedload(Contract.client),
+            joinedload(Contract.commercial_contact)
+        ).filter(Contract.commercial_contact_id == user_id).filter(Contract.is_signed).all()
+    finally:
+        session.close()
+
+
+def _legacy_support_events(user_id):
+    """Version précédente de Event.get_by_support_user"""
+    session = db_manager.get_read_session()
+    try:
+        return session.query(Event).options(
+            joinedload(Event.contract).joinedload(Contract.client),
+            joinedload(Event.support_contact)
+        ).filter(Event.support_contact_id == user_id).all()
+    finally:
+        session.close()
+
+
+def _legacy_clients_by_commercial(user_id):
+    """Version précédente de Client.get_by_commercial"""
+    session = db_manager.get_read_session()
+    try:
+        return session.query(Client).filter(Client.commercial_contact_id == user_id).all()
+    finally:
+        session.close()
+
+
+def _rebuilt(statement_builder):
+    """Mêmes lignes projetées que la version actuelle, mais requête reconstruite à chaque appel (sans lambda_stmt)"""
+    def call(user_id):
+        session = db_manager.get_read_session()
+        try:
+            return session.execute(statement_builder(user_id)).all()
+        finally:
+            session.close()
+    return call
+
+
+def _populate(session, rows):
+    """Un commercial, un support, et quelques lignes de chaque table"""
+    commercial_department = Department(name="commercial", description="Commercial")
+    support_department = Department(name="support", description="Support")
+    session.add_all([commercial_department, support_department])
+    session.flush()
+
+    commercial = User(name="Commercial", mail="commercial@bench.fr", username="commercial", password_hash="-",
+                      employee_number="BENCH-1", department_id=commercial_department.id)
+    support = User(name="Support", mail="support@bench.fr", username="support", password_hash="-",
+                   employee_number="BENCH-2", department_id=support_department.id)
+    session.add_all([commercial, support])
+    session.flush()
+
+    for index in range(rows):
+        client = Client(name=f"Client {index}", mail=f"client{index}@bench.fr", phone="+33123456789",
+                        company_name=f"Société {index}", commercial_contact_id=commercial.id)
+        session.add(client)
+        session.flush()
+        contract = Contract(client_id=client.id, commercial_contact_id=commercial.id, total_amount=1000.0,
+                            remaining_amount=0.0, is_signed=True)
+        session.add(contract)
+        session.flush()
+        session.add(Event(name=f"Événement {index}", contract_id=contract.id, date_start=datetime(2026, 6, 1, 9),
+                          date_end=datetime(2026, 6, 1, 18), location="Salle", attendees=10,
+                          support_contact_id=support.id))
+    session.commit()
+    return commercial.id, support.id
+
+
+def _time_per_call(function, argument, calls):
+    function(argument)  # Premier appel : compilation et mise en cache hors mesure
+    start = time.perf_counter()
+    for _ in range(calls):
+        function(argument)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def run(calls=2000, rows=5):
+    """Retourne [(requête, µs par appel : avant, select() reconstruit, lambda_stmt en cache)]"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    original_session_local, original_replica = db_manager.SessionLocal, db_manager.ReplicaSessionLocal
+    db_manager.SessionLocal = sessionmaker(bind=engine)
+    db_manager.ReplicaSessionLocal = None
+    try:
+        session = db_manager.SessionLocal()
+        commercial_id, support_id = _populate(session, rows)
+        session.close()
+
+        cases = [
+            ("Contract.get_filtered_contracts", _legacy_filtered_contracts,
+             _rebuilt(lambda user_id: Contract.row_select().where(
+                 Contract.commercial_contact_id == user_id, Contract.is_signed).order_by(Contract.id)),
+             lambda user_id: Contract.get_filtered_contracts(user_id, "signed"), commercial_id),
+            ("Event.get_by_support_user", _legacy_support_events,
+             _rebuilt(lambda user_id: Event.row_select().where(
+                 Event.support_contact_id == user_id).order_by(Event.date_start, Event.id)),
+             Event.get_by_support_user, support_id),
+            ("Client.get_by_commercial", _legacy_clients_by_commercial,
+             _rebuilt(lambda user_id: Client.row_select().where(
+                 Client.commercial_contact_id == user_id).order_by(Client.id)),
+             Client.get_by_commercial, commercial_id),
+        ]
+        return [
+            (name, *[_time_per_call(function, argument, calls) for function in functions])
+            for name, *functions, argument in cases
+        ]
+    finally:
+        db_manager.SessionLocal, db_manager.ReplicaSessionLocal = original_session_local, original_replica
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût par appel des requêtes chaudes, avant / après mise en cache")
+    parser.add_argument("--calls", type=int, default=2000, help="Nombre d'appels mesurés par requête")
+    parser.add_argument("--rows", type=int, default=5, help="Lignes retournées par chaque requête")
+    args = parser.parse_args()
+
+    print(f"{'Requête (µs par appel)':<35}{'avant':>10}{'select()':>10}{'en cache':>10}{'gain':>8}")
+    for name, before, rebuilt, cached in run(args.calls, args.rows):
+        print(f"{name:<35}{before:>10.1f}{rebuilt:>10.1f}{cached:>10.1f}{before / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
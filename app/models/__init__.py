@@ -4,3 +4,7 @@ from .department import Department
 from .client import Client
 from .event import Event
 from .contract import Contract
+from .audit_entry import AuditEntry
+from .archive import ArchivedContract, ArchivedEvent
+from .outbox import OutboxMessage
+from .tombstone import Tombstone
@@ -0,0 +1,108 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, String, Text
+from app.database.db import Base, db_manager
+import sentry_sdk
+
+
+class ArchivedContract(Base):
+    """
+    Contrats soldés (signés et entièrement payés) sortis de la table contracts
+
+    Mêmes colonnes que Contract, sans clé étrangère : les tables chaudes restent
+    petites et l'archive n'impose aucune contrainte aux suppressions futures.
+    """
+    __tablename__ = 'archived_contracts'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    client_id = Column(Integer, nullable=False, index=True)
+    commercial_contact_id = Column(Integer, nullable=False, index=True)
+    total_amount = Column(Float, nullable=False)
+    remaining_amount = Column(Float, nullable=False)
+    is_signed = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):  # pragma: no cover
+        return f"ArchivedContract(id={self.id}, client_id={self.client_id}, archived_at={self.archived_at})"
+
+    @classmethod
+    def get_by_client(cls, client_id):
+        """Historique des contrats archivés d'un client"""
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            return session.query(cls).filter(cls.client_id == client_id).order_by(cls.id).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def get_by_commercial(cls, user_id):
+        """Historique des contrats archivés d'un commercial"""
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            return session.query(cls).filter(cls.commercial_contact_id == user_id).order_by(cls.id).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+
+class ArchivedEvent(Base):
+    """
+    Événements terminés depuis plus longtemps que la durée de rétention
+
+    Mêmes colonnes que Event, sans clé étrangère vers contracts ni users.
+    """
+    __tablename__ = 'archived_events'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(255), nullable=False)
+    contract_id = Column(Integer, nullable=False, index=True)
+    date_start = Column(DateTime, nullable=False)
+    date_end = Column(DateTime, nullable=False)
+    support_contact_id = Column(Integer, nullable=True, index=True)
+    location = Column(Text, nullable=False)
+    attendees = Column(Integer, nullable=False)
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    last_updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):  # pragma: no cover
+        return f"ArchivedEvent(id={self.id}, name='{self.name}', date_end={self.date_end})"
+
+    @classmethod
+    def get_by_contract(cls, contract_id):
+        """Historique des événements archivés d'un contrat"""
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            return session.query(cls).filter(cls.contract_id == contract_id).order_by(cls.date_start).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def get_by_support_user(cls, user_id):
+        """Historique des événements archivés d'un membre du support"""
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            return session.query(cls).filter(cls.support_contact_id == user_id).order_by(cls.date_start).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
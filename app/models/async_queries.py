@@ -0,0 +1,291 @@
+import asyncio
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
+from app.database.policy import policy_conditions
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.department import Department
+from app.models.event import Event
+from app.models.user import User
+import sentry_sdk
+
+
+class AsyncClientQueries:
+    """Version asynchrone des requêtes de lecture sur les clients"""
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all(self):
+        """Récupérer tous les clients"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(select(Client).order_by(Client.id))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_id(self, client_id):
+        """Récupérer un client par son ID"""
+        try:
+            async with self.db.get_session() as session:
+                client = await session.get(Client, client_id)
+                if not client:
+                    raise ValueError(f"Client avec l'ID {client_id} introuvable")
+                return client
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_email(self, email):
+        """Récupérer un client par son email"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(select(Client).where(Client.mail == email))
+                client = result.scalars().first()
+                if not client:
+                    raise ValueError(f"Client avec l'email '{email}' introuvable")
+                return client
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_commercial(self, user_id):
+        """Récupérer les clients d'un commercial spécifique"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    select(Client).where(Client.commercial_contact_id == user_id).order_by(Client.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def search_by_name(self, name):
+        """Rechercher des clients par nom"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(select(Client).where(Client.name.ilike(f"%{name}%")))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def search_by_prefix(self, prefix, limit=10):
+        """Rechercher les clients dont le nom commence par le préfixe donné"""
+        try:
+            prefix = (prefix or "").strip().lower()
+            if not prefix:
+                return []
+
+            escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    select(Client).where(
+                        func.lower(Client.name).like(f"{escaped}%", escape="\\")
+                    ).order_by(func.lower(Client.name), Client.id).limit(limit)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+
+class AsyncContractQueries:
+    """Version asynchrone des requêtes de lecture sur les contrats"""
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def _base_query():
+        """Requête de base avec client et commercial chargés (pas de chargement implicite en async)"""
+        return select(Contract).options(
+            joinedload(Contract.client),
+            joinedload(Contract.commercial_contact)
+        )
+
+    async def get_all(self):
+        """Récupérer tous les contrats"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().order_by(Contract.id))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_commercial(self, user_id):
+        """Récupérer les contrats d'un commercial (contrats de ses clients, cf. politique d'accès)"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    self._base_query().where(*policy_conditions(Contract, user_id, "commercial")).order_by(Contract.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_id_with_permissions(self, contract_id, user_id, role):
+        """Récupérer un contrat avec permissions"""
+        try:
+            query = self._base_query().where(Contract.id == contract_id, *policy_conditions(Contract, user_id, role, "update"))
+
+            async with self.db.get_session() as session:
+                result = await session.execute(query)
+                return result.scalars().first()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return None
+
+    async def get_filtered_contracts(self, user_id, filter_type):
+        """Filtrer les contrats d'un commercial (contrats de ses clients, cf. politique d'accès)"""
+        try:
+            query = self._base_query().where(*policy_conditions(Contract, user_id, "commercial"))
+
+            if filter_type == "unsigned":
+                query = query.where(~Contract.is_signed)
+            elif filter_type == "signed":
+                query = query.where(Contract.is_signed)
+            elif filter_type == "unpaid":
+                query = query.where(Contract.remaining_amount > 0)
+
+            async with self.db.get_session() as session:
+                result = await session.execute(query.order_by(Contract.id))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+
+class AsyncEventQueries:
+    """Version asynchrone des requêtes de lecture sur les événements"""
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def _base_query():
+        """Requête de base avec contrat, client et support chargés"""
+        return select(Event).options(
+            joinedload(Event.contract).joinedload(Contract.client),
+            joinedload(Event.support_contact)
+        )
+
+    async def get_all(self):
+        """Récupérer tous les événements"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().order_by(Event.id))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_id(self, event_id):
+        """Récupérer un événement par son ID"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().where(Event.id == event_id))
+                event = result.scalars().first()
+                if not event:
+                    raise ValueError(f"Événement avec l'ID {event_id} introuvable")
+                return event
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_support_user(self, user_id):
+        """Récupérer les événements assignés à un utilisateur support"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    self._base_query().where(Event.support_contact_id == user_id).order_by(Event.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_events_without_support(self):
+        """Récupérer les événements sans support assigné"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    self._base_query().where(Event.support_contact_id.is_(None)).order_by(Event.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_event_with_permissions(self, event_id, user_id, user_role):
+        """Récupérer un événement avec validation des permissions"""
+        try:
+            query = self._base_query().where(Event.id == event_id, *policy_conditions(Event, user_id, user_role, "update"))
+
+            async with self.db.get_session() as session:
+                result = await session.execute(query)
+                return result.scalars().first()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return None
+
+
+class AsyncUserQueries:
+    """Version asynchrone des requêtes de lecture sur les utilisateurs"""
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def _base_query():
+        """Requête de base avec le département chargé"""
+        return select(User).options(joinedload(User.department))
+
+    async def get_all(self):
+        """Récupérer tous les utilisateurs"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().order_by(User.id))
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_id(self, user_id):
+        """Récupère un utilisateur par son ID"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().where(User.id == user_id))
+                return result.scalars().first()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def get_by_department(self, department_name):
+        """Récupérer les utilisateurs par département"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    self._base_query().join(User.department).where(Department.name == department_name).order_by(User.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+
+    async def authenticate(self, username, password):
+        """Authentifier un utilisateur"""
+        try:
+            async with self.db.get_session() as session:
+                result = await session.execute(self._base_query().where(User.username == username))
+                user = result.scalars().first()
+
+            # Le hachage argon2 est coûteux en CPU : il ne doit pas bloquer la boucle d'événements
+            if user and await asyncio.to_thread(user.verify_password, password):
+                return user
+            return None
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
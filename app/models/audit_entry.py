@@ -0,0 +1,52 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.database.db import Base, db_manager
+import sentry_sdk
+
+
+class AuditEntry(Base):
+    """
+    Journal d'audit en ajout seul
+
+    Une ligne par création / modification / suppression, avec le détail
+    des champs modifiés ({champ: [ancienne valeur, nouvelle valeur]}).
+    Pas de clé étrangère : l'historique doit survivre à la suppression de l'entité.
+    """
+    __tablename__ = 'audit_entries'
+    __table_args__ = (
+        Index('ix_audit_entries_entity', 'entity_type', 'entity_id', 'created_at'),
+    )
+
+    ACTIONS = ["create", "update", "delete"]
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(10), nullable=False)
+    changes = Column(JSON, nullable=False, default=dict)
+    actor_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):  # pragma: no cover
+        return f"AuditEntry(id={self.id}, {self.entity_type}#{self.entity_id}, action='{self.action}')"
+
+    @classmethod
+    def history(cls, entity_type, entity_id, limit=None):
+        """Historique d'une entité, du plus ancien au plus récent"""
+        session = None
+        try:
+            session = db_manager.get_session()
+            query = session.query(cls).filter(
+                cls.entity_type == entity_type,
+                cls.entity_id == entity_id
+            ).order_by(cls.created_at, cls.id)
+
+            if limit:
+                query = query.limit(limit)
+            return query.all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, func, lambda_stmt, or_, select
+from sqlalchemy.orm import relationship, validates
 
 from app.database.db import Base, db_manager
+from app.database.pagination import PagedQuery
+from app.database.policy import policy_conditions
 from app.models.date_tracked import DateTracked
+from app.utils.normalizers import normalize_company, normalize_email, normalize_phone
+from app.utils.similarity import DUPLICATE_THRESHOLD, client_similarity
 from app.utils.validators import validate_email, validate_tel
 import sentry_sdk
 
@@ -16,6 +20,11 @@ class Client(Base, DateTracked):
     phone = Column(String(50))
     company_name = Column(String(255))
 
+    # Clés de regroupement pour la détection des doublons (calculées automatiquement)
+    mail_normalized = Column(String(255), index=True)
+    phone_e164 = Column(String(20), index=True)
+    company_key = Column(String(255), index=True)
+
     # Relation avec la class User (Equipe commercial)
     commercial_contact_id = Column(Integer, ForeignKey('users.id'), nullable=True)
     commercial_contact = relationship("app.models.user.User", back_populates="clients")
@@ -23,6 +32,26 @@ class Client(Base, DateTracked):
     # Relation avec la class Contract
     contracts = relationship("app.models.contract.Contract", back_populates="client")
 
+    # Index fonctionnel pour la recherche par préfixe (LIKE 'abc%') insensible à la casse
+    __table_args__ = (
+        Index(
+            'ix_clients_name_lower',
+            func.lower(name).label('name_lower'),
+            postgresql_ops={'name_lower': 'text_pattern_ops'}
+        ),
+    )
+
+    @validates('mail', 'phone', 'company_name')
+    def _update_blocking_keys(self, key, value):
+        """Tenir à jour les clés de regroupement à chaque modification"""
+        if key == 'mail':
+            self.mail_normalized = normalize_email(value)
+        elif key == 'phone':
+            self.phone_e164 = normalize_phone(value)
+        else:
+            self.company_key = normalize_company(value)
+        return value
+
     def __repr__(self):  # pragma: no cover
         return f"Client(id={self.id}, name='{self.name}', email='{self.mail}', company='{self.company_name}')"
 
@@ -52,7 +81,8 @@ class Client(Base, DateTracked):
             if role != 'commercial':
                 raise PermissionError("Seuls les commerciaux peuvent créer des clients")
 
-            # Vérification de l'existence d'un client
+            # Vérification de l'existence d'un client (email exact ; l'email normalisé
+            # ne sert qu'à l'avertissement de doublon probable, cf. find_duplicates)
             if 'mail' in kwargs:
                 existing = session.query(cls).filter(cls.mail == kwargs['mail']).first()
                 if existing:
@@ -122,7 +152,7 @@ class Client(Base, DateTracked):
         """
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             clients = session.query(cls).all()
             return clients
 
@@ -141,6 +171,25 @@ class Client(Base, DateTracked):
             if session:
                 session.close()
 
+    @classmethod
+    def row_select(cls):
+        """
+        Lignes des listes de clients : seules les colonnes affichées,
+        en tuples nommés légers (Row) au lieu d'entités ORM
+        """
+        return select(
+            cls.id, cls.name, cls.mail, cls.phone, cls.company_name,
+            cls.commercial_contact_id, cls.created_at, cls.last_updated_at
+        )
+
+    @classmethod
+    def get_all_paged(cls):
+        """
+        Récupérer tous les clients sous forme de séquence paginée
+        Les lignes ne sont chargées que page par page lors de l'affichage
+        """
+        return PagedQuery(lambda session: cls.row_select().order_by(cls.id))
+
     @classmethod
     def get_by_id(cls, client_id):
         """
@@ -149,7 +198,7 @@ class Client(Base, DateTracked):
         """
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             client = session.query(cls).filter(cls.id == client_id).first()
             if not client:
                 raise ValueError(f"Client avec l'ID {client_id} introuvable")
@@ -177,7 +226,7 @@ class Client(Base, DateTracked):
         """
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             client = session.query(cls).filter(cls.mail == email).first()
             if not client:
                 raise ValueError(f"Client avec l'email '{email}' introuvable")
@@ -203,8 +252,10 @@ class Client(Base, DateTracked):
         """Récupérer les clients d'un commercial spécifique"""
         session = None
         try:
-            session = db_manager.get_session()
-            return session.query(cls).filter(cls.commercial_contact_id == user_id).all()
+            session = db_manager.get_read_session()
+            # Requête compilée une seule fois puis mise en cache : seul user_id change d'un appel à l'autre
+            statement = lambda_stmt(lambda: cls.row_select().where(cls.commercial_contact_id == user_id).order_by(cls.id))
+            return session.execute(statement).all()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
@@ -217,7 +268,7 @@ class Client(Base, DateTracked):
         """Rechercher des clients par nom"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             return session.query(cls).filter(cls.name.ilike(f"%{name}%")).all()
         except Exception as e:
             sentry_sdk.capture_exception(e)
@@ -227,14 +278,108 @@ class Client(Base, DateTracked):
                 session.close()
 
     @classmethod
-    def get_by_id_with_permissions(cls, client_id, user_id):
-        """RÉCUPÉRER UN CLIENT AVEC PERMISSIONS"""
+    def search_by_prefix(cls, prefix, user_id, role, limit=10):
+        """
+        Rechercher les clients dont le nom commence par le préfixe donné
+        Utilise l'index sur lower(name) et limite le nombre de résultats
+        Seuls les clients que le rôle peut lire sont proposés (un commercial : les siens)
+        """
+        session = None
+        try:
+            prefix = (prefix or "").strip().lower()
+            if not prefix:
+                return []
+
+            # Échapper les jokers pour que la recherche reste un simple préfixe
+            escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+            session = db_manager.get_read_session()
+            return session.query(cls).filter(
+                func.lower(cls.name).like(f"{escaped}%", escape="\\"),
+                *policy_conditions(cls, user_id, role)
+            ).order_by(func.lower(cls.name), cls.id).limit(limit).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def has_any(cls):
+        """Vérifier qu'au moins un client existe sans charger la table"""
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            return session.query(cls.id).limit(1).first() is not None
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    def dedup_fields(self):
+        """Champs comparés par le score de similarité"""
+        return {
+            "name": self.name,
+            "mail": self.mail,
+            "phone": self.phone,
+            "company_name": self.company_name
+        }
+
+    @classmethod
+    def find_duplicates(cls, threshold=DUPLICATE_THRESHOLD, exclude_id=None, **fields):
+        """
+        Clients probablement identiques aux données fournies
+
+        Seuls les clients partageant une clé de regroupement (email normalisé,
+        téléphone E.164 ou nom d'entreprise normalisé) sont lus puis notés.
+        Retourne une liste de (client, score) triée par score décroissant.
+        """
+        session = None
+        try:
+            conditions = []
+            mail_key = normalize_email(fields.get("mail"))
+            phone_key = normalize_phone(fields.get("phone"))
+            company_key = normalize_company(fields.get("company_name"))
+
+            if mail_key:
+                conditions.append(cls.mail_normalized == mail_key)
+            if phone_key:
+                conditions.append(cls.phone_e164 == phone_key)
+            if company_key:
+                conditions.append(cls.company_key == company_key)
+            if not conditions:
+                return []
+
+            session = db_manager.get_read_session()
+            query = session.query(cls).filter(or_(*conditions))
+            if exclude_id is not None:
+                query = query.filter(cls.id != exclude_id)
+
+            scored = [(client, client_similarity(fields, client.dedup_fields())) for client in query.all()]
+            return sorted(
+                [(client, score) for client, score in scored if score >= threshold],
+                key=lambda item: item[1],
+                reverse=True
+            )
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def get_by_id_with_permissions(cls, client_id, user_id, role="commercial"):
+        """RÉCUPÉRER UN CLIENT AVEC PERMISSIONS (seul le commercial du client peut le modifier)"""
         session = None
         try:
             session = db_manager.get_session()
             client = session.query(cls).filter(
                 cls.id == client_id,
-                cls.commercial_contact_id == user_id
+                *policy_conditions(cls, user_id, role, "update")
             ).first()
             return client
         except Exception as e:
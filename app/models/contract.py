@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, Index, lambda_stmt, select
 from sqlalchemy.orm import relationship, joinedload
 from app.database.db import Base, db_manager
+from app.database.pagination import PagedQuery
+from app.database.policy import policy_conditions
 from app.models.client import Client
 from app.models.user import User
 from app.models.date_tracked import DateTracked
@@ -9,6 +11,13 @@ import sentry_sdk
 
 class Contract(Base, DateTracked):
     __tablename__ = 'contracts'
+    __table_args__ = (
+        # Filtres composables (filter_by_criteria) : périmètre d'abord, puis date ou montant
+        Index('ix_contracts_commercial_created', 'commercial_contact_id', 'created_at'),
+        Index('ix_contracts_commercial_signed_remaining', 'commercial_contact_id', 'is_signed', 'remaining_amount'),
+        Index('ix_contracts_client_created', 'client_id', 'created_at'),
+        Index('ix_contracts_created_at', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -91,7 +100,7 @@ class Contract(Base, DateTracked):
         """Récupérer le client et son commercial assigné"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
 
             client = session.query(Client).options(
                 joinedload(Client.commercial_contact)
@@ -143,7 +152,7 @@ class Contract(Base, DateTracked):
         """Récupérer tous les contrats"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             return session.query(cls).options(
                 joinedload(cls.client),
                 joinedload(cls.commercial_contact)
@@ -155,16 +164,32 @@ class Contract(Base, DateTracked):
             if session:
                 session.close()
 
+    @classmethod
+    def row_select(cls):
+        """
+        Lignes des listes de contrats : colonnes affichées et noms du client et du commercial,
+        en tuples nommés légers (Row) au lieu d'entités ORM avec leurs relations
+        """
+        return select(
+            cls.id, cls.client_id, Client.name.label("client_name"), User.name.label("commercial_name"),
+            cls.total_amount, cls.remaining_amount, cls.is_signed, cls.created_at, cls.last_updated_at
+        ).outerjoin(cls.client).outerjoin(cls.commercial_contact)
+
+    @classmethod
+    def get_all_paged(cls):
+        """Récupérer tous les contrats sous forme de séquence paginée"""
+        return PagedQuery(lambda session: cls.row_select().order_by(cls.id))
+
     @classmethod
     def get_by_commercial(cls, user_id):
-        """Récupérer les contrats d'un commercial"""
+        """Récupérer les contrats d'un commercial (règle "read" de la politique d'accès : contrats de ses clients)"""
         session = None
         try:
-            session = db_manager.get_session()
-            return session.query(cls).options(
-                joinedload(cls.client),
-                joinedload(cls.commercial_contact)
-            ).filter(cls.commercial_contact_id == user_id).all()
+            session = db_manager.get_read_session()
+            statement = lambda_stmt(
+                lambda: cls.row_select().where(*policy_conditions(cls, user_id, "commercial")).order_by(cls.id)
+            )
+            return session.execute(statement).all()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
@@ -174,26 +199,18 @@ class Contract(Base, DateTracked):
 
     @classmethod
     def get_by_id_with_permissions(cls, contract_id, user_id, role):
-        """Récupérer un contrat avec permissions"""
+        """Récupérer un contrat avec permissions (règles "update" de la politique d'accès)"""
         session = None
         try:
             session = db_manager.get_session()
 
-            if role == "commercial":
-                contract = session.query(cls).options(
-                    joinedload(cls.client),
-                    joinedload(cls.commercial_contact)
-                ).join(cls.client).filter(
-                    cls.id == contract_id,
-                    Client.commercial_contact_id == user_id
-                ).first()
-            elif role == "gestion":
-                contract = session.query(cls).options(
-                    joinedload(cls.client),
-                    joinedload(cls.commercial_contact)
-                ).filter(cls.id == contract_id).first()
-            else:
-                return None
+            contract = session.query(cls).options(
+                joinedload(cls.client),
+                joinedload(cls.commercial_contact)
+            ).filter(
+                cls.id == contract_id,
+                *policy_conditions(cls, user_id, role, "update")
+            ).first()
 
             return contract
         except Exception as e:
@@ -205,24 +222,25 @@ class Contract(Base, DateTracked):
 
     @classmethod
     def get_filtered_contracts(cls, user_id, filter_type):
-        """Filtrer les contrats d'un commercial"""
+        """Filtrer les contrats d'un commercial (règle "read" de la politique d'accès : contrats de ses clients)"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
 
-            base_query = session.query(cls).options(
-                joinedload(cls.client),
-                joinedload(cls.commercial_contact)
-            ).filter(cls.commercial_contact_id == user_id)
+            # Requête compilée une seule fois par type de filtre puis mise en cache :
+            # seul user_id change d'un appel à l'autre
+            statement = lambda_stmt(
+                lambda: cls.row_select().where(*policy_conditions(cls, user_id, "commercial")).order_by(cls.id)
+            )
 
             if filter_type == "unsigned":
-                return base_query.filter(~cls.is_signed).all()
+                statement += lambda s: s.where(~cls.is_signed)
             elif filter_type == "signed":
-                return base_query.filter(cls.is_signed).all()
+                statement += lambda s: s.where(cls.is_signed)
             elif filter_type == "unpaid":
-                return base_query.filter(cls.remaining_amount > 0).all()
+                statement += lambda s: s.where(cls.remaining_amount > 0)
 
-            return base_query.all()
+            return session.execute(statement).all()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
@@ -230,12 +248,48 @@ class Contract(Base, DateTracked):
             if session:
                 session.close()
 
+    @classmethod
+    def filter_by_criteria(cls, user_id, role, client_id=None, is_signed=None,
+                           created_from=None, created_until=None,
+                           min_total=None, max_total=None,
+                           min_remaining=None, max_remaining=None):
+        """
+        Filtrer les contrats sur plusieurs critères combinés (ET), côté serveur
+
+        Limité aux contrats que le rôle peut lire (politique d'accès), les critères à None
+        sont ignorés. created_from est inclus, created_until exclu.
+        Retourne une séquence paginée triée par date de création.
+        """
+        for low, high in ((created_from, created_until), (min_total, max_total), (min_remaining, max_remaining)):
+            if low is not None and high is not None and low > high:
+                raise ValueError("Borne minimale supérieure à la borne maximale")
+
+        conditions = policy_conditions(cls, user_id, role)
+        if client_id is not None:
+            conditions.append(cls.client_id == client_id)
+        if is_signed is not None:
+            conditions.append(cls.is_signed == is_signed)
+        if created_from is not None:
+            conditions.append(cls.created_at >= created_from)
+        if created_until is not None:
+            conditions.append(cls.created_at < created_until)
+        if min_total is not None:
+            conditions.append(cls.total_amount >= min_total)
+        if max_total is not None:
+            conditions.append(cls.total_amount <= max_total)
+        if min_remaining is not None:
+            conditions.append(cls.remaining_amount >= min_remaining)
+        if max_remaining is not None:
+            conditions.append(cls.remaining_amount <= max_remaining)
+
+        return PagedQuery(lambda session: cls.row_select().where(*conditions).order_by(cls.created_at, cls.id))
+
     @classmethod
     def validate_client_access(cls, client_id):
         """Valider l'accès au client"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             client = session.query(Client).filter(Client.id == client_id).first()
             return client is not None
         except Exception as e:
@@ -15,8 +15,9 @@ class DateTracked:
     def last_updated_at(cls):
         """
         Date de dernière modification de l'enregistrement
+        Indexée : filigrane du flux de changements et des synchronisations incrémentales
         """
-        return Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+        return Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True)
 
     def update_last_updated(self):
         """
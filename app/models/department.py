@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.db import Base, db_manager
+from app.utils.cache import reference_cache
 import sentry_sdk
 
 
@@ -34,6 +35,9 @@ class Department(Base):
             session.add(department)
             session.commit()
             session.refresh(department)
+
+            # Les données de référence en cache ne sont plus à jour
+            db_manager.after_commit(session, reference_cache.invalidate)
             return department
         except Exception as e:
             if session:
@@ -53,11 +57,19 @@ class Department(Base):
 
     @classmethod
     def get_department_with_id(cls, department_id):
-        """Récupère le nom du département via son ID"""
+        """Récupère le nom du département via son ID (mis en cache)"""
+        return reference_cache.get_or_load(
+            ("department_name", department_id),
+            lambda: cls._load_department_name(department_id)
+        )
+
+    @classmethod
+    def _load_department_name(cls, department_id):
+        """Charge le nom du département depuis la base"""
         session = None
 
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             dept = session.query(cls).filter(cls.id == department_id).first()
             return dept.name if dept else None
 
@@ -1,16 +1,29 @@
-from sqlalchemy import Column, Integer, DateTime, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, String, Text, ForeignKey, Index, lambda_stmt, select
 from sqlalchemy.orm import relationship, joinedload
 from app.database.db import Base, db_manager
+from app.database.pagination import PagedQuery
+from app.database.policy import policy_conditions
+from app.database.partitioning import enable_monthly_partitions
 from app.models.date_tracked import DateTracked
 from app.models.contract import Contract
 from app.models.user import User
-from app.models.department import Department
-from app.models.client import Client
 import sentry_sdk
 
 
 class Event(Base, DateTracked):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Sélection des événements à archiver
+        Index('ix_events_date_end', 'date_end'),
+        Index('ix_events_date_start', 'date_start'),
+        Index('ix_events_support_contact_id', 'support_contact_id'),
+        Index('ix_events_contract_id', 'contract_id'),
+        # PostgreSQL : une partition par mois de date_start (ignoré par SQLite)
+        {
+            'postgresql_partition_by': 'RANGE (date_start)',
+            'info': {'partition_key': 'date_start'}
+        }
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
@@ -140,11 +153,9 @@ class Event(Base, DateTracked):
         """Récupérer les événements sans support assigné"""
         session = None
         try:
-            session = db_manager.get_session()
-            return session.query(cls).options(
-                joinedload(cls.contract).joinedload(Contract.client),
-                joinedload(cls.support_contact)
-            ).filter(cls.support_contact_id.is_(None)).all()
+            session = db_manager.get_read_session()
+            statement = lambda_stmt(lambda: cls.row_select().where(cls.support_contact_id.is_(None)).order_by(cls.id))
+            return session.execute(statement).all()
         except Exception as e:
             sentry_sdk.set_context("event_model_get_no_support", {
                 "action": "get_without_support_error",
@@ -158,7 +169,36 @@ class Event(Base, DateTracked):
 
     def assign_support(self, support_user_id):
         """Assigner un support à l'événement"""
-        return self.update(support_contact_id=support_user_id)
+        type(self).assign_support_by_id(self.id, support_user_id)
+        self.support_contact_id = support_user_id
+        return self
+
+    @classmethod
+    def assign_support_by_id(cls, event_id, support_user_id):
+        """
+        Assigner un support à un événement connu par son ID (ex : ligne d'une liste)
+
+        Chargement par clé primaire puis mise à jour de la seule colonne : contrairement
+        à update() (merge), les relations ne sont pas relues.
+        """
+        session = None
+        try:
+            session = db_manager.get_session()
+            event = session.get(cls, event_id)
+            if not event:
+                raise ValueError(f"Événement avec l'ID {event_id} introuvable")
+
+            event.support_contact_id = support_user_id
+            session.commit()
+            return event
+        except Exception as e:
+            if session:
+                session.rollback()
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
 
     @classmethod
     def get_by_id(cls, event_id):
@@ -182,45 +222,31 @@ class Event(Base, DateTracked):
 
     @classmethod
     def get_available_supports(cls):
-        """Récupérer la liste des supports disponibles"""
-        session = None
+        """Récupérer la liste des supports disponibles (équipe support en cache)"""
         try:
-            session = db_manager.get_session()
-            supports = session.query(User).join(User.department).filter(
-                Department.name == 'support'
-            ).all()
-            return supports
+            return User.get_by_department('support')
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
-        finally:
-            if session:
-                session.close()
 
     @classmethod
     def validate_support_user(cls, support_id):
         """Valider qu'un utilisateur est bien un support"""
-        session = None
         try:
-            session = db_manager.get_session()
-            support = session.query(User).join(User.department).filter(
-                User.id == support_id,
-                Department.name == 'support'
-            ).first()
-            return support
+            return next(
+                (support for support in cls.get_available_supports() if str(support.id) == str(support_id).strip()),
+                None
+            )
         except Exception as e:
             sentry_sdk.capture_exception(e)
             return None
-        finally:
-            if session:
-                session.close()
 
     @classmethod
     def get_all(cls):
         """Récupérer tous les événements"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             return session.query(cls).options(
                 joinedload(cls.contract).joinedload(Contract.client),
                 joinedload(cls.support_contact)
@@ -232,16 +258,60 @@ class Event(Base, DateTracked):
             if session:
                 session.close()
 
+    @classmethod
+    def row_select(cls):
+        """
+        Lignes des listes d'événements : colonnes affichées et nom du support,
+        en tuples nommés légers (Row) au lieu d'entités ORM avec contrat, client et support
+        """
+        return select(
+            cls.id, cls.name, cls.contract_id, cls.date_start, cls.date_end, cls.location,
+            cls.attendees, cls.notes, cls.support_contact_id, User.name.label("support_name")
+        ).outerjoin(cls.support_contact)
+
+    @classmethod
+    def get_all_paged(cls):
+        """Récupérer tous les événements sous forme de séquence paginée"""
+        return PagedQuery(lambda session: cls.row_select().order_by(cls.id))
+
     @classmethod
     def get_by_support_user(cls, user_id):
         """Récupérer les événements assignés à un utilisateur support"""
         session = None
         try:
-            session = db_manager.get_session()
-            return session.query(cls).options(
+            session = db_manager.get_read_session()
+            # Requête compilée une seule fois puis mise en cache : seul user_id change d'un appel à l'autre
+            statement = lambda_stmt(
+                lambda: cls.row_select().where(cls.support_contact_id == user_id).order_by(cls.date_start, cls.id)
+            )
+            return session.execute(statement).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def get_in_date_range(cls, start, end, support_user_id=None):
+        """
+        Récupérer les événements commençant dans [start, end)
+
+        Le filtre porte directement sur date_start : PostgreSQL ne lit
+        que les partitions mensuelles concernées
+        """
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            query = session.query(cls).options(
                 joinedload(cls.contract).joinedload(Contract.client),
                 joinedload(cls.support_contact)
-            ).filter(cls.support_contact_id == user_id).all()
+            ).filter(cls.date_start >= start, cls.date_start < end)
+
+            if support_user_id is not None:
+                query = query.filter(cls.support_contact_id == support_user_id)
+
+            return query.order_by(cls.date_start, cls.id).all()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
@@ -250,15 +320,14 @@ class Event(Base, DateTracked):
                 session.close()
 
     @classmethod
-    def validate_contract_access(cls, contract_id, user_id):
-        """Valider que l'utilisateur a accès au contrat"""
+    def validate_contract_access(cls, contract_id, user_id, role="commercial"):
+        """Valider que l'utilisateur peut créer un événement sur le contrat (signé, client suivi par le commercial)"""
         session = None
         try:
-            session = db_manager.get_session()
-            contract = session.query(Contract).join(Contract.client).filter(
+            session = db_manager.get_read_session()
+            contract = session.query(Contract.id).filter(
                 Contract.id == contract_id,
-                Contract.is_signed,
-                Client.commercial_contact_id == user_id
+                *policy_conditions(Contract, user_id, role, "create_event")
             ).first()
             return contract is not None
         except Exception as e:
@@ -275,20 +344,13 @@ class Event(Base, DateTracked):
         try:
             session = db_manager.get_session()
 
-            base_query = session.query(cls).options(
+            event = session.query(cls).options(
                 joinedload(cls.contract).joinedload(Contract.client),
                 joinedload(cls.support_contact)
-            )
-
-            if user_role == "support":
-                event = base_query.filter(
-                    cls.id == event_id,
-                    cls.support_contact_id == user_id
-                ).first()
-            elif user_role == "gestion":
-                event = base_query.filter(cls.id == event_id).first()
-            else:
-                return None
+            ).filter(
+                cls.id == event_id,
+                *policy_conditions(cls, user_id, user_role, "update")
+            ).first()
 
             return event
         except Exception as e:
@@ -297,3 +359,6 @@ class Event(Base, DateTracked):
         finally:
             if session:
                 session.close()
+
+
+enable_monthly_partitions(Event.__table__)
@@ -0,0 +1,105 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, UniqueConstraint, insert, tuple_
+from app.database.db import Base, db_manager
+import sentry_sdk
+
+
+class OutboxMessage(Base):
+    """
+    Boîte d'envoi locale des notifications
+
+    Le planificateur de rappels y écrit les messages dus, un relais d'envoi
+    les lit puis les marque comme envoyés. Un rappel donné (événement, type)
+    n'est inscrit qu'une seule fois.
+    Pas de clé étrangère vers events (table partitionnée sous PostgreSQL).
+    """
+    __tablename__ = 'outbox_messages'
+    __table_args__ = (
+        UniqueConstraint('event_id', 'kind', name='uq_outbox_messages_event_kind'),
+        Index('ix_outbox_messages_pending', 'sent_at', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, nullable=False)
+    kind = Column(String(20), nullable=False)
+    recipient_id = Column(Integer, nullable=True)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    due_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):  # pragma: no cover
+        return f"OutboxMessage(id={self.id}, event_id={self.event_id}, kind='{self.kind}', sent={self.sent_at is not None})"
+
+    @classmethod
+    def enqueue(cls, messages):
+        """
+        Inscrit un lot de messages en une requête, en ignorant ceux déjà présents
+        Retourne le nombre de messages ajoutés
+        """
+        if not messages:
+            return 0
+
+        session = None
+        try:
+            session = db_manager.get_session()
+            keys = [(message["event_id"], message["kind"]) for message in messages]
+            existing = set(session.query(cls.event_id, cls.kind).filter(tuple_(cls.event_id, cls.kind).in_(keys)).all())
+
+            new_messages = []
+            for message in messages:
+                key = (message["event_id"], message["kind"])
+                if key not in existing:
+                    existing.add(key)
+                    new_messages.append(message)
+
+            if new_messages:
+                session.execute(insert(cls), new_messages)
+                session.commit()
+            return len(new_messages)
+        except Exception as e:
+            if session:
+                session.rollback()
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def get_pending(cls, limit=100):
+        """Messages non envoyés, dans l'ordre d'inscription"""
+        session = None
+        try:
+            session = db_manager.get_session()
+            return session.query(cls).filter(cls.sent_at.is_(None)).order_by(cls.id).limit(limit).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    @classmethod
+    def mark_sent(cls, message_ids, sent_at=None):
+        """Marque un lot de messages comme envoyés"""
+        if not message_ids:
+            return 0
+
+        session = None
+        try:
+            session = db_manager.get_session()
+            updated = session.query(cls).filter(cls.id.in_(message_ids)).update(
+                {cls.sent_at: sent_at or datetime.now()}, synchronize_session=False
+            )
+            session.commit()
+            return updated
+        except Exception as e:
+            if session:
+                session.rollback()
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
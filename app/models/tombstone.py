@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Index, event, insert, inspect
+from sqlalchemy.orm import Session
+from app.database.db import Base
+
+
+class Tombstone(Base):
+    """
+    Trace des lignes supprimées (ou archivées) des tables suivies par le flux de changements
+
+    Les consommateurs du flux apprennent ainsi les suppressions sans relire les tables.
+    """
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        Index('ix_tombstones_entity_deleted', 'entity_type', 'deleted_at', 'id'),
+    )
+
+    REASONS = ["delete", "archive"]
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    reason = Column(String(20), nullable=False, default="delete")
+    deleted_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):  # pragma: no cover
+        return f"Tombstone({self.entity_type}#{self.entity_id}, reason='{self.reason}')"
+
+    @classmethod
+    def rows(cls, entity_type, entity_ids, reason="delete"):
+        """Lignes à insérer pour un lot d'ID supprimés"""
+        deleted_at = datetime.now()
+        return [
+            {"entity_type": entity_type, "entity_id": entity_id, "reason": reason, "deleted_at": deleted_at}
+            for entity_id in entity_ids
+        ]
+
+
+# Tables dont les suppressions sont tracées
+TRACKED_TABLES = {"clients", "contracts", "events", "users"}
+
+
+@event.listens_for(Session, "after_flush")
+def _record_deletions(session, flush_context):
+    """Les pierres tombales sont écrites dans la même transaction que la suppression"""
+    deleted = {}
+    for obj in session.deleted:
+        table_name = getattr(obj, "__tablename__", None)
+        if table_name in TRACKED_TABLES:
+            deleted.setdefault(table_name, []).append(inspect(obj).mapper.primary_key_from_instance(obj)[0])
+
+    for table_name, entity_ids in deleted.items():
+        session.connection().execute(insert(Tombstone), Tombstone.rows(table_name, entity_ids))
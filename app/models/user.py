@@ -1,9 +1,11 @@
 import random
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, select
+from sqlalchemy.orm import relationship, contains_eager
 from app.database.db import Base, db_manager
+from app.database.pagination import PagedQuery
+from app.utils.cache import reference_cache
 from app.models.date_tracked import DateTracked
 from app.models.department import Department
 import sentry_sdk
@@ -122,6 +124,9 @@ class User(Base, DateTracked):
             session.add(user)
             session.commit()
             session.refresh(user)
+
+            # L'équipe d'un département a changé
+            db_manager.after_commit(session, reference_cache.invalidate)
             return user
 
         except Exception as e:
@@ -169,6 +174,7 @@ class User(Base, DateTracked):
 
             session.commit()
             session.refresh(user)
+            db_manager.after_commit(session, reference_cache.invalidate)
 
             # Mettre à jour l'instance actuelle
             for key, value in kwargs.items():
@@ -205,6 +211,7 @@ class User(Base, DateTracked):
 
             session.delete(user)
             session.commit()
+            db_manager.after_commit(session, reference_cache.invalidate)
             return True
 
         except Exception as e:
@@ -221,7 +228,7 @@ class User(Base, DateTracked):
         """Récupérer tous les utilisateurs"""
         session = None
         try:
-            session = db_manager.get_session()
+            session = db_manager.get_read_session()
             users = session.query(cls).all()
 
             for user in users:
@@ -242,6 +249,23 @@ class User(Base, DateTracked):
             if session:
                 session.close()
 
+    @classmethod
+    def row_select(cls):
+        """Lignes des listes de collaborateurs : colonnes affichées et nom du département (tuples nommés légers)"""
+        return select(
+            cls.id, cls.employee_number, cls.name, cls.mail, Department.name.label("department_name"), cls.created_at
+        ).outerjoin(cls.department)
+
+    @classmethod
+    def get_all_paged(cls):
+        """Récupérer tous les utilisateurs sous forme de séquence paginée"""
+        return PagedQuery(lambda session: cls.row_select().order_by(cls.id))
+
+    @classmethod
+    def get_rows_by_department(cls, department_name):
+        """Lignes de liste des utilisateurs d'un département (séquence paginée, comme get_all_paged)"""
+        return PagedQuery(lambda session: cls.row_select().where(Department.name == department_name).order_by(cls.id))
+
     @classmethod
     def _generate_employee_number(cls):
         """Générer un numéro d'employé unique"""
@@ -302,17 +326,27 @@ class User(Base, DateTracked):
 
     @classmethod
     def get_by_department(cls, department_name):
-        """Récupérer les utilisateurs par département"""
+        """Récupérer les utilisateurs par département (mis en cache)"""
+        users = reference_cache.get_or_load(
+            ("users_by_department", department_name),
+            lambda: cls._load_by_department(department_name)
+        )
+        # Copie pour que l'appelant ne modifie pas la liste en cache
+        return list(users)
+
+    @classmethod
+    def _load_by_department(cls, department_name):
+        """Charger les utilisateurs d'un département depuis la base"""
         session = None
         try:
-            session = db_manager.get_session()
-            users = session.query(cls).join(cls.department).filter(
+            # Les objets mis en cache survivent à la commande : session indépendante de l'unité de travail
+            with db_manager.outside_unit_of_work():
+                session = db_manager.get_read_session()
+            return session.query(cls).join(cls.department).options(
+                contains_eager(cls.department)
+            ).filter(
                 Department.name == department_name
             ).all()
-            # Forcer le chargement des départements
-            for user in users:
-                _ = user.department.name if user.department else None
-            return users
         except Exception as e:
             sentry_sdk.capture_exception(e)
             raise e
@@ -0,0 +1,28 @@
+from rich.console import Console
+from app.services.profiler import CommandProfiler
+from app.views.client import ClientView
+from app.views.contract import ContractView
+from app.views.event import EventView
+from app.views.filter import FilterView
+from app.views.inputs import InteractiveInput
+from app.views.user import userView
+
+
+class AppContext:
+    """
+    Contexte applicatif partagé
+
+    Possède l'unique console de l'application et les vues, créées une seule fois
+    puis réutilisées par le routeur et les commandes à chaque navigation,
+    ainsi que le profileur des commandes (--profile) et le fournisseur des saisies
+    (clavier, ou réponses scriptées pour rejouer les menus sans terminal).
+    """
+    def __init__(self, console=None, profiler=None, inputs=None):
+        self.console = console or Console()
+        self.profiler = profiler or CommandProfiler()
+        self.inputs = inputs or InteractiveInput(self.console)
+        self.client_view = ClientView(console=self.console, inputs=self.inputs)
+        self.contract_view = ContractView(console=self.console, inputs=self.inputs)
+        self.event_view = EventView(console=self.console, inputs=self.inputs)
+        self.user_view = userView(console=self.console, inputs=self.inputs)
+        self.filter_view = FilterView(console=self.console, inputs=self.inputs)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, delete, exists, insert, literal, select
+from app.database.db import db_manager
+from app.models.archive import ArchivedContract, ArchivedEvent
+from app.models.contract import Contract
+from app.models.event import Event
+from app.models.tombstone import Tombstone
+import os
+import sentry_sdk
+
+
+class ArchiveService:
+    """
+    Déplace les données mortes vers les tables d'archive
+
+    - événements terminés depuis plus de retention_days jours
+    - contrats signés, soldés et sans événement restant dans la table chaude
+
+    Le déplacement se fait par lots (INSERT ... SELECT puis DELETE sur les mêmes ID,
+    une transaction par lot) pour ne pas verrouiller longtemps les tables chaudes.
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, retention_days=None, batch_size=None):
+        self.retention_days = retention_days if retention_days is not None else int(os.getenv('ARCHIVE_RETENTION_DAYS', 365))
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+    def run(self, now=None):
+        """Archive les événements puis les contrats (qui peuvent alors ne plus avoir d'événement)"""
+        now = now or datetime.now()
+        return {
+            "events": self.archive_events(now),
+            "contracts": self.archive_contracts(now)
+        }
+
+    def archive_events(self, now=None):
+        """Archive les événements terminés avant la limite de rétention"""
+        now = now or datetime.now()
+        cutoff = now - timedelta(days=self.retention_days)
+        ids_query = select(Event.id).where(Event.date_end < cutoff)
+        return self._move(Event, ArchivedEvent, ids_query, now)
+
+    def archive_contracts(self, now=None):
+        """Archive les contrats signés, soldés et sans événement actif"""
+        now = now or datetime.now()
+        ids_query = select(Contract.id).where(
+            Contract.is_signed,
+            Contract.remaining_amount == 0,
+            ~exists().where(Event.contract_id == Contract.id)
+        )
+        return self._move(Contract, ArchivedContract, ids_query, now)
+
+    def _move(self, model, archive_model, ids_query, now):
+        """Copie puis supprime les lignes sélectionnées, lot par lot"""
+        columns = [column.name for column in model.__table__.columns]
+        moved = 0
+
+        while True:
+            session = None
+            try:
+                session = db_manager.get_session()
+                ids = session.execute(ids_query.order_by(model.id).limit(self.batch_size)).scalars().all()
+                if not ids:
+                    return moved
+
+                rows = select(
+                    *[model.__table__.c[name] for name in columns],
+                    literal(now, DateTime).label("archived_at")
+                ).where(model.id.in_(ids))
+
+                session.execute(insert(archive_model).from_select(columns + ["archived_at"], rows))
+                session.execute(delete(model).where(model.id.in_(ids)))
+                # Le flux de changements signale les lignes sorties de la table chaude
+                session.execute(insert(Tombstone), Tombstone.rows(model.__tablename__, ids, reason="archive"))
+                session.commit()
+                moved += len(ids)
+
+                if len(ids) < self.batch_size:
+                    return moved
+            except Exception as e:
+                if session:
+                    session.rollback()
+                sentry_sdk.set_context("archive_service", {
+                    "table": model.__tablename__,
+                    "moved": moved,
+                    "error_type": type(e).__name__
+                })
+                sentry_sdk.capture_exception(e)
+                raise e
+            finally:
+                if session:
+                    session.close()
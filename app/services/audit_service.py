@@ -0,0 +1,224 @@
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+from app.database.db import db_manager
+from app.models.audit_entry import AuditEntry
+import threading
+import sentry_sdk
+
+
+# Utilisateur à l'origine des modifications (CLI : utilisateur connecté, API : porteur du token)
+_current_actor = ContextVar("audit_actor", default=None)
+
+# Colonnes jamais recopiées en clair dans le journal
+REDACTED_FIELDS = {"password_hash"}
+
+# Colonnes techniques ignorées dans les différences (dont les clés de regroupement dérivées des clients)
+IGNORED_FIELDS = {"last_updated_at", "mail_normalized", "phone_e164", "company_key"}
+
+
+def set_actor(user_id):
+    """Définit l'utilisateur associé aux prochaines entrées d'audit"""
+    _current_actor.set(user_id)
+
+
+def get_actor():
+    return _current_actor.get()
+
+
+def _json_value(value):
+    """Convertit une valeur de colonne en valeur sérialisable en JSON"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _field_value(key, value):
+    if key in REDACTED_FIELDS and value is not None:
+        return "***"
+    return _json_value(value)
+
+
+def _diff(obj, action):
+    """Différences champ par champ : {champ: [ancienne valeur, nouvelle valeur]}"""
+    state = inspect(obj)
+    changes = {}
+
+    for column_attr in state.mapper.column_attrs:
+        key = column_attr.key
+        if key in IGNORED_FIELDS:
+            continue
+
+        if action == "create":
+            value = state.dict.get(key)
+            if value is not None:
+                changes[key] = [None, _field_value(key, value)]
+        elif action == "delete":
+            value = state.dict.get(key)
+            if value is not None:
+                changes[key] = [_field_value(key, value), None]
+        else:
+            history = state.attrs[key].history
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old != new:
+                changes[key] = [_field_value(key, old), _field_value(key, new)]
+
+    return changes
+
+
+def _is_audited(obj):
+    return not isinstance(obj, AuditEntry) and hasattr(obj, "__tablename__")
+
+
+class AuditWriter:
+    """
+    Écriture différée du journal d'audit
+
+    Les entrées sont accumulées en mémoire après chaque commit puis insérées
+    par lots (un seul INSERT multi-lignes) par un thread d'arrière-plan :
+    l'audit n'ajoute aucun aller-retour à la base pendant les écritures métier.
+    """
+    BATCH_SIZE = 200
+    FLUSH_INTERVAL = 2.0
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def record(self, entries):
+        """Ajoute des entrées au tampon et réveille l'écrivain si un lot est complet"""
+        if not entries:
+            return
+        with self._lock:
+            self._buffer.extend(entries)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        """Nombre d'entrées en attente d'écriture"""
+        with self._lock:
+            return len(self._buffer)
+
+    def discard(self):
+        """Vide le tampon sans rien écrire (tests)"""
+        with self._lock:
+            self._buffer.clear()
+
+    def flush(self):
+        """Écrit toutes les entrées en attente, par lots, et retourne leur nombre"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._buffer[:self.batch_size]
+                    del self._buffer[:self.batch_size]
+                if not batch:
+                    return written
+
+                session = None
+                try:
+                    session = db_manager.get_session()
+                    session.info["audit_skip"] = True
+                    session.execute(insert(AuditEntry), batch)
+                    session.commit()
+                    written += len(batch)
+                except Exception as e:
+                    if session:
+                        session.rollback()
+                    # Les entrées sont remises en tête du tampon pour la prochaine tentative
+                    with self._lock:
+                        self._buffer[:0] = batch
+                    sentry_sdk.capture_exception(e)
+                    return written
+                finally:
+                    if session:
+                        session.close()
+
+    def start(self):
+        """Démarre le thread d'écriture en arrière-plan"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread et écrit les dernières entrées"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+audit_writer = AuditWriter()
+
+
+def get_history(entity_type, entity_id, limit=None):
+    """Historique d'une entité (les entrées en attente sont écrites avant la lecture)"""
+    audit_writer.flush()
+    return AuditEntry.history(entity_type, entity_id, limit=limit)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    """Calcule les différences pendant le flush, tant que l'historique des attributs est disponible"""
+    if session.info.get("audit_skip"):
+        return
+
+    actor_id = get_actor()
+    pending = session.info.setdefault("audit_pending", [])
+
+    for action, objects in (("create", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if not _is_audited(obj):
+                continue
+            if action == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+
+            changes = _diff(obj, action)
+            if action == "update" and not changes:
+                continue
+
+            pending.append({
+                "entity_type": obj.__tablename__,
+                "entity_id": inspect(obj).mapper.primary_key_from_instance(obj)[0],
+                "action": action,
+                "changes": changes,
+                "actor_id": actor_id,
+                "created_at": datetime.now()
+            })
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    """Seules les modifications validées sont transmises à l'écrivain"""
+    audit_writer.record(session.info.pop("audit_pending", None))
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_changes(session):
+    session.info.pop("audit_pending", None)
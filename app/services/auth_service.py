@@ -1,17 +1,20 @@
-import getpass
 import json
 import jwt
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from rich.console import Console
+from sqlalchemy.exc import OperationalError
 from app.models.user import User
+from app.services.offline_service import OfflineReplica
+from app.views.inputs import InteractiveInput
 import sentry_sdk
 import os
 
 
 class AuthService:
-    def __init__(self, console=None):
+    def __init__(self, console=None, inputs=None):
         self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
         self.secret_key = os.getenv('SECRET_KEY')
         self.token_file = Path.home() / '.epic_token'
 
@@ -24,8 +27,8 @@ class AuthService:
 
             # Sinon, connexion normale
             self.console.print("Veuillez vous connecter pour accéder à l'application.\n")
-            username = input("Nom d'utilisateur : ")
-            password = getpass.getpass("Mot de passe : ")
+            username = self.inputs.text("Nom d'utilisateur : ")
+            password = self.inputs.secret("Mot de passe : ")
 
             user = User.authenticate(username, password)
             if user:  # Vérification que user n'est pas None
@@ -44,6 +47,10 @@ class AuthService:
             sentry_sdk.capture_exception(e)
             raise e
 
+    def get_saved_user(self):
+        """Utilisateur de la session enregistrée, sans demander d'identifiants (mode batch)"""
+        return self._check_existing_token()
+
     def _check_existing_token(self):
         """Vérifie si un token valide existe et retourne l'objet User"""
         try:
@@ -51,11 +58,18 @@ class AuthService:
                 with open(self.token_file, 'r') as f:
                     data = json.load(f)
 
-                payload = jwt.decode(data['token'], self.secret_key, algorithms=['HS256'])
+                payload = self.decode_token(data['token'])
                 self.console.print("[green]Déjà connecté ![/green]")
 
                 # Récupérer l'objet User depuis la base
-                user = User.get_by_id(payload['user_id'])
+                try:
+                    user = User.get_by_id(payload['user_id'])
+                except OperationalError:
+                    # Base injoignable : la session reprend depuis la copie locale du mode hors ligne (support)
+                    user = OfflineReplica.saved_user(payload['user_id'])
+                    if user is None:
+                        raise
+                    self.console.print("[yellow]Base injoignable : session reprise depuis la copie locale.[/yellow]")
                 return user
 
         except Exception as e:
@@ -72,6 +86,19 @@ class AuthService:
 
         return None
 
+    def create_token(self, user):
+        """Génère un token JWT signé pour l'utilisateur (valable 24h)"""
+        payload = {
+            'user_id': user.id,
+            'username': user.username,
+            'exp': datetime.now(timezone.utc) + timedelta(hours=24)
+        }
+        return jwt.encode(payload, self.secret_key, algorithm='HS256')
+
+    def decode_token(self, token):
+        """Vérifie un token JWT et retourne son contenu (lève une exception si invalide ou expiré)"""
+        return jwt.decode(token, self.secret_key, algorithms=['HS256'])
+
     def _save_token(self, user):
         """Sauvegarde un token JWT"""
         try:
@@ -81,12 +108,7 @@ class AuthService:
             if not hasattr(user, 'id') or not hasattr(user, 'username'):
                 raise ValueError(f"User object missing required attributes: {user}")
 
-            payload = {
-                'user_id': user.id,
-                'username': user.username,
-                'exp': datetime.now(timezone.utc) + timedelta(hours=24)
-            }
-            token = jwt.encode(payload, self.secret_key, algorithm='HS256')
+            token = self.create_token(user)
 
             with open(self.token_file, 'w') as f:
                 json.dump({'token': token}, f)
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.database.db import db_manager
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.event import Event
+from app.models.tombstone import Tombstone
+from app.models.user import User
+import base64
+import json
+import sentry_sdk
+
+
+# Tables exposées par le flux et colonnes jamais transmises
+FEED_MODELS = {
+    "clients": Client,
+    "contracts": Contract,
+    "events": Event,
+    "users": User
+}
+EXCLUDED_COLUMNS = {"password_hash"}
+
+
+class CursorError(ValueError):
+    """Curseur de reprise illisible"""
+
+
+def encode_cursor(state):
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+
+def decode_cursor(token):
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        raise CursorError("Curseur invalide")
+
+
+def _parse_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _serialize(obj, columns):
+    row = {}
+    for column in columns:
+        value = getattr(obj, column.key)
+        row[column.name] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+
+class ChangeFeed:
+    """
+    Flux incrémental des lignes modifiées depuis un filigrane
+
+    - borne haute figée au premier appel (instantané) : until = maintenant - LAG,
+      pour ne pas manquer une transaction encore en cours à l'instant de la lecture
+    - lignes modifiées dans ]since, until] (index sur last_updated_at), par ordre de clé primaire
+    - puis pierres tombales (suppressions, archivages) de la même période
+    - chaque page retourne un curseur de reprise ; la dernière retourne le nouveau filigrane (until)
+
+    Le coût est proportionnel au nombre de changements, pas à la taille des tables.
+    """
+    PAGE_SIZE = 500
+    LAG = timedelta(seconds=5)
+
+    def __init__(self, page_size=None, lag=None, clock=datetime.now):
+        self.page_size = page_size or self.PAGE_SIZE
+        self.lag = self.LAG if lag is None else lag
+        self.clock = clock
+
+    def read(self, entity, since=None, cursor=None):
+        """
+        Une page du flux
+
+        Retourne {"items": [...], "deleted": [...], "next_cursor": jeton ou None, "watermark": filigrane ou None}
+        Le filigrane n'est donné qu'une fois le flux épuisé : c'est le "since" du prochain appel.
+        """
+        if entity not in FEED_MODELS:
+            raise ValueError(f"Table inconnue : {entity}")
+
+        if cursor:
+            state = decode_cursor(cursor)
+            if state.get("entity") != entity:
+                raise CursorError("Curseur d'une autre table")
+        else:
+            since = _parse_datetime(since)
+            state = {
+                "entity": entity,
+                "since": since.isoformat() if since else None,
+                "until": (self.clock() - self.lag).isoformat(),
+                "phase": "rows",
+                "after": 0
+            }
+
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            if state["phase"] == "rows":
+                return self._read_rows(session, state)
+            return self._read_tombstones(session, state)
+        except CursorError:
+            raise
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    def _window(self, column, state):
+        conditions = [column <= datetime.fromisoformat(state["until"])]
+        if state["since"]:
+            conditions.append(column > datetime.fromisoformat(state["since"]))
+        return conditions
+
+    def _read_rows(self, session, state):
+        model = FEED_MODELS[state["entity"]]
+        columns = [column for column in model.__table__.columns if column.name not in EXCLUDED_COLUMNS]
+
+        rows = session.execute(
+            select(model)
+            .where(*self._window(model.last_updated_at, state), model.id > state["after"])
+            .order_by(model.id)
+            .limit(self.page_size)
+        ).scalars().all()
+
+        items = [_serialize(row, columns) for row in rows]
+        if len(rows) == self.page_size:
+            return self._page(items, [], {**state, "after": rows[-1].id})
+
+        # Lignes épuisées : on enchaîne sur les suppressions de la même période
+        state = {**state, "phase": "tombstones", "after": 0}
+        page = self._read_tombstones(session, state, limit=self.page_size - len(rows))
+        page["items"] = items + page["items"]
+        return page
+
+    def _read_tombstones(self, session, state, limit=None):
+        limit = limit or self.page_size
+        tombstones = session.execute(
+            select(Tombstone.id, Tombstone.entity_id, Tombstone.reason, Tombstone.deleted_at)
+            .where(
+                Tombstone.entity_type == state["entity"],
+                *self._window(Tombstone.deleted_at, state),
+                Tombstone.id > state["after"]
+            )
+            .order_by(Tombstone.id)
+            .limit(limit)
+        ).all()
+
+        deleted = [
+            {"id": row.entity_id, "reason": row.reason, "deleted_at": row.deleted_at.isoformat()}
+            for row in tombstones
+        ]
+        if len(tombstones) == limit:
+            return self._page([], deleted, {**state, "after": tombstones[-1].id})
+
+        return {"items": [], "deleted": deleted, "next_cursor": None, "watermark": state["until"]}
+
+    @staticmethod
+    def _page(items, deleted, state):
+        return {"items": items, "deleted": deleted, "next_cursor": encode_cursor(state), "watermark": None}
+
+    def stream(self, entity, since=None):
+        """Parcourt toutes les pages ; produit les pages une à une"""
+        page = self.read(entity, since=since)
+        yield page
+        while page["next_cursor"]:
+            page = self.read(entity, cursor=page["next_cursor"])
+            yield page
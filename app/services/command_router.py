@@ -1,16 +1,36 @@
 from app.controllers import UserCommands, ContractCommands, ClientCommands, EventCommands
-from rich.console import Console
+from app.database.db import db_manager
+from app.services.app_context import AppContext
+from app.utils.cache import CommandMemo
 import sentry_sdk
 
 
 class CommandRouter:
-    def __init__(self, current_user=None):
+    def __init__(self, current_user=None, context=None):
+        context = context or AppContext()
         self.current_user = current_user
-        self.user_cmd = UserCommands(current_user=current_user)
-        self.contract_cmd = ContractCommands(current_user=current_user)
-        self.client_cmd = ClientCommands(current_user=current_user)
-        self.event_cmd = EventCommands(current_user=current_user)
-        self.console = Console()
+        self.console = context.console
+        self.profiler = context.profiler
+        # Résultats partagés par les étapes d'une commande, vidés à la fin de chacune
+        self.memo = CommandMemo()
+        self.user_cmd = UserCommands(
+            current_user=current_user, console=self.console, view=context.user_view, filter_view=context.filter_view
+        )
+        self.contract_cmd = ContractCommands(
+            current_user=current_user, console=self.console, view=context.contract_view, filter_view=context.filter_view
+        )
+        self.client_cmd = ClientCommands(
+            current_user=current_user, console=self.console, view=context.client_view, filter_view=context.filter_view
+        )
+        self.event_cmd = EventCommands(
+            current_user=current_user,
+            console=self.console,
+            view=context.event_view,
+            contract_cmd=self.contract_cmd,
+            filter_view=context.filter_view,
+            memo=self.memo,
+            inputs=context.inputs
+        )
 
         self.command_map = {
             # Users - Gestion
@@ -18,29 +38,36 @@ class CommandRouter:
             ("users", "gestion", "2"): lambda: self.user_cmd.update_user(),
             ("users", "gestion", "3"): lambda: self.user_cmd.delete_user(),
             ("users", "gestion", "4"): lambda: self.user_cmd.list_users(),
+            ("users", "gestion", "5"): lambda: self.user_cmd.search_users(),
 
             # Contracts - Gestion
             ("contracts", "gestion", "1"): lambda: self.contract_cmd.create_contract(),
             ("contracts", "gestion", "2"): lambda: self.contract_cmd.update_contract("gestion"),
             ("contracts", "gestion", "3"): lambda: self.contract_cmd.list_contracts("gestion"),
+            ("contracts", "gestion", "4"): lambda: self.contract_cmd.filter_contracts_by_criteria("gestion"),
+            ("contracts", "gestion", "5"): lambda: self.contract_cmd.search_contracts("gestion"),
 
             # Contracts - Commercial
             ("contracts", "commercial", "1"): lambda: self.contract_cmd.list_contracts("commercial"),
             ("contracts", "commercial", "2"): lambda: self.contract_cmd.update_contract("commercial"),
+            ("contracts", "commercial", "3"): lambda: self.contract_cmd.search_contracts("commercial"),
 
             # Clients - Commercial
-            ("clients", "commercial", "1"): lambda: self.client_cmd.list_clients(),
+            ("clients", "commercial", "1"): lambda: self.client_cmd.list_clients("commercial"),
             ("clients", "commercial", "2"): lambda: self.client_cmd.update_client(),
+            ("clients", "commercial", "3"): lambda: self.client_cmd.search_clients("commercial"),
 
             # Filters - Commercial
             ("filters", "commercial", "1"): lambda: self.contract_cmd.filter_unsigned_contracts(),
             ("filters", "commercial", "2"): lambda: self.contract_cmd.filter_unpaid_contracts(),
+            ("filters", "commercial", "3"): lambda: self.contract_cmd.filter_contracts_by_criteria("commercial"),
 
             # Events - Gestion
             ("events", "gestion", "1"): lambda: self.event_cmd.update_event(),
             ("events", "gestion", "2"): lambda: self.event_cmd.assign_support(),
             ("events", "gestion", "3"): lambda: self.event_cmd.list_events("gestion"),
             ("events", "gestion", "4"): lambda: self.event_cmd.list_events("gestion", filter_no_support=True),
+            ("events", "gestion", "5"): lambda: self.event_cmd.search_events("gestion"),
 
             # Actions directes
             ("direct", "create_client", ""): lambda: self.client_cmd.create_client(),
@@ -48,16 +75,35 @@ class CommandRouter:
             ("direct", "list_all_clients", ""): lambda: self.client_cmd.list_clients("support"),
             ("direct", "list_assigned_events", ""): lambda: self.event_cmd.list_events("support"),
             ("direct", "update_event", ""): lambda: self.event_cmd.update_event(),
-            ("direct", "list_all_contracts", ""): lambda: self.contract_cmd.list_contracts("support")
+            ("direct", "list_all_contracts", ""): lambda: self.contract_cmd.list_contracts("support"),
+            ("direct", "sync_offline", ""): lambda: self.event_cmd.sync_offline(),
+            ("direct", "search_clients", ""): lambda: self.client_cmd.search_clients("gestion"),
+            ("direct", "search_events", ""): lambda: self.event_cmd.search_events("support")
         }
 
+    def _run(self, command, label):
+        """
+        Exécute une commande dans une unité de travail : une session et une transaction
+        partagées par toutes les lectures et écritures de la commande ; chaque opération a son
+        point de sauvegarde, un rollback dans un modèle n'annule que l'opération en échec
+
+        Avec --profile, la commande (validation comprise) est profilée et son rapport enregistré.
+        """
+        run = None
+        try:
+            with self.profiler.profile(label) as run, db_manager.unit_of_work():
+                command()
+        finally:
+            if run is not None and run.report_path:
+                self.console.print(f"[dim]Profil de la commande enregistré : {run.report_path}[/dim]")
+
     def execute(self, command_type, role, choice):
         """Exécute la commande en fonction du type, rôle et choix"""
         try:
             command = self.command_map.get((command_type, role, choice))
 
             if command:
-                command()
+                self._run(command, f"{command_type}-{role}-{choice}")
             else:
                 self.console.print(f"[red]Commande non trouvée: {command_type}/{role}/{choice}[/red]")
 
@@ -73,13 +119,15 @@ class CommandRouter:
                 "error_type": type(e).__name__
             })
             sentry_sdk.capture_exception(e)
+        finally:
+            self.memo.clear()
 
     def execute_direct_action(self, action):
         """Exécute les actions directes"""
         try:
             command = self.command_map.get(("direct", action, ""))
             if command:
-                command()
+                self._run(command, f"direct-{action}")
             else:
                 self.console.print(f"[red]Action directe non trouvée: {action}[/red]")
 
@@ -93,3 +141,5 @@ class CommandRouter:
                 "error_type": type(e).__name__
             })
             sentry_sdk.capture_exception(e)
+        finally:
+            self.memo.clear()
@@ -0,0 +1,115 @@
+from itertools import combinations
+from sqlalchemy import func
+from app.database.db import db_manager
+from app.models.client import Client
+from app.utils.similarity import DUPLICATE_THRESHOLD, client_similarity
+import sentry_sdk
+
+
+class DedupService:
+    """
+    Rapport de doublons sur toute la table clients
+
+    Les clients ne sont comparés qu'à l'intérieur d'un même bloc (même email
+    normalisé, même téléphone E.164 ou même nom d'entreprise normalisé) :
+    le coût reste proche du linéaire au lieu de comparer chaque client à tous les autres.
+    Les blocs anormalement gros (clé générique) sont ignorés et signalés.
+    """
+    BLOCK_KEYS = ("mail_normalized", "phone_e164", "company_key")
+    MAX_BLOCK_SIZE = 50
+    BATCH_SIZE = 500
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, max_block_size=None):
+        self.threshold = threshold
+        self.max_block_size = max_block_size or self.MAX_BLOCK_SIZE
+
+    def backfill_keys(self):
+        """Calcule les clés de regroupement des clients créés avant leur ajout"""
+        updated = 0
+        last_id = 0
+        while True:
+            session = None
+            try:
+                session = db_manager.get_session()
+                clients = session.query(Client).filter(
+                    Client.mail_normalized.is_(None),
+                    Client.id > last_id
+                ).order_by(Client.id).limit(self.BATCH_SIZE).all()
+                if not clients:
+                    return updated
+
+                for client in clients:
+                    # La réaffectation déclenche le calcul des clés (@validates)
+                    client.mail = client.mail
+                    client.phone = client.phone
+                    client.company_name = client.company_name
+                last_id = clients[-1].id
+                session.commit()
+                updated += len(clients)
+            except Exception as e:
+                if session:
+                    session.rollback()
+                sentry_sdk.capture_exception(e)
+                raise e
+            finally:
+                if session:
+                    session.close()
+
+    def report(self):
+        """
+        Paires de doublons probables et blocs ignorés
+
+        Retourne {"pairs": [(client_a, client_b, score, clé)], "skipped_blocks": [(clé, valeur, taille)]}
+        triées par score décroissant
+        """
+        pairs = {}
+        skipped_blocks = []
+
+        for key in self.BLOCK_KEYS:
+            for value, size, clients in self._blocks(key):
+                if size > self.max_block_size:
+                    skipped_blocks.append((key, value, size))
+                    continue
+
+                for client_a, client_b in combinations(sorted(clients, key=lambda client: client.id), 2):
+                    pair_key = (client_a.id, client_b.id)
+                    if pair_key in pairs:
+                        continue
+                    score = client_similarity(client_a.dedup_fields(), client_b.dedup_fields())
+                    if score >= self.threshold:
+                        pairs[pair_key] = (client_a, client_b, score, key)
+
+        return {
+            "pairs": sorted(pairs.values(), key=lambda pair: pair[2], reverse=True),
+            "skipped_blocks": skipped_blocks
+        }
+
+    def _blocks(self, key):
+        """Blocs de plus d'un client pour une clé : (valeur, taille, clients)"""
+        column = getattr(Client, key)
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            sizes = dict(
+                session.query(column, func.count(Client.id))
+                .filter(column.isnot(None))
+                .group_by(column)
+                .having(func.count(Client.id) > 1)
+                .all()
+            )
+
+            values = [value for value, size in sizes.items() if size <= self.max_block_size]
+            members = {}
+            for start in range(0, len(values), self.BATCH_SIZE):
+                chunk = values[start:start + self.BATCH_SIZE]
+                for client in session.query(Client).filter(column.in_(chunk)).all():
+                    members.setdefault(getattr(client, key), []).append(client)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+        for value, size in sizes.items():
+            yield value, size, members.get(value, [])
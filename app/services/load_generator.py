@@ -0,0 +1,531 @@
+"""
+Générateur de charge : sessions CRM simultanées (commerciaux, supports, gestion)
+
+    poetry run python -m app.services.load_generator --users 200 --duration 60 [--url postgresql://...]
+
+Chaque utilisateur simulé est un thread : il se connecte via AuthService puis enchaîne des parcours
+tirés au sort selon leur poids (lister ses clients, filtrer les contrats non payés, modifier un
+événement...), exécutés par le CommandRouter avec des réponses scriptées (QueueInput).
+
+Sans --url, une base SQLite temporaire sert de substitut. Avec PostgreSQL, utiliser une base dédiée :
+les tables sont créées si besoin et les données de charge (préfixe "charge") y restent.
+
+Rapport : débit, latences p50 / p95 / p99 par parcours, attente du pool de connexions
+(QueuePool instrumenté) et verrous (erreurs de verrou ; attente échantillonnée sous PostgreSQL).
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+from rich.console import Console
+from app.controllers.api import get_user_role
+from app.database.db import Base, db_manager
+from app.database.policy import set_policy_subject
+from app.models import Client, Contract, Department, Event, User
+from app.services.app_context import AppContext
+from app.services.audit_service import audit_writer, set_actor
+from app.services.auth_service import AuthService
+from app.services.command_router import CommandRouter
+from app.utils.cache import reference_cache
+from app.views.inputs import EndOfInput, QueueInput
+from app.views.pager import TablePager
+import argparse
+import math
+import os
+import random
+import re
+import secrets
+import tempfile
+import threading
+import time
+
+
+# Mot de passe commun des utilisateurs simulés (haché une seule fois)
+PASSWORD = "charge-password"
+
+# Statut d'une étape chronométrée
+OK, FAILED, INTERRUPTED = "ok", "échec", "interrompu"
+
+# Erreurs de base de données dues aux verrous (SQLite, PostgreSQL)
+LOCK_ERROR = re.compile(r"database is locked|deadlock detected|lock timeout|could not obtain lock|could not serialize", re.IGNORECASE)
+
+# Messages d'erreur affichés par les commandes (balisage Rich en rouge)
+ERROR_MARKUP = re.compile(r"\[(?:bold )?red\]")
+
+
+class WaitStats:
+    """Nombre, total et maximum de durées mesurées depuis plusieurs threads, et nombre d'échecs"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds, failed=False):
+        with self._lock:
+            self.count += 1
+            self.failures += failed
+            self.seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool mesurant le temps d'obtention de chaque connexion (attente d'une connexion libre comprise)
+
+    Les demandes abandonnées après pool_timeout sont comptées comme échecs.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_waits = WaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_waits.add(time.perf_counter() - started, failed=True)
+            raise
+        self.checkout_waits.add(time.perf_counter() - started)
+        return connection
+
+
+class ErrorCountingConsole(Console):
+    """
+    Console d'une session simulée comptant les messages d'erreur affichés
+
+    Les commandes interceptent leurs exceptions et les affichent en rouge au lieu de les propager :
+    sans ce compteur, une commande en échec serait chronométrée comme réussie.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = 0
+
+    def print(self, *objects, **kwargs):
+        if any(isinstance(obj, str) and ERROR_MARKUP.search(obj) for obj in objects):
+            self.errors += 1
+        super().print(*objects, **kwargs)
+
+
+class LockMonitor:
+    """
+    Verrous rencontrés pendant la charge
+
+    Toutes bases : erreurs de verrou (SQLite "database is locked", interblocages PostgreSQL).
+    PostgreSQL : sessions en attente d'un verrou échantillonnées dans pg_stat_activity ;
+    le temps d'attente cumulé est estimé à partir des échantillons.
+    """
+    SAMPLE_INTERVAL = 0.1
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.errors = 0
+        self.database_errors = 0
+        self.sampled_wait_seconds = None
+        self.max_waiting = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        with self._lock:
+            self.database_errors += 1
+            if LOCK_ERROR.search(str(context.original_exception)):
+                self.errors += 1
+
+    def start(self):
+        if self.engine.dialect.name != "postgresql":
+            return
+        self.sampled_wait_seconds, self.max_waiting = 0.0, 0
+        self._thread = threading.Thread(target=self._sample, name="lock-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if event.contains(self.engine, "handle_error", self._on_error):
+            event.remove(self.engine, "handle_error", self._on_error)
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self):
+        # Connexion hors du pool mesuré
+        sampler = create_engine(self.engine.url, poolclass=NullPool)
+        try:
+            with sampler.connect() as connection:
+                while not self._stop.wait(self.SAMPLE_INTERVAL):
+                    waiting = connection.execute(text(
+                        "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()"
+                    )).scalar()
+                    self.sampled_wait_seconds += waiting * self.SAMPLE_INTERVAL
+                    self.max_waiting = max(self.max_waiting, waiting)
+        finally:
+            sampler.dispose()
+
+
+@dataclass
+class SimulatedUser:
+    """Utilisateur simulé et les lignes qui lui appartiennent"""
+    role: str
+    username: str
+    client_ids: list = field(default_factory=list)
+    event_ids: list = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    """Utilisateurs simulés, événements créés, et nombre total de lignes (listes de la gestion et du support)"""
+    users: list
+    event_ids: list
+    client_count: int
+    event_count: int
+    contract_count: int
+
+
+def _pager(count):
+    """Réponse au pager si la liste dépasse une page (quitter)"""
+    return ["q"] if count > TablePager.PAGE_SIZE else []
+
+
+def _update_client(user, dataset, rng):
+    # ID, puis nom, email et téléphone inchangés (Entrée), nouvelle entreprise
+    return [str(rng.choice(user.client_ids)), "", "", "", f"Entreprise {rng.randrange(1000)}"]
+
+
+def _editable_events(user, dataset):
+    """Événements modifiables par l'utilisateur et nombre de lignes de la liste affichée avant le choix"""
+    if user.role == "support":
+        return user.event_ids, len(user.event_ids)
+    return dataset.event_ids, dataset.event_count
+
+
+def _update_event(user, dataset, rng):
+    # Liste des événements, ID, puis nom, dates, lieu et participants inchangés, nouvelles notes
+    event_ids, listed = _editable_events(user, dataset)
+    return [*_pager(listed), str(rng.choice(event_ids)), "", "", "", "", "", f"Passage {rng.randrange(1000)}"]
+
+
+def _has_rows(answers, user, dataset):
+    """Un parcours de modification n'est proposé qu'à un utilisateur ayant au moins une ligne à modifier"""
+    if answers is _update_client:
+        return bool(user.client_ids)
+    if answers is _update_event:
+        return bool(_editable_events(user, dataset)[0])
+    return True
+
+
+# Parcours par rôle : (nom, poids, commande du routeur, réponses(utilisateur, données, aléa))
+JOURNEYS = {
+    "commercial": [
+        # Le menu « Mes clients > Lister » affiche tous les clients
+        ("mes clients", 5, ("clients", "commercial", "1"), lambda user, dataset, rng: _pager(dataset.client_count)),
+        ("contrats non payés", 3, ("filters", "commercial", "2"), lambda user, dataset, rng: _pager(len(user.client_ids))),
+        ("modifier un client", 1, ("clients", "commercial", "2"), _update_client),
+    ],
+    "support": [
+        ("mes événements", 5, ("direct", "list_assigned_events", ""), lambda user, dataset, rng: _pager(len(user.event_ids))),
+        ("tous les contrats", 2, ("direct", "list_all_contracts", ""), lambda user, dataset, rng: _pager(dataset.contract_count)),
+        ("modifier un événement", 2, ("direct", "update_event", ""), _update_event),
+    ],
+    "gestion": [
+        ("événements sans support", 3, ("events", "gestion", "4"), lambda user, dataset, rng: _pager(dataset.event_count)),
+        ("tous les contrats", 3, ("contracts", "gestion", "3"), lambda user, dataset, rng: _pager(dataset.contract_count)),
+        ("modifier un événement", 1, ("events", "gestion", "1"), _update_event),
+    ],
+}
+
+
+def seed(session, users_per_role, clients_per_commercial, roles):
+    """Crée les utilisateurs simulés, leurs clients, contrats et événements"""
+    tag = f"charge{datetime.now():%H%M%S}"
+    password_hash = User.hash_password(PASSWORD)
+
+    departments = {}
+    for role in roles + ["commercial", "support"]:
+        department = session.query(Department).filter_by(name=role).one_or_none()
+        if department is None:
+            department = Department(name=role, description=role.capitalize())
+            session.add(department)
+            session.flush()
+        departments[role] = department
+
+    def add_user(role, index):
+        user = User(name=f"{role.capitalize()} {index}", mail=f"{tag}-{role}-{index}@charge.fr",
+                    username=f"{tag}-{role}-{index}", password_hash=password_hash,
+                    employee_number=f"{tag}-{role}-{index}", department_id=departments[role].id)
+        session.add(user)
+        return user
+
+    # Les commerciaux et supports possèdent les données même si leur rôle n'est pas simulé
+    commercials = [add_user("commercial", index) for index in range(max(users_per_role, 1))]
+    supports = [add_user("support", index) for index in range(max(users_per_role, 1))]
+    managers = [add_user("gestion", index) for index in range(users_per_role)] if "gestion" in roles else []
+    session.flush()
+
+    simulated = {user.id: SimulatedUser(role, user.username) for role, group in
+                 (("commercial", commercials), ("support", supports), ("gestion", managers)) for user in group}
+    event_ids = []
+    assigned_count = 0
+    start = datetime.now() + timedelta(days=30)
+
+    for commercial_index, commercial in enumerate(commercials):
+        for index in range(clients_per_commercial):
+            client = Client(name=f"Client {commercial_index}-{index}", mail=f"{tag}-{commercial_index}-{index}@client.fr",
+                            phone="+33123456789", company_name=f"Société {index}", commercial_contact_id=commercial.id)
+            session.add(client)
+            session.flush()
+            simulated[commercial.id].client_ids.append(client.id)
+
+            # Un contrat sur deux reste à payer
+            contract = Contract(client_id=client.id, commercial_contact_id=commercial.id, total_amount=1000.0,
+                                remaining_amount=500.0 if index % 2 else 0.0, is_signed=True)
+            session.add(contract)
+            session.flush()
+
+            # Un événement sur trois attend un support, les autres sont répartis à tour de rôle entre les supports
+            # (compteur propre aux événements assignés : chaque support en reçoit, quel que soit leur nombre)
+            assigned = len(event_ids) % 3 != 2
+            support = supports[assigned_count % len(supports)]
+            date_start = start + timedelta(days=index)
+            evt = Event(name=f"Événement {commercial_index}-{index}", contract_id=contract.id, date_start=date_start,
+                        date_end=date_start + timedelta(hours=8), location="Salle", attendees=50,
+                        support_contact_id=support.id if assigned else None)
+            session.add(evt)
+            session.flush()
+            event_ids.append(evt.id)
+            if assigned:
+                simulated[support.id].event_ids.append(evt.id)
+                assigned_count += 1
+
+    session.commit()
+    # Totaux de la base (une base PostgreSQL réutilisée contient aussi les données des lancements précédents)
+    return Dataset(
+        users=[user for user in simulated.values() if user.role in roles],
+        event_ids=event_ids,
+        client_count=session.query(Client).count(),
+        event_count=session.query(Event).count(),
+        contract_count=session.query(Contract).count()
+    )
+
+
+def percentile(values, fraction):
+    """Percentile par rang le plus proche d'une liste triée (None si vide)"""
+    if not values:
+        return None
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+
+class SessionRunner:
+    """Une session CRM simulée : connexion puis parcours jusqu'à l'échéance"""
+    def __init__(self, user, dataset, token_dir, secret_key, seed_value, think_time=0.0):
+        self.user = user
+        self.dataset = dataset
+        self.rng = random.Random(seed_value)
+        self.think_time = think_time
+        self.inputs = QueueInput()
+        self.console = ErrorCountingConsole(file=open(os.devnull, "w"), width=120)
+        self.auth_service = AuthService(console=self.console, inputs=self.inputs)
+        self.auth_service.token_file = Path(token_dir) / f"{user.username}.token"
+        self.auth_service.secret_key = secret_key
+        # (parcours, durée en secondes, statut)
+        self.timings = []
+
+    def _timed(self, name, action):
+        """
+        Exécute et chronomètre une étape
+
+        Une étape échoue si elle lève une exception ou si la commande affiche une erreur
+        (les contrôleurs interceptent leurs exceptions).
+        """
+        started = time.perf_counter()
+        errors = self.console.errors
+        result, status = None, OK
+        try:
+            result = action()
+        except EndOfInput:
+            # Le script ne correspond plus aux questions posées
+            status = INTERRUPTED
+        except Exception:
+            status = FAILED
+        if status == OK and self.console.errors > errors:
+            status = FAILED
+        self.timings.append((name, time.perf_counter() - started, status))
+        return result, status
+
+    def _replay(self, router, command, answers):
+        """Exécute une commande du menu avec les réponses scriptées du parcours"""
+        self.inputs.answers.clear()
+        self.inputs.feed(*answers(self.user, self.dataset, self.rng))
+        router.execute(*command)
+
+    def _login(self):
+        self.inputs.feed(self.user.username, PASSWORD)
+        return self.auth_service.authenticate_user()
+
+    def run(self, deadline, max_journeys=None):
+        try:
+            current_user, status = self._timed("connexion", self._login)
+            if current_user is None:
+                if status == OK:
+                    # Identifiants refusés (ou erreur interceptée par l'authentification)
+                    self.timings[-1] = (*self.timings[-1][:2], FAILED)
+                return
+
+            set_actor(current_user.id)
+            set_policy_subject(current_user.id, get_user_role(current_user))
+            router = CommandRouter(current_user=current_user, context=AppContext(console=self.console, inputs=self.inputs))
+
+            journeys = [journey for journey in JOURNEYS[self.user.role] if _has_rows(journey[3], self.user, self.dataset)]
+            weights = [weight for _, weight, _, _ in journeys]
+            done = 0
+            while time.monotonic() < deadline and (max_journeys is None or done < max_journeys):
+                name, _, command, answers = self.rng.choices(journeys, weights)[0]
+                self._timed(name, lambda: self._replay(router, command, answers))
+                done += 1
+
+                if self.think_time:
+                    time.sleep(self.rng.uniform(0, 2 * self.think_time))
+        finally:
+            self.console.file.close()
+
+
+@dataclass
+class LoadReport:
+    """Résultats d'une charge ; latencies et failures sont indexés par parcours (dont "connexion")"""
+    duration: float
+    users: int
+    latencies: dict
+    failures: dict
+    interrupted: int
+    pool_checkouts: int
+    pool_timeouts: int
+    pool_wait_seconds: float
+    pool_max_wait: float
+    lock_errors: int
+    database_errors: int
+    lock_wait_seconds: float = None
+    max_lock_waiters: int = None
+
+    @property
+    def journeys(self):
+        return sum(len(values) for name, values in self.latencies.items() if name != "connexion")
+
+    @property
+    def throughput(self):
+        return self.journeys / self.duration if self.duration else 0.0
+
+
+def run(users_per_role=5, duration=30.0, url=None, roles=("commercial", "support", "gestion"), clients_per_commercial=5,
+        pool_size=5, max_overflow=10, pool_timeout=30, think_time=0.0, ramp_up=0.0, max_journeys=None, seed_value=0):
+    """Lance la charge et retourne un LoadReport"""
+    roles = list(roles)
+    workdir = tempfile.TemporaryDirectory(prefix="epic_events_charge_")
+    url = url or f"sqlite:///{Path(workdir.name) / 'charge.db'}"
+    engine = create_engine(url, poolclass=TimedQueuePool, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    Base.metadata.create_all(engine)
+
+    original_session_local, original_replica = db_manager.SessionLocal, db_manager.ReplicaSessionLocal
+    db_manager.SessionLocal = sessionmaker(bind=engine)
+    db_manager.ReplicaSessionLocal = None
+    reference_cache.invalidate()
+    monitor = None
+    try:
+        session = db_manager.SessionLocal()
+        try:
+            dataset = seed(session, users_per_role, clients_per_commercial, roles)
+        finally:
+            session.close()
+
+        # Seules les connexions pendant la charge sont mesurées
+        engine.pool.checkout_waits = WaitStats()
+        secret_key = os.getenv('SECRET_KEY') or secrets.token_hex(32)
+        runners = [SessionRunner(user, dataset, workdir.name, secret_key, seed_value + index, think_time)
+                   for index, user in enumerate(dataset.users)]
+
+        monitor = LockMonitor(engine)
+        monitor.start()
+        audit_writer.start()
+        started = time.monotonic()
+        deadline = started + ramp_up + duration
+        threads = [threading.Thread(target=runner.run, args=(deadline, max_journeys), name=f"charge-{runner.user.username}")
+                   for runner in runners]
+        for index, thread in enumerate(threads):
+            if ramp_up and index:
+                time.sleep(ramp_up / len(threads))
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        audit_writer.stop()
+        monitor.stop()
+
+        latencies, failures, interrupted = {}, {}, 0
+        for runner in runners:
+            for name, seconds, status in runner.timings:
+                latencies.setdefault(name, []).append(seconds)
+                failures[name] = failures.get(name, 0) + (status == FAILED)
+                interrupted += status == INTERRUPTED
+        for values in latencies.values():
+            values.sort()
+
+        waits = engine.pool.checkout_waits
+        return LoadReport(
+            duration=elapsed, users=len(runners), latencies=latencies, failures=failures, interrupted=interrupted,
+            pool_checkouts=waits.count, pool_timeouts=waits.failures, pool_wait_seconds=waits.seconds, pool_max_wait=waits.max_seconds,
+            lock_errors=monitor.errors, database_errors=monitor.database_errors,
+            lock_wait_seconds=monitor.sampled_wait_seconds, max_lock_waiters=monitor.max_waiting
+        )
+    finally:
+        if monitor is not None:
+            monitor.stop()
+        db_manager.SessionLocal, db_manager.ReplicaSessionLocal = original_session_local, original_replica
+        reference_cache.invalidate()
+        engine.dispose()
+        workdir.cleanup()
+
+
+def print_report(report):
+    print(f"{report.users} utilisateur(s), {report.duration:.1f} s, {report.journeys} parcours, {report.throughput:.1f} parcours/s")
+    print(f"{'Parcours (ms)':<28}{'nombre':>8}{'échecs':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, values in sorted(report.latencies.items()):
+        p50, p95, p99 = (percentile(values, fraction) * 1000 for fraction in (0.50, 0.95, 0.99))
+        print(f"{name:<28}{len(values):>8}{report.failures[name]:>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+    mean_wait = report.pool_wait_seconds / report.pool_checkouts * 1000 if report.pool_checkouts else 0.0
+    print(f"Pool : {report.pool_checkouts} demande(s) de connexion dont {report.pool_timeouts} abandonnée(s) (pool_timeout), "
+          f"attente totale {report.pool_wait_seconds:.2f} s, moyenne {mean_wait:.2f} ms, max {report.pool_max_wait * 1000:.1f} ms")
+    lock_wait = "non mesurée (PostgreSQL uniquement)" if report.lock_wait_seconds is None else \
+        f"{report.lock_wait_seconds:.2f} s estimées, jusqu'à {report.max_lock_waiters} session(s) en attente"
+    print(f"Verrous : {report.lock_errors} erreur(s) de verrou sur {report.database_errors} erreur(s) SQL, attente {lock_wait}")
+    if report.interrupted:
+        print(f"Parcours interrompus (réponses scriptées épuisées) : {report.interrupted}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sessions CRM simultanées : débit, latences, attente du pool et verrous")
+    parser.add_argument("--users", type=int, default=5, help="Utilisateurs simulés par rôle")
+    parser.add_argument("--roles", nargs="+", choices=sorted(JOURNEYS), default=["commercial", "support", "gestion"])
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée de la charge (secondes)")
+    parser.add_argument("--url", help="Base cible (PostgreSQL dédiée) ; par défaut une base SQLite temporaire")
+    parser.add_argument("--clients", type=int, default=5, help="Clients (et contrats, événements) par commercial")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--pool-timeout", type=float, default=30)
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause moyenne entre deux parcours (secondes)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Étalement du démarrage des sessions (secondes)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du tirage des parcours")
+    args = parser.parse_args()
+
+    print_report(run(
+        users_per_role=args.users, duration=args.duration, url=args.url, roles=args.roles, clients_per_commercial=args.clients,
+        pool_size=args.pool_size, max_overflow=args.max_overflow, pool_timeout=args.pool_timeout,
+        think_time=args.think_time, ramp_up=args.ramp_up, seed_value=args.seed
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,16 @@
-from rich.console import Console
 from app.models import Department
 from app.views.menu import Menu, Submenu
 from app.utils.constants import MESSAGES, MENU_MAPPING
 from app.services.command_router import CommandRouter
+from app.services.app_context import AppContext
 from app.utils.constants import DIRECT_ACTIONS
 import sentry_sdk
 
 
 class MenuService:
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, context=None):
+        self.context = context or AppContext()
+        self.console = self.context.console
         self.router = None
 
     def handle_main_menu(self, user):
@@ -17,13 +18,15 @@ class MenuService:
 
         try:
             # Initialisation du routeur de commandes avec l'utilisateur courant
-            self.router = CommandRouter(current_user=user)
+            # (réutilisé tant que l'utilisateur reste le même)
+            if self.router is None or self.router.current_user is not user:
+                self.router = CommandRouter(current_user=user, context=self.context)
 
             # Récupération du département
             dept_name = self._get_user_department(user)
 
             # Affichage du menu principal
-            menu = Menu(dept_name)
+            menu = Menu(dept_name, console=self.console, inputs=self.context.inputs)
             menu.display()
 
             while True:
@@ -71,7 +74,7 @@ class MenuService:
         """Gère l'affichage et la sélection des options dans un sous-menu"""
         try:
             if submenu_key:
-                submenu = Submenu(submenu_key)
+                submenu = Submenu(submenu_key, console=self.console, inputs=self.context.inputs)
                 submenu.display()
 
                 while True:
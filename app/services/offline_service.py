@@ -0,0 +1,381 @@
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import (
+    Column, DateTime, Integer, JSON, MetaData, String, Table, create_engine, delete, func, select
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, sessionmaker
+from app.database.db import db_manager
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.department import Department
+from app.models.event import Event
+from app.models.user import User
+import os
+import sentry_sdk
+
+
+# Tables propres à la réplique locale (hors modèles de l'application)
+local_metadata = MetaData()
+
+sync_state = Table(
+    "sync_state", local_metadata,
+    Column("key", String(50), primary_key=True),
+    Column("value", DateTime, nullable=True)
+)
+
+pending_changes = Table(
+    "pending_changes", local_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("event_id", Integer, nullable=False),
+    Column("changes", JSON, nullable=False),
+    Column("base_updated_at", DateTime, nullable=False),
+    Column("status", String(20), nullable=False, default="pending"),
+    Column("created_at", DateTime, nullable=False, default=datetime.now)
+)
+
+# Champs d'événement modifiables hors ligne, et ceux à reconvertir en date
+EDITABLE_FIELDS = {"name", "date_start", "date_end", "location", "attendees", "notes"}
+DATE_FIELDS = {"date_start", "date_end"}
+
+
+class OfflineReplica:
+    """
+    Réplique SQLite locale du périmètre d'un membre du support
+
+    Contient ses événements assignés, leurs contrats et leurs clients.
+    - pull : synchronisation incrémentale par filigrane (last_updated_at) par table,
+      plus élagage des lignes sorties du périmètre (ex : événement réassigné)
+    - les modifications d'événements faites hors ligne sont mises en file
+    - push : rejoue la file sur la base principale ; si l'événement a changé depuis
+      la copie locale (last_updated_at différent), la modification est marquée en conflit
+    """
+    SYNCED_MODELS = (Client, Contract, Event)
+
+    def __init__(self, user, path=None):
+        self.user = user
+        self.path = Path(path) if path else self.default_path(user.id)
+        self.engine = None
+        self.SessionLocal = None
+
+    @staticmethod
+    def default_path(user_id):
+        directory = Path(os.getenv('OFFLINE_DIR', "~/.epic_events")).expanduser()
+        return directory / f"offline_{user_id}.db"
+
+    @classmethod
+    def saved_user(cls, user_id, path=None):
+        """
+        Membre du support lu dans sa réplique locale (avec son département), ou None
+
+        Permet de reprendre la session enregistrée quand la base principale est injoignable.
+        """
+        path = Path(path) if path else cls.default_path(user_id)
+        if not path.exists():
+            return None
+        engine = create_engine(f"sqlite:///{path}")
+        session = sessionmaker(bind=engine)()
+        try:
+            return session.query(User).options(joinedload(User.department)).filter(User.id == user_id).first()
+        finally:
+            session.close()
+            engine.dispose()
+
+    def exists(self):
+        """La réplique a-t-elle déjà été synchronisée au moins une fois ?"""
+        return self.path.exists() and self.last_sync_at() is not None
+
+    def _open(self):
+        if self.engine is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.engine = create_engine(f"sqlite:///{self.path}")
+            tables = [Department.__table__, User.__table__] + [model.__table__ for model in self.SYNCED_MODELS]
+            Department.metadata.create_all(self.engine, tables=tables)
+            local_metadata.create_all(self.engine)
+            # Les écritures locales ne doivent pas alimenter le journal d'audit
+            self.SessionLocal = sessionmaker(bind=self.engine, info={"audit_skip": True})
+        return self.engine
+
+    def get_session(self):
+        self._open()
+        return self.SessionLocal()
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
+    # Filigranes
+
+    def _watermark(self, key, connection=None):
+        if connection is not None:
+            return connection.execute(select(sync_state.c.value).where(sync_state.c.key == key)).scalar()
+        with self._open().connect() as connection:
+            return self._watermark(key, connection)
+
+    def _set_watermark(self, connection, key, value):
+        statement = sqlite_insert(sync_state).values(key=key, value=value)
+        connection.execute(statement.on_conflict_do_update(index_elements=["key"], set_={"value": value}))
+
+    def last_sync_at(self):
+        if not self.path.exists():
+            return None
+        return self._watermark("last_sync")
+
+    # Synchronisation
+
+    def sync(self):
+        """Rejoue la file locale puis récupère les changements de la base principale"""
+        pushed, conflicts = self.push()
+        pulled = self.pull()
+        return {"pushed": pushed, "conflicts": conflicts, "pulled": pulled}
+
+    def _scope_ids(self, session):
+        """ID des lignes du périmètre sur la base principale (requêtes étroites)"""
+        event_ids = set(session.execute(select(Event.id).where(Event.support_contact_id == self.user.id)).scalars())
+        contract_ids = set(session.execute(
+            select(Event.contract_id).where(Event.support_contact_id == self.user.id).distinct()
+        ).scalars())
+        client_ids = set(session.execute(
+            select(Contract.client_id).where(Contract.id.in_(contract_ids)).distinct()
+        ).scalars()) if contract_ids else set()
+        return {Event: event_ids, Contract: contract_ids, Client: client_ids}
+
+    def pull(self):
+        """
+        Récupère les lignes modifiées depuis le dernier filigrane et celles entrées
+        dans le périmètre, supprime celles qui en sont sorties.
+        Retourne le nombre de lignes copiées par table.
+        """
+        engine = self._open()
+        primary = None
+        try:
+            primary = db_manager.get_read_session()
+            scope = self._scope_ids(primary)
+            pulled = {}
+
+            with engine.begin() as local:
+                for model in self.SYNCED_MODELS:
+                    table = model.__table__
+                    key = table.name
+                    in_scope = scope[model]
+                    local_versions = dict(local.execute(select(table.c.id, table.c.last_updated_at)).all())
+                    local_ids = set(local_versions)
+
+                    # Lignes sorties du périmètre
+                    removed = local_ids - in_scope
+                    if removed:
+                        local.execute(delete(table).where(table.c.id.in_(removed)))
+
+                    # Lignes modifiées depuis le filigrane, et lignes nouvelles dans le périmètre
+                    # Comparaison large (>=) : une ligne validée après la lecture précédente avec la même
+                    # date que le filigrane n'est pas perdue ; celles déjà copiées à l'identique sont ignorées
+                    rows = []
+                    watermark = self._watermark(key, local)
+                    if in_scope:
+                        changed = primary.query(model).filter(model.id.in_(in_scope))
+                        if watermark is not None:
+                            changed = changed.filter(model.last_updated_at >= watermark)
+                        rows = [row for row in changed.all() if local_versions.get(row.id) != row.last_updated_at]
+
+                        fetched = {row.id for row in rows}
+                        missing = (in_scope - local_ids) - fetched
+                        if missing:
+                            rows += primary.query(model).filter(model.id.in_(missing)).all()
+
+                    if rows:
+                        self._upsert(local, table, [self._row(table, row) for row in rows])
+                        newest = max(row.last_updated_at for row in rows)
+                        if watermark is None or newest > watermark:
+                            self._set_watermark(local, key, newest)
+                    pulled[key] = len(rows)
+
+                # Le membre du support lui-même (affichage du support assigné, session hors ligne)
+                # avec son département, sans son mot de passe
+                support = primary.get(User, self.user.id)
+                if support.department is not None:
+                    self._upsert(local, Department.__table__, [self._row(Department.__table__, support.department)])
+                user_row = self._row(User.__table__, support)
+                user_row["password_hash"] = ""
+                self._upsert(local, User.__table__, [user_row])
+
+                self._set_watermark(local, "last_sync", datetime.now())
+
+            return pulled
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if primary:
+                primary.close()
+
+    @staticmethod
+    def _row(table, obj):
+        return {column.name: getattr(obj, column.key) for column in table.columns}
+
+    @staticmethod
+    def _upsert(connection, table, rows):
+        statement = sqlite_insert(table)
+        columns = {column.name: statement.excluded[column.name] for column in table.columns if not column.primary_key}
+        connection.execute(statement.on_conflict_do_update(index_elements=["id"], set_=columns), rows)
+
+    def push(self):
+        """
+        Rejoue les modifications en attente sur la base principale
+
+        Retourne (nombre de modifications appliquées, liste des conflits)
+        """
+        engine = self._open()
+        with engine.connect() as local:
+            queued = local.execute(
+                select(pending_changes).where(pending_changes.c.status == "pending").order_by(pending_changes.c.id)
+            ).all()
+
+        applied = 0
+        conflicts = []
+        for change in queued:
+            # La ligne en file n'est supprimée qu'après la validation de la modification sur le serveur
+            status = self._apply(change)
+            with engine.begin() as local:
+                if status == "applied":
+                    local.execute(delete(pending_changes).where(pending_changes.c.id == change.id))
+                    applied += 1
+                else:
+                    local.execute(
+                        pending_changes.update().where(pending_changes.c.id == change.id).values(status="conflict")
+                    )
+                    conflicts.append({"event_id": change.event_id, "changes": change.changes, "reason": status})
+        return applied, conflicts
+
+    def _apply(self, change):
+        """
+        Applique une modification si l'événement n'a pas changé depuis la copie locale
+
+        Chaque modification a sa propre session et sa propre transaction, hors de l'unité de
+        travail de la commande : "applied" n'est retourné qu'une fois la modification validée
+        sur le serveur, et un conflit n'annule pas les modifications déjà rejouées.
+        """
+        with db_manager.outside_unit_of_work():
+            return self._apply_in_own_transaction(change)
+
+    def _apply_in_own_transaction(self, change):
+        session = None
+        try:
+            session = db_manager.get_session()
+            event = session.query(Event).filter(Event.id == change.event_id).with_for_update().first()
+
+            if not event or event.support_contact_id != self.user.id:
+                session.rollback()
+                return "Événement introuvable ou réassigné"
+            if event.last_updated_at != change.base_updated_at:
+                session.rollback()
+                return "Événement modifié sur le serveur depuis la dernière synchronisation"
+
+            for key, value in self._decode(change.changes).items():
+                setattr(event, key, value)
+            session.commit()
+            return "applied"
+        except Exception as e:
+            if session:
+                session.rollback()
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+    # Lectures et écritures locales
+
+    def get_assigned_events(self):
+        """Événements assignés, lus dans la réplique locale"""
+        session = self.get_session()
+        try:
+            return session.execute(
+                Event.row_select().where(Event.support_contact_id == self.user.id).order_by(Event.date_start, Event.id)
+            ).all()
+        finally:
+            session.close()
+
+    def get_event(self, event_id):
+        session = self.get_session()
+        try:
+            return session.query(Event).filter(
+                Event.id == event_id,
+                Event.support_contact_id == self.user.id
+            ).first()
+        finally:
+            session.close()
+
+    def update_event(self, event_id, **changes):
+        """
+        Modifie un événement dans la réplique et met la modification en file
+
+        Plusieurs modifications du même événement sont fusionnées en gardant
+        la date de version du serveur d'origine (base de la détection de conflit)
+        """
+        changes = {key: value for key, value in changes.items() if key in EDITABLE_FIELDS and value is not None}
+        session = self.get_session()
+        try:
+            event = session.query(Event).filter(
+                Event.id == event_id,
+                Event.support_contact_id == self.user.id
+            ).first()
+            if not event:
+                return None
+
+            base_updated_at = event.last_updated_at
+            existing = session.execute(
+                select(pending_changes).where(
+                    pending_changes.c.event_id == event_id,
+                    pending_changes.c.status == "pending"
+                )
+            ).first()
+
+            for key, value in changes.items():
+                setattr(event, key, value)
+
+            if existing:
+                session.execute(
+                    pending_changes.update().where(pending_changes.c.id == existing.id).values(
+                        changes={**existing.changes, **self._encode(changes)}
+                    )
+                )
+            else:
+                session.execute(pending_changes.insert().values(
+                    event_id=event_id,
+                    changes=self._encode(changes),
+                    base_updated_at=base_updated_at,
+                    status="pending",
+                    created_at=datetime.now()
+                ))
+            session.commit()
+            return event
+        except Exception as e:
+            session.rollback()
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            session.close()
+
+    def pending_count(self):
+        with self._open().connect() as connection:
+            return connection.execute(
+                select(func.count()).select_from(pending_changes).where(pending_changes.c.status == "pending")
+            ).scalar()
+
+    def get_conflicts(self):
+        with self._open().connect() as connection:
+            return connection.execute(
+                select(pending_changes).where(pending_changes.c.status == "conflict").order_by(pending_changes.c.id)
+            ).all()
+
+    @staticmethod
+    def _encode(changes):
+        return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in changes.items()}
+
+    @staticmethod
+    def _decode(changes):
+        return {
+            key: datetime.fromisoformat(value) if key in DATE_FIELDS and isinstance(value, str) else value
+            for key, value in changes.items()
+        }
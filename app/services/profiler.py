@@ -0,0 +1,168 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import cProfile
+import io
+import os
+import pstats
+import re
+import sentry_sdk
+import time
+import tracemalloc
+
+
+# Profilage de chaque commande du menu (--profile ou PROFILE_COMMANDS=1)
+PROFILE_COMMANDS = os.getenv('PROFILE_COMMANDS') == '1'
+
+# Temps SQL de la commande profilée en cours : {"count": n, "seconds": s}
+_sql_stats = ContextVar("profiler_sql_stats", default=None)
+
+# Commande profilée en cours : (ProfileRun, cProfile.Profile), None hors profilage ou pendant une saisie
+_active_profile = ContextVar("profiler_active", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _sql_started(conn, cursor, statement, parameters, context, executemany):
+    if _sql_stats.get() is not None:
+        conn.info.setdefault("profiler_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _sql_finished(conn, cursor, statement, parameters, context, executemany):
+    stats = _sql_stats.get()
+    started = conn.info.get("profiler_started_at")
+    if stats is None or not started:
+        return
+    stats["count"] += 1
+    stats["seconds"] += time.perf_counter() - started.pop()
+
+
+class ProfileRun:
+    """
+    Mesures d'une commande profilée ; report_path est renseigné une fois le rapport écrit
+
+    input_seconds : temps passé à attendre les saisies de l'utilisateur, exclu des mesures
+    """
+    def __init__(self, label):
+        self.label = label
+        self.report_path = None
+        self.input_seconds = 0.0
+
+
+@contextmanager
+def input_pause():
+    """
+    Suspend le profilage de la commande en cours le temps d'une saisie
+
+    Les fournisseurs de saisies l'utilisent : l'attente de l'utilisateur n'entre ni dans
+    le profil CPU ni dans la durée de la commande. Sans effet hors profilage.
+    """
+    active = _active_profile.get()
+    if active is None:
+        yield
+        return
+
+    run, profiler = active
+    profiler.disable()
+    token = _active_profile.set(None)
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.input_seconds += time.perf_counter() - started_at
+        _active_profile.reset(token)
+        profiler.enable()
+
+
+class CommandProfiler:
+    """
+    Profilage CPU et mémoire des commandes
+
+    Pour chaque commande : cProfile (fonctions les plus coûteuses), tracemalloc (allocations)
+    et temps passé dans les requêtes SQL. Un rapport texte et les statistiques brutes (.prof,
+    lisibles avec pstats ou snakeviz) sont écrits dans le dossier des profils.
+    Désactivé, profile() ne fait rien.
+    """
+    TOP_FUNCTIONS = 25
+    TOP_ALLOCATIONS = 15
+
+    def __init__(self, enabled=None, directory=None):
+        self.enabled = PROFILE_COMMANDS if enabled is None else enabled
+        self.directory = Path(directory or os.getenv('PROFILE_DIR', "~/.epic_events/profiles")).expanduser()
+
+    @contextmanager
+    def profile(self, label):
+        """Profile le bloc ; le rapport est écrit même si la commande échoue"""
+        run = ProfileRun(label)
+        if not self.enabled:
+            yield run
+            return
+
+        stats_token = _sql_stats.set({"count": 0, "seconds": 0.0})
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile()
+        started_at = time.perf_counter()
+
+        active_token = _active_profile.set((run, profiler))
+        profiler.enable()
+        try:
+            yield run
+        finally:
+            profiler.disable()
+            _active_profile.reset(active_token)
+            # Durée de la commande hors attente des saisies
+            elapsed = time.perf_counter() - started_at - run.input_seconds
+            snapshot = tracemalloc.take_snapshot()
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            sql = _sql_stats.get()
+            _sql_stats.reset(stats_token)
+
+            try:
+                run.report_path = self._write_report(
+                    label, profiler, snapshot, elapsed, sql,
+                    memory_peak - memory_before, memory_after - memory_before, run.input_seconds
+                )
+            except OSError as e:
+                # Un rapport impossible à écrire ne doit pas faire échouer la commande
+                sentry_sdk.capture_exception(e)
+
+    def _write_report(self, label, profiler, snapshot, elapsed, sql, memory_peak, memory_retained, input_seconds=0.0):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.now():%Y%m%d-%H%M%S-%f}_{re.sub(r'[^A-Za-z0-9_-]+', '_', label)}"
+
+        profiler.dump_stats(self.directory / f"{name}.prof")
+
+        functions = io.StringIO()
+        pstats.Stats(profiler, stream=functions).sort_stats("cumulative").print_stats(self.TOP_FUNCTIONS)
+
+        # Allocations du code profilé uniquement (sans tracemalloc lui-même)
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        allocations = [str(statistic) for statistic in snapshot.statistics("lineno")[:self.TOP_ALLOCATIONS]]
+
+        sql_share = sql["seconds"] / elapsed * 100 if elapsed else 0.0
+        lines = [
+            f"Commande : {label}",
+            f"Date : {datetime.now():%d/%m/%Y %H:%M:%S}",
+            f"Durée totale : {elapsed:.3f} s (attente des saisies exclue : {input_seconds:.3f} s)",
+            f"SQL : {sql['count']} requête(s), {sql['seconds']:.3f} s ({sql_share:.1f} % du temps total)",
+            f"Mémoire : pic {memory_peak / 1024:.1f} Kio, conservée {memory_retained / 1024:.1f} Kio",
+            "",
+            f"== Fonctions les plus coûteuses (temps cumulé, {self.TOP_FUNCTIONS} premières) ==",
+            functions.getvalue().strip(),
+            "",
+            f"== Allocations par ligne ({self.TOP_ALLOCATIONS} premières) ==",
+            *allocations,
+        ]
+
+        path = self.directory / f"{name}.txt"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
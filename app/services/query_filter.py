@@ -0,0 +1,235 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import func, not_
+from sqlalchemy.orm import joinedload
+from app.database.pagination import PagedQuery
+from app.database.policy import policy_conditions
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.event import Event
+from app.models.user import User
+import re
+import shlex
+
+
+# Champs filtrables et triables par table : nom dans l'expression -> (colonne, type)
+FILTER_FIELDS = {
+    "clients": {
+        "id": (Client.id, "int"),
+        "name": (Client.name, "text"),
+        "mail": (Client.mail, "text"),
+        "company": (Client.company_name, "text"),
+        "commercial": (Client.commercial_contact_id, "int"),
+        "created": (Client.created_at, "date"),
+        "updated": (Client.last_updated_at, "date"),
+    },
+    "contracts": {
+        "id": (Contract.id, "int"),
+        "client": (Contract.client_id, "int"),
+        "commercial": (Contract.commercial_contact_id, "int"),
+        "total": (Contract.total_amount, "number"),
+        "remaining": (Contract.remaining_amount, "number"),
+        "signed": (Contract.is_signed, "bool"),
+        "created": (Contract.created_at, "date"),
+        "updated": (Contract.last_updated_at, "date"),
+    },
+    "events": {
+        "id": (Event.id, "int"),
+        "name": (Event.name, "text"),
+        "contract": (Event.contract_id, "int"),
+        "support": (Event.support_contact_id, "int"),
+        "start": (Event.date_start, "date"),
+        "end": (Event.date_end, "date"),
+        "location": (Event.location, "text"),
+        "attendees": (Event.attendees, "int"),
+        "created": (Event.created_at, "date"),
+        "updated": (Event.last_updated_at, "date"),
+    },
+    "users": {
+        "id": (User.id, "int"),
+        "name": (User.name, "text"),
+        "username": (User.username, "text"),
+        "mail": (User.mail, "text"),
+        "department": (User.department_id, "int"),
+        "created": (User.created_at, "date"),
+        "updated": (User.last_updated_at, "date"),
+    },
+}
+
+# Modèle et relations chargées avec chaque page (mêmes options que get_all_paged)
+SEARCH_MODELS = {
+    "clients": (Client, lambda: ()),
+    "contracts": (Contract, lambda: (joinedload(Contract.client), joinedload(Contract.commercial_contact))),
+    "events": (Event, lambda: (joinedload(Event.contract).joinedload(Contract.client), joinedload(Event.support_contact))),
+    "users": (User, lambda: (joinedload(User.department),)),
+}
+
+TERM_PATTERN = re.compile(r'^(?P<field>[a-z_]+)(?P<op>>=|<=|!=|=|:|>|<)(?P<value>.*)$')
+TRUE_VALUES = {"true", "oui", "yes", "1"}
+FALSE_VALUES = {"false", "non", "no", "0"}
+NULL_VALUES = {"null", "none", "aucun"}
+
+# Expression analysée : conditions (champ, opérateur, valeur typée) et tri (champ, décroissant)
+ParsedFilter = namedtuple("ParsedFilter", ["conditions", "sort"])
+
+
+class FilterError(ValueError):
+    """Expression de filtre invalide"""
+
+
+def _convert(field, kind, value):
+    """Convertit la valeur textuelle selon le type du champ"""
+    if value.lower() in NULL_VALUES:
+        return None
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "number":
+            return float(value)
+        if kind == "date":
+            # Une date seule (AAAA-MM-JJ) reste une date : elle désigne toute la journée
+            return date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+    except ValueError:
+        raise FilterError(f"Valeur invalide pour {field} : {value}")
+
+    if kind == "bool":
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise FilterError(f"Valeur invalide pour {field} : {value} (true/false attendu)")
+    return value
+
+
+@lru_cache(maxsize=256)
+def parse_filter(resource, expression):
+    """
+    Analyse une expression, ex : "signed:false remaining>0 created>=2026-01-01 sort:-remaining"
+
+    - champ:valeur ou champ=valeur : égalité (préfixe insensible à la casse pour le texte avec ":")
+    - champ!=valeur, champ>valeur, champ>=valeur, champ<valeur, champ<=valeur
+    - valeur null : champ vide (ex : support:null)
+    - sort:champ ou sort:-champ (décroissant), plusieurs champs séparés par des virgules
+    - valeurs avec espaces entre guillemets : location:"Salle A"
+
+    Les champs sont contrôlés par la liste blanche de la table. Le résultat est mis en cache :
+    une même expression n'est analysée qu'une fois.
+    """
+    if resource not in FILTER_FIELDS:
+        raise FilterError(f"Table inconnue : {resource}")
+    fields = FILTER_FIELDS[resource]
+
+    try:
+        terms = shlex.split(expression or "")
+    except ValueError as e:
+        raise FilterError(f"Expression invalide : {e}")
+
+    conditions = []
+    sort = []
+    for term in terms:
+        match = TERM_PATTERN.match(term)
+        if not match:
+            raise FilterError(f"Terme invalide : {term}")
+        field, op, value = match.group("field"), match.group("op"), match.group("value")
+
+        if field == "sort" and op in (":", "="):
+            for name in value.split(","):
+                descending = name.startswith("-")
+                name = name.lstrip("-")
+                if name not in fields:
+                    raise FilterError(f"Tri impossible sur {name}. Champs disponibles : {', '.join(fields)}")
+                sort.append((name, descending))
+            continue
+
+        if field not in fields:
+            raise FilterError(f"Champ inconnu : {field}. Champs disponibles : {', '.join(fields)}")
+        if value == "":
+            raise FilterError(f"Valeur manquante pour {field}")
+
+        kind = fields[field][1]
+        converted = _convert(field, kind, value)
+        if converted is None and op not in (":", "=", "!="):
+            raise FilterError(f"Comparaison impossible avec null : {term}")
+        if kind == "bool" and op not in (":", "=", "!="):
+            raise FilterError(f"Comparaison impossible sur un booléen : {term}")
+        conditions.append((field, op, converted))
+
+    return ParsedFilter(tuple(conditions), tuple(sort))
+
+
+def _date_condition(column, op, value):
+    """Une date sans heure désigne toute la journée"""
+    value = datetime(value.year, value.month, value.day)
+    next_day = value + timedelta(days=1)
+    if op in (":", "="):
+        return (column >= value) & (column < next_day)
+    if op == "!=":
+        return (column < value) | (column >= next_day)
+    if op == "<=":
+        return column < next_day
+    if op == ">":
+        return column >= next_day
+    return column >= value if op == ">=" else column < value
+
+
+def _condition(column, kind, op, value):
+    if value is None:
+        return column.isnot(None) if op == "!=" else column.is_(None)
+
+    if kind == "date" and not isinstance(value, datetime):
+        return _date_condition(column, op, value)
+
+    if kind == "text" and op == ":":
+        # Préfixe insensible à la casse (index sur lower(name) pour les clients)
+        escaped = value.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return func.lower(column).like(f"{escaped}%", escape="\\")
+
+    if op in (":", "="):
+        return column == value
+    if op == "!=":
+        return not_(column == value)
+    if op == ">":
+        return column > value
+    if op == ">=":
+        return column >= value
+    if op == "<":
+        return column < value
+    return column <= value
+
+
+def compile_filter(resource, expression):
+    """Retourne (clauses WHERE, clauses ORDER BY) ; l'ID termine toujours le tri pour une pagination stable"""
+    parsed = parse_filter(resource, expression)
+    fields = FILTER_FIELDS[resource]
+    model = SEARCH_MODELS[resource][0]
+
+    where = [_condition(fields[field][0], fields[field][1], op, value) for field, op, value in parsed.conditions]
+    order_by = [fields[name][0].desc() if descending else fields[name][0] for name, descending in parsed.sort]
+    if "id" not in [name for name, _ in parsed.sort]:
+        order_by.append(model.id)
+    return where, order_by
+
+
+def scope_conditions(resource, user_id, role):
+    """Restrictions d'accès des listes, données par la politique d'accès (règles de lecture)"""
+    return policy_conditions(SEARCH_MODELS[resource][0], user_id, role)
+
+
+def search(resource, expression, *scope, rows=False):
+    """
+    Séquence paginée des lignes correspondant à l'expression
+
+    scope : conditions supplémentaires imposées par l'appelant (ex : contrats du commercial connecté)
+    rows : lignes légères des listes (row_select du modèle) au lieu d'entités ORM
+    """
+    where, order_by = compile_filter(resource, expression)
+    model, options = SEARCH_MODELS[resource]
+    if rows:
+        return PagedQuery(lambda session: model.row_select().where(*scope, *where).order_by(*order_by))
+    return PagedQuery(lambda session: session.query(model).options(*options()).filter(*scope, *where).order_by(*order_by))
+
+
+def describe_fields(resource):
+    """Champs disponibles pour l'aide en ligne, ex : "signed (bool), remaining (number)" """
+    return ", ".join(f"{name} ({kind})" for name, (_, kind) in FILTER_FIELDS[resource].items())
@@ -0,0 +1,248 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, tuple_
+from app.database.db import db_manager
+from app.models.event import Event
+from app.models.outbox import OutboxMessage
+import heapq
+import time
+import sentry_sdk
+
+
+# Rappels envoyés avant le début de chaque événement
+REMINDER_OFFSETS = {
+    "7d": timedelta(days=7),
+    "24h": timedelta(hours=24)
+}
+
+
+def time_left_label(time_left):
+    """
+    Délai avant le début de l'événement, arrondi, pour le sujet du rappel
+
+    Calculé au moment de l'envoi : un rappel rattrapé au démarrage (échéance dépassée)
+    annonce le délai réel, ex : « dans 3 jours » pour un rappel 7 jours en retard.
+    """
+    hours = round(time_left.total_seconds() / 3600)
+    if hours >= 48:
+        return f"dans {round(hours / 24)} jours"
+    if hours >= 1:
+        return f"dans {hours} heure{'s' if hours > 1 else ''}"
+    minutes = max(1, round(time_left.total_seconds() / 60))
+    return f"dans {minutes} minute{'s' if minutes > 1 else ''}"
+
+
+class ReminderScheduler:
+    """
+    Planificateur des rappels d'événements
+
+    Les rappels sont gardés dans un tas trié par échéance. Seuls ceux dont
+    l'échéance tombe dans la fenêtre à venir (lookahead) sont chargés : la table
+    events est lue par tranches de dates successives, jamais en entier.
+    Les événements créés ou replanifiés après le chargement de leur tranche sont
+    repris via last_updated_at (index dédié).
+    Les rappels échus sont écrits par lots dans la boîte d'envoi (outbox_messages).
+    """
+    LOOKAHEAD = timedelta(hours=1)
+    LOAD_CHUNK = 1000
+    BATCH_SIZE = 500
+
+    def __init__(self, offsets=None, lookahead=None, batch_size=None, clock=datetime.now):
+        self.offsets = offsets or REMINDER_OFFSETS
+        self.lookahead = lookahead or self.LOOKAHEAD
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.clock = clock
+
+        # Tas de (échéance, event_id, type) ; _scheduled garde l'échéance en vigueur
+        # pour chaque rappel, les entrées périmées du tas sont ignorées au dépilement
+        self._heap = []
+        self._scheduled = {}
+        self._events = {}
+        self.loaded_until = None
+        self.changes_checked_at = None
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def tick(self, now=None):
+        """Charge la fenêtre suivante si besoin et écrit les rappels échus. Retourne le nombre de messages ajoutés"""
+        now = now or self.clock()
+        self._load_changes(now)
+        if self.loaded_until is None or self.loaded_until < now + self.lookahead:
+            self._load_window(now, now + self.lookahead)
+        return self._flush_due(now)
+
+    def run_forever(self, interval=60, on_tick=None):
+        """Boucle du planificateur (interrompue par Ctrl+C)"""
+        while True:
+            added = self.tick()
+            if on_tick:
+                on_tick(added)
+            time.sleep(interval)
+
+    def _schedule(self, event_row, now):
+        """Ajoute (ou replanifie) les rappels d'un événement"""
+        event_id, name, date_start, support_contact_id, location = event_row
+        if date_start <= now:
+            return
+
+        self._events[event_id] = (name, date_start, support_contact_id, location)
+        for kind, offset in self.offsets.items():
+            due_at = date_start - offset
+            # Rappel trop éloigné : il sera chargé avec sa tranche
+            if self.loaded_until is not None and due_at >= self.loaded_until:
+                self._scheduled.pop((event_id, kind), None)
+                continue
+            if self._scheduled.get((event_id, kind)) != due_at:
+                self._scheduled[(event_id, kind)] = due_at
+                heapq.heappush(self._heap, (due_at, event_id, kind))
+
+    def _columns(self):
+        return select(Event.id, Event.name, Event.date_start, Event.support_contact_id, Event.location)
+
+    def _load_window(self, now, until):
+        """
+        Charge les rappels dont l'échéance est dans [loaded_until, until)
+
+        Pour un décalage d, l'échéance est dans cette fenêtre si date_start y est
+        une fois décalée de d : une requête par type de rappel, filtrée sur date_start
+        """
+        start = self.loaded_until
+        self.loaded_until = until
+
+        for offset in self.offsets.values():
+            lower = now if start is None else max(start + offset, now)
+            self._load_range(lower, until + offset, now)
+
+    def _load_range(self, lower, upper, now):
+        """Lecture par pages (date_start, id) pour borner la mémoire"""
+        query = self._columns().where(Event.date_start >= lower, Event.date_start < upper)
+        after = None
+
+        while True:
+            page = query
+            if after is not None:
+                page = page.where(tuple_(Event.date_start, Event.id) > after)
+
+            session = None
+            try:
+                session = db_manager.get_read_session()
+                rows = session.execute(page.order_by(Event.date_start, Event.id).limit(self.LOAD_CHUNK)).all()
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                raise e
+            finally:
+                if session:
+                    session.close()
+
+            for row in rows:
+                self._schedule(tuple(row), now)
+
+            if len(rows) < self.LOAD_CHUNK:
+                return
+            after = (rows[-1].date_start, rows[-1].id)
+
+    def _load_changes(self, now):
+        """Reprend les événements créés ou modifiés depuis le dernier passage"""
+        since = self.changes_checked_at
+        self.changes_checked_at = now
+        if since is None or self.loaded_until is None:
+            return
+
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            rows = session.execute(
+                self._columns().where(Event.last_updated_at >= since, Event.date_start > now)
+            ).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+        for row in rows:
+            self._schedule(tuple(row), now)
+
+    def _flush_due(self, now):
+        """Dépile les rappels échus et les écrit par lots dans la boîte d'envoi"""
+        batch = []
+        added = 0
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, event_id, kind = heapq.heappop(self._heap)
+            if self._scheduled.get((event_id, kind)) != due_at:
+                continue
+            del self._scheduled[(event_id, kind)]
+
+            batch.append(self._message(event_id, kind, due_at, now))
+            if len(batch) >= self.batch_size:
+                added += self._enqueue(batch)
+                batch = []
+
+        added += self._enqueue(batch)
+        self._forget_events()
+        return added
+
+    def _enqueue(self, batch):
+        """Écrit un lot, sans les rappels d'événements supprimés entre-temps"""
+        if not batch:
+            return 0
+
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            event_ids = {message["event_id"] for message in batch}
+            existing = set(session.execute(select(Event.id).where(Event.id.in_(event_ids))).scalars())
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise e
+        finally:
+            if session:
+                session.close()
+
+        return OutboxMessage.enqueue([message for message in batch if message["event_id"] in existing])
+
+    def _forget_events(self):
+        """Libère les événements qui n'ont plus de rappel en attente"""
+        pending = {event_id for event_id, _ in self._scheduled}
+        for event_id in list(self._events):
+            if event_id not in pending:
+                del self._events[event_id]
+
+    def _message(self, event_id, kind, due_at, now):
+        name, date_start, support_contact_id, location = self._events[event_id]
+        return {
+            "event_id": event_id,
+            "kind": kind,
+            "recipient_id": support_contact_id,
+            "subject": f"Rappel : {name} {time_left_label(date_start - now)}",
+            "body": f"L'événement « {name} » commence le {date_start:%d/%m/%Y à %H:%M} ({location}).",
+            "due_at": due_at,
+            "created_at": datetime.now()
+        }
+
+
+def drain_outbox(send, batch_size=100):
+    """
+    Relais d'envoi : transmet les messages en attente à la fonction send(message)
+    puis les marque comme envoyés, lot par lot. Retourne le nombre de messages envoyés
+    """
+    sent = 0
+    while True:
+        messages = OutboxMessage.get_pending(limit=batch_size)
+        if not messages:
+            return sent
+
+        delivered = []
+        for message in messages:
+            try:
+                send(message)
+                delivered.append(message.id)
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+
+        OutboxMessage.mark_sent(delivered)
+        sent += len(delivered)
+        if len(delivered) < len(messages):
+            return sent
@@ -0,0 +1,137 @@
+import json
+import threading
+import pytest
+from http.client import HTTPConnection
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.controllers.api import create_api_server
+from app.database.db import Base, db_manager
+from app.models import Client, Department, User
+from app.utils.cache import reference_cache
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serveur API sur un port libre, base SQLite partagée entre les threads"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(db_manager, "get_session", sessionmaker(bind=engine))
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    reference_cache.invalidate()
+
+    for name in Department.DEPARTMENTS:
+        Department.create(name=name)
+    commercial = User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+    other = User.create(name="Autre", mail="autre@test.com", username="autre", password="password123", department="commercial")
+    User.create(name="Sup", mail="sup@test.com", username="sup", password="password123", department="support")
+    for index in range(5):
+        Client.create("commercial", name=f"Client {index}", mail=f"c{index}@test.com", commercial_contact_id=commercial.id)
+    Client.create("commercial", name="Client autre", mail="autre.client@test.com", commercial_contact_id=other.id)
+
+    with patch('app.controllers.api.Console'):
+        server = create_api_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def request(port, method, path, body=None, token=None, headers=None):
+    connection = HTTPConnection("127.0.0.1", port)
+    all_headers = dict(headers or {})
+    if token:
+        all_headers["Authorization"] = f"Bearer {token}"
+    payload = json.dumps(body).encode() if body is not None else None
+    connection.request(method, path, body=payload, headers=all_headers)
+    response = connection.getresponse()
+    raw = response.read()
+    connection.close()
+    return response.status, dict(response.getheaders()), json.loads(raw) if raw else None
+
+
+def login(port, username):
+    status, _, body = request(port, "POST", "/auth/token", {"username": username, "password": "password123"})
+    assert status == 200
+    return body["token"]
+
+
+def test_requires_token(api):
+    """Une requête sans token est refusée"""
+    status, _, body = request(api, "GET", "/clients")
+    assert status == 401
+    assert "error" in body
+
+
+def test_login_invalid_credentials(api):
+    """Identifiants invalides"""
+    status, _, _ = request(api, "POST", "/auth/token", {"username": "com", "password": "faux"})
+    assert status == 401
+
+
+def test_keyset_pagination_and_fields(api):
+    """Pagination par jeu de clés, limitée au périmètre du commercial"""
+    token = login(api, "com")
+
+    status, _, first = request(api, "GET", "/clients?limit=3&fields=id,name", token=token)
+    assert status == 200
+    assert [item["name"] for item in first["items"]] == ["Client 0", "Client 1", "Client 2"]
+    assert set(first["items"][0]) == {"id", "name"}
+
+    status, _, second = request(api, "GET", f"/clients?limit=3&fields=id,name&after={first['next_after']}", token=token)
+    assert [item["name"] for item in second["items"]] == ["Client 3", "Client 4"]
+    assert second["next_after"] is None
+
+
+def test_etag_not_modified(api):
+    """If-None-Match avec l'ETag courant retourne 304, une modification change l'ETag"""
+    token = login(api, "com")
+    status, headers, _ = request(api, "GET", "/clients", token=token)
+    etag = headers["ETag"]
+
+    status, _, body = request(api, "GET", "/clients", token=token, headers={"If-None-Match": etag})
+    assert status == 304
+    assert body is None
+
+    status, _, _ = request(api, "PATCH", "/clients/1", {"company_name": "Nouvelle"}, token=token)
+    assert status == 200
+    status, headers, _ = request(api, "GET", "/clients", token=token, headers={"If-None-Match": etag})
+    assert status == 200
+    assert headers["ETag"] != etag
+
+
+def test_role_checks(api):
+    """Les règles de rôle du menu s'appliquent à l'API"""
+    support_token = login(api, "sup")
+    commercial_token = login(api, "com")
+
+    assert request(api, "GET", "/users", token=commercial_token)[0] == 403
+    assert request(api, "POST", "/clients", {"name": "X", "mail": "x@test.com"}, token=support_token)[0] == 403
+    assert request(api, "PATCH", "/clients/6", {"name": "Pas à moi"}, token=commercial_token)[0] == 404
+    assert request(api, "GET", "/clients/6", token=commercial_token)[0] == 404
+
+
+def test_create_client(api):
+    """Création d'un client par un commercial"""
+    token = login(api, "com")
+    status, _, body = request(api, "POST", "/clients", {"name": "Nouveau", "mail": "nouveau@test.com"}, token=token)
+
+    assert status == 201
+    assert body["commercial_contact_id"] == 1
+    assert request(api, "POST", "/clients", {"name": "Nouveau", "mail": "invalide"}, token=token)[0] == 400
+
+
+def test_change_feed_endpoint(api):
+    """Le flux de changements est réservé à la gestion"""
+    commercial_token = login(api, "com")
+    assert request(api, "GET", "/changes/clients", token=commercial_token)[0] == 403
+
+    User.create(name="Ges", mail="ges@test.com", username="ges", password="password123", department="gestion")
+    token = login(api, "ges")
+    status, _, page = request(api, "GET", "/changes/clients", token=token)
+
+    assert status == 200
+    assert "items" in page and "next_cursor" in page
+    assert request(api, "GET", "/changes/inconnue", token=token)[0] == 400
@@ -2,7 +2,9 @@ import pytest  # noqa
 from unittest.mock import Mock, patch
 from click.testing import CliRunner
 
+from app.controllers import cli
 from app.controllers.cli import main_cli, show_menu, initialize_database
+from app.views.inputs import EndOfInput, ScriptedInput
 
 
 class TestCLI:
@@ -30,13 +32,217 @@ class TestCLI:
             assert result.exit_code == 0
             mock_main_loop.assert_called_once()
 
+    def test_main_cli_profile(self):
+        """Test --profile active le profilage des commandes du menu"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.main_loop') as mock_main_loop, \
+                patch('app.controllers.cli.app_context') as mock_context:
+            mock_context.profiler.enabled = False
+            result = runner.invoke(main_cli, ['--profile'])
+
+            assert result.exit_code == 0
+            assert mock_context.profiler.enabled is True
+            mock_main_loop.assert_called_once()
+
+    def test_main_cli_replay(self, tmp_path):
+        """Test --replay lit les saisies dans le fichier et s'arrête à sa fin"""
+        script = tmp_path / "parcours.txt"
+        script.write_text("alice\n", encoding="utf-8")
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.main_loop', side_effect=EndOfInput) as mock_main_loop, \
+                patch('app.controllers.cli.app_context'):
+            result = runner.invoke(main_cli, ['--replay', str(script)])
+
+            assert result.exit_code == 0
+            assert "Fin des saisies rejouées" in result.output
+            assert isinstance(cli.app_context.inputs, ScriptedInput)
+            mock_main_loop.assert_called_once()
+
+    def test_main_cli_archive(self):
+        """Test du CLI avec l'option --archive"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ArchiveService') as mock_service, \
+                patch('app.controllers.cli.ensure_monthly_partitions') as mock_partitions, \
+                patch('app.controllers.cli.main_loop') as mock_main_loop, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="gestion"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=1)
+            mock_service.return_value.run.return_value = {"events": 2, "contracts": 1}
+
+            result = runner.invoke(main_cli, ['--archive'])
+
+            assert result.exit_code == 0
+            mock_partitions.assert_called_once()
+            mock_service.return_value.run.assert_called_once()
+            mock_main_loop.assert_not_called()
+
+    def test_main_cli_archive_partition_error(self):
+        """Test une erreur de création des partitions n'empêche pas l'archivage"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ArchiveService') as mock_service, \
+                patch('app.controllers.cli.ensure_monthly_partitions', side_effect=RuntimeError("partition")), \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="gestion"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=1)
+            mock_service.return_value.run.return_value = {"events": 0, "contracts": 0}
+
+            result = runner.invoke(main_cli, ['--archive'])
+
+            assert result.exit_code == 0
+            assert "Erreur lors de la création des partitions" in result.output
+            mock_service.return_value.run.assert_called_once()
+
+    def test_main_cli_dedup_report(self):
+        """Test du rapport des doublons avec une session gestion"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.DedupService') as mock_service, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="gestion"), \
+                patch('app.controllers.cli.app_context') as mock_context:
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=1)
+
+            result = runner.invoke(main_cli, ['--dedup-report'])
+
+            assert result.exit_code == 0
+            mock_service.return_value.backfill_keys.assert_called_once()
+            mock_context.client_view.display_duplicate_report.assert_called_once_with(
+                mock_service.return_value.report.return_value
+            )
+
+    def test_main_cli_dedup_report_requires_gestion(self):
+        """Test du rapport des doublons refusé hors gestion ou sans session enregistrée"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.DedupService') as mock_service, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="commercial"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=3)
+            result = runner.invoke(main_cli, ['--dedup-report'])
+
+            assert result.exit_code == 0
+            assert "Seule l'équipe gestion" in result.output
+            mock_auth.return_value.get_saved_user.return_value = None
+            result = runner.invoke(main_cli, ['--dedup-report'])
+
+            assert "Aucune session enregistrée" in result.output
+            mock_service.assert_not_called()
+
+    def test_main_cli_archive_requires_gestion(self):
+        """Test de l'archivage refusé hors gestion ou sans session enregistrée"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ArchiveService') as mock_service, \
+                patch('app.controllers.cli.ensure_monthly_partitions') as mock_partitions, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="support"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=2)
+            result = runner.invoke(main_cli, ['--archive'])
+
+            assert result.exit_code == 0
+            assert "Seule l'équipe gestion peut lancer l'archivage" in result.output
+            mock_auth.return_value.get_saved_user.return_value = None
+            result = runner.invoke(main_cli, ['--archive'])
+
+            assert "Aucune session enregistrée" in result.output
+            mock_service.assert_not_called()
+            mock_partitions.assert_not_called()
+
+    def test_main_cli_reminders(self):
+        """Test du CLI avec l'option --reminders"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ReminderScheduler') as mock_scheduler:
+            mock_scheduler.return_value.run_forever.side_effect = KeyboardInterrupt
+
+            result = runner.invoke(main_cli, ['--reminders'])
+
+            assert result.exit_code == 0
+            mock_scheduler.return_value.run_forever.assert_called_once()
+
+    def test_main_cli_changes(self):
+        """Test du CLI avec l'option --changes : une ligne JSON par page"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ChangeFeed') as mock_feed, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="gestion"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=1)
+            mock_feed.return_value.read.side_effect = [
+                {"items": [{"id": 1}], "deleted": [], "next_cursor": "abc", "watermark": None},
+                {"items": [], "deleted": [], "next_cursor": None, "watermark": "2030-01-01T00:00:00"},
+            ]
+
+            result = runner.invoke(main_cli, ['--changes', 'clients', '--since', '2029-01-01T00:00:00'])
+
+            assert result.exit_code == 0
+            assert len(result.output.strip().splitlines()) == 2
+            mock_feed.return_value.read.assert_any_call('clients', cursor='abc')
+
+    def test_main_cli_changes_requires_gestion(self):
+        """Test du flux de changements refusé hors gestion ou sans session enregistrée"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.ChangeFeed') as mock_feed, \
+                patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="commercial"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=3)
+            result = runner.invoke(main_cli, ['--changes', 'clients'])
+
+            assert result.exit_code == 0
+            mock_auth.return_value.get_saved_user.return_value = None
+            result = runner.invoke(main_cli, ['--changes', 'clients'])
+
+            assert result.exit_code == 0
+            mock_feed.return_value.read.assert_not_called()
+
+    def test_main_cli_command_csv(self):
+        """Test du mode batch : liste filtrée en CSV"""
+        runner = CliRunner()
+        user = Mock(id=3)
+
+        with patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="commercial"), \
+                patch('app.controllers.cli.search') as mock_search, \
+                patch('app.controllers.cli.serialize') as mock_serialize:
+            mock_auth.return_value.get_saved_user.return_value = user
+            mock_search.return_value = [Mock()]
+            mock_serialize.return_value = {"id": 7, "total_amount": 1000.0}
+
+            result = runner.invoke(main_cli, ['-c', 'contracts signed:false remaining>0'])
+
+            assert result.exit_code == 0
+            lines = result.output.strip().splitlines()
+            assert lines[0].startswith("id,client_id")
+            assert lines[1].startswith("7,")
+            assert mock_search.call_args.args[:2] == ("contracts", "signed:false remaining>0")
+
+    def test_main_cli_command_invalid_filter(self):
+        """Test du mode batch avec une expression invalide : aucune ligne produite"""
+        runner = CliRunner()
+
+        with patch('app.controllers.cli.AuthService') as mock_auth, \
+                patch('app.controllers.cli.get_user_role', return_value="gestion"):
+            mock_auth.return_value.get_saved_user.return_value = Mock(id=1)
+
+            result = runner.invoke(main_cli, ['-c', 'contracts password_hash:x'])
+
+            assert result.exit_code == 0
+            assert "id,client_id" not in result.output
+
 
 class TestInitializeDatabase:
     """Tests pour l'initialisation de la base de données"""
 
+    @patch('app.controllers.cli.DedupService')
+    @patch('app.controllers.cli.upgrade_schema')
     @patch('app.controllers.cli.Initialization')
     @patch('app.controllers.cli.console')
-    def test_initialize_database_success(self, mock_console, mock_initialization):
+    def test_initialize_database_success(self, mock_console, mock_initialization, mock_upgrade, mock_dedup):
         """Test initialisation réussie"""
         mock_initialization.initialize_application.return_value = {
             'errors': []
@@ -45,6 +251,23 @@ class TestInitializeDatabase:
 
         assert result is True
         mock_initialization.initialize_application.assert_called_once()
+        mock_upgrade.assert_called_once()
+        mock_dedup.return_value.backfill_keys.assert_called_once()
+
+    @patch('app.controllers.cli.DedupService')
+    @patch('app.controllers.cli.upgrade_schema', side_effect=RuntimeError("ALTER"))
+    @patch('app.controllers.cli.Initialization')
+    @patch('app.controllers.cli.console')
+    def test_initialize_database_upgrade_error(self, mock_console, mock_initialization, mock_upgrade, mock_dedup):
+        """Test une mise à jour du schéma impossible interrompt l'initialisation"""
+        mock_initialization.initialize_application.return_value = {
+            'errors': []
+        }
+
+        result = initialize_database()
+
+        assert result is False
+        mock_dedup.return_value.backfill_keys.assert_not_called()
 
     @patch('app.controllers.cli.Initialization')
     @patch('app.controllers.cli.console')
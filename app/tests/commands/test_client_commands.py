@@ -42,6 +42,21 @@ class TestClientCommands:
         mock_client.create.assert_called_once_with('commercial', **expected_data)
         self.client_commands.console.print.assert_called()
 
+    @patch('app.controllers.client.Client')
+    def test_create_client_duplicate_cancelled(self, mock_client):
+        """Test création annulée face à un doublon probable"""
+        self.client_commands.view.get_client_creation_form.return_value = {
+            'name': 'Client Test',
+            'mail': 'client@test.com'
+        }
+        mock_client.find_duplicates.return_value = [(Mock(), 0.9)]
+        self.client_commands.view.confirm_duplicate_creation.return_value = False
+
+        self.client_commands.create_client()
+
+        self.client_commands.view.display_duplicate_candidates.assert_called_once()
+        mock_client.create.assert_not_called()
+
     @patch('app.controllers.client.Client')
     def test_create_client_exception(self, mock_client):
         """Test exception lors de la création de client"""
@@ -59,11 +74,11 @@ class TestClientCommands:
     def test_list_clients_gestion_role(self, mock_client):
         """Test listage des clients pour rôle gestion"""
         mock_clients = [Mock(), Mock()]
-        mock_client.get_all.return_value = mock_clients
+        mock_client.get_all_paged.return_value = mock_clients
 
         self.client_commands.list_clients("gestion")
 
-        mock_client.get_all.assert_called_once()
+        mock_client.get_all_paged.assert_called_once()
         self.client_commands.view.display_clients.assert_called_once_with(mock_clients)
 
     @patch('app.controllers.client.Client')
@@ -191,9 +206,9 @@ class TestClientCommands:
     def test_list_clients_support_role(self, mock_client):
         """Test listage des clients pour rôle support"""
         mock_clients = [Mock(), Mock(), Mock()]
-        mock_client.get_all.return_value = mock_clients
+        mock_client.get_all_paged.return_value = mock_clients
 
         self.client_commands.list_clients("support")
 
-        mock_client.get_all.assert_called_once()
+        mock_client.get_all_paged.assert_called_once()
         self.client_commands.view.display_clients.assert_called_once_with(mock_clients)
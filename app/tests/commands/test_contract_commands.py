@@ -2,6 +2,7 @@ import pytest  # noqa
 from unittest.mock import Mock, patch
 
 from app.controllers.contract import ContractCommands
+from app.models import Contract
 
 
 class TestContractCommands:
@@ -95,11 +96,11 @@ class TestContractCommands:
     def test_list_contracts_gestion_role(self, mock_contract):
         """Test listage des contrats pour rôle gestion"""
         mock_contracts = [Mock(), Mock()]
-        mock_contract.get_all.return_value = mock_contracts
+        mock_contract.get_all_paged.return_value = mock_contracts
 
         result = self.contract_commands.list_contracts("gestion")
 
-        mock_contract.get_all.assert_called_once()
+        mock_contract.get_all_paged.assert_called_once()
         self.contract_commands.contract_view.display_contract_list.assert_called_once_with(mock_contracts)
 
     @patch('app.controllers.contract.Contract')
@@ -155,6 +156,63 @@ class TestContractCommands:
 
         self.contract_commands.console.print.assert_called()
 
+    @patch('app.controllers.contract.Contract')
+    def test_filter_contracts_by_criteria_commercial(self, mock_contract):
+        """Test filtres combinés restreints aux contrats du commercial"""
+        self.contract_commands.contract_view.get_contract_filter_form.return_value = {"min_total": 1000.0}
+
+        self.contract_commands.filter_contracts_by_criteria("commercial")
+
+        mock_contract.filter_by_criteria.assert_called_once_with(1, "commercial", min_total=1000.0)
+        self.contract_commands.contract_view.get_contract_filter_form.assert_called_once_with(1, "commercial")
+        self.contract_commands.contract_view.display_contract_list.assert_called_once_with(
+            mock_contract.filter_by_criteria.return_value
+        )
+
+    @patch('app.controllers.contract.Contract')
+    def test_filter_contracts_by_criteria_gestion(self, mock_contract):
+        """Test filtres combinés sur tous les contrats"""
+        self.contract_commands.contract_view.get_contract_filter_form.return_value = {"is_signed": False}
+
+        self.contract_commands.filter_contracts_by_criteria("gestion")
+
+        mock_contract.filter_by_criteria.assert_called_once_with(1, "gestion", is_signed=False)
+
+    @patch('app.controllers.contract.Contract')
+    def test_filter_contracts_by_criteria_cancelled(self, mock_contract):
+        """Test filtrage annulé à la sélection du client"""
+        self.contract_commands.contract_view.get_contract_filter_form.return_value = None
+
+        self.contract_commands.filter_contracts_by_criteria("commercial")
+
+        mock_contract.filter_by_criteria.assert_not_called()
+        self.contract_commands.contract_view.display_contract_list.assert_not_called()
+
+    @patch('app.controllers.contract.Contract')
+    def test_filter_contracts_by_criteria_error(self, mock_contract):
+        """Test bornes incohérentes"""
+        self.contract_commands.contract_view.get_contract_filter_form.return_value = {"min_total": 10, "max_total": 5}
+        mock_contract.filter_by_criteria.side_effect = ValueError("Borne minimale supérieure à la borne maximale")
+
+        self.contract_commands.filter_contracts_by_criteria("gestion")
+
+        self.contract_commands.console.print.assert_called()
+        self.contract_commands.contract_view.display_contract_list.assert_not_called()
+
+    @patch('app.controllers.contract.search')
+    def test_search_contracts_scoped(self, mock_search):
+        """Test recherche par expression limitée aux contrats des clients du commercial"""
+        self.contract_commands.filter_view = Mock()
+        self.contract_commands.filter_view.get_filter_expression.return_value = "remaining>0"
+
+        self.contract_commands.search_contracts("commercial")
+
+        resource, expression, scope = mock_search.call_args.args
+        assert (resource, expression) == ("contracts", "remaining>0")
+        expected = Contract.client.has(commercial_contact_id=1)
+        assert str(scope.compile(compile_kwargs={"literal_binds": True})) == str(expected.compile(compile_kwargs={"literal_binds": True}))
+        self.contract_commands.contract_view.display_contract_list.assert_called_once_with(mock_search.return_value)
+
     def test_filter_methods_call_filter_contracts(self):
         """Test que les méthodes de filtrage appellent filter_contracts"""
         self.contract_commands.filter_contracts = Mock()
@@ -226,7 +284,7 @@ class TestContractCommands:
     @patch('app.controllers.contract.Contract')
     def test_list_contracts_exception(self, mock_contract):
         """Test exception dans list_contracts"""
-        mock_contract.get_all.side_effect = Exception("Erreur DB")
+        mock_contract.get_all_paged.side_effect = Exception("Erreur DB")
 
         result = self.contract_commands.list_contracts("gestion")
 
@@ -1,7 +1,10 @@
 import pytest  # noqa
+from datetime import datetime
 from unittest.mock import Mock, patch
+from sqlalchemy.exc import OperationalError
 
 from app.controllers.event import EventCommands
+from app.views.inputs import QueueInput
 
 
 class TestEventCommands:
@@ -15,54 +18,48 @@ class TestEventCommands:
         self.mock_user.department = Mock()
         self.mock_user.department.name = "support"
 
-        self.event_commands = EventCommands(current_user=self.mock_user)
+        self.inputs = QueueInput()
+        self.event_commands = EventCommands(current_user=self.mock_user, console=Mock(), inputs=self.inputs)
         self.event_commands.event_view = Mock()
-        self.event_commands.console = Mock()
 
     @patch('app.controllers.event.Event')
     @patch('app.controllers.event.Contract')
-    @patch('app.controllers.event.ContractCommands')
-    def test_create_event_success(self, mock_contract_commands, mock_contract, mock_event):
+    def test_create_event_success(self, mock_contract, mock_event):
         """Test création d'événement réussie"""
         # Mock des contrats signés disponibles
         mock_contract.get_filtered_contracts.return_value = [Mock(), Mock()]
 
-        # Mock des commandes de contrat
-        mock_contract_instance = Mock()
-        mock_contract_commands.return_value = mock_contract_instance
+        # Mock des commandes de contrat partagées
+        self.event_commands.contract_cmd = Mock()
 
         # Mock de la validation du contrat
         mock_event.validate_contract_access.return_value = True
 
-        # Mock de l'input utilisateur
-        self.event_commands.console.input.return_value = "1"
+        # Saisie de l'utilisateur
+        self.inputs.feed("1")
 
-        # Mock de EventView pour la création
+        # Mock de la vue partagée pour la création
         mock_event_data = {
             'name': 'Test Event',
             'contract_id': 1,
             'location': 'Paris',
             'attendees': 50
         }
+        self.event_commands.event_view.get_event_creation_form.return_value = mock_event_data
 
-        # Patcher EventView dans le bon contexte
-        with patch('app.controllers.event.EventView') as mock_event_view:
-            mock_event_view_instance = Mock()
-            mock_event_view.return_value = mock_event_view_instance
-            mock_event_view_instance.get_event_creation_form.return_value = mock_event_data
-
-            # Mock de Event.create
-            mock_event_instance = Mock()
-            mock_event_instance.id = 123
-            mock_event.create.return_value = mock_event_instance
+        # Mock de Event.create
+        mock_event_instance = Mock()
+        mock_event_instance.id = 123
+        mock_event.create.return_value = mock_event_instance
 
-            # Exécution
-            self.event_commands.create_event()
+        # Exécution
+        self.event_commands.create_event()
 
         # Vérifications
         mock_contract.get_filtered_contracts.assert_called_once_with(1, "signed")
-        mock_contract_instance.filter_signed_contracts.assert_called_once()
+        self.event_commands.contract_cmd.filter_signed_contracts.assert_called_once()
         mock_event.validate_contract_access.assert_called_once_with("1", 1)
+        self.event_commands.event_view.get_event_creation_form.assert_called_once_with("1")
         mock_event.create.assert_called_once()
         self.event_commands.console.print.assert_called()
 
@@ -86,18 +83,15 @@ class TestEventCommands:
         mock_event.get_event_with_permissions.return_value = mock_event_instance
 
         self.event_commands.list_events = Mock()
-        self.event_commands.console.input.return_value = "1"
+        self.inputs.feed("1")
 
-        # Mock de EventView pour la mise à jour
-        with patch('app.controllers.event.EventView') as mock_event_view:
-            mock_event_view_instance = Mock()
-            mock_event_view.return_value = mock_event_view_instance
-            mock_event_view_instance.get_event_update_form.return_value = {
-                'name': 'Updated Event',
-                'location': 'Lyon'
-            }
+        # Mock de la vue partagée pour la mise à jour
+        self.event_commands.event_view.get_event_update_form.return_value = {
+            'name': 'Updated Event',
+            'location': 'Lyon'
+        }
 
-            self.event_commands.update_event()
+        self.event_commands.update_event()
 
         # Vérifications
         mock_event.get_event_with_permissions.assert_called_once_with(1, 1, "support")
@@ -110,7 +104,7 @@ class TestEventCommands:
         mock_event.get_event_with_permissions.return_value = None
 
         self.event_commands.list_events = Mock()
-        self.event_commands.console.input.return_value = "999"
+        self.inputs.feed("999")
 
         self.event_commands.update_event()
 
@@ -119,7 +113,7 @@ class TestEventCommands:
     def test_update_event_invalid_id(self):
         """Test mise à jour avec ID invalide"""
         self.event_commands.list_events = Mock()
-        self.event_commands.console.input.return_value = "abc"
+        self.inputs.feed("abc")
 
         self.event_commands.update_event()
 
@@ -131,7 +125,7 @@ class TestEventCommands:
         self.event_commands.current_user.department.name = "commercial"
 
         self.event_commands.list_events = Mock()
-        self.event_commands.console.input.return_value = "1"
+        self.inputs.feed("1")
 
         self.event_commands.update_event()
 
@@ -141,14 +135,14 @@ class TestEventCommands:
     def test_list_events_gestion_role(self, mock_event):
         """Test listage des événements pour rôle gestion"""
         mock_events = [Mock(), Mock()]
-        mock_event.get_all.return_value = mock_events
+        mock_event.get_all_paged.return_value = mock_events
 
         self.event_commands.event_view.display_event_list.return_value = "events_displayed"
 
         result = self.event_commands.list_events(role="gestion")
 
         assert result == "events_displayed"
-        mock_event.get_all.assert_called_once()
+        mock_event.get_all_paged.assert_called_once()
         self.event_commands.event_view.display_event_list.assert_called_once_with(mock_events)
 
     @patch('app.controllers.event.Event')
@@ -165,27 +159,68 @@ class TestEventCommands:
         mock_event.get_by_support_user.assert_called_once_with(1)
         self.event_commands.event_view.display_event_list.assert_called_once_with(mock_events)
 
+    @patch('app.controllers.event.Event')
+    def test_list_events_support_offline_fallback(self, mock_event):
+        """Test listage depuis la copie locale quand la base est injoignable"""
+        mock_event.get_by_support_user.side_effect = OperationalError("SELECT", {}, Exception("down"))
+        replica = Mock()
+        replica.exists.return_value = True
+        replica.last_sync_at.return_value = datetime(2030, 1, 1, 12, 0)
+        local_events = [Mock()]
+        replica.get_assigned_events.return_value = local_events
+        self.event_commands.offline_replica = replica
+
+        self.event_commands.list_events(role="support")
+
+        assert self.event_commands.offline is True
+        self.event_commands.event_view.display_event_list.assert_called_once_with(local_events)
+
+    @patch('app.controllers.event.Event')
+    def test_update_event_offline_is_queued(self, mock_event):
+        """Test modification hors ligne mise en file dans la copie locale"""
+        mock_event.get_by_support_user.side_effect = OperationalError("SELECT", {}, Exception("down"))
+        replica = Mock()
+        replica.exists.return_value = True
+        replica.last_sync_at.return_value = datetime(2030, 1, 1, 12, 0)
+        self.event_commands.offline_replica = replica
+        self.inputs.feed("3")
+        self.event_commands.event_view.get_event_update_form.return_value = {"location": "Lyon"}
+
+        self.event_commands.update_event()
+
+        replica.update_event.assert_called_once_with(3, location="Lyon")
+        mock_event.get_event_with_permissions.assert_not_called()
+
+    def test_sync_offline(self):
+        """Test synchronisation de la copie locale"""
+        replica = Mock()
+        replica.sync.return_value = {"pushed": 1, "conflicts": [{"event_id": 2, "reason": "modifié"}], "pulled": {"events": 3}}
+        self.event_commands.offline_replica = replica
+        self.event_commands.offline = True
+
+        self.event_commands.sync_offline()
+
+        replica.sync.assert_called_once()
+        assert self.event_commands.offline is False
+        assert self.event_commands.console.print.call_count == 3
+
     @patch('app.controllers.event.Event')
     def test_list_events_with_filter_no_support(self, mock_event):
         """Test listage avec filtre sans support"""
-        mock_event_with_support = Mock()
-        mock_event_with_support.support_contact = Mock()
         mock_event_without_support = Mock()
         mock_event_without_support.support_contact = None
-
-        mock_events = [mock_event_with_support, mock_event_without_support]
-        mock_event.get_all.return_value = mock_events
+        mock_event.get_events_without_support.return_value = [mock_event_without_support]
 
         self.event_commands.list_events(role="gestion", filter_no_support=True)
 
-        # Vérifications - seuls les événements sans support sont affichés
-        expected_filtered = [mock_event_without_support]
-        self.event_commands.event_view.display_event_list.assert_called_once_with(expected_filtered)
+        # Vérifications - le filtre est fait en SQL, sans charger tous les événements
+        mock_event.get_all_paged.assert_not_called()
+        self.event_commands.event_view.display_event_list.assert_called_once_with([mock_event_without_support])
 
     @patch('app.controllers.event.Event')
     def test_list_events_exception(self, mock_event):
         """Test exception dans list_events"""
-        mock_event.get_all.side_effect = Exception("Erreur DB")
+        mock_event.get_all_paged.side_effect = Exception("Erreur DB")
 
         result = self.event_commands.list_events(role="gestion")
 
@@ -195,14 +230,10 @@ class TestEventCommands:
     @patch('app.controllers.event.Event')
     def test_assign_support_success(self, mock_event):
         """Test assignation de support réussie"""
-        # Mock des événements sans support
-        mock_events = [Mock()]
-        mock_event.get_events_without_support.return_value = mock_events
-
-        # Mock de l'événement à assigner
+        # Mock des événements sans support, dont l'événement à assigner
         mock_event_instance = Mock()
         mock_event_instance.id = 1
-        mock_event.get_by_id.return_value = mock_event_instance
+        mock_event.get_events_without_support.return_value = [Mock(id=3), mock_event_instance]
 
         # Mock des supports disponibles
         mock_support = Mock()
@@ -211,18 +242,17 @@ class TestEventCommands:
         mock_event.get_available_supports.return_value = [mock_support]
         mock_event.validate_support_user.return_value = mock_support
 
-        # Mock des méthodes
-        self.event_commands.filter_events_without_support = Mock()
-        self.event_commands.console.input.side_effect = ["1", "2"]
+        self.inputs.feed("1", "2")
 
         self.event_commands.assign_support()
 
-        # Vérifications
+        # Vérifications : liste chargée une seule fois (affichage compris), pas de relecture de l'événement
         mock_event.get_events_without_support.assert_called_once()
-        mock_event.get_by_id.assert_called_once_with("1")
+        self.event_commands.event_view.display_event_list.assert_called_once()
+        mock_event.get_by_id.assert_not_called()
         mock_event.get_available_supports.assert_called_once()
         mock_event.validate_support_user.assert_called_once_with("2")
-        mock_event_instance.assign_support.assert_called_once_with(2)
+        mock_event.assign_support_by_id.assert_called_once_with(1, 2)
         self.event_commands.console.print.assert_called()
 
     @patch('app.controllers.event.Event')
@@ -237,25 +267,24 @@ class TestEventCommands:
     @patch('app.controllers.event.Event')
     def test_assign_support_event_not_found(self, mock_event):
         """Test assignation avec événement introuvable"""
-        mock_event.get_events_without_support.return_value = [Mock()]
-        mock_event.get_by_id.side_effect = ValueError("Event not found")
+        mock_event.get_events_without_support.return_value = [Mock(id=1)]
 
         self.event_commands.filter_events_without_support = Mock()
-        self.event_commands.console.input.return_value = "999"
+        self.inputs.feed("999")
 
         self.event_commands.assign_support()
 
         self.event_commands.console.print.assert_called()
+        mock_event.get_available_supports.assert_not_called()
 
     @patch('app.controllers.event.Event')
     def test_assign_support_no_supports_available(self, mock_event):
         """Test assignation sans supports disponibles"""
-        mock_event.get_events_without_support.return_value = [Mock()]
-        mock_event.get_by_id.return_value = Mock()
+        mock_event.get_events_without_support.return_value = [Mock(id=1)]
         mock_event.get_available_supports.return_value = []
 
         self.event_commands.filter_events_without_support = Mock()
-        self.event_commands.console.input.return_value = "1"
+        self.inputs.feed("1")
 
         self.event_commands.assign_support()
 
@@ -264,13 +293,12 @@ class TestEventCommands:
     @patch('app.controllers.event.Event')
     def test_assign_support_support_not_found(self, mock_event):
         """Test assignation avec support introuvable"""
-        mock_event.get_events_without_support.return_value = [Mock()]
-        mock_event.get_by_id.return_value = Mock()
+        mock_event.get_events_without_support.return_value = [Mock(id=1)]
         mock_event.get_available_supports.return_value = [Mock()]
         mock_event.validate_support_user.return_value = None
 
         self.event_commands.filter_events_without_support = Mock()
-        self.event_commands.console.input.side_effect = ["1", "999"]
+        self.inputs.feed("1", "999")
 
         self.event_commands.assign_support()
 
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy import event as sa_event
+from app.controllers.event import EventCommands
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.department import Department
+from app.models.event import Event
+from app.models.user import User
+from app.utils.cache import CommandMemo
+
+
+@pytest.fixture
+def statements(test_db):
+    """Requêtes SQL exécutées sur la base de test"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    sa_event.listen(test_db, "before_cursor_execute", record)
+    yield executed
+    sa_event.remove(test_db, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def setup_events(test_db):
+    Department.create(name="commercial", description="Commercial")
+    Department.create(name="support", description="Support")
+    commercial = User.create(name="Commercial", mail="commercial@test.com", username="commercial",
+                             password="password123", department="commercial")
+    support = User.create(name="Support", mail="support@test.com", username="support",
+                          password="password123", department="support")
+    client = Client.create(name="Client", mail="client@test.com", phone="+33123456789",
+                           company_name="Company", commercial_contact_id=commercial.id, role="commercial")
+    contract = Contract.create(client_id=client.id, commercial_contact_id=commercial.id,
+                               total_amount=1000.0, remaining_amount=0.0, status="signé")
+    events = [
+        Event.create(name=f"Événement {i}", contract_id=contract.id, date_start=datetime(2030, 1, i + 1, 9),
+                     date_end=datetime(2030, 1, i + 1, 18), location="Paris", attendees=10)
+        for i in range(3)
+    ]
+    Event.create(name="Assigné", contract_id=contract.id, date_start=datetime(2030, 2, 1, 9),
+                 date_end=datetime(2030, 2, 1, 18), location="Paris", attendees=10, support_contact_id=support.id)
+    return {"support": support, "events": events}
+
+
+def make_commands():
+    return EventCommands(current_user=Mock(id=1), console=Mock(), view=Mock(), memo=CommandMemo())
+
+
+def test_list_events_without_support_single_query(setup_events, statements):
+    """Le filtre sans support est fait en SQL : une seule requête"""
+    commands = make_commands()
+    statements.clear()
+
+    commands.list_events("gestion", filter_no_support=True)
+
+    displayed = commands.event_view.display_event_list.call_args.args[0]
+    assert sorted(event.id for event in displayed) == sorted(event.id for event in setup_events["events"])
+    assert len(statements) == 1
+
+
+def test_assign_support_round_trips(setup_events, statements):
+    """Assignation : liste chargée une fois, pas de relecture de l'événement choisi"""
+    support = setup_events["support"]
+    target = setup_events["events"][1]
+    commands = make_commands()
+
+    # Équipe support déjà en cache de référence (données de référence partagées entre commandes)
+    Event.get_available_supports()
+    statements.clear()
+
+    commands.console.input.side_effect = [str(target.id), str(support.id)]
+    commands.assign_support()
+
+    # 1 lecture des événements sans support (affichage compris), 1 lecture par clé + 1 UPDATE
+    assert len(statements) == 3
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "SELECT", "UPDATE"]
+    assert Event.get_by_id(target.id).support_contact_id == support.id
@@ -1,7 +1,10 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.database.db import Base, db_manager
+from app.database.policy import set_policy_subject
+from app.utils.cache import reference_cache
+from app.services.audit_service import audit_writer, set_actor
 
 
 @pytest.fixture(scope="function")
@@ -9,16 +12,34 @@ def test_db():
     """Crée une base de données en mémoire pour chaque test"""
     # Base de données temporaire en mémoire
     engine = create_engine("sqlite:///:memory:", echo=False)
+
+    # Transactions explicites : sans cela pysqlite laisse le premier SAVEPOINT ouvrir la transaction
+    # et sa libération valide tout (les points de sauvegarde des unités de travail se comportent comme sur PostgreSQL)
+    @event.listens_for(engine, "connect")
+    def _autocommit_driver(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        # Directement sur le pilote, comme le BEGIN implicite de psycopg (hors des requêtes comptées par les tests)
+        connection.connection.driver_connection.execute("BEGIN")
+
     Base.metadata.create_all(engine)
 
-    # Remplacer temporairement la session
-    test_session = sessionmaker(bind=engine)
+    # Remplacer temporairement la fabrique de sessions (get_session et les unités de travail l'utilisent)
+    original_session_local = db_manager.SessionLocal
+    db_manager.SessionLocal = sessionmaker(bind=engine)
+
+    # Repartir d'un cache de référence vide
+    reference_cache.invalidate()
+    reference_cache.reset_stats()
 
-    # Monkey patch pour utiliser la DB de test
-    original_get_session = db_manager.get_session
-    db_manager.get_session = lambda: test_session()
+    # Ne pas écrire dans cette base les entrées d'audit d'un test précédent
+    audit_writer.discard()
+    set_actor(None)
+    set_policy_subject(None)
 
     yield engine
 
     # Restaurer après le test
-    db_manager.get_session = original_get_session
+    db_manager.SessionLocal = original_session_local
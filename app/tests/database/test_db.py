@@ -105,3 +105,51 @@ class TestDatabaseManager:
 
         mock_drop_all.assert_called_once_with(bind=db_manager.engine)
         mock_print.assert_called_once_with("Tables supprimées !")
+
+
+class TestReadReplicaRouting:
+    def setup_method(self):
+        self.db_manager = DatabaseManager(replica_url="sqlite://")
+
+    def test_without_replica_reads_use_primary(self):
+        """Sans réplique, les lectures utilisent la session primaire"""
+        db_manager = DatabaseManager()
+        db_manager.replica_url = None
+        db_manager.ReplicaSessionLocal = None
+        db_manager.get_session = Mock(return_value="primary")
+
+        assert db_manager.get_read_session() == "primary"
+
+    def test_reads_go_to_replica(self):
+        """Les lectures partent sur la réplique"""
+        session = self.db_manager.get_read_session()
+        assert session.get_bind() is self.db_manager.replica_engine
+        session.close()
+
+    def test_read_your_writes_after_write(self):
+        """Juste après une écriture, les lectures restent sur le primaire"""
+        self.db_manager.mark_write()
+        session = self.db_manager.get_read_session()
+        assert session.get_bind() is self.db_manager.engine
+        session.close()
+
+    def test_read_your_writes_window_expires(self):
+        """La fenêtre read-your-writes expire"""
+        with patch('app.database.db.time.monotonic', return_value=100):
+            self.db_manager.mark_write()
+        with patch('app.database.db.time.monotonic', return_value=100 + DatabaseManager.READ_YOUR_WRITES_WINDOW + 1):
+            session = self.db_manager.get_read_session()
+
+        assert session.get_bind() is self.db_manager.replica_engine
+        session.close()
+
+    def test_read_from_primary_escape_hatch(self):
+        """read_from_primary force les lectures sur le primaire"""
+        with self.db_manager.read_from_primary():
+            session = self.db_manager.get_read_session()
+            assert session.get_bind() is self.db_manager.engine
+            session.close()
+
+        session = self.db_manager.get_read_session()
+        assert session.get_bind() is self.db_manager.replica_engine
+        session.close()
@@ -0,0 +1,36 @@
+import pytest # noqa
+from app.database.pagination import PagedQuery
+from app.models import Client
+
+
+def _create_clients(count):
+    for index in range(count):
+        Client.create(role="commercial", name=f"Client {index}", mail=f"client{index}@test.com")
+
+
+def test_len_and_slice(test_db):
+    """Test COUNT et chargement d'une seule page"""
+    _create_clients(7)
+    clients = Client.get_all_paged()
+
+    assert len(clients) == 7
+    assert bool(clients) is True
+    assert [client.name for client in clients[2:4]] == ["Client 2", "Client 3"]
+    assert clients[-1].name == "Client 6"
+
+
+def test_empty(test_db):
+    """Test séquence vide"""
+    clients = Client.get_all_paged()
+    assert len(clients) == 0
+    assert not clients
+    with pytest.raises(IndexError):
+        clients[0]
+
+
+def test_iteration_by_chunks(test_db, monkeypatch):
+    """Test itération complète par blocs"""
+    _create_clients(5)
+    monkeypatch.setattr(PagedQuery, "CHUNK_SIZE", 2)
+
+    assert [client.name for client in Client.get_all_paged()] == [f"Client {i}" for i in range(5)]
@@ -0,0 +1,104 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+from app.database.partitioning import (
+    add_months, default_partition_move_statements, ensure_monthly_partitions, monthly_partition_ddl, partition_statements
+)
+from app.models import Client, Contract, Department, Event, User
+
+
+def test_postgresql_ddl_is_partitioned():
+    """La table events est partitionnée par date_start sous PostgreSQL"""
+    ddl = str(CreateTable(Event.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PARTITION BY RANGE (date_start)" in ddl
+    assert "PRIMARY KEY (id, date_start)" in ddl
+
+
+def test_sqlite_ddl_is_a_single_table():
+    """SQLite garde une table simple"""
+    ddl = str(CreateTable(Event.__table__).compile(dialect=sqlite.dialect()))
+
+    assert "PARTITION" not in ddl
+    assert "PRIMARY KEY (id)" in ddl
+
+
+def test_orm_primary_key_unchanged():
+    """Côté ORM la clé primaire reste l'ID seul"""
+    assert [column.name for column in Event.__mapper__.primary_key] == ["id"]
+
+
+def test_add_months_crosses_years():
+    assert add_months(datetime(2025, 11, 1), 3) == datetime(2026, 2, 1)
+
+
+def test_monthly_partition_bounds():
+    """Une partition couvre [début du mois, début du mois suivant)"""
+    ddl = monthly_partition_ddl("events", datetime(2025, 12, 15))
+
+    assert "events_2025_12 PARTITION OF events" in ddl
+    assert "FROM ('2025-12-01') TO ('2026-01-01')" in ddl
+
+
+def test_partition_statements_cover_months_ahead():
+    statements = partition_statements("events", now=datetime(2025, 6, 10), months_ahead=2)
+
+    assert [statement.split()[5] for statement in statements] == ["events_2025_06", "events_2025_07", "events_2025_08"]
+
+
+def test_ensure_partitions_noop_on_sqlite(test_db):
+    """Aucune DDL hors PostgreSQL"""
+    assert ensure_monthly_partitions(test_db, Event.__table__) == []
+
+
+def test_ensure_partitions_on_postgresql():
+    """Les DDL sont exécutées dans une transaction, seulement pour les partitions absentes"""
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    connection = engine.begin.return_value.__enter__.return_value
+    # Juin existe déjà, juillet est à créer
+    connection.execute.return_value.scalar.side_effect = ["events_2025_06", None]
+
+    statements = ensure_monthly_partitions(engine, Event.__table__, now=datetime(2025, 6, 1), months_ahead=1)
+
+    assert statements == default_partition_move_statements("events", "date_start", datetime(2025, 7, 1))
+    assert connection.exec_driver_sql.call_count == 4
+
+
+def test_default_partition_rows_moved_before_creation():
+    """Les lignes du mois déjà dans la partition par défaut sont déplacées dans la nouvelle partition"""
+    statements = default_partition_move_statements("events", "date_start", datetime(2026, 9, 20))
+    condition = "date_start >= '2026-09-01' AND date_start < '2026-10-01'"
+
+    assert statements == [
+        f"CREATE TEMP TABLE events_2026_09_pending ON COMMIT DROP AS SELECT * FROM events_default WHERE {condition}",
+        f"DELETE FROM events_default WHERE {condition}",
+        monthly_partition_ddl("events", datetime(2026, 9, 1)),
+        "INSERT INTO events SELECT * FROM events_2026_09_pending",
+    ]
+
+
+def test_get_in_date_range(test_db):
+    """Fenêtre de dates sur date_start, avec filtre support optionnel"""
+    Department.create(name="commercial")
+    Department.create(name="support")
+    commercial = User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+    support = User.create(name="Sup", mail="sup@test.com", username="sup", password="password123", department="support")
+    client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    contract = Contract.create(client_id=client.id, commercial_contact_id=commercial.id, total_amount=100, remaining_amount=0, status="signé")
+
+    for month in (5, 6, 7):
+        Event.create(
+            name=f"Mois {month}",
+            contract_id=contract.id,
+            date_start=datetime(2025, month, 10),
+            date_end=datetime(2025, month, 11),
+            location="Paris",
+            attendees=10,
+            support_contact_id=support.id if month == 6 else None
+        )
+
+    june = Event.get_in_date_range(datetime(2025, 6, 1), datetime(2025, 7, 1))
+    assert [event.name for event in june] == ["Mois 6"]
+    assert len(Event.get_in_date_range(datetime(2025, 5, 1), datetime(2025, 8, 1), support_user_id=support.id)) == 1
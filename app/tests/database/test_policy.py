@@ -0,0 +1,157 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import event
+from app.database import policy
+from app.database.policy import (
+    install_row_level_security, policy_conditions, rls_statements, set_policy_subject
+)
+from app.database.db import db_manager
+from app.models import Client, Contract, Department, Event, User
+
+
+@pytest.fixture
+def dataset(test_db):
+    for name in ("commercial", "support", "gestion"):
+        Department.create(name=name, description=name)
+    alice = User.create(name="Alice", mail="alice@test.com", username="alice", password="password123", department="commercial")
+    bob = User.create(name="Bob", mail="bob@test.com", username="bob", password="password123", department="commercial")
+    sam = User.create(name="Sam", mail="sam@test.com", username="sam", password="password123", department="support")
+
+    acme = Client.create(name="Acme", mail="acme@test.com", phone="+33123456789",
+                         company_name="Acme", commercial_contact_id=alice.id, role="commercial")
+    signed = Contract.create(client_id=acme.id, commercial_contact_id=alice.id, total_amount=100.0,
+                             remaining_amount=0.0, status="signé")
+    unsigned = Contract.create(client_id=acme.id, commercial_contact_id=alice.id, total_amount=100.0,
+                               remaining_amount=100.0, status="non signé")
+    gala = Event.create(name="Gala", contract_id=signed.id, date_start=datetime(2026, 7, 1, 9),
+                        date_end=datetime(2026, 7, 1, 18), location="Salle B", attendees=200,
+                        support_contact_id=sam.id)
+    return {"alice": alice, "bob": bob, "sam": sam, "acme": acme, "signed": signed, "unsigned": unsigned, "gala": gala}
+
+
+def test_conditions_by_role():
+    """Aucune restriction pour la gestion, refus pour un rôle sans règle"""
+    assert policy_conditions(Contract, 1, "gestion") == []
+    assert [str(condition) for condition in policy_conditions(Contract, 1, "commercial")] == [
+        str(Contract.client.has(commercial_contact_id=1))
+    ]
+    assert str(policy_conditions(User, 1, "support")[0]) == "false"
+    assert str(policy_conditions(Client, 1, None, "update")[0]) == "false"
+
+
+def test_client_update_policy(dataset):
+    acme = dataset["acme"]
+    assert Client.get_by_id_with_permissions(acme.id, dataset["alice"].id).id == acme.id
+    assert Client.get_by_id_with_permissions(acme.id, dataset["bob"].id) is None
+    assert Client.get_by_id_with_permissions(acme.id, dataset["alice"].id, "gestion") is None
+
+
+def test_contract_update_policy(dataset):
+    """Un commercial modifie les contrats de ses clients, la gestion tous, le support aucun"""
+    signed = dataset["signed"]
+    assert Contract.get_by_id_with_permissions(signed.id, dataset["alice"].id, "commercial").client.name == "Acme"
+    assert Contract.get_by_id_with_permissions(signed.id, dataset["bob"].id, "commercial") is None
+    assert Contract.get_by_id_with_permissions(signed.id, dataset["bob"].id, "gestion").id == signed.id
+    assert Contract.get_by_id_with_permissions(signed.id, dataset["sam"].id, "support") is None
+
+
+def test_updatable_rows_are_readable(dataset):
+    """Un contrat modifiable par un commercial lui reste lisible (politique PostgreSQL appliquée à l'UPDATE)"""
+    alice, bob = dataset["alice"], dataset["bob"]
+    # Contrat d'un client d'Alice dont le contact commercial est Bob
+    handed_over = Contract.create(client_id=dataset["acme"].id, commercial_contact_id=bob.id, total_amount=50.0,
+                                  remaining_amount=50.0, status="non signé")
+
+    assert Contract.get_by_id_with_permissions(handed_over.id, alice.id, "commercial").id == handed_over.id
+    session = db_manager.get_session()
+    try:
+        readable = {contract.id for contract in session.query(Contract).filter(*policy_conditions(Contract, alice.id, "commercial"))}
+    finally:
+        session.close()
+    assert handed_over.id in readable
+
+    for (table, action), rules in policy.POLICIES.items():
+        if action == "read":
+            continue
+        for role in rules:
+            assert role in policy.POLICIES[(table, "read")], (table, action, role)
+
+
+def test_create_event_policy(dataset):
+    """Événement possible sur un contrat signé d'un client du commercial"""
+    alice = dataset["alice"]
+    assert Event.validate_contract_access(dataset["signed"].id, alice.id)
+    assert not Event.validate_contract_access(dataset["unsigned"].id, alice.id)
+    assert not Event.validate_contract_access(dataset["signed"].id, dataset["bob"].id)
+    assert not Event.validate_contract_access(dataset["signed"].id, alice.id, "gestion")
+
+
+def test_event_update_policy(dataset):
+    gala = dataset["gala"]
+    assert Event.get_event_with_permissions(gala.id, dataset["sam"].id, "support").contract.client.name == "Acme"
+    assert Event.get_event_with_permissions(gala.id, dataset["sam"].id, "gestion").id == gala.id
+    assert Event.get_event_with_permissions(gala.id, dataset["bob"].id, "support") is None
+    assert Event.get_event_with_permissions(gala.id, dataset["alice"].id, "commercial") is None
+
+
+def test_permission_check_is_one_statement(dataset, test_db):
+    """Droits et ligne vérifiés par une seule requête"""
+    statements = []
+    event.listen(test_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    Contract.get_by_id_with_permissions(dataset["signed"].id, dataset["alice"].id, "commercial")
+    Event.validate_contract_access(dataset["signed"].id, dataset["alice"].id)
+
+    assert len(statements) == 2
+    assert "EXISTS" in statements[0]
+
+
+def test_rls_statements():
+    """Les règles de lecture sont compilées en politique PostgreSQL"""
+    statements = rls_statements(Contract)
+
+    assert statements[0] == "ALTER TABLE contracts ENABLE ROW LEVEL SECURITY"
+    assert statements[-1].startswith("CREATE POLICY epic_events_access ON contracts USING (")
+    # Sous-requête corrélée à la ligne contrôlée (contracts absent de son FROM)
+    assert "= 'commercial' AND (EXISTS (SELECT 1 FROM clients WHERE clients.id = contracts.client_id " \
+        "AND clients.commercial_contact_id = CAST(nullif(current_setting('app.user_id', true), '') AS INTEGER)))" \
+        in " ".join(statements[-1].split())
+
+
+def test_install_rls_noop_outside_postgresql():
+    engine = MagicMock()
+    engine.dialect.name = "sqlite"
+    with patch.object(policy, "ROW_LEVEL_SECURITY", True):
+        assert install_row_level_security(engine, [Client]) == []
+    engine.begin.assert_not_called()
+
+
+def test_install_rls_requires_flag():
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    with patch.object(policy, "ROW_LEVEL_SECURITY", False):
+        assert install_row_level_security(engine, [Client]) == []
+
+    with patch.object(policy, "ROW_LEVEL_SECURITY", True):
+        statements = install_row_level_security(engine, [Client, Event])
+    connection = engine.begin.return_value.__enter__.return_value
+    assert connection.exec_driver_sql.call_count == len(statements) == 8
+
+
+def test_subject_transmitted_to_postgresql():
+    """L'utilisateur connecté est transmis à chaque transaction PostgreSQL"""
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+
+    set_policy_subject(7, "support")
+    with patch.object(policy, "ROW_LEVEL_SECURITY", True):
+        policy._transmit_policy_subject(None, None, connection)
+    set_policy_subject(None)
+
+    assert connection.execute.call_args[0][1] == {"user_id": "7", "role": "support"}
+
+    connection.reset_mock()
+    with patch.object(policy, "ROW_LEVEL_SECURITY", True):
+        policy._transmit_policy_subject(None, None, connection)
+    connection.execute.assert_not_called()
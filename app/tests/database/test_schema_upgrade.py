@@ -0,0 +1,42 @@
+from sqlalchemy import create_engine, inspect
+from app.database.schema_upgrade import missing_column_statements, upgrade_schema
+from app.models import Client
+
+
+def _old_clients_engine():
+    """Table clients créée avant l'ajout des clés de regroupement"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE clients (id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL, mail VARCHAR(255) NOT NULL, "
+            "phone VARCHAR(50), company_name VARCHAR(255), commercial_contact_id INTEGER, "
+            "created_at DATETIME, last_updated_at DATETIME)"
+        )
+        connection.exec_driver_sql("INSERT INTO clients (id, name, mail) VALUES (1, 'Ancien', 'Ancien@Example.com')")
+    return engine
+
+
+def test_missing_columns_are_added_with_their_indexes():
+    """Les colonnes absentes de la table sont ajoutées puis indexées"""
+    engine = _old_clients_engine()
+
+    statements = upgrade_schema(engine, [Client.__table__])
+
+    columns = {column["name"] for column in inspect(engine).get_columns("clients")}
+    indexes = {index["name"] for index in inspect(engine).get_indexes("clients")}
+    assert {"mail_normalized", "phone_e164", "company_key"} <= columns
+    assert "ix_clients_mail_normalized" in indexes
+    assert any("ADD COLUMN mail_normalized VARCHAR(255)" in statement for statement in statements)
+
+
+def test_upgrade_is_idempotent():
+    """Une base à jour ne reçoit aucune DDL"""
+    engine = _old_clients_engine()
+    upgrade_schema(engine, [Client.__table__])
+
+    assert missing_column_statements(engine, Client.__table__) == []
+
+
+def test_missing_table_is_left_to_create_all():
+    """Une table absente n'est pas modifiée (create_all la crée complète)"""
+    assert missing_column_statements(create_engine("sqlite://"), Client.__table__) == []
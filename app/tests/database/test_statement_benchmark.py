@@ -0,0 +1,15 @@
+from app.database.db import db_manager
+from app.database.statement_benchmark import run
+
+
+def test_benchmark_reports_each_hot_query():
+    """Le microbenchmark mesure les trois requêtes et restaure la configuration des sessions"""
+    session_local = db_manager.SessionLocal
+
+    results = run(calls=3, rows=2)
+
+    assert [name for name, *_ in results] == [
+        "Contract.get_filtered_contracts", "Event.get_by_support_user", "Client.get_by_commercial"
+    ]
+    assert all(timing > 0 for _, *timings in results for timing in timings)
+    assert db_manager.SessionLocal is session_local
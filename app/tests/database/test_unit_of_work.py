@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import event as sa_event
+from app.database.db import db_manager
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.department import Department
+from app.models.user import User
+
+
+@pytest.fixture
+def contract(test_db):
+    Department.create(name="commercial", description="Commercial")
+    commercial = User.create(name="Commercial", mail="commercial@test.com", username="commercial",
+                             password="password123", department="commercial")
+    client = Client.create(name="Client", mail="client@test.com", phone="+33123456789",
+                           company_name="Company", commercial_contact_id=commercial.id, role="commercial")
+    return Contract.create(client_id=client.id, commercial_contact_id=commercial.id,
+                           total_amount=1000.0, remaining_amount=500.0, status="non signé")
+
+
+def test_unit_of_work_shares_one_session(test_db):
+    """Toutes les sessions demandées dans le bloc sont la session de la commande"""
+    with db_manager.unit_of_work() as session:
+        assert db_manager.get_session() is session
+        assert db_manager.get_read_session() is session
+
+        # Un bloc imbriqué réutilise l'unité de travail en cours
+        with db_manager.unit_of_work() as nested:
+            assert nested is session
+
+        # Le cache de référence garde des sessions indépendantes
+        with db_manager.outside_unit_of_work():
+            assert db_manager.get_session() is not session
+
+    assert db_manager.get_session() is not session
+
+
+def test_unit_of_work_identity_map(contract, test_db):
+    """Lecture puis mise à jour : le même objet, sans relecture ni merge"""
+    statements = []
+    sa_event.listen(test_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with db_manager.unit_of_work():
+        found = Contract.get_by_id_with_permissions(contract.id, contract.commercial_contact_id, "gestion")
+        assert Contract.get_by_id_with_permissions(contract.id, None, "gestion") is found
+
+        statements.clear()
+        found.update(remaining_amount=0.0, is_signed=True)
+
+    # UPDATE puis relecture demandée par update() (refresh) dans le point de sauvegarde de l'opération,
+    # validés une seule fois en fin de commande
+    assert [statement.split()[0] for statement in statements] == ["SAVEPOINT", "UPDATE", "SELECT", "RELEASE"]
+    reloaded = Contract.get_by_id_with_permissions(contract.id, None, "gestion")
+    assert reloaded.remaining_amount == 0.0
+    assert reloaded.is_signed is True
+
+
+def test_unit_of_work_rolls_back_on_error(contract):
+    """Une exception qui traverse la commande annule toutes ses écritures"""
+    with pytest.raises(RuntimeError):
+        with db_manager.unit_of_work():
+            Contract.get_by_id_with_permissions(contract.id, None, "gestion").update(remaining_amount=0.0)
+            raise RuntimeError("Erreur pendant la commande")
+
+    assert Contract.get_by_id_with_permissions(contract.id, None, "gestion").remaining_amount == 500.0
+
+
+def test_rollback_keeps_earlier_writes(contract):
+    """Une opération annulée (rollback dans un modèle) ne défait pas les écritures précédentes de la commande"""
+    with db_manager.unit_of_work():
+        Contract.get_by_id_with_permissions(contract.id, None, "gestion").update(remaining_amount=0.0)
+
+        with pytest.raises(ValueError):
+            Client.create(name="Doublon", mail="client@test.com", phone="+33123456789",
+                          company_name="Company", role="commercial")
+
+        # La commande continue dans la même transaction
+        Client.create(name="Autre", mail="autre@test.com", phone="+33123456780",
+                      company_name="Autre", role="commercial")
+
+    assert Contract.get_by_id_with_permissions(contract.id, None, "gestion").remaining_amount == 0.0
+    assert Client.search_by_prefix("Autre", None, "gestion")[0].mail == "autre@test.com"
+
+
+def test_rollback_discards_only_the_failed_operation(contract, test_db):
+    """Le rollback d'une opération annule ses propres écritures jusqu'à son point de sauvegarde"""
+    with db_manager.unit_of_work():
+        Contract.get_by_id_with_permissions(contract.id, None, "gestion").update(remaining_amount=0.0)
+
+        session = db_manager.get_session()
+        try:
+            session.get(Contract, contract.id).total_amount = 1.0
+            session.flush()
+            session.rollback()
+        finally:
+            session.close()
+
+    reloaded = Contract.get_by_id_with_permissions(contract.id, None, "gestion")
+    assert reloaded.remaining_amount == 0.0
+    assert reloaded.total_amount == 1000.0
+
+
+def test_reference_cache_invalidated_after_real_commit(test_db):
+    """Dans une commande, le cache de référence n'est invalidé qu'après la validation réelle"""
+    Department.create(name="support", description="Support")
+
+    with patch("app.models.user.reference_cache") as cache:
+        with db_manager.unit_of_work():
+            User.create(name="Support", mail="support@test.com", username="support",
+                        password="password123", department="support")
+            cache.invalidate.assert_not_called()
+        cache.invalidate.assert_called_once()
+
+
+def test_reference_cache_kept_on_rollback(test_db):
+    """Une commande annulée n'invalide pas le cache de référence"""
+    Department.create(name="support", description="Support")
+
+    with patch("app.models.user.reference_cache") as cache:
+        with pytest.raises(RuntimeError):
+            with db_manager.unit_of_work():
+                User.create(name="Support", mail="support@test.com", username="support",
+                            password="password123", department="support")
+                raise RuntimeError("échec de la commande")
+        cache.invalidate.assert_not_called()
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from app.database.async_db import AsyncDatabaseManager
+from app.models import Client, Contract, Department, Event, User
+from app.models.async_queries import (
+    AsyncClientQueries,
+    AsyncContractQueries,
+    AsyncEventQueries,
+    AsyncUserQueries
+)
+
+
+@pytest.fixture
+def async_db(tmp_path):
+    """Base SQLite asynchrone (aiosqlite) avec un jeu de données minimal"""
+    db = AsyncDatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def setup():
+        await db.create_tables()
+        async with db.get_session() as session:
+            commercial_dept = Department(name="commercial")
+            support_dept = Department(name="support")
+            commercial = User(
+                employee_number="EMP1", name="Commercial", mail="commercial@test.com",
+                username="commercial", password_hash=User.hash_password("password123"),
+                department=commercial_dept
+            )
+            support = User(
+                employee_number="EMP2", name="Support", mail="support@test.com",
+                username="support", password_hash=User.hash_password("password123"),
+                department=support_dept
+            )
+            client = Client(name="Dupont", mail="dupont@test.com", commercial_contact=commercial)
+            signed = Contract(client=client, commercial_contact=commercial, total_amount=1000, remaining_amount=0, is_signed=True)
+            unsigned = Contract(client=client, commercial_contact=commercial, total_amount=500, remaining_amount=500, is_signed=False)
+            start = datetime.now() + timedelta(days=10)
+            session.add_all([
+                Event(name="Assigné", contract=signed, date_start=start, date_end=start + timedelta(hours=2),
+                      location="Paris", attendees=10, support_contact=support),
+                Event(name="Libre", contract=signed, date_start=start, date_end=start + timedelta(hours=2),
+                      location="Lyon", attendees=20),
+                unsigned
+            ])
+            await session.commit()
+
+    asyncio.run(setup())
+    yield db
+    asyncio.run(db.dispose())
+
+
+def test_client_queries(async_db):
+    """Requêtes clients asynchrones"""
+    queries = AsyncClientQueries(async_db)
+
+    async def run():
+        clients = await queries.get_all()
+        by_prefix = await queries.search_by_prefix("DU")
+        by_mail = await queries.get_by_email("dupont@test.com")
+        with pytest.raises(ValueError):
+            await queries.get_by_id(999)
+        return clients, by_prefix, by_mail
+
+    clients, by_prefix, by_mail = asyncio.run(run())
+    assert [client.name for client in clients] == ["Dupont"]
+    assert by_prefix[0].id == by_mail.id
+
+
+def test_contract_queries(async_db):
+    """Requêtes contrats asynchrones avec relations chargées"""
+    queries = AsyncContractQueries(async_db)
+
+    async def run():
+        return (
+            await queries.get_all(),
+            await queries.get_filtered_contracts(1, "unpaid"),
+            await queries.get_by_id_with_permissions(1, 1, "commercial"),
+            await queries.get_by_id_with_permissions(1, 2, "support")
+        )
+
+    contracts, unpaid, allowed, denied = asyncio.run(run())
+    assert len(contracts) == 2
+    assert contracts[0].client.name == "Dupont"
+    assert [contract.total_amount for contract in unpaid] == [500]
+    assert allowed.commercial_contact.name == "Commercial"
+    assert denied is None
+
+
+def test_event_queries_run_concurrently(async_db):
+    """Plusieurs requêtes événements en parallèle sur la même boucle"""
+    queries = AsyncEventQueries(async_db)
+
+    async def run():
+        return await asyncio.gather(
+            queries.get_all(),
+            queries.get_by_support_user(2),
+            queries.get_events_without_support(),
+            queries.get_event_with_permissions(1, 2, "support")
+        )
+
+    all_events, assigned, without_support, permitted = asyncio.run(run())
+    assert len(all_events) == 2
+    assert [event.name for event in assigned] == ["Assigné"]
+    assert [event.name for event in without_support] == ["Libre"]
+    assert permitted.contract.client.name == "Dupont"
+
+
+def test_user_queries(async_db):
+    """Requêtes utilisateurs asynchrones"""
+    queries = AsyncUserQueries(async_db)
+
+    async def run():
+        return (
+            await queries.get_by_department("support"),
+            await queries.authenticate("commercial", "password123"),
+            await queries.authenticate("commercial", "mauvais")
+        )
+
+    supports, user, wrong = asyncio.run(run())
+    assert [support.name for support in supports] == ["Support"]
+    assert user.department.name == "commercial"
+    assert wrong is None
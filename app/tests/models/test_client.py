@@ -123,6 +123,17 @@ def test_create_client_duplicate_email(test_db):
     assert "Le client avec l'email 'duplicate@test.com' existe déjà"
 
 
+def test_create_client_same_normalized_email_is_allowed(test_db):
+    """Test : deux adresses distinctes de même forme normalisée sont acceptées, puis signalées comme doublon probable"""
+    first = Client.create(role="commercial", name="Jean Martin", mail="jean.martin+pro@test.com")
+
+    second = Client.create(role="commercial", name="Jean Martin", mail="Jean.Martin@test.com")
+
+    assert second.id != first.id
+    duplicates = Client.find_duplicates(name="Jean Martin", mail="jean.martin@test.com")
+    assert {client.id for client, _ in duplicates} == {first.id, second.id}
+
+
 # TEST PHONES
 @pytest.mark.parametrize("phone", VALID_PHONES)
 def test_create_valid_phones(phone, test_db):
@@ -205,3 +216,33 @@ def test_get_by_email_not_found(test_db):
         Client.get_by_email("inexistant@test.com")
 
     assert "Client avec l'email 'inexistant@test.com' introuvable" in str(exc_info.value)
+
+
+def test_search_by_prefix(test_db):
+    """Test : recherche par préfixe insensible à la casse et limitée"""
+    Client.create(role="commercial", name="Dupont", mail="dupont@test.com")
+    Client.create(role="commercial", name="durand", mail="durand@test.com")
+    Client.create(role="commercial", name="Martin", mail="martin@test.com")
+
+    results = Client.search_by_prefix("DU", None, "gestion")
+    assert [client.name for client in results] == ["Dupont", "durand"]
+
+    assert len(Client.search_by_prefix("du", None, "gestion", limit=1)) == 1
+    assert Client.search_by_prefix("", None, "gestion") == []
+    assert Client.search_by_prefix("%", None, "gestion") == []
+
+
+def test_search_by_prefix_scoped_to_commercial(test_db):
+    """Test : un commercial ne se voit proposer que ses propres clients"""
+    Client.create(role="commercial", name="Dupont", mail="dupont@test.com", commercial_contact_id=1)
+    Client.create(role="commercial", name="Durand", mail="durand@test.com", commercial_contact_id=2)
+
+    assert [client.name for client in Client.search_by_prefix("du", 1, "commercial")] == ["Dupont"]
+    assert [client.name for client in Client.search_by_prefix("du", 1, "support")] == ["Dupont", "Durand"]
+
+
+def test_has_any(test_db):
+    """Test : présence d'au moins un client"""
+    assert Client.has_any() is False
+    Client.create(role="commercial", name="Jean", mail="jean@test.com")
+    assert Client.has_any() is True
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 
 from app.models.contract import Contract
 from app.models.client import Client
@@ -129,3 +130,61 @@ def test_create_contract_invalid_commercial(test_db):
         )
 
     assert "Commercial avec l'ID 999 introuvable" in str(exc_info.value)
+
+
+def test_filter_by_criteria(test_db):
+    """Test filtres combinés : périmètre, statut, dates et montants"""
+    Department.create(name="commercial", description="Commercial")
+    alice = User.create(name="Alice", mail="alice@test.com", username="alice", password="password123", department="commercial")
+    bob = User.create(name="Bob", mail="bob@test.com", username="bob", password="password123", department="commercial")
+
+    client = Client.create(
+        name="Client Test",
+        mail="client@test.com",
+        phone="+33123456789",
+        company_name="Test Company",
+        commercial_contact_id=alice.id,
+        role="commercial"
+    )
+    bob_client = Client.create(name="Client Bob", mail="bob.client@test.com", commercial_contact_id=bob.id, role="commercial")
+
+    # Le dernier contrat porte encore Alice comme commercial, mais son client est suivi par Bob :
+    # la politique de lecture (contrats des clients du commercial) le donne à Bob
+    rows = [
+        (alice, 1000.0, 0.0, "signé", datetime(2024, 1, 10)),
+        (alice, 5000.0, 2500.0, "signé", datetime(2024, 2, 10)),
+        (alice, 200.0, 200.0, "non signé", datetime(2024, 3, 10)),
+        (alice, 8000.0, 8000.0, "signé", datetime(2024, 2, 15)),
+    ]
+    contracts = []
+    for index, (commercial, total, remaining, status, created_at) in enumerate(rows):
+        contract = Contract.create(
+            client_id=bob_client.id if index == 3 else client.id,
+            commercial_contact_id=commercial.id,
+            total_amount=total,
+            remaining_amount=remaining,
+            status=status
+        )
+        contract.update(created_at=created_at)
+        contracts.append(contract)
+
+    def ids(user_id=None, role="gestion", **criteria):
+        return [contract.id for contract in Contract.filter_by_criteria(user_id, role, **criteria)]
+
+    assert ids() == [contracts[0].id, contracts[1].id, contracts[3].id, contracts[2].id]
+    assert ids(alice.id, "commercial", is_signed=True) == [contracts[0].id, contracts[1].id]
+    assert ids(created_from=datetime(2024, 2, 1), created_until=datetime(2024, 3, 1)) == [contracts[1].id, contracts[3].id]
+    assert ids(min_total=1000, max_total=5000, min_remaining=0.01) == [contracts[1].id]
+    assert ids(bob.id, "commercial") == [contracts[3].id]
+    assert ids(bob.id, "commercial", max_remaining=100) == []
+    assert ids(client_id=client.id, is_signed=False)[0] == contracts[2].id
+
+    # Noms affichés projetés avec la page (lignes légères, pas d'entités)
+    page = Contract.filter_by_criteria(bob.id, "commercial")[0:1]
+    assert (page[0].client_name, page[0].commercial_name) == ("Client Bob", "Alice")
+
+
+def test_filter_by_criteria_inverted_bounds(test_db):
+    """Test bornes minimale et maximale inversées"""
+    with pytest.raises(ValueError):
+        Contract.filter_by_criteria(None, "gestion", min_total=500, max_total=100)
@@ -1,5 +1,6 @@
 import pytest
 from app.models.department import Department
+from app.utils.cache import reference_cache
 
 
 def test_create_department_success(test_db):
@@ -53,3 +54,15 @@ def test_get_department_with_none_id():
     result = Department.get_department_with_id(None)
 
     assert result is None
+
+
+def test_get_department_with_id_is_cached(test_db):
+    """Le nom du département est servi depuis le cache au second appel"""
+    _dept = Department.create(name="support", description="Test")
+
+    assert Department.get_department_with_id(_dept.id) == "support"
+    assert Department.get_department_with_id(_dept.id) == "support"
+
+    stats = reference_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -0,0 +1,119 @@
+from datetime import datetime
+from sqlalchemy import event
+from app.controllers.user import UserCommands
+from app.database.db import db_manager
+from app.models import Client, Contract, Department, Event, User
+from app.views.contract import ContractView
+from app.views.event import EventView
+from app.views.user import userView
+from unittest.mock import Mock
+
+
+def _dataset():
+    Department.create(name="commercial", description="Commercial")
+    Department.create(name="support", description="Support")
+    alice = User.create(name="Alice", mail="alice@test.com", username="alice", password="password123", department="commercial")
+    sam = User.create(name="Sam", mail="sam@test.com", username="sam", password="password123", department="support")
+    client = Client.create(name="Acme", mail="acme@test.com", phone="+33123456789",
+                           company_name="Acme", commercial_contact_id=alice.id, role="commercial")
+    contract = Contract.create(client_id=client.id, commercial_contact_id=alice.id, total_amount=100.0,
+                               remaining_amount=50.0, status="signé")
+    Event.create(name="Gala", contract_id=contract.id, date_start=datetime(2026, 7, 1, 9),
+                 date_end=datetime(2026, 7, 1, 18), location="Salle B", attendees=200, support_contact_id=sam.id)
+    Event.create(name="Salon", contract_id=contract.id, date_start=datetime(2026, 8, 1, 9),
+                 date_end=datetime(2026, 8, 1, 18), location="Salle A", attendees=20)
+    return alice
+
+
+def test_list_rows_are_projected(test_db):
+    """Les listes retournent des tuples nommés avec les seules colonnes affichées"""
+    alice = _dataset()
+    statements = []
+    event.listen(test_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    contract = Contract.get_all_paged()[0]
+    assert (contract.client_name, contract.commercial_name, contract.remaining_amount) == ("Acme", "Alice", 50.0)
+    assert contract._fields == (
+        "id", "client_id", "client_name", "commercial_name", "total_amount",
+        "remaining_amount", "is_signed", "created_at", "last_updated_at"
+    )
+    # Seules les colonnes affichées : ni email du client, ni hash de mot de passe
+    assert "password_hash" not in statements[-1]
+    assert "clients.mail" not in statements[-1]
+
+    assert [(row.name, row.support_name) for row in Event.get_all_paged()] == [("Gala", "Sam"), ("Salon", None)]
+    assert [row.name for row in Event.get_events_without_support()] == ["Salon"]
+    assert [row.client_name for row in Contract.get_by_commercial(alice.id)] == ["Acme"]
+    assert [row.department_name for row in User.get_all_paged()] == ["commercial", "support"]
+
+
+def test_views_accept_rows(test_db):
+    """Les vues affichent directement les lignes projetées"""
+    _dataset()
+    console = Mock()
+    console.input.return_value = "q"
+
+    ContractView(console=console).display_contract_list(Contract.get_all_paged())
+    EventView(console=console).display_event_list(Event.get_all_paged())
+    userView(console=console).display_user_list(User.get_all_paged())
+
+    assert console.print.called
+
+
+def test_assign_support_by_id(test_db):
+    """Assignation depuis une ligne de liste (sans entité chargée)"""
+    _dataset()
+    row = Event.get_events_without_support()[0]
+    sam = User.get_by_department("support")[0]
+
+    Event.assign_support_by_id(row.id, sam.id)
+
+    session = db_manager.get_session()
+    try:
+        assert session.get(Event, row.id).support_contact_id == sam.id
+    finally:
+        session.close()
+
+
+def test_cached_statements_bind_each_call(test_db):
+    """Les requêtes mises en cache (lambda_stmt) reçoivent les paramètres de chaque appel"""
+    alice = _dataset()
+    bob = User.create(name="Bob", mail="bob@test.com", username="bob", password="password123", department="commercial")
+    sam = User.get_by_department("support")[0]
+
+    assert [row.client_name for row in Contract.get_filtered_contracts(alice.id, "signed")] == ["Acme"]
+    assert Contract.get_filtered_contracts(alice.id, "unsigned") == []
+    assert Contract.get_filtered_contracts(bob.id, "signed") == []
+    assert [row.name for row in Client.get_by_commercial(alice.id)] == ["Acme"]
+    assert Client.get_by_commercial(bob.id) == []
+    assert [row.name for row in Event.get_by_support_user(sam.id)] == ["Gala"]
+    assert Event.get_by_support_user(bob.id) == []
+
+
+def test_commercial_lists_follow_read_policy(test_db):
+    """Listes d'un commercial : les contrats de ses clients, comme la règle de lecture de la politique d'accès"""
+    alice = _dataset()
+    bob = User.create(name="Bob", mail="bob@test.com", username="bob", password="password123", department="commercial")
+    # Client repris par Bob : son contrat porte encore Alice comme commercial
+    client = Client.create(name="Bolt", mail="bolt@test.com", commercial_contact_id=bob.id, role="commercial")
+    Contract.create(client_id=client.id, commercial_contact_id=alice.id, total_amount=10.0, remaining_amount=10.0, status="signé")
+
+    assert [row.client_name for row in Contract.get_by_commercial(bob.id)] == ["Bolt"]
+    assert [row.client_name for row in Contract.get_filtered_contracts(bob.id, "unpaid")] == ["Bolt"]
+    assert [row.client_name for row in Contract.get_by_commercial(alice.id)] == ["Acme"]
+
+
+def test_list_users_filtered_by_department(test_db):
+    """Liste des collaborateurs filtrée par département : mêmes lignes projetées que la liste complète"""
+    _dataset()
+    view = userView(console=Mock())
+    view.display_user_list = Mock(wraps=view.display_user_list)
+    commands = UserCommands(console=Mock(), view=view)
+
+    commands.list_users(filter_by_department="support")
+
+    commands.console.print.assert_not_called()
+    rows = view.display_user_list.call_args[0][0]
+    assert type(rows) is type(User.get_all_paged())
+    assert [(row.name, row.department_name) for row in rows] == [("Sam", "support")]
+    assert not any(isinstance(row, User) for row in rows)
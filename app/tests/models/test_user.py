@@ -461,3 +461,32 @@ def test_get_by_department_success(test_db):
     assert len(support_users) == 1
     assert commercial_users[0].name == "Commercial 1"
     assert support_users[0].name == "Support 1"
+
+
+def test_get_by_department_cache_invalidated_on_create(test_db):
+    """Le roster en cache est invalidé à la création d'un utilisateur"""
+    Department.create(name="support", description="Support")
+    User.create(name="Support 1", mail="s1@test.com", username="s1", password="password123", department="support")
+
+    assert len(User.get_by_department("support")) == 1
+    assert len(User.get_by_department("support")) == 1
+
+    User.create(name="Support 2", mail="s2@test.com", username="s2", password="password123", department="support")
+    supports = User.get_by_department("support")
+
+    assert len(supports) == 2
+    assert supports[0].department.name == "support"
+
+
+def test_validate_support_user_uses_roster(test_db):
+    """La validation d'un support s'appuie sur le roster en cache"""
+    from app.models.event import Event
+
+    Department.create(name="support", description="Support")
+    Department.create(name="gestion", description="Gestion")
+    support = User.create(name="Support", mail="s@test.com", username="s", password="password123", department="support")
+    manager = User.create(name="Gestion", mail="g@test.com", username="g", password="password123", department="gestion")
+
+    assert Event.validate_support_user(str(support.id)).id == support.id
+    assert Event.validate_support_user(manager.id) is None
+    assert Event.validate_support_user("999") is None
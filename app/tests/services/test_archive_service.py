@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from app.models import ArchivedContract, ArchivedEvent, Client, Contract, Department, Event, Tombstone, User
+from app.database.db import db_manager
+from app.services.archive_service import ArchiveService
+
+
+NOW = datetime(2025, 6, 1)
+
+
+def create_contract(client, commercial, signed=True, remaining=0):
+    return Contract.create(
+        client_id=client.id,
+        commercial_contact_id=commercial.id,
+        total_amount=1000,
+        remaining_amount=remaining,
+        status="signé" if signed else "non signé"
+    )
+
+
+def create_event(contract, days_ago):
+    session = db_manager.get_session()
+    event = Event(
+        name=f"Événement J-{days_ago}",
+        contract_id=contract.id,
+        date_start=NOW - timedelta(days=days_ago + 1),
+        date_end=NOW - timedelta(days=days_ago),
+        location="Paris",
+        attendees=10
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    session.close()
+    return event
+
+
+def setup_data():
+    Department.create(name="commercial")
+    commercial = User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+    client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    return client, commercial
+
+
+def count(model):
+    session = db_manager.get_session()
+    total = session.query(model).count()
+    session.close()
+    return total
+
+
+def test_archive_old_events_only(test_db):
+    """Seuls les événements terminés avant la rétention sont déplacés"""
+    client, commercial = setup_data()
+    contract = create_contract(client, commercial, remaining=500)
+    old = create_event(contract, days_ago=400)
+    create_event(contract, days_ago=10)
+
+    moved = ArchiveService(retention_days=365).archive_events(NOW)
+
+    assert moved == 1
+    assert count(Event) == 1
+    archived = ArchivedEvent.get_by_contract(contract.id)
+    assert [event.id for event in archived] == [old.id]
+    assert archived[0].archived_at == NOW
+
+
+def test_archive_settled_contracts_without_events(test_db):
+    """Les contrats soldés sont archivés une fois leurs événements archivés"""
+    client, commercial = setup_data()
+    settled = create_contract(client, commercial)
+    create_event(settled, days_ago=400)
+    unpaid = create_contract(client, commercial, remaining=100)
+    unsigned = create_contract(client, commercial, signed=False)
+    busy = create_contract(client, commercial)
+    create_event(busy, days_ago=5)
+
+    results = ArchiveService(retention_days=365).run(NOW)
+
+    assert results == {"events": 1, "contracts": 1}
+    assert [contract.id for contract in ArchivedContract.get_by_client(client.id)] == [settled.id]
+    assert {contract.id for contract in Contract.get_all()} == {unpaid.id, unsigned.id, busy.id}
+    assert len(ArchivedContract.get_by_commercial(commercial.id)) == 1
+
+
+def test_archive_in_batches(test_db):
+    """Le déplacement se fait par lots jusqu'à épuisement"""
+    client, commercial = setup_data()
+    contract = create_contract(client, commercial, remaining=500)
+    for days_ago in range(400, 405):
+        create_event(contract, days_ago)
+
+    assert ArchiveService(retention_days=365, batch_size=2).archive_events(NOW) == 5
+    assert count(Event) == 0
+    assert count(ArchivedEvent) == 5
+
+
+def test_archive_nothing_to_do(test_db):
+    """Aucune donnée à archiver"""
+    assert ArchiveService().run(NOW) == {"events": 0, "contracts": 0}
+
+
+def test_archive_writes_tombstones(test_db):
+    """Les lignes archivées sont signalées au flux de changements"""
+    client, commercial = setup_data()
+    contract = create_contract(client, commercial, remaining=500)
+    event = create_event(contract, days_ago=400)
+
+    ArchiveService(retention_days=365).archive_events(NOW)
+
+    session = db_manager.get_session()
+    tombstones = session.query(Tombstone).all()
+    session.close()
+    assert [(t.entity_type, t.entity_id, t.reason) for t in tombstones] == [("events", event.id, "archive")]
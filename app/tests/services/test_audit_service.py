@@ -0,0 +1,105 @@
+from unittest.mock import patch
+from app.models import Client, Department, User
+from app.services.audit_service import audit_writer, get_history, set_actor, AuditWriter
+
+
+def create_commercial():
+    Department.create(name="commercial")
+    return User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+
+
+def test_create_update_delete_are_recorded(test_db):
+    """Chaque création / modification / suppression produit une entrée d'audit"""
+    commercial = create_commercial()
+    client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    client.update(company_name="Société")
+
+    history = get_history("clients", client.id)
+
+    assert [entry.action for entry in history] == ["create", "update"]
+    assert history[0].changes["name"] == [None, "Client"]
+    assert history[1].changes == {"company_name": [None, "Société"]}
+
+
+def test_user_delete_and_password_redacted(test_db):
+    """Le hash du mot de passe n'est jamais recopié et la suppression est journalisée"""
+    Department.create(name="gestion")
+    user = User.create(name="Sup", mail="sup@test.com", username="sup", password="password123", department="gestion")
+    User.delete(user.id, "gestion")
+
+    history = get_history("users", user.id)
+
+    assert [entry.action for entry in history] == ["create", "delete"]
+    assert history[0].changes["password_hash"] == [None, "***"]
+    assert history[1].changes["username"] == ["sup", None]
+
+
+def test_actor_is_recorded(test_db):
+    """L'utilisateur connecté est associé aux entrées"""
+    commercial = create_commercial()
+    set_actor(commercial.id)
+    try:
+        client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    finally:
+        set_actor(None)
+
+    assert get_history("clients", client.id)[0].actor_id == commercial.id
+
+
+def test_entries_are_buffered_until_flush(test_db):
+    """Aucune écriture d'audit pendant la transaction métier : tout passe par le tampon"""
+    commercial = create_commercial()
+    before = audit_writer.pending()
+    Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+
+    assert audit_writer.pending() == before + 1
+    assert audit_writer.flush() == before + 1
+    assert audit_writer.pending() == 0
+
+
+def test_rollback_discards_changes(test_db):
+    """Une écriture annulée ne laisse pas de trace"""
+    commercial = create_commercial()
+    audit_writer.flush()
+
+    try:
+        Client.create("commercial", name="Client", mail="invalide", commercial_contact_id=commercial.id)
+    except ValueError:
+        pass
+
+    assert audit_writer.pending() == 0
+
+
+def test_writer_inserts_in_batches(test_db):
+    """Le tampon est écrit par lots de taille fixe"""
+    writer = AuditWriter(batch_size=2)
+    writer.record([
+        {"entity_type": "clients", "entity_id": index, "action": "create", "changes": {}, "actor_id": None}
+        for index in range(5)
+    ])
+
+    with patch("app.services.audit_service.insert", wraps=__import__("sqlalchemy").insert) as mock_insert:
+        assert writer.flush() == 5
+    assert mock_insert.call_count == 3
+
+
+def test_failed_flush_keeps_entries(test_db):
+    """En cas d'erreur, les entrées restent en attente"""
+    writer = AuditWriter()
+    writer.record([{"entity_type": "clients", "entity_id": 1, "action": "create", "changes": {}, "actor_id": None}])
+
+    with patch("app.services.audit_service.db_manager.get_session", side_effect=Exception("DB down")):
+        assert writer.flush() == 0
+    assert writer.pending() == 1
+
+
+def test_background_thread_flushes_on_stop(test_db):
+    """Le thread d'arrière-plan écrit les dernières entrées à l'arrêt"""
+    commercial = create_commercial()
+    writer = AuditWriter(flush_interval=60)
+    writer.start()
+    writer.record([{"entity_type": "users", "entity_id": commercial.id, "action": "update", "changes": {}, "actor_id": None}])
+    writer.stop()
+
+    assert writer.pending() == 0
+    assert [entry.action for entry in get_history("users", commercial.id)] == ["create", "update"]
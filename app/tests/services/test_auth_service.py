@@ -1,6 +1,8 @@
 import pytest # noqa
 from unittest.mock import Mock, patch, mock_open
+from sqlalchemy.exc import OperationalError
 from app.services.auth_service import AuthService
+from app.views.inputs import QueueInput
 
 
 class TestAuthService:
@@ -13,22 +15,19 @@ class TestAuthService:
             mock_token_file = Mock()
             mock_path.home.return_value.__truediv__.return_value = mock_token_file
 
-            self.auth_service = AuthService()
+            # Mock de la console pour éviter les vraies sorties, saisies fournies par la file
+            self.inputs = QueueInput()
+            self.auth_service = AuthService(console=Mock(), inputs=self.inputs)
             self.auth_service.token_file = mock_token_file
-            # Mock de la console pour éviter les vraies sorties
-            self.auth_service.console = Mock()
 
     @patch('app.services.auth_service.User')
-    @patch('builtins.input')
-    @patch('app.services.auth_service.getpass.getpass')
-    def test_authenticate_user_success_new_login(self, mock_getpass, mock_input, mock_user):
+    def test_authenticate_user_success_new_login(self, mock_user):
         """Test authentification réussie avec nouvelle connexion"""
         # Mock du token inexistant
         self.auth_service._check_existing_token = Mock(return_value=None)
 
         # Mock des inputs utilisateur
-        mock_input.return_value = "testuser"
-        mock_getpass.return_value = "testpass"
+        self.inputs.feed("testuser", "testpass")
 
         # Mock de l'utilisateur authentifié
         mock_user_instance = Mock()
@@ -73,6 +72,26 @@ class TestAuthService:
         mock_user.get_by_id.assert_called_once_with(1)
         self.auth_service.console.print.assert_called()
 
+    @patch('app.services.auth_service.OfflineReplica')
+    @patch('app.services.auth_service.User')
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('app.services.auth_service.json.load')
+    @patch('app.services.auth_service.jwt.decode')
+    def test_check_existing_token_database_down(self, mock_jwt_decode, mock_json_load, mock_file, mock_user, mock_replica):
+        """Test base injoignable : la session enregistrée reprend depuis la copie locale, le token est conservé"""
+        self.auth_service.token_file.exists.return_value = True
+        mock_json_load.return_value = {'token': 'valid_token'}
+        mock_jwt_decode.return_value = {'user_id': 1, 'username': 'testuser'}
+        mock_user.get_by_id.side_effect = OperationalError("SELECT", {}, Exception("connection refused"))
+        local_user = Mock()
+        mock_replica.saved_user.return_value = local_user
+
+        result = self.auth_service._check_existing_token()
+
+        assert result == local_user
+        mock_replica.saved_user.assert_called_once_with(1)
+        self.auth_service.token_file.unlink.assert_not_called()
+
     def test_check_existing_token_file_not_exists(self):
         """Test vérification avec fichier token inexistant"""
         # Mock du fichier inexistant
@@ -136,18 +155,13 @@ class TestAuthService:
         mock_user.id = 1
         self.auth_service._check_existing_token = Mock(return_value=mock_user)
 
-        # Mock pour s'assurer qu'on n'appelle pas les autres méthodes
-        with patch('builtins.input') as mock_input, \
-                patch('app.services.auth_service.getpass.getpass') as mock_getpass:
-
-            # Exécution
-            result = self.auth_service.authenticate_user()
+        # Exécution
+        result = self.auth_service.authenticate_user()
 
-            # Vérifications
-            assert result == mock_user  # ← Teste le return existing_user
-            # Vérifier qu'on n'a pas demandé d'input (connexion directe)
-            mock_input.assert_not_called()
-            mock_getpass.assert_not_called()
+        # Vérifications
+        assert result == mock_user  # ← Teste le return existing_user
+        # Vérifier qu'on n'a pas demandé d'input (connexion directe)
+        assert self.inputs.prompts == []
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('app.services.auth_service.json.load')
@@ -0,0 +1,85 @@
+import pytest
+from datetime import datetime, timedelta
+from app.models import Client, Department, User
+from app.services.change_feed import ChangeFeed, CursorError
+
+
+@pytest.fixture
+def commercial(test_db):
+    Department.create(name="commercial")
+    Department.create(name="gestion")
+    return User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+
+
+def create_clients(commercial, count, start=0):
+    return [
+        Client.create("commercial", name=f"Client {index}", mail=f"c{index}@test.com", commercial_contact_id=commercial.id)
+        for index in range(start, start + count)
+    ]
+
+
+def feed():
+    return ChangeFeed(page_size=2, lag=timedelta(0))
+
+
+def collect(entity, since=None):
+    pages = list(feed().stream(entity, since=since))
+    items = [item for page in pages for item in page["items"]]
+    deleted = [item for page in pages for item in page["deleted"]]
+    return pages, items, deleted
+
+
+def test_full_feed_in_primary_key_order(commercial):
+    """Sans filigrane, tout est retourné par pages, dans l'ordre des clés"""
+    clients = create_clients(commercial, 5)
+
+    pages, items, _ = collect("clients")
+
+    assert [item["id"] for item in items] == [client.id for client in clients]
+    assert len(pages) == 3
+    assert all(page["watermark"] is None for page in pages[:-1])
+    assert pages[-1]["watermark"] is not None
+
+
+def test_incremental_feed_returns_only_changes(commercial):
+    """Avec le filigrane de la lecture précédente, seules les modifications reviennent"""
+    clients = create_clients(commercial, 3)
+    watermark = collect("clients")[0][-1]["watermark"]
+
+    clients[1].update(company_name="Nouvelle")
+    create_clients(commercial, 1, start=10)
+
+    _, items, _ = collect("clients", since=watermark)
+
+    assert [item["name"] for item in items] == ["Client 1", "Client 10"]
+
+
+def test_deletions_are_reported(commercial):
+    """Les suppressions apparaissent comme pierres tombales"""
+    gestion_user = User.create(name="Ges", mail="ges@test.com", username="ges", password="password123", department="gestion")
+    since = datetime.now() - timedelta(seconds=1)
+
+    User.delete(gestion_user.id, "gestion")
+
+    _, items, deleted = collect("users", since=since)
+    assert [item["id"] for item in deleted] == [gestion_user.id]
+    assert deleted[0]["reason"] == "delete"
+    assert all("password_hash" not in item for item in items)
+
+
+def test_cursor_resumes(commercial):
+    """Un curseur permet de reprendre la lecture là où elle s'est arrêtée"""
+    create_clients(commercial, 3)
+    first = feed().read("clients")
+
+    second = feed().read("clients", cursor=first["next_cursor"])
+
+    assert [item["id"] for item in first["items"]] == [1, 2]
+    assert [item["id"] for item in second["items"]] == [3]
+
+
+def test_invalid_cursor_and_entity(commercial):
+    with pytest.raises(CursorError):
+        feed().read("clients", cursor="pas-un-curseur")
+    with pytest.raises(ValueError):
+        feed().read("inconnue")
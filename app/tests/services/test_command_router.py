@@ -95,7 +95,7 @@ class TestCommandRouter:
     def test_execute_clients_commercial_list(self):
         """Test listage de clients"""
         self.command_router.execute("clients", "commercial", "1")
-        self.mock_client_cmd.list_clients.assert_called_once()
+        self.mock_client_cmd.list_clients.assert_called_once_with("commercial")
 
     def test_execute_clients_commercial_update(self):
         """Test mise à jour de client"""
@@ -113,6 +113,16 @@ class TestCommandRouter:
         self.command_router.execute("filters", "commercial", "2")
         self.mock_contract_cmd.filter_unpaid_contracts.assert_called_once()
 
+    def test_execute_filters_commercial_criteria(self):
+        """Test filtres combinés côté commercial"""
+        self.command_router.execute("filters", "commercial", "3")
+        self.mock_contract_cmd.filter_contracts_by_criteria.assert_called_once_with("commercial")
+
+    def test_execute_contracts_gestion_criteria(self):
+        """Test filtres combinés côté gestion"""
+        self.command_router.execute("contracts", "gestion", "4")
+        self.mock_contract_cmd.filter_contracts_by_criteria.assert_called_once_with("gestion")
+
     # Tests pour les commandes Events - Gestion
     def test_execute_events_gestion_update(self):
         """Test mise à jour d'événement"""
@@ -165,6 +175,11 @@ class TestCommandRouter:
         self.command_router.execute_direct_action("list_all_contracts")
         self.mock_contract_cmd.list_contracts.assert_called_once_with("support")
 
+    def test_execute_direct_action_sync_offline(self):
+        """Test action directe synchronisation hors ligne"""
+        self.command_router.execute_direct_action("sync_offline")
+        self.mock_event_cmd.sync_offline.assert_called_once()
+
     # Tests pour les commandes non trouvées
     def test_execute_command_not_found(self):
         """Test commande non trouvée"""
@@ -233,13 +248,66 @@ class TestCommandRouter:
                 patch('app.services.command_router.EventCommands') as mock_event_cmd:
 
             test_user = Mock()
-            CommandRouter(current_user=test_user)
+            context = Mock()
+            router = CommandRouter(current_user=test_user, context=context)
+
+            # Vérifier que toutes les commandes sont initialisées avec current_user et le contexte partagé
+            mock_user_cmd.assert_called_once_with(
+                current_user=test_user, console=context.console, view=context.user_view, filter_view=context.filter_view
+            )
+            mock_contract_cmd.assert_called_once_with(
+                current_user=test_user, console=context.console, view=context.contract_view, filter_view=context.filter_view
+            )
+            mock_client_cmd.assert_called_once_with(
+                current_user=test_user, console=context.console, view=context.client_view, filter_view=context.filter_view
+            )
+            mock_event_cmd.assert_called_once_with(
+                current_user=test_user,
+                console=context.console,
+                view=context.event_view,
+                contract_cmd=mock_contract_cmd.return_value,
+                filter_view=context.filter_view,
+                memo=router.memo,
+                inputs=context.inputs
+            )
+
+    def test_commands_run_in_unit_of_work(self):
+        """Test chaque commande s'exécute dans une unité de travail"""
+        with patch('app.services.command_router.db_manager') as mock_db_manager:
+            self.command_router.execute("users", "gestion", "4")
+            self.command_router.execute_direct_action("create_client")
+
+        assert mock_db_manager.unit_of_work.call_count == 2
+        self.mock_user_cmd.list_users.assert_called_once()
+        self.mock_client_cmd.create_client.assert_called_once()
+
+    def test_memo_cleared_after_each_command(self):
+        """Test les résultats mémorisés ne survivent pas à la commande"""
+        self.command_router.memo.get_or_load("events_without_support", lambda: ["event"])
+        self.command_router.execute("events", "gestion", "2")
+        assert self.command_router.memo.get_or_load("events_without_support", lambda: []) == []
+
+        self.command_router.memo.get_or_load("events_without_support", lambda: ["event"])
+        self.mock_client_cmd.create_client.side_effect = Exception("Erreur")
+        self.command_router.execute_direct_action("create_client")
+        assert self.command_router.memo.get_or_load("events_without_support", lambda: []) == []
+
+    def test_search_commands(self):
+        """Test recherches par expression de filtre"""
+        self.command_router.execute("users", "gestion", "5")
+        self.mock_user_cmd.search_users.assert_called_once()
+
+        self.command_router.execute("contracts", "commercial", "3")
+        self.mock_contract_cmd.search_contracts.assert_called_once_with("commercial")
+
+        self.command_router.execute("clients", "commercial", "3")
+        self.mock_client_cmd.search_clients.assert_called_once_with("commercial")
+
+        self.command_router.execute("events", "gestion", "5")
+        self.mock_event_cmd.search_events.assert_called_once_with("gestion")
 
-            # Vérifier que toutes les commandes sont initialisées avec current_user
-            mock_user_cmd.assert_called_once_with(current_user=test_user)
-            mock_contract_cmd.assert_called_once_with(current_user=test_user)
-            mock_client_cmd.assert_called_once_with(current_user=test_user)
-            mock_event_cmd.assert_called_once_with(current_user=test_user)
+        self.command_router.execute_direct_action("search_events")
+        self.mock_event_cmd.search_events.assert_called_with("support")
 
     # Test des cas edge
     def test_execute_with_empty_strings(self):
@@ -0,0 +1,75 @@
+import pytest
+from app.database.db import db_manager
+from app.models import Client, Department, User
+from app.services.dedup_service import DedupService
+
+
+@pytest.fixture
+def commercial(test_db):
+    Department.create(name="commercial")
+    return User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+
+
+def create_client(commercial, **kwargs):
+    return Client.create("commercial", commercial_contact_id=commercial.id, **kwargs)
+
+
+def test_blocking_keys_are_computed(commercial):
+    client = create_client(commercial, name="Jean", mail="Jean@Exemple.fr", phone="06 12 34 56 78", company_name="Dupont SAS")
+
+    assert client.mail_normalized == "jean@exemple.fr"
+    assert client.phone_e164 == "+33612345678"
+    assert client.company_key == "dupont"
+
+    client.update(phone="+33 7 00 00 00 00")
+    assert Client.get_by_id(client.id).phone_e164 == "+33700000000"
+
+
+def test_create_rejects_exact_mail_duplicate(commercial):
+    """Un email identique est refusé ; ne différant que par la casse, il est signalé comme doublon probable"""
+    existing = create_client(commercial, name="Jean", mail="jean@exemple.fr")
+
+    with pytest.raises(ValueError, match="existe déjà"):
+        create_client(commercial, name="Jean", mail="jean@exemple.fr")
+
+    assert [client.id for client, _ in Client.find_duplicates(name="Jean", mail="JEAN@exemple.fr")] == [existing.id]
+
+
+def test_find_duplicates_by_phone_block(commercial):
+    """Même téléphone reformaté et nom proche : doublon probable"""
+    existing = create_client(commercial, name="Jean Dupont", mail="jean@exemple.fr", phone="0612345678")
+    create_client(commercial, name="Autre", mail="autre@exemple.fr", phone="0699999999")
+
+    duplicates = Client.find_duplicates(name="Jean Dupond", mail="j.dupont@ailleurs.fr", phone="+33 6 12 34 56 78")
+
+    assert [client.id for client, _ in duplicates] == [existing.id]
+
+
+def test_find_duplicates_without_keys(commercial):
+    assert Client.find_duplicates(name="Jean") == []
+
+
+def test_report_pairs_and_skipped_blocks(commercial):
+    """Le rapport compare uniquement à l'intérieur des blocs"""
+    a = create_client(commercial, name="Jean Dupont", mail="jean@exemple.fr", company_name="Dupont SARL")
+    b = create_client(commercial, name="Jean Dupond", mail="jean.dupond@exemple.fr", company_name="DUPONT")
+    create_client(commercial, name="Marie Curie", mail="marie@radium.fr", company_name="Radium")
+    for index in range(3):
+        create_client(commercial, name=f"Client {index}", mail=f"c{index}@test.fr", phone="0600000000")
+
+    report = DedupService(max_block_size=2).report()
+
+    assert [(pair[0].id, pair[1].id, pair[3]) for pair in report["pairs"]] == [(a.id, b.id, "company_key")]
+    assert report["skipped_blocks"] == [("phone_e164", "+33600000000", 3)]
+
+
+def test_backfill_keys(commercial):
+    """Les clients existants sans clé sont complétés"""
+    client = create_client(commercial, name="Jean", mail="Jean@Exemple.fr")
+    session = db_manager.get_session()
+    session.query(Client).update({Client.mail_normalized: None}, synchronize_session=False)
+    session.commit()
+    session.close()
+
+    assert DedupService().backfill_keys() == 1
+    assert Client.get_by_id(client.id).mail_normalized == "jean@exemple.fr"
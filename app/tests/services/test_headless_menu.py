@@ -0,0 +1,39 @@
+from io import StringIO
+from rich.console import Console
+from app.models import Client, Department, User
+from app.services.app_context import AppContext
+from app.services.auth_service import AuthService
+from app.services.menu_service import MenuService
+from app.views.inputs import QueueInput
+
+
+def test_menu_flow_replayed_headless(test_db, tmp_path):
+    """Connexion puis parcours complet des menus d'un commercial, sans terminal"""
+    Department.create(name="commercial", description="Commercial")
+    User.create(name="Alice", mail="alice@test.com", username="alice", password="password123", department="commercial")
+
+    inputs = QueueInput([
+        "alice", "password123",
+        # Créer un client (action directe)
+        "2", "Acme", "contact@acme.fr", "+33123456789", "Acme SA",
+        # Mes clients > Lister
+        "1", "1",
+        # Déconnexion
+        "0",
+    ])
+    console = Console(file=StringIO(), width=120)
+
+    auth_service = AuthService(console=console, inputs=inputs)
+    auth_service.token_file = tmp_path / "token"
+    auth_service.secret_key = "secret-de-test-du-parcours-sans-terminal"
+    user = auth_service.authenticate_user()
+
+    menu_service = MenuService(context=AppContext(console=console, inputs=inputs))
+    results = []
+    while not results or results[-1] != "logout":
+        results.append(menu_service.handle_main_menu(user))
+
+    assert results == [None, None, "logout"]
+    assert [row.name for row in Client.get_by_commercial(user.id)] == ["Acme"]
+    assert "Acme SA" in console.file.getvalue()
+    assert not inputs.answers
@@ -0,0 +1,97 @@
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database.db import Base, db_manager
+from app.services import load_generator
+from app.services.load_generator import (
+    FAILED, OK, Dataset, SessionRunner, SimulatedUser, TimedQueuePool, percentile, run, seed
+)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert [percentile(values, fraction) for fraction in (0.50, 0.95, 0.99)] == [50, 95, 99]
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) is None
+
+
+def test_timed_pool_counts_checkouts():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0)
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    assert engine.pool.checkout_waits.count == 3
+    engine.dispose()
+
+
+def test_load_run_reports_each_role():
+    """Chaque utilisateur simulé se connecte puis enchaîne ses parcours ; la configuration des sessions est restaurée"""
+    session_local = db_manager.SessionLocal
+
+    report = run(users_per_role=1, duration=60, clients_per_commercial=3, max_journeys=4)
+
+    assert report.users == 3
+    assert len(report.latencies["connexion"]) == 3
+    assert report.journeys == 12
+    assert report.interrupted == 0
+    assert sum(report.failures.values()) == 0
+    assert report.pool_checkouts > 0
+    assert report.lock_errors == 0 and report.lock_wait_seconds is None
+    assert db_manager.SessionLocal is session_local
+
+
+def test_load_journeys_write_through_commands(tmp_path):
+    """Les parcours de modification passent par les commandes et modifient la base"""
+    url = f"sqlite:///{tmp_path / 'charge.db'}"
+    journeys = {
+        "commercial": [journey for journey in load_generator.JOURNEYS["commercial"] if journey[0] == "modifier un client"],
+        "support": [journey for journey in load_generator.JOURNEYS["support"] if journey[0] == "modifier un événement"],
+    }
+
+    with patch.dict(load_generator.JOURNEYS, journeys):
+        report = run(users_per_role=1, duration=60, url=url, roles=["commercial", "support"],
+                     clients_per_commercial=3, max_journeys=2)
+
+    assert report.interrupted == 0 and report.database_errors == 0
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM events WHERE notes LIKE 'Passage %'")).scalar() >= 1
+        assert connection.execute(text("SELECT count(*) FROM clients WHERE company_name LIKE 'Entreprise %'")).scalar() >= 1
+    engine.dispose()
+
+
+def test_seed_gives_events_to_every_support():
+    """Avec un nombre de supports multiple de 3, chaque support reçoit des événements assignés"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    dataset = seed(session, 3, 3, ["support"])
+
+    assert [len(user.event_ids) for user in dataset.users] == [2, 2, 2]
+    session.close()
+    engine.dispose()
+
+
+def test_displayed_error_fails_the_step(tmp_path):
+    """Une erreur affichée par une commande (exception interceptée) compte comme un échec du parcours"""
+    user = SimulatedUser("support", "support-0")
+    runner = SessionRunner(user, Dataset([user], [], 0, 0, 0), tmp_path, "secret", 0)
+
+    runner._timed("mes événements", lambda: runner.console.print("[green]3 événement(s)[/green]"))
+    runner._timed("modifier un événement", lambda: runner.console.print("[red]Erreur lors de la mise à jour[/red]"))
+
+    assert [status for _, _, status in runner.timings] == [OK, FAILED]
+    runner.console.file.close()
+
+
+def test_update_journeys_skipped_without_rows():
+    """Un support sans événement assigné ne tire pas le parcours de modification"""
+    user = SimulatedUser("support", "support-0")
+    dataset = Dataset([user], [1, 2], 0, 2, 0)
+
+    available = [name for name, _, _, answers in load_generator.JOURNEYS["support"]
+                 if load_generator._has_rows(answers, user, dataset)]
+
+    assert available == ["mes événements", "tous les contrats"]
@@ -23,6 +23,22 @@ class TestMenuService:
         result = self.menu_service.handle_main_menu(self.mock_user)
         assert result == "logout"
 
+    @patch('app.services.menu_service.CommandRouter')
+    @patch('app.services.menu_service.Menu')
+    def test_handle_main_menu_reuses_router(self, mock_menu_class, mock_router):
+        """Test le routeur est créé une seule fois pour le même utilisateur"""
+        self.menu_service._get_user_department = Mock(return_value="gestion")
+        mock_router.return_value.current_user = self.mock_user
+        mock_menu = Mock()
+        mock_menu_class.return_value = mock_menu
+        mock_menu.get_choice.return_value = "0"
+        mock_menu.is_valid_choice.return_value = True
+
+        self.menu_service.handle_main_menu(self.mock_user)
+        self.menu_service.handle_main_menu(self.mock_user)
+
+        mock_router.assert_called_once_with(current_user=self.mock_user, context=self.menu_service.context)
+
     @patch('app.services.menu_service.MENU_MAPPING', {"gestion": {"1": "submenu_key"}})
     @patch('app.services.menu_service.DIRECT_ACTIONS', {})
     def test_submenu_key_found(self):
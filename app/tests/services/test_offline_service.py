@@ -0,0 +1,179 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from app.database.db import db_manager
+from app.models import Client, Contract, Department, Event, User
+from app.services.offline_service import OfflineReplica
+
+
+@pytest.fixture
+def scope(test_db):
+    """Un support avec deux événements, un autre support avec un événement"""
+    for name in ("commercial", "support"):
+        Department.create(name=name)
+    commercial = User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+    support = User.create(name="Sup", mail="sup@test.com", username="sup", password="password123", department="support")
+    other = User.create(name="Autre", mail="autre@test.com", username="autre", password="password123", department="support")
+
+    client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    other_client = Client.create("commercial", name="Autre client", mail="autre.client@test.com", commercial_contact_id=commercial.id)
+    contract = Contract.create(
+        client_id=client.id, commercial_contact_id=commercial.id, total_amount=100, remaining_amount=0, status="signé"
+    )
+    other_contract = Contract.create(
+        client_id=other_client.id, commercial_contact_id=commercial.id, total_amount=100, remaining_amount=0, status="signé"
+    )
+
+    events = []
+    for index, (contract_id, support_id) in enumerate([(contract.id, support.id), (contract.id, support.id), (other_contract.id, other.id)]):
+        events.append(Event.create(
+            name=f"Événement {index}",
+            contract_id=contract_id,
+            date_start=datetime(2030, 1, 1) + timedelta(days=index),
+            date_end=datetime(2030, 1, 1, 18) + timedelta(days=index),
+            location="Paris",
+            attendees=10,
+            support_contact_id=support_id
+        ))
+    return {"support": support, "other": other, "events": events}
+
+
+@pytest.fixture
+def replica(scope, tmp_path):
+    replica = OfflineReplica(scope["support"], path=tmp_path / "offline.db")
+    yield replica
+    replica.close()
+
+
+def test_initial_sync_copies_scope_only(scope, replica):
+    """Seuls les événements assignés, leurs contrats et leurs clients sont copiés"""
+    assert not replica.exists()
+
+    result = replica.sync()
+
+    assert result["pulled"] == {"clients": 1, "contracts": 1, "events": 2}
+    assert replica.exists()
+    events = replica.get_assigned_events()
+    assert [event.name for event in events] == ["Événement 0", "Événement 1"]
+    assert events[0].contract_id == events[1].contract_id
+    assert events[0].support_name == "Sup"
+
+
+def test_incremental_pull_uses_watermark(scope, replica):
+    """Une seconde synchronisation ne copie que les lignes modifiées"""
+    replica.sync()
+    time.sleep(0.01)
+    scope["events"][0].update(notes="Nouvelle note")
+
+    pulled = replica.pull()
+
+    assert pulled == {"clients": 0, "contracts": 0, "events": 1}
+    assert replica.get_event(scope["events"][0].id).notes == "Nouvelle note"
+
+
+def test_pull_keeps_rows_stamped_at_the_watermark(scope, replica):
+    """Une ligne validée après la synchronisation avec la date du filigrane est tout de même copiée"""
+    replica.sync()
+    watermark = replica._watermark("events")
+    session = db_manager.get_session()
+    session.execute(
+        update(Event).where(Event.id == scope["events"][0].id).values(notes="Validée en retard", last_updated_at=watermark)
+    )
+    session.commit()
+    session.close()
+
+    pulled = replica.pull()
+
+    assert pulled["events"] == 1
+    assert replica.get_event(scope["events"][0].id).notes == "Validée en retard"
+    assert replica.pull()["events"] == 0
+
+
+def test_saved_user_reads_local_copy(scope, replica):
+    """Le support et son département sont lisibles dans la copie locale (session reprise hors ligne)"""
+    assert OfflineReplica.saved_user(scope["support"].id, path=replica.path) is None
+
+    replica.sync()
+    user = OfflineReplica.saved_user(scope["support"].id, path=replica.path)
+
+    assert user.username == "sup"
+    assert user.department.name == "support"
+
+
+def test_reassigned_event_is_pruned(scope, replica):
+    """Un événement réassigné sort de la copie locale, son contrat et son client aussi"""
+    replica.sync()
+    for event in scope["events"][:2]:
+        event.assign_support(scope["other"].id)
+
+    replica.pull()
+
+    assert replica.get_assigned_events() == []
+    with replica.get_session() as session:
+        assert session.query(Client).count() == 0
+
+
+def test_offline_update_is_queued_then_pushed(scope, replica):
+    """La modification locale est rejouée sur la base principale"""
+    replica.sync()
+    event_id = scope["events"][0].id
+
+    replica.update_event(event_id, location="Lyon")
+    replica.update_event(event_id, attendees=50)
+    assert replica.pending_count() == 1
+    assert replica.get_event(event_id).location == "Lyon"
+
+    result = replica.sync()
+
+    assert result["pushed"] == 1
+    assert result["conflicts"] == []
+    primary_event = Event.get_by_id(event_id)
+    assert (primary_event.location, primary_event.attendees) == ("Lyon", 50)
+    assert replica.pending_count() == 0
+
+
+def test_conflict_is_detected(scope, replica):
+    """Si l'événement a changé sur le serveur, la modification locale est mise de côté"""
+    replica.sync()
+    event_id = scope["events"][0].id
+    replica.update_event(event_id, location="Lyon")
+    time.sleep(0.01)
+    scope["events"][0].update(location="Marseille")
+
+    result = replica.sync()
+
+    assert result["pushed"] == 0
+    assert [conflict["event_id"] for conflict in result["conflicts"]] == [event_id]
+    assert Event.get_by_id(event_id).location == "Marseille"
+    assert replica.get_event(event_id).location == "Marseille"
+    assert len(replica.get_conflicts()) == 1
+
+
+def test_push_commits_each_change_before_dequeuing(scope, replica):
+    """Dans une commande : une modification rejouée puis un conflit, la première reste validée sur le serveur"""
+    replica.sync()
+    applied_id, conflict_id = scope["events"][0].id, scope["events"][1].id
+    replica.update_event(applied_id, location="Lyon")
+    replica.update_event(conflict_id, location="Nice")
+    time.sleep(0.01)
+    scope["events"][1].update(location="Marseille")
+
+    with pytest.raises(RuntimeError):
+        with db_manager.unit_of_work():
+            pushed, conflicts = replica.push()
+            raise RuntimeError("échec de la commande après la synchronisation")
+
+    assert pushed == 1
+    assert [conflict["event_id"] for conflict in conflicts] == [conflict_id]
+    assert Event.get_by_id(applied_id).location == "Lyon"
+    assert Event.get_by_id(conflict_id).location == "Marseille"
+    assert replica.pending_count() == 0
+    assert len(replica.get_conflicts()) == 1
+
+
+def test_update_outside_scope_is_refused(scope, replica):
+    replica.sync()
+
+    assert replica.update_event(scope["events"][2].id, location="Lyon") is None
+    assert replica.pending_count() == 0
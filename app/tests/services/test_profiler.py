@@ -0,0 +1,82 @@
+import pytest
+import time
+import tracemalloc
+from unittest.mock import Mock, patch
+from app.models import Department
+from app.services.app_context import AppContext
+from app.services.command_router import CommandRouter
+from app.services.profiler import CommandProfiler
+from app.views.inputs import InteractiveInput
+
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = CommandProfiler(enabled=False, directory=tmp_path)
+
+    with profiler.profile("users-gestion-4") as run:
+        pass
+
+    assert run.report_path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_report_contents(test_db, tmp_path):
+    """Rapport : durée, part du temps SQL, fonctions et allocations, plus les statistiques brutes"""
+    profiler = CommandProfiler(enabled=True, directory=tmp_path)
+
+    with profiler.profile("events/gestion 3") as run:
+        Department.create(name="support", description="Support")
+
+    report = run.report_path.read_text(encoding="utf-8")
+    assert run.report_path.name.endswith("_events_gestion_3.txt")
+    assert run.report_path.with_suffix(".prof").exists()
+    assert "Commande : events/gestion 3" in report
+    assert "SQL : 0 requête(s)" not in report
+    assert "% du temps total" in report
+    assert "Fonctions les plus coûteuses" in report and "function calls" in report
+    assert "Allocations par ligne" in report
+    assert not tracemalloc.is_tracing()
+
+
+def test_input_wait_is_excluded(tmp_path):
+    """L'attente d'une saisie n'entre ni dans la durée de la commande ni dans le profil CPU"""
+    profiler = CommandProfiler(enabled=True, directory=tmp_path)
+    console = Mock()
+    console.input.side_effect = lambda prompt: time.sleep(0.2) or "réponse"
+    inputs = InteractiveInput(console=console)
+
+    with profiler.profile("clients-commercial-2") as run:
+        assert inputs.text("Nom : ") == "réponse"
+
+    report = run.report_path.read_text(encoding="utf-8")
+    assert run.input_seconds >= 0.2
+    duration = float(report.split("Durée totale : ")[1].split(" s")[0])
+    assert duration < 0.2
+    assert "attente des saisies exclue" in report
+    assert "sleep" not in report
+
+
+def test_report_written_when_command_fails(tmp_path):
+    profiler = CommandProfiler(enabled=True, directory=tmp_path)
+
+    with pytest.raises(ValueError):
+        with profiler.profile("direct-create_client") as run:
+            raise ValueError("échec")
+
+    assert run.report_path.exists()
+
+
+def test_router_profiles_each_command(tmp_path):
+    """Chaque commande du menu produit son rapport, dont le chemin est affiché"""
+    context = AppContext(console=Mock(), profiler=CommandProfiler(enabled=True, directory=tmp_path))
+    with patch('app.services.command_router.UserCommands'), \
+            patch('app.services.command_router.ContractCommands'), \
+            patch('app.services.command_router.ClientCommands'), \
+            patch('app.services.command_router.EventCommands'), \
+            patch('app.services.command_router.db_manager'):
+        router = CommandRouter(current_user=Mock(id=1), context=context)
+        router.execute("users", "gestion", "4")
+        router.execute_direct_action("create_client")
+
+    reports = sorted(path.name.split("_", 1)[1] for path in tmp_path.glob("*.txt"))
+    assert reports == ["direct-create_client.txt", "users-gestion-4.txt"]
+    assert "Profil de la commande enregistré" in context.console.print.call_args[0][0]
@@ -0,0 +1,126 @@
+import pytest
+from datetime import date, datetime
+from app.models.client import Client
+from app.models.contract import Contract
+from app.models.department import Department
+from app.models.event import Event
+from app.models.user import User
+from app.services.query_filter import (
+    FilterError, compile_filter, parse_filter, scope_conditions, search
+)
+
+
+def test_parse_filter():
+    """Test analyse : conditions typées et tri"""
+    parsed = parse_filter("contracts", "signed:false remaining>0 created>=2026-01-01 sort:-remaining,id")
+
+    assert parsed.conditions == (
+        ("signed", ":", False),
+        ("remaining", ">", 0.0),
+        ("created", ">=", date(2026, 1, 1)),
+    )
+    assert parsed.sort == (("remaining", True), ("id", False))
+
+
+def test_parse_filter_is_cached():
+    """Test une même expression n'est analysée qu'une fois"""
+    parse_filter.cache_clear()
+    parse_filter("events", "support:null")
+    parse_filter("events", "support:null")
+    assert parse_filter.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("expression", [
+    "password_hash:abc",
+    "remaining>abc",
+    "signed>true",
+    "remaining>null",
+    "sort:-password",
+    "signed",
+    "location:\"Salle",
+    "total:",
+])
+def test_parse_filter_invalid(expression):
+    """Test champs hors liste blanche et valeurs invalides"""
+    with pytest.raises(FilterError):
+        parse_filter("contracts", expression)
+
+
+def test_parse_filter_unknown_table():
+    with pytest.raises(FilterError):
+        parse_filter("departments", "id:1")
+
+
+def test_compile_filter_order():
+    """Test l'ID termine toujours le tri"""
+    where, order_by = compile_filter("contracts", "sort:-total")
+    assert where == []
+    assert [str(clause) for clause in order_by] == ["contracts.total_amount DESC", str(Contract.id)]
+
+
+@pytest.fixture
+def dataset(test_db):
+    Department.create(name="commercial", description="Commercial")
+    Department.create(name="support", description="Support")
+    alice = User.create(name="Alice", mail="alice@test.com", username="alice", password="password123", department="commercial")
+    bob = User.create(name="Bob", mail="bob@test.com", username="bob", password="password123", department="commercial")
+    sam = User.create(name="Sam", mail="sam@test.com", username="sam", password="password123", department="support")
+
+    acme = Client.create(name="Acme Corp", mail="acme@test.com", phone="+33123456789",
+                         company_name="Acme", commercial_contact_id=alice.id, role="commercial")
+    globex = Client.create(name="Globex", mail="globex@test.com", phone="+33123456780",
+                           company_name="Globex", commercial_contact_id=bob.id, role="commercial")
+
+    contracts = []
+    for client, commercial, total, remaining, status, created_at in [
+        (acme, alice, 1000.0, 0.0, "signé", datetime(2026, 1, 10, 15, 30)),
+        (acme, alice, 5000.0, 2500.0, "non signé", datetime(2026, 2, 1)),
+        (globex, bob, 8000.0, 8000.0, "non signé", datetime(2025, 12, 31, 23, 0)),
+    ]:
+        contract = Contract.create(client_id=client.id, commercial_contact_id=commercial.id,
+                                   total_amount=total, remaining_amount=remaining, status=status)
+        contract.update(created_at=created_at)
+        contracts.append(contract)
+
+    event = Event.create(name="Salon", contract_id=contracts[0].id, date_start=datetime(2026, 6, 1, 9),
+                         date_end=datetime(2026, 6, 1, 18), location="Salle A", attendees=50)
+    Event.create(name="Gala", contract_id=contracts[0].id, date_start=datetime(2026, 7, 1, 9),
+                 date_end=datetime(2026, 7, 1, 18), location="Salle B", attendees=200,
+                 support_contact_id=sam.id)
+    return {"alice": alice, "bob": bob, "sam": sam, "contracts": contracts, "event": event}
+
+
+def ids(rows):
+    return [row.id for row in rows]
+
+
+def test_search_contracts(dataset):
+    """Test filtres combinés, tri et dates sans heure (journée entière)"""
+    contracts = dataset["contracts"]
+
+    assert ids(search("contracts", "signed:false remaining>0 sort:-remaining")) == [contracts[2].id, contracts[1].id]
+    assert ids(search("contracts", "created>=2026-01-01")) == [contracts[0].id, contracts[1].id]
+    assert ids(search("contracts", "created:2026-01-10")) == [contracts[0].id]
+    assert ids(search("contracts", "created<=2025-12-31")) == [contracts[2].id]
+    assert ids(search("contracts", "")) == ids(contracts)
+
+    # Les relations affichées sont chargées avec la page
+    assert search("contracts", "id:%d" % contracts[2].id)[0].client.name == "Globex"
+
+
+def test_search_scoped(dataset):
+    """Test restrictions d'accès ajoutées par l'appelant"""
+    alice = dataset["alice"]
+    scope = scope_conditions("contracts", alice.id, "commercial")
+
+    assert ids(search("contracts", "total>=5000", *scope)) == [dataset["contracts"][1].id]
+    assert scope_conditions("contracts", alice.id, "gestion") == []
+
+
+def test_search_text_and_null(dataset):
+    """Test préfixe insensible à la casse et valeur null"""
+    assert [client.name for client in search("clients", "name:acme")] == ["Acme Corp"]
+    assert [client.name for client in search("clients", "name=acme")] == []
+    assert ids(search("events", "support:null")) == [dataset["event"].id]
+    assert [event.name for event in search("events", 'location:"salle b"')] == ["Gala"]
+    assert [user.name for user in search("users", "username!=alice sort:-name")] == ["Sam", "Bob"]
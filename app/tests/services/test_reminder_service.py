@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from app.database.db import db_manager
+from app.models import Client, Contract, Department, Event, OutboxMessage, User
+from app.services.reminder_service import ReminderScheduler, drain_outbox, time_left_label
+
+
+NOW = datetime(2030, 1, 1, 12, 0)
+
+
+def setup_contract():
+    Department.create(name="commercial")
+    commercial = User.create(name="Com", mail="com@test.com", username="com", password="password123", department="commercial")
+    client = Client.create("commercial", name="Client", mail="client@test.com", commercial_contact_id=commercial.id)
+    return Contract.create(client_id=client.id, commercial_contact_id=commercial.id, total_amount=100, remaining_amount=0, status="signé")
+
+
+def create_event(contract, date_start, name="Salon"):
+    return Event.create(
+        name=name,
+        contract_id=contract.id,
+        date_start=date_start,
+        date_end=date_start + timedelta(hours=4),
+        location="Paris",
+        attendees=10
+    )
+
+
+def pending_subjects():
+    return sorted(message.subject for message in OutboxMessage.get_pending())
+
+
+def pending_kinds():
+    return sorted((message.event_id, message.kind) for message in OutboxMessage.get_pending())
+
+
+def test_reminders_fire_at_due_time(test_db):
+    """Le rappel 7 jours puis le rappel 24 heures sont écrits à leur échéance"""
+    contract = setup_contract()
+    event = create_event(contract, NOW + timedelta(days=8))
+    scheduler = ReminderScheduler()
+
+    assert scheduler.tick(NOW) == 0
+    assert scheduler.tick(NOW + timedelta(days=1, minutes=1)) == 1
+    assert pending_kinds() == [(event.id, "7d")]
+
+    assert scheduler.tick(NOW + timedelta(days=7, minutes=1)) == 1
+    assert pending_kinds() == [(event.id, "24h"), (event.id, "7d")]
+    assert pending_subjects() == ["Rappel : Salon dans 24 heures", "Rappel : Salon dans 7 jours"]
+
+
+def test_only_lookahead_window_is_loaded(test_db):
+    """Les événements lointains ne sont pas chargés en mémoire"""
+    contract = setup_contract()
+    create_event(contract, NOW + timedelta(days=30))
+    create_event(contract, NOW + timedelta(days=7, minutes=30), name="Proche")
+    scheduler = ReminderScheduler(lookahead=timedelta(hours=1))
+
+    scheduler.tick(NOW)
+
+    assert len(scheduler) == 1
+
+
+def test_missed_reminders_are_sent_at_startup(test_db):
+    """Un événement dans 3 jours reçoit son rappel 7 jours dès le démarrage"""
+    contract = setup_contract()
+    event = create_event(contract, NOW + timedelta(days=3))
+
+    assert ReminderScheduler().tick(NOW) == 1
+    assert pending_kinds() == [(event.id, "7d")]
+    # Rappel rattrapé : le sujet annonce le délai réel, pas « dans 7 jours »
+    assert pending_subjects() == ["Rappel : Salon dans 3 jours"]
+
+
+def test_time_left_label():
+    assert time_left_label(timedelta(days=6, hours=23, minutes=59)) == "dans 7 jours"
+    assert time_left_label(timedelta(hours=30)) == "dans 30 heures"
+    assert time_left_label(timedelta(minutes=61)) == "dans 1 heure"
+    assert time_left_label(timedelta(minutes=20)) == "dans 20 minutes"
+    assert time_left_label(timedelta(seconds=10)) == "dans 1 minute"
+
+
+def test_restart_does_not_duplicate(test_db):
+    """La boîte d'envoi ignore un rappel déjà inscrit"""
+    contract = setup_contract()
+    create_event(contract, NOW + timedelta(days=3))
+
+    ReminderScheduler().tick(NOW)
+    assert ReminderScheduler().tick(NOW) == 0
+    assert len(OutboxMessage.get_pending()) == 1
+
+
+def test_rescheduled_event_is_picked_up(test_db):
+    """Un événement créé après le chargement de sa tranche est repris via last_updated_at"""
+    contract = setup_contract()
+    scheduler = ReminderScheduler()
+    scheduler.tick(datetime.now() - timedelta(minutes=1))
+
+    create_event(contract, datetime.now() + timedelta(days=2))
+
+    assert scheduler.tick(datetime.now()) == 1
+
+
+def test_deleted_event_is_skipped(test_db):
+    """Aucun rappel pour un événement supprimé entre-temps"""
+    contract = setup_contract()
+    event = create_event(contract, NOW + timedelta(days=7, minutes=30))
+    scheduler = ReminderScheduler()
+    scheduler.tick(NOW)
+
+    session = db_manager.get_session()
+    session.query(Event).filter(Event.id == event.id).delete()
+    session.commit()
+    session.close()
+
+    assert scheduler.tick(NOW + timedelta(hours=1)) == 0
+
+
+def test_drain_outbox_marks_sent(test_db):
+    """Le relais transmet les messages puis les marque comme envoyés"""
+    contract = setup_contract()
+    create_event(contract, NOW + timedelta(days=3))
+    create_event(contract, NOW + timedelta(hours=12), name="Demain")
+    ReminderScheduler().tick(NOW)
+
+    sent = []
+    assert drain_outbox(sent.append, batch_size=2) == 3
+    assert {message.kind for message in sent} == {"7d", "24h"}
+    assert OutboxMessage.get_pending() == []
+
+
+def test_drain_outbox_keeps_failed_messages(test_db):
+    """Un échec d'envoi laisse le message en attente"""
+    contract = setup_contract()
+    create_event(contract, NOW + timedelta(days=3))
+    ReminderScheduler().tick(NOW)
+
+    def failing_send(message):
+        raise ConnectionError("relais indisponible")
+
+    assert drain_outbox(failing_send) == 0
+    assert len(OutboxMessage.get_pending()) == 1
@@ -0,0 +1,63 @@
+import pytest # noqa
+from unittest.mock import Mock
+from app.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_or_load_hit_and_miss():
+    """Test lecture traversante avec compteurs"""
+    cache = TTLCache(ttl=10, clock=FakeClock())
+    loader = Mock(return_value="valeur")
+
+    assert cache.get_or_load("clé", loader) == "valeur"
+    assert cache.get_or_load("clé", loader) == "valeur"
+
+    loader.assert_called_once()
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "ttl": 10}
+
+
+def test_entry_expires_after_ttl():
+    """Test expiration d'une entrée"""
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    loader = Mock(side_effect=["ancienne", "nouvelle"])
+
+    cache.get_or_load("clé", loader)
+    clock.now = 11
+    assert cache.get_or_load("clé", loader) == "nouvelle"
+    assert loader.call_count == 2
+
+
+def test_invalidate_during_load_is_not_overwritten():
+    """Une valeur chargée pendant une invalidation est retournée sans être mise en cache"""
+    cache = TTLCache(ttl=10, clock=FakeClock())
+
+    def stale_loader():
+        cache.invalidate("clé")
+        return "ancienne"
+
+    assert cache.get_or_load("clé", stale_loader) == "ancienne"
+    assert cache.get_or_load("clé", lambda: "nouvelle") == "nouvelle"
+    assert cache.get_or_load("clé", lambda: "autre") == "nouvelle"
+
+
+def test_invalidate():
+    """Test invalidation d'une clé puis de tout le cache"""
+    cache = TTLCache(ttl=10, clock=FakeClock())
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+
+    cache.invalidate("a")
+    assert cache.stats()["size"] == 1
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
+
+    cache.reset_stats()
+    assert cache.stats()["misses"] == 0
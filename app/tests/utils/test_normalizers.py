@@ -0,0 +1,38 @@
+from app.utils.normalizers import normalize_company, normalize_email, normalize_phone
+from app.utils.similarity import client_similarity, DUPLICATE_THRESHOLD
+
+
+def test_normalize_email():
+    assert normalize_email("  Jean.Dupont+salon@Exemple.FR ") == "jean.dupont@exemple.fr"
+    assert normalize_email("invalide") is None
+    assert normalize_email(None) is None
+
+
+def test_normalize_phone_e164():
+    """Formats national, international et 00 donnent la même clé"""
+    assert normalize_phone("06 12 34 56 78") == "+33612345678"
+    assert normalize_phone("+33 6.12.34.56.78") == "+33612345678"
+    assert normalize_phone("0033 (6) 12-34-56-78") == "+33612345678"
+    assert normalize_phone("abc") is None
+    assert normalize_phone("") is None
+
+
+def test_normalize_company():
+    """Casse, accents, ponctuation, forme juridique et ordre des mots ignorés"""
+    assert normalize_company("Événements Dupont SARL") == normalize_company("dupont, evenements")
+    assert normalize_company("SAS") is None
+
+
+def test_similarity_typo_is_duplicate():
+    a = {"name": "Jean Dupont", "mail": "jean.dupont@exemple.fr", "phone": "0612345678", "company_name": "Dupont SAS"}
+    b = {"name": "Jean Dupond", "mail": "jean.dupond@exemple.fr", "phone": "+33 6 12 34 56 78", "company_name": "DUPONT"}
+
+    assert client_similarity(a, b) >= DUPLICATE_THRESHOLD
+
+
+def test_similarity_different_clients():
+    a = {"name": "Jean Dupont", "mail": "jean@exemple.fr", "company_name": "Dupont"}
+    b = {"name": "Marie Curie", "mail": "marie@radium.fr", "company_name": "Radium"}
+
+    assert client_similarity(a, b) < DUPLICATE_THRESHOLD
+    assert client_similarity({}, {}) == 0.0
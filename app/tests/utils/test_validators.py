@@ -0,0 +1,68 @@
+import pytest
+from app.utils.validators import normalize_tel, validate_email, validate_records, validate_tel
+
+
+def test_validate_email():
+    validate_email("jean@exemple.fr")
+    with pytest.raises(ValueError):
+        validate_email("jean@exemple")
+    with pytest.raises(ValueError):
+        validate_email(None)
+
+
+def test_validate_tel():
+    validate_tel("+33 6 12 34 56 78")
+    with pytest.raises(ValueError):
+        validate_tel("12345")
+
+
+def test_normalize_tel_e164():
+    assert normalize_tel("06.12.34.56.78") == "+33612345678"
+    assert normalize_tel("0033 6 12 34 56 78") == "+33612345678"
+    assert normalize_tel("+1 (415) 555-2671") == "+14155552671"
+    assert normalize_tel("+33 (0)6 12 34 56 78") == "+33612345678"
+    assert normalize_tel("0033 (0)6 12 34 56 78") == "+33612345678"
+    assert normalize_tel(33612345678) == "+33612345678"
+    with pytest.raises(ValueError):
+        normalize_tel("pas un numéro")
+
+
+def test_validate_records_collects_all_errors():
+    """Toutes les erreurs de chaque ligne sont retournées, les lignes valides sont nettoyées"""
+    records = [
+        {"name": " Jean ", "mail": "jean@exemple.fr", "phone": "06 12 34 56 78"},
+        {"name": "", "mail": "invalide", "phone": "123"},
+        {"name": "Marie", "mail": "marie@exemple.fr", "phone": ""},
+    ]
+
+    result = validate_records(records)
+
+    assert result["valid"] == [
+        (0, {"name": "Jean", "mail": "jean@exemple.fr", "phone": "+33612345678"}),
+        (2, {"name": "Marie", "mail": "marie@exemple.fr", "phone": ""}),
+    ]
+    assert set(result["errors"][1]) == {"name", "mail", "phone"}
+
+
+def test_validate_records_non_string_values():
+    """Les valeurs non textuelles sont des erreurs de la ligne, pas des exceptions"""
+    records = [
+        {"name": "Jean", "mail": 42, "phone": None},
+        {"name": "Marie", "mail": "marie@exemple.fr", "phone": 33612345678},
+        {"name": "Paul", "mail": "paul@exemple.fr", "phone": ["06 12 34 56 78"]},
+    ]
+
+    result = validate_records(records)
+
+    assert result["valid"] == [(1, {"name": "Marie", "mail": "marie@exemple.fr", "phone": "+33612345678"})]
+    assert set(result["errors"][0]) == {"mail"}
+    assert set(result["errors"][2]) == {"phone"}
+
+
+def test_validate_records_large_batch():
+    records = [{"name": f"Client {index}", "mail": f"c{index}@exemple.fr"} for index in range(5000)]
+
+    result = validate_records(records)
+
+    assert len(result["valid"]) == 5000
+    assert result["errors"] == {}
@@ -1,16 +1,17 @@
 import pytest # noqa
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from app.views.client import ClientView
+from app.views.inputs import QueueInput
 
 
 class TestClientView:
     def setup_method(self):
-        self.client_view = ClientView()
-        self.client_view.console = Mock()
+        self.inputs = QueueInput()
+        self.client_view = ClientView(console=Mock(), inputs=self.inputs)
 
     def test_get_client_creation_form(self):
         """Test formulaire création client"""
-        self.client_view.console.input.side_effect = ["Test Client", "test@test.com", "+33123456789", "Test Corp"]
+        self.inputs.feed("Test Client", "test@test.com", "+33123456789", "Test Corp")
         result = self.client_view.get_client_creation_form()
 
         assert result == {
@@ -42,19 +43,18 @@ class TestClientView:
 
     def test_get_id_client(self):
         """Test récupération ID client"""
-        self.client_view.console.input.return_value = " 123 "
+        self.inputs.feed(" 123 ")
         result = self.client_view.get_id_client()
         assert result == "123"
 
-    @patch('app.views.client.Prompt')
-    def test_get_client_update_form(self, mock_prompt):
+    def test_get_client_update_form(self):
         """Test formulaire mise à jour"""
         mock_client = Mock()
         mock_client.name = "Old Name"
         mock_client.mail = "old@test.com"
         mock_client.phone = "+33987654321"
         mock_client.company_name = "Old Corp"
-        mock_prompt.ask.side_effect = ["New Name", "new@test.com", "+33111111111", "New Corp"]
+        self.inputs.feed("New Name", "new@test.com", "+33111111111", "New Corp")
 
         result = self.client_view.get_client_update_form(mock_client)
         assert result == {
@@ -66,6 +66,6 @@ class TestClientView:
 
     def test_research_client(self):
         """Test recherche client"""
-        self.client_view.console.input.return_value = " Test Search "
+        self.inputs.feed(" Test Search ")
         result = self.client_view.research_client()
         assert result == "Test Search"
@@ -2,19 +2,23 @@ import pytest # noqa
 from unittest.mock import Mock, patch
 from datetime import datetime
 from app.views.contract import ContractView
+from app.views.inputs import QueueInput
 
 
 class TestContractView:
     def setup_method(self):
-        self.contract_view = ContractView()
-        self.contract_view.console = Mock()
+        self.inputs = QueueInput()
+        self.contract_view = ContractView(console=Mock(), inputs=self.inputs)
 
-    @patch('app.views.contract.ClientCommands')
-    @patch('app.views.contract.Prompt')
-    def test_get_contract_creation_form(self, mock_prompt, mock_client_commands):
+    @patch('app.views.contract.Client')
+    def test_get_contract_creation_form(self, mock_client):
         """Test formulaire création contrat"""
-        mock_prompt.ask.side_effect = ["1", "1000", "500", "signé"]
-        result = self.contract_view.get_contract_creation_form()
+        mock_match = Mock(id=1, company_name="Test Corp", mail="client@test.com")
+        mock_match.name = "Test Client"
+        mock_client.has_any.return_value = True
+        mock_client.search_by_prefix.return_value = [mock_match]
+        self.inputs.feed("tes", "1000", "500", "signé")
+        result = self.contract_view.get_contract_creation_form(3, "gestion")
 
         assert result == {
             'client_id': "1",
@@ -22,28 +26,74 @@ class TestContractView:
             'remaining_amount': "500",
             'status': "signé"
         }
+        mock_client.search_by_prefix.assert_called_once_with("tes", 3, "gestion", limit=ContractView.PICKER_LIMIT)
+        mock_client.get_all.assert_not_called()
+
+    @patch('app.views.contract.Client')
+    def test_get_contract_creation_form_no_client(self, mock_client):
+        """Test formulaire création contrat sans client existant"""
+        mock_client.has_any.return_value = False
+        result = self.contract_view.get_contract_creation_form(3, "gestion")
+
+        assert result is None
+        mock_client.search_by_prefix.assert_not_called()
+
+    @patch('app.views.contract.Client')
+    def test_pick_client_multiple_matches(self, mock_client):
+        """Test sélection parmi plusieurs correspondances après une recherche vide"""
+        first = Mock(id=1, company_name="Corp", mail="dupont@test.com")
+        second = Mock(id=2, company_name=None, mail="durand@test.com")
+        first.name, second.name = "Dupont", "Durand"
+        mock_client.search_by_prefix.side_effect = [[], [first, second]]
+        self.inputs.feed("zz", "du", "2")
+
+        result = self.contract_view.pick_client(3, "commercial")
+
+        assert result == "2"
+        assert mock_client.search_by_prefix.call_count == 2
+
+    @patch('app.views.contract.Client')
+    def test_pick_client_cancel(self, mock_client):
+        """Test une saisie vide ou "q" annule la sélection au lieu de boucler"""
+        first = Mock(id=1, company_name="Corp", mail="dupont@test.com")
+        second = Mock(id=2, company_name=None, mail="durand@test.com")
+        first.name, second.name = "Dupont", "Durand"
+        mock_client.search_by_prefix.return_value = [first, second]
+        self.inputs.feed("", "Q", "du", "q")
+
+        assert self.contract_view.pick_client(3, "commercial") is None
+        assert self.contract_view.pick_client(3, "commercial") is None
+        assert self.contract_view.pick_client(3, "commercial") is None
+        mock_client.search_by_prefix.assert_called_once_with("du", 3, "commercial", limit=ContractView.PICKER_LIMIT)
+
+    @patch('app.views.contract.Client')
+    def test_get_contract_creation_form_client_cancelled(self, mock_client):
+        """Test annuler la sélection du client annule la création"""
+        mock_client.has_any.return_value = True
+        self.inputs.feed("q")
+
+        assert self.contract_view.get_contract_creation_form(3, "gestion") is None
 
     def test_get_contract_id_valid(self):
         """Test récupération ID contrat valide"""
-        self.contract_view.console.input.return_value = " 123 "
+        self.inputs.feed(" 123 ")
         result = self.contract_view.get_contract_id()
         assert result == 123
 
     def test_get_contract_id_invalid(self):
         """Test récupération ID contrat invalide"""
-        self.contract_view.console.input.return_value = "abc"
+        self.inputs.feed("abc")
         result = self.contract_view.get_contract_id()
         assert result is None
 
-    @patch('app.views.contract.Prompt')
-    def test_get_contract_update_form(self, mock_prompt):
+    def test_get_contract_update_form(self):
         """Test formulaire mise à jour"""
         mock_contract = Mock()
         mock_contract.id = 1
         mock_contract.total_amount = 1000
         mock_contract.remaining_amount = 500
         mock_contract.is_signed = True
-        mock_prompt.ask.side_effect = ["2000", "1000", "non signé"]
+        self.inputs.feed("2000", "1000", "non signé")
         result = self.contract_view.get_contract_update_form(mock_contract)
 
         assert result == {
@@ -61,8 +111,8 @@ class TestContractView:
         """Test affichage contrats avec données"""
         mock_contract = Mock()
         mock_contract.id = 1
-        mock_contract.client.name = "Test Client"
-        mock_contract.commercial_contact.name = "Test Commercial"
+        mock_contract.client_name = "Test Client"
+        mock_contract.commercial_name = "Test Commercial"
         mock_contract.total_amount = 1000
         mock_contract.remaining_amount = 500
         mock_contract.is_signed = True
@@ -74,50 +124,102 @@ class TestContractView:
 
     def test_research_contract(self):
         """Test recherche contrat"""
-        self.contract_view.console.input.return_value = " 123 "
+        self.inputs.feed(" 123 ")
         result = self.contract_view.research_contract()
         assert result == "123"
 
     def test_get_date_filter_valid(self):
         """Test filtre date valide"""
-        self.contract_view.console.input.return_value = "01-01-2024"
+        self.inputs.feed("01-01-2024")
         result = self.contract_view.get_date_filter()
         assert result == datetime(2024, 1, 1)
 
     def test_get_date_filter_invalid(self):
         """Test filtre date invalide"""
-        self.contract_view.console.input.return_value = "invalid"
+        self.inputs.feed("invalid")
         result = self.contract_view.get_date_filter()
         assert result is None
 
     def test_get_amount_filter_valid(self):
         """Test filtre montant valide"""
-        self.contract_view.console.input.return_value = " 1000.50 "
+        self.inputs.feed(" 1000.50 ")
         result = self.contract_view.get_amount_filter()
         assert result == 1000.50
 
     def test_get_amount_filter_invalid(self):
         """Test filtre montant invalide"""
-        self.contract_view.console.input.return_value = "abc"
+        self.inputs.feed("abc")
         result = self.contract_view.get_amount_filter()
         assert result is None
 
-    @patch('app.views.contract.UserCommands')
-    @patch('app.views.contract.Prompt')
-    def test_get_commercial_id(self, mock_prompt, mock_user_commands):
+    def test_get_filters_optional_empty(self):
+        """Test saisie vide ignorée pour un critère optionnel"""
+        self.inputs.feed("  ", "  ")
+        assert self.contract_view.get_date_filter("Date : ", optional=True) is None
+        assert self.contract_view.get_amount_filter("Montant : ", optional=True) is None
+        self.contract_view.console.print.assert_not_called()
+
+    def test_get_contract_filter_form(self):
+        """Test formulaire de filtres combinés"""
+        self.inputs.feed("01-01-2024", "31-01-2024", "1000", "", "0.01", "", "signé", "non")
+
+        result = self.contract_view.get_contract_filter_form(3, "commercial")
+
+        assert result == {
+            "created_from": datetime(2024, 1, 1),
+            "created_until": datetime(2024, 2, 1),
+            "min_total": 1000.0,
+            "min_remaining": 0.01,
+            "is_signed": True
+        }
+
+    def test_get_contract_filter_form_invalid_values_asked_again(self):
+        """Test une date ou un montant invalide est signalé puis redemandé au lieu d'être ignoré"""
+        self.inputs.feed("31/01/2024", "31-01-2024", "", "mille", "1000", "", "", "", "", "non")
+
+        result = self.contract_view.get_contract_filter_form(3, "commercial")
+
+        assert result == {"created_from": datetime(2024, 1, 31), "min_total": 1000.0}
+        printed = [call.args[0] for call in self.contract_view.console.print.call_args_list]
+        assert "[red]Format de date invalide. Utilisez DD-MM-YYYY[/red]" in printed
+        assert "[red]Montant invalide. Veuillez entrer un nombre.[/red]" in printed
+
+    def test_get_contract_filter_form_client_cancelled(self):
+        """Test annuler la sélection du client annule le filtrage"""
+        self.inputs.feed("", "", "", "", "", "", "", "oui")
+        self.contract_view.pick_client = Mock(return_value=None)
+
+        assert self.contract_view.get_contract_filter_form(3, "commercial") is None
+
+    def test_get_contract_filter_form_with_client(self):
+        """Test formulaire de filtres avec sélection d'un client"""
+        # Critères vides, statut par défaut (tous), puis filtre sur un client
+        self.inputs.feed("", "", "", "", "", "", "", "oui")
+        self.contract_view.pick_client = Mock(return_value="7")
+
+        result = self.contract_view.get_contract_filter_form(3, "commercial")
+
+        assert result == {"client_id": 7}
+        self.contract_view.pick_client.assert_called_once_with(3, "commercial")
+
+    @patch('app.views.contract.User')
+    def test_get_commercial_id(self, mock_user):
         """Test récupération ID commercial"""
-        mock_prompt.ask.return_value = "5"
+        commercial = Mock(id=5)
+        commercial.name = "Commercial"
+        mock_user.get_by_department.return_value = [commercial]
+        self.inputs.feed("5")
         result = self.contract_view.get_commercial_id()
 
         assert result == "5"
-        mock_user_commands.assert_called_once()
+        mock_user.get_by_department.assert_called_once_with("commercial")
 
     def test_display_contract_list_unsigned(self):
         """Test affichage contrat non signé"""
         mock_contract = Mock()
         mock_contract.id = 1
-        mock_contract.client.name = "Test Client"
-        mock_contract.commercial_contact.name = "Test Commercial"
+        mock_contract.client_name = "Test Client"
+        mock_contract.commercial_name = "Test Commercial"
         mock_contract.total_amount = 1000
         mock_contract.remaining_amount = 500
         mock_contract.is_signed = False  # ← Non signé pour tester l'else
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import Mock, patch
+from app.views.inputs import EndOfInput, InteractiveInput, QueueInput, ScriptedInput
+
+
+def test_queue_answers_in_order():
+    inputs = QueueInput(["Acme", "", "oui", 42])
+
+    assert inputs.text("Nom : ") == "Acme"
+    assert inputs.ask("Statut", choices=["tous", "signé"], default="tous") == "tous"
+    assert inputs.confirm("Continuer ?") is True
+    assert inputs.secret("Mot de passe : ") == "42"
+    assert inputs.prompts == ["Nom : ", "Statut", "Continuer ?", "Mot de passe : "]
+
+
+def test_queue_rejects_invalid_answers():
+    """Un script invalide échoue au lieu de boucler"""
+    with pytest.raises(ValueError):
+        QueueInput(["autre"]).ask("Statut", choices=["tous", "signé"])
+    with pytest.raises(ValueError):
+        QueueInput(["peut-être"]).confirm("Continuer ?")
+
+
+def test_queue_exhausted_ends_session():
+    """La fin du script n'est pas interceptée par les except Exception des menus"""
+    inputs = QueueInput()
+    with pytest.raises(EndOfInput):
+        inputs.text("Choix : ")
+    assert not issubclass(EndOfInput, Exception)
+
+
+def test_scripted_input_reads_file(tmp_path):
+    """Une réponse par ligne, ligne vide = Entrée, commentaires ignorés"""
+    script = tmp_path / "parcours.txt"
+    script.write_text("# Connexion\nalice\n\n# Menu\n1\n", encoding="utf-8")
+
+    inputs = ScriptedInput(script)
+
+    assert [inputs.text("?"), inputs.ask("?", default="x"), inputs.text("?")] == ["alice", "x", "1"]
+
+
+def test_interactive_input_uses_console():
+    console = Mock()
+    console.input.return_value = "1"
+    inputs = InteractiveInput(console)
+
+    assert inputs.text("Choix : ") == "1"
+    with patch('app.views.inputs.Prompt.ask', return_value="signé") as mock_ask:
+        assert inputs.ask("Statut", choices=["signé"]) == "signé"
+    assert mock_ask.call_args.kwargs["console"] is console
@@ -1,5 +1,8 @@
 import pytest # noqa
+from io import StringIO
 from unittest.mock import Mock, patch
+from rich.console import Console
+from app.views.inputs import QueueInput
 from app.views.menu import MenuManager, Menu, Submenu
 
 
@@ -10,13 +13,31 @@ class TestMenuManager:
 
     def test_display(self):
         """Test affichage menu"""
+        console = Console(file=StringIO(), width=60)
+        self.menu_manager.console = console
         self.menu_manager.items = [{"option": "1", "title": "Test Option"}]
         self.menu_manager.display()
-        self.menu_manager.console.print.assert_called()
+        assert "Test Option" in console.file.getvalue()
+
+    def test_display_uses_render_cache(self):
+        """Test le rendu du menu n'est calculé qu'une seule fois"""
+        console = Console(file=StringIO(), width=60)
+        self.menu_manager.console = console
+        self.menu_manager.items = [{"option": "9", "title": "Option en cache"}]
+
+        with patch.object(MenuManager, '_build_table', wraps=self.menu_manager._build_table) as mock_build:
+            self.menu_manager.display()
+            # Une autre instance partage le même cache
+            other = MenuManager(console=console)
+            other.items = self.menu_manager.items
+            other.display()
+
+        mock_build.assert_called_once()
+        assert console.file.getvalue().count("Option en cache") == 2
 
     def test_get_choice(self):
         """Test récupération choix"""
-        self.menu_manager.console.input.return_value = "1"
+        self.menu_manager.inputs = QueueInput(["1"])
         result = self.menu_manager.get_choice()
         assert result == "1"
 
@@ -0,0 +1,60 @@
+import pytest # noqa
+from unittest.mock import Mock
+from rich.text import Text
+from app.views.pager import TablePager
+
+
+class TestTablePager:
+    def setup_method(self):
+        self.console = Mock()
+        self.pager = TablePager(
+            self.console,
+            "Test",
+            [("ID", {}), ("Nom", {})],
+            lambda item: [str(item), f"Nom {item}"],
+            page_size=10
+        )
+
+    def test_single_page_no_prompt(self):
+        """Test une seule page : pas de navigation"""
+        self.pager.display(list(range(5)))
+        self.console.print.assert_called_once()
+        self.console.input.assert_not_called()
+
+    def test_navigation_next_prev_jump_quit(self):
+        """Test navigation suivante, précédente, saut et sortie"""
+        rows = Mock()
+        rows.__len__ = Mock(return_value=35)
+        rows.__getitem__ = Mock(side_effect=lambda s: list(range(35))[s])
+        self.console.input.side_effect = ["n", "p", "4", "x", "q"]
+
+        self.pager.display(rows)
+
+        # 1 échantillon + 4 pages affichées (1, 2, 1, 4)
+        fetched = [call.args[0] for call in rows.__getitem__.call_args_list]
+        assert fetched[1:] == [slice(0, 10), slice(10, 20), slice(0, 10), slice(30, 40)]
+        assert self.console.input.call_count == 5
+
+    def test_enter_on_last_page_exits(self):
+        """Test Entrée sur la dernière page termine l'affichage"""
+        self.console.input.side_effect = ["", ""]
+        self.pager.display(list(range(15)))
+        assert self.console.input.call_count == 2
+
+    def test_widths_from_sample_are_capped(self):
+        """Test largeurs calculées sur l'échantillon et plafonnées"""
+        pager = TablePager(self.console, "Test", [("ID", {}), ("Nom", {})], lambda item: ["1", item])
+        widths = pager._measure_widths([Text.from_markup("[green]abc[/green]"), "x" * 100])
+        assert widths == [2, TablePager.MAX_COLUMN_WIDTH]
+
+    def test_data_cells_are_not_markup(self):
+        """Test des crochets dans les données sont affichés tels quels, le style des Text est conservé"""
+        pager = TablePager(self.console, "Test", [("Nom", {}), ("Statut", {})],
+                           lambda item: [item, Text("Signé", style="green")])
+
+        table = pager._build_table(["[bold]Dupont[/] [red]"], [30, 10], 0, 1, 1)
+
+        name, status = (column._cells[0] for column in table.columns)
+        assert name.plain == "[bold]Dupont[/] [red]"
+        assert name.spans == []
+        assert status.plain == "Signé" and str(status.style) == "green"
@@ -1,19 +1,17 @@
 import pytest # noqa
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
+from app.views.inputs import QueueInput
 from app.views.user import userView
 
 
 class TestUserView:
     def setup_method(self):
-        self.user_view = userView()
-        self.user_view.console = Mock()
+        self.inputs = QueueInput()
+        self.user_view = userView(console=Mock(), inputs=self.inputs)
 
-    @patch('app.views.user.Prompt')
-    def test_get_user_creation_form(self, mock_prompt):
+    def test_get_user_creation_form(self):
         """Test formulaire création utilisateur"""
-        mock_prompt.ask.side_effect = [
-            "John Doe", "john@test.com", "johndoe", "password123", "commercial"
-        ]
+        self.inputs.feed("John Doe", "john@test.com", "johndoe", "password123", "commercial")
 
         result = self.user_view.get_user_creation_form()
 
@@ -22,15 +20,13 @@ class TestUserView:
             'password': "password123", 'department': "commercial"
         }
 
-    @patch('app.views.user.Prompt')
-    def test_get_user_id(self, mock_prompt):
+    def test_get_user_id(self):
         """Test récupération ID utilisateur"""
-        mock_prompt.ask.return_value = "123"
+        self.inputs.feed("123")
         result = self.user_view.get_user_id()
         assert result == 123
 
-    @patch('app.views.user.Prompt')
-    def test_get_user_update_form(self, mock_prompt):
+    def test_get_user_update_form(self):
         """Test formulaire mise à jour utilisateur"""
         mock_user = Mock()
         mock_user.name = "Old"
@@ -38,7 +34,7 @@ class TestUserView:
         mock_user.username = "old"
         mock_user.department.name = "support"
 
-        mock_prompt.ask.side_effect = ["New", "new@test.com", "new", "gestion"]
+        self.inputs.feed("New", "new@test.com", "new", "gestion")
         result = self.user_view.get_user_update_form(mock_user)
 
         assert result['name'] == "New"
@@ -55,7 +51,7 @@ class TestUserView:
         mock_user.employee_number = "EMP001"
         mock_user.name = "John"
         mock_user.mail = "john@test.com"
-        mock_user.department.name = "commercial"
+        mock_user.department_name = "commercial"
         mock_user.created_at.strftime.return_value = "01/01/2024"
 
         self.user_view.display_user_list([mock_user])
@@ -68,7 +64,7 @@ class TestUserView:
         mock_user.employee_number = "EMP001"
         mock_user.name = "John"
         mock_user.mail = "john@test.com"
-        mock_user.department = None
+        mock_user.department_name = None
         mock_user.created_at = None
 
         self.user_view.display_user_list([mock_user])
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Cache en mémoire avec durée de vie (TTL) pour les données de référence
+
+    Lecture traversante : get_or_load() retourne la valeur en cache si elle est
+    encore valide, sinon appelle le chargeur et mémorise le résultat.
+    Les compteurs de succès / échecs sont exposés via stats().
+    Chaque invalidation incrémente une génération : une valeur chargée pendant
+    une invalidation n'est pas mémorisée (elle peut déjà être périmée).
+    """
+    def __init__(self, ttl=300, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """Retourne la valeur associée à la clé, en la chargeant si besoin"""
+        now = self.clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        # Le chargement se fait hors verrou pour ne pas bloquer les autres lectures
+        value = loader()
+
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Invalide une entrée, ou tout le cache si aucune clé n'est donnée"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def reset_stats(self):
+        """Remet les compteurs à zéro"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Compteurs du cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "ttl": self.ttl
+            }
+
+
+class CommandMemo:
+    """
+    Mémo des résultats d'une commande du menu
+
+    Chaque jeu de données logique (ex : événements sans support) n'est chargé
+    qu'une fois par interaction, même si plusieurs étapes de la commande le
+    demandent. Le routeur le vide à la fin de chaque commande : les données ne
+    survivent pas d'une interaction à l'autre.
+    """
+    def __init__(self):
+        self._results = {}
+
+    def get_or_load(self, key, loader):
+        """Retourne le résultat mémorisé pour la clé, en le chargeant au premier appel"""
+        if key not in self._results:
+            self._results[key] = loader()
+        return self._results[key]
+
+    def clear(self):
+        self._results.clear()
+
+
+# Cache des données de référence (départements, équipe support...)
+reference_cache = TTLCache(ttl=int(os.getenv('REFERENCE_CACHE_TTL', 300)))
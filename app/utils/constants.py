@@ -11,6 +11,7 @@ MENU = {
         {"option": "2", "title": "Gestion des contrats"},
         {"option": "3", "title": "Gestion des événements"},
         {"option": "5", "title": "Consulter tous les clients"},
+        {"option": "6", "title": "Rechercher des clients"},
         {"option": "0", "title": "Se déconnecter"}
     ],
     "commercial": [
@@ -26,6 +27,8 @@ MENU = {
         {"option": "2", "title": "Mettre à jour mes événements"},
         {"option": "3", "title": "Consulter tous les clients"},
         {"option": "4", "title": "Consulter tous les contrats"},
+        {"option": "5", "title": "Synchroniser le mode hors ligne"},
+        {"option": "6", "title": "Rechercher dans mes événements"},
         {"option": "0", "title": "Se déconnecter"}
     ]
 }
@@ -37,12 +40,15 @@ SUBMENUS = {
         {"option": "2", "title": "Modifier un collaborateur"},
         {"option": "3", "title": "Supprimer un collaborateur"},
         {"option": "4", "title": "Lister tous les collaborateurs"},
+        {"option": "5", "title": "Rechercher des collaborateurs"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
     "gestion_contrats": [
         {"option": "1", "title": "Créer un contrat"},
         {"option": "2", "title": "Modifier un contrat"},
         {"option": "3", "title": "Lister tous les contrats"},
+        {"option": "4", "title": "Filtrer les contrats (date, montant, client, statut)"},
+        {"option": "5", "title": "Rechercher des contrats"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
     "gestion_evenements": [
@@ -50,6 +56,7 @@ SUBMENUS = {
         {"option": "2", "title": "Assigner un support à un événement"},
         {"option": "3", "title": "Lister tous les événements"},
         {"option": "4", "title": "Événements sans support assigné"},
+        {"option": "5", "title": "Rechercher des événements"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
     "gestion_filtres_evenements": [
@@ -61,16 +68,19 @@ SUBMENUS = {
     "commercial_mes_clients": [
         {"option": "1", "title": "Lister mes clients"},
         {"option": "2", "title": "Modifier un de mes clients"},
+        {"option": "3", "title": "Rechercher dans mes clients"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
     "commercial_mes_contrats": [
         {"option": "1", "title": "Lister mes contrats"},
         {"option": "2", "title": "Modifier un de mes contrats"},
+        {"option": "3", "title": "Rechercher dans mes contrats"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
     "commercial_filtres_contrats": [
         {"option": "1", "title": "Contrats non signés"},
         {"option": "2", "title": "Contrats non entièrement payés"},
+        {"option": "3", "title": "Filtres combinés (date, montant, client, statut)"},
         {"option": "0", "title": "Retour au menu principal"}
     ],
 }
@@ -94,8 +104,11 @@ DIRECT_ACTIONS = {
     ("commercial", "2"): "create_client",
     ("commercial", "5"): "create_event",
     ("gestion", "5"): "list_all_clients",
+    ("gestion", "6"): "search_clients",
     ("support", "1"): "list_assigned_events",
     ("support", "2"): "update_event",
     ("support", "3"): "list_all_clients",
-    ("support", "4"): "list_all_contracts"
+    ("support", "4"): "list_all_contracts",
+    ("support", "5"): "sync_offline",
+    ("support", "6"): "search_events"
 }
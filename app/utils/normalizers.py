@@ -0,0 +1,55 @@
+import re
+import unicodedata
+from app.utils.validators import DEFAULT_COUNTRY_CODE, normalize_tel
+
+
+# Formes juridiques ignorées pour comparer les noms d'entreprise
+LEGAL_FORMS = {
+    "sa", "sas", "sasu", "sarl", "eurl", "sci", "snc", "scop", "ei",
+    "inc", "ltd", "llc", "gmbh", "plc", "co", "corp", "company", "group", "groupe"
+}
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def strip_accents(value):
+    """Supprime les accents (é -> e)"""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_email(mail):
+    """
+    Clé de comparaison d'un email : minuscules, sans espaces,
+    sans sous-adresse (jean+salon@x.fr -> jean@x.fr)
+    """
+    if not mail or "@" not in mail:
+        return None
+
+    local, _, domain = mail.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    return f"{local}@{domain}" if local and domain else None
+
+
+def normalize_phone(phone, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Numéro au format E.164 (+33612345678), ou None s'il est invalide
+    Même règle que la validation des saisies (normalize_tel)
+    """
+    try:
+        return normalize_tel(phone, country_code)
+    except ValueError:
+        return None
+
+
+def normalize_company(company_name):
+    """
+    Clé de comparaison d'un nom d'entreprise : minuscules, sans accents,
+    sans ponctuation ni forme juridique ("Événements Dupont SARL" -> "dupont evenements")
+    """
+    if not company_name:
+        return None
+
+    words = WORD_PATTERN.findall(strip_accents(company_name.lower()))
+    words = sorted(word for word in words if word not in LEGAL_FORMS)
+    return " ".join(words) or None
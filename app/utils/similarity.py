@@ -0,0 +1,70 @@
+from difflib import SequenceMatcher
+from app.utils.normalizers import normalize_company, normalize_email, normalize_phone, strip_accents
+
+
+# Poids de chaque champ dans le score de similarité entre deux clients
+FIELD_WEIGHTS = {
+    "name": 0.4,
+    "mail": 0.3,
+    "phone": 0.15,
+    "company_name": 0.15
+}
+
+# Score à partir duquel deux clients sont considérés comme de probables doublons
+DUPLICATE_THRESHOLD = 0.75
+
+
+def text_ratio(a, b):
+    """Similarité approximative de deux textes (0 à 1), insensible à la casse et aux accents"""
+    a = strip_accents(a.strip().lower())
+    b = strip_accents(b.strip().lower())
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _field_scores(a, b):
+    """Scores par champ, uniquement pour les champs renseignés des deux côtés"""
+    scores = {}
+
+    if a.get("name") and b.get("name"):
+        scores["name"] = text_ratio(a["name"], b["name"])
+
+    mail_a, mail_b = normalize_email(a.get("mail")), normalize_email(b.get("mail"))
+    if mail_a and mail_b:
+        # Même adresse normalisée, sinon fautes de frappe sur la partie locale d'un même domaine
+        if mail_a == mail_b:
+            scores["mail"] = 1.0
+        else:
+            local_a, _, domain_a = mail_a.partition("@")
+            local_b, _, domain_b = mail_b.partition("@")
+            scores["mail"] = text_ratio(local_a, local_b) * (1.0 if domain_a == domain_b else 0.5)
+
+    phone_a, phone_b = normalize_phone(a.get("phone")), normalize_phone(b.get("phone"))
+    if phone_a and phone_b:
+        scores["phone"] = 1.0 if phone_a == phone_b else 0.0
+
+    company_a, company_b = normalize_company(a.get("company_name")), normalize_company(b.get("company_name"))
+    if company_a and company_b:
+        scores["company_name"] = text_ratio(company_a, company_b)
+
+    return scores
+
+
+def client_similarity(a, b):
+    """
+    Score de similarité (0 à 1) entre deux clients donnés sous forme de dictionnaires
+
+    Moyenne pondérée des champs renseignés des deux côtés. Un email ou un
+    téléphone identique suffit si les noms sont proches (le score vaut alors au
+    moins la similarité des noms).
+    """
+    scores = _field_scores(a, b)
+    total_weight = sum(FIELD_WEIGHTS[field] for field in scores)
+    if not total_weight:
+        return 0.0
+
+    score = sum(FIELD_WEIGHTS[field] * value for field, value in scores.items()) / total_weight
+    if "name" in scores and (scores.get("mail") == 1.0 or scores.get("phone") == 1.0):
+        score = max(score, scores["name"])
+    return score
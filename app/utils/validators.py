@@ -1,16 +1,34 @@
 import re
 
 
+# Expressions compilées une seule fois, au chargement du module
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-().]')
+PHONE_PATTERN = re.compile(r'^\+?[0-9]{10,15}$')
+# Préfixe national noté entre parenthèses après l'indicatif : +33 (0)6 12 34 56 78
+TRUNK_PREFIX = re.compile(r'\(0\)')
+
+# Indicatif utilisé pour les numéros saisis au format national (06 12 34 56 78)
+DEFAULT_COUNTRY_CODE = "33"
+
+
 def validate_email(mail):
     """
     Contrôle si l'email est valide à l'aide d'un regex
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-    if not re.match(pattern, mail):
+    if not isinstance(mail, str) or not EMAIL_PATTERN.match(mail):
         raise ValueError(f"Email invalide: {mail}")
 
 
+def _phone_text(phone):
+    """Numéro sous forme de texte : un nombre (ex : colonne de tableur) est converti, les autres types refusés"""
+    if isinstance(phone, int) and not isinstance(phone, bool):
+        return str(phone)
+    if not isinstance(phone, str):
+        raise ValueError(f"Numéro de téléphone invalide: {phone}")
+    return phone
+
+
 def validate_tel(phone):
     """
     Contrôle si le téléphone est valide à l'aide d'un regex
@@ -18,8 +36,90 @@ def validate_tel(phone):
     Suppression des espaces, tirets, points et parenthèses
     Contrôle que cela commence par un + et si c'est suivi de 10 à 15 chiffres
     """
-    clean_tel = re.sub(r'[\s\-().]', '', phone)
-    pattern = r'^\+?[0-9]{10,15}$'
+    if not phone or not PHONE_PATTERN.match(PHONE_SEPARATORS.sub('', _phone_text(phone))):
+        raise ValueError(f"Numéro de téléphone invalide: {phone}")
+
+
+def normalize_tel(phone, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Valide le téléphone et retourne sa forme canonique E.164 (+33612345678)
+
+    Accepte les formats +33 6.., +33 (0)6.., 0033 6.. et le format national 06..
+    """
+    validate_tel(phone)
+
+    text = _phone_text(phone).strip()
+    if text.startswith(('+', '00')):
+        # Le 0 national entre parenthèses ne se compose pas depuis l'étranger
+        text = TRUNK_PREFIX.sub('', text, count=1)
 
-    if not re.match(pattern, clean_tel):
+    digits = PHONE_SEPARATORS.sub('', text)
+    if digits.startswith('+'):
+        digits = digits[1:]
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = country_code + digits[1:]
+
+    if len(digits) > 15:
         raise ValueError(f"Numéro de téléphone invalide: {phone}")
+    return f"+{digits}"
+
+
+def _required(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        raise ValueError("Champ obligatoire")
+    return value.strip() if isinstance(value, str) else value
+
+
+def _email(value):
+    value = value.strip() if isinstance(value, str) else value
+    validate_email(value)
+    return value
+
+
+# Règles de validation d'un client importé : champ -> (obligatoire, fonction de validation)
+# La fonction retourne la valeur nettoyée ou lève ValueError
+CLIENT_RULES = {
+    "name": (True, _required),
+    "mail": (True, _email),
+    "phone": (False, normalize_tel),
+    "company_name": (False, _required)
+}
+
+
+def validate_records(records, rules=None):
+    """
+    Valide un lot d'enregistrements (ex : import de clients)
+
+    Toutes les erreurs de chaque ligne sont collectées, sans s'arrêter à la première ;
+    une valeur d'un type inattendu (nombre, booléen...) est une erreur de son champ.
+    Retourne {"valid": [(index, enregistrement nettoyé)], "errors": {index: {champ: message}}}
+    Les téléphones valides sont retournés au format E.164.
+    """
+    rules = rules or CLIENT_RULES
+    valid = []
+    errors = {}
+
+    for index, record in enumerate(records):
+        cleaned = dict(record)
+        row_errors = {}
+
+        for field, (required, validator) in rules.items():
+            value = record.get(field)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                if required:
+                    row_errors[field] = "Champ obligatoire"
+                continue
+
+            try:
+                cleaned[field] = validator(value)
+            except (ValueError, TypeError) as e:
+                row_errors[field] = str(e)
+
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            valid.append((index, cleaned))
+
+    return {"valid": valid, "errors": errors}
@@ -1,19 +1,21 @@
 from rich.console import Console
 from rich.table import Table
-from rich.prompt import Prompt
+from app.views.inputs import InteractiveInput
+from app.views.pager import TablePager
 
 
 class ClientView:
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
 
     def get_client_creation_form(self):
         """Formulaire de création d'un nouveau client"""
         self.console.print("[blue]Création d'un nouveau client[/blue]")
-        name = self.console.input("Nom du client : ")
-        mail = self.console.input("Email du client : ")
-        phone = self.console.input("Téléphone du client : ")
-        company_name = self.console.input("Entreprise du client : ")
+        name = self.inputs.text("Nom du client : ")
+        mail = self.inputs.text("Email du client : ")
+        phone = self.inputs.text("Téléphone du client : ")
+        company_name = self.inputs.text("Entreprise du client : ")
 
         return {
             "name": name,
@@ -23,52 +25,106 @@ class ClientView:
         }
 
     def display_clients(self, clients):
-        """Afficher une liste de clients"""
+        """Afficher une liste de clients page par page"""
         if not clients:
             self.console.print("[yellow]Aucun client trouvé.[/yellow]")
             return
 
-        table = Table(title="[bold blue]Liste des clients[/bold blue]")
+        pager = TablePager(
+            self.console,
+            "[bold blue]Liste des clients[/bold blue]",
+            [
+                ("ID", {"style": "cyan", "no_wrap": True}),
+                ("Nom", {"style": "cyan", "no_wrap": True}),
+                ("Email", {"style": "magenta"}),
+                ("Téléphone", {"style": "green"}),
+                ("Entreprise", {"style": "yellow"}),
+                ("Commercial ID", {"style": "blue", "no_wrap": True}),
+                ("Créé le", {"style": "dim"}),
+                ("Modifier le", {"style": "dim"}),
+            ],
+            self._client_row,
+            inputs=self.inputs
+        )
 
-        # Ajouter les colonnes
+        self.console.print("\n" * 2)
+        pager.display(clients)
+        self.console.print("\n" * 2)
+
+    @staticmethod
+    def _client_row(client):
+        """Cellules d'une ligne du tableau des clients"""
+        return [
+            str(client.id),
+            client.name,
+            client.mail,
+            client.phone or "",
+            client.company_name or "",
+            str(client.commercial_contact_id),
+            client.created_at.strftime("%d-%m-%Y"),
+            client.last_updated_at.strftime("%d-%m-%Y")
+        ]
+
+    def display_duplicate_candidates(self, duplicates):
+        """Afficher les clients existants qui ressemblent au client saisi"""
+        table = Table(title="[bold yellow]Clients similaires déjà enregistrés[/bold yellow]")
         table.add_column("ID", style="cyan", no_wrap=True)
-        table.add_column("Nom", style="cyan", no_wrap=True)
+        table.add_column("Nom", style="cyan")
         table.add_column("Email", style="magenta")
         table.add_column("Téléphone", style="green")
         table.add_column("Entreprise", style="yellow")
-        table.add_column("Commercial ID", style="blue", no_wrap=True)
-        table.add_column("Créé le", style="dim")
-        table.add_column("Modifier le", style="dim")
+        table.add_column("Similarité", style="bold", no_wrap=True)
 
-        # Ajouter les lignes
-        for client in clients:
+        for client, score in duplicates:
             table.add_row(
                 str(client.id),
                 client.name,
                 client.mail,
-                client.phone,
-                client.company_name,
-                str(client.commercial_contact_id),
-                client.created_at.strftime("%d-%m-%Y"),
-                client.last_updated_at.strftime("%d-%m-%Y")
+                client.phone or "",
+                client.company_name or "",
+                f"{score:.0%}"
             )
-
-        self.console.print("\n" * 2)
         self.console.print(table)
-        self.console.print("\n" * 2)
+
+    def confirm_duplicate_creation(self):
+        """Demander confirmation avant de créer un doublon probable"""
+        return self.inputs.confirm("Créer quand même ce client ?", default=False)
+
+    def display_duplicate_report(self, report):
+        """Afficher le rapport de doublons de la table clients"""
+        if not report["pairs"]:
+            self.console.print("[green]Aucun doublon probable.[/green]")
+        else:
+            table = Table(title="[bold blue]Doublons probables[/bold blue]")
+            table.add_column("Client A", style="cyan")
+            table.add_column("Client B", style="cyan")
+            table.add_column("Clé commune", style="magenta")
+            table.add_column("Similarité", style="bold", no_wrap=True)
+
+            for client_a, client_b, score, key in report["pairs"]:
+                table.add_row(
+                    f"({client_a.id}) {client_a.name}",
+                    f"({client_b.id}) {client_b.name}",
+                    key,
+                    f"{score:.0%}"
+                )
+            self.console.print(table)
+
+        for key, value, size in report["skipped_blocks"]:
+            self.console.print(f"[yellow]Bloc ignoré ({size} clients) : {key} = {value}[/yellow]")
 
     def get_id_client(self):
         """Obtenir l'ID du client à mettre à jour"""
-        client_id = self.console.input("Entrez l'ID du client à mettre à jour : ")
+        client_id = self.inputs.text("Entrez l'ID du client à mettre à jour : ")
         return client_id.strip()
 
     def get_client_update_form(self, client):
         """Formulaire de mise à jour d'un client existant"""
         self.console.print(f"[blue]Mise à jour du client : {client.name}[/blue]")
-        name = Prompt.ask("Nom du client", default=client.name or "")
-        mail = Prompt.ask("Email du client", default=client.mail or "")
-        phone = Prompt.ask("Téléphone du client", default=client.phone or "")
-        company_name = Prompt.ask("Entreprise du client", default=client.company_name or "")
+        name = self.inputs.ask("Nom du client", default=client.name or "")
+        mail = self.inputs.ask("Email du client", default=client.mail or "")
+        phone = self.inputs.ask("Téléphone du client", default=client.phone or "")
+        company_name = self.inputs.ask("Entreprise du client", default=client.company_name or "")
 
         return {
             "name": name,
@@ -79,5 +135,5 @@ class ClientView:
 
     def research_client(self):
         """Rechercher un client par nom"""
-        search_term = self.console.input("Entrez le nom du client à rechercher : ")
+        search_term = self.inputs.text("Entrez le nom du client à rechercher : ")
         return search_term.strip()
@@ -1,40 +1,44 @@
 from rich.console import Console
-from rich.prompt import Prompt
 from rich.table import Table
-from app.controllers.client import ClientCommands
-from app.controllers.user import UserCommands
+from rich.text import Text
+from app.views.inputs import InteractiveInput
+from app.views.pager import TablePager
 from app.models.client import Client
-from datetime import datetime
+from app.models.user import User
+from datetime import datetime, timedelta
 
 
 class ContractView:
     """Vue liées aux contrats"""
-    def __init__(self):
-        self.console = Console()
+    # Nombre maximum de clients proposés par le sélecteur
+    PICKER_LIMIT = 10
 
-    def get_contract_creation_form(self):
+    def __init__(self, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
+
+    def get_contract_creation_form(self, user_id, role):
         """Affiche le formulaire de création de contrat et retourne les données"""
 
         self.console.print("[blue]Création d'un nouveau contrat[/blue]\n")
 
-        # Afficher la liste des clients
+        # Vérifier qu'il existe au moins un client, sans charger toute la table
         try:
-            clients = Client.get_all()  # Récupérer les clients
-            if not clients:  # Vérifier s'il y a des clients
+            if not Client.has_any():
                 self.console.print("[yellow]Aucun client trouvé. Veuillez d'abord créer un client.[/yellow]")
                 return None  # Retourner None pour arrêter le processus
 
-            # Afficher la liste seulement s'il y a des clients
-            ClientCommands(role="gestion").list_clients()
+            client_id = self.pick_client(user_id, role)
+            if client_id is None:
+                return None
 
         except Exception as e:
             self.console.print(f"[red]Erreur lors de la récupération des clients : {e}[/red]")
             return None
 
-        client_id = Prompt.ask("ID du client")
-        total_amount = Prompt.ask("Montant total", default=0.00)
-        remaining_amount = Prompt.ask("Montant restant à payer", default=0.00)
-        status = Prompt.ask("Statut", choices=["signé", "non signé"], default="non signé")
+        total_amount = self.inputs.ask("Montant total", default=0.00)
+        remaining_amount = self.inputs.ask("Montant restant à payer", default=0.00)
+        status = self.inputs.ask("Statut", choices=["signé", "non signé"], default="non signé")
 
         return {
             'client_id': client_id,
@@ -43,10 +47,61 @@ class ContractView:
             'status': status
         }
 
+    def pick_client(self, user_id, role):
+        """
+        Sélection incrémentale d'un client :
+        saisie des premières lettres du nom puis choix parmi les meilleures correspondances
+        (limitées aux clients que l'utilisateur peut lire)
+
+        Une saisie vide ou "q" annule la sélection : retourne None
+        """
+        while True:
+            prefix = self.inputs.ask("Nom du client (premières lettres, vide ou q pour annuler)", default="").strip()
+            if prefix.lower() in ("", "q"):
+                self.console.print("[yellow]Sélection du client annulée.[/yellow]")
+                return None
+
+            matches = Client.search_by_prefix(prefix, user_id, role, limit=self.PICKER_LIMIT)
+
+            if not matches:
+                self.console.print(f"[yellow]Aucun client ne commence par '{prefix}'.[/yellow]")
+                continue
+
+            self.display_client_matches(matches)
+            choices = [str(client.id) for client in matches]
+
+            if len(matches) == 1:
+                self.console.print(f"[green]Client sélectionné : {matches[0].name}[/green]")
+                return choices[0]
+
+            # Une saisie vide relance la recherche, "q" annule
+            choice = self.inputs.ask(
+                "ID du client (vide pour relancer la recherche, q pour annuler)",
+                choices=choices + ["", "q"], show_choices=False, default=""
+            )
+            if choice == "q":
+                self.console.print("[yellow]Sélection du client annulée.[/yellow]")
+                return None
+            if choice:
+                return choice
+
+    def display_client_matches(self, clients):
+        """Afficher les clients correspondant à la recherche"""
+        table = Table(title="[bold blue]Clients correspondants[/bold blue]")
+        table.add_column("ID", style="cyan", no_wrap=True)
+        table.add_column("Nom", style="magenta")
+        table.add_column("Entreprise", style="yellow")
+        table.add_column("Email", style="green")
+
+        for client in clients:
+            table.add_row(str(client.id), client.name, client.company_name or "", client.mail)
+
+        self.console.print(table)
+
     def get_contract_id(self):
         """Obtenir l'ID du contrat à mettre à jour"""
         try:
-            contract_id = self.console.input("Entrez l'ID du contrat à mettre à jour : ")
+            contract_id = self.inputs.text("Entrez l'ID du contrat à mettre à jour : ")
             return int(contract_id.strip())
         except ValueError:
             self.console.print("[red]ID invalide. Veuillez entrer un nombre.[/red]")
@@ -57,10 +112,10 @@ class ContractView:
         self.console.print(f"[blue]Mise à jour du contrat : {contract.id}[/blue]")
 
         # Obtenir les nouvelles données du contrat
-        total_amount = Prompt.ask("Montant total", default=str(contract.total_amount))
-        remaining_amount = Prompt.ask("Montant restant à payer", default=str(contract.remaining_amount or "0"))
+        total_amount = self.inputs.ask("Montant total", default=str(contract.total_amount))
+        remaining_amount = self.inputs.ask("Montant restant à payer", default=str(contract.remaining_amount or "0"))
         current_status = "signé" if contract.is_signed else "non signé"
-        status = Prompt.ask("Statut", choices=["signé", "non signé"], default=current_status)
+        status = self.inputs.ask("Statut", choices=["signé", "non signé"], default=current_status)
 
         return {
             'total_amount': float(total_amount),
@@ -69,70 +124,132 @@ class ContractView:
         }
 
     def display_contract_list(self, contracts):
-        """Afficher la liste des contrats"""
+        """Afficher la liste des contrats page par page"""
         if not contracts:
             self.console.print("[yellow]Aucun contrat trouvé.[/yellow]")
             return
 
-        table = Table(title="[bold blue]Liste des contrats[/bold blue]")
-
-        # Ajouter les colonnes
-        table.add_column("ID Contrat", style="cyan", no_wrap=True)
-        table.add_column("Client", style="magenta")  # Nom du client
-        table.add_column("Commercial", style="blue")  # Nom du commercial
-        table.add_column("Montant total", style="green")
-        table.add_column("Montant restant", style="yellow")
-        table.add_column("Statut")
-        table.add_column("Créé le", style="dim")
-        table.add_column("Modifier le", style="dim")
-
-        # Ajouter les lignes
-        for contract in contracts:
-            if contract.is_signed:
-                status_formatted = "[green]Signé[/green]"
-            else:
-                status_formatted = "[red]Non signé[/red]"
-
-            table.add_row(
-                str(contract.id),
-                contract.client.name,
-                contract.commercial_contact.name,
-                f"{contract.total_amount}€",
-                f"{contract.remaining_amount}€",
-                status_formatted,
-                contract.created_at.strftime("%d-%m-%Y"),
-                contract.last_updated_at.strftime("%d-%m-%Y")
-            )
+        pager = TablePager(
+            self.console,
+            "[bold blue]Liste des contrats[/bold blue]",
+            [
+                ("ID Contrat", {"style": "cyan", "no_wrap": True}),
+                ("Client", {"style": "magenta"}),  # Nom du client
+                ("Commercial", {"style": "blue"}),  # Nom du commercial
+                ("Montant total", {"style": "green"}),
+                ("Montant restant", {"style": "yellow"}),
+                ("Statut", {}),
+                ("Créé le", {"style": "dim"}),
+                ("Modifier le", {"style": "dim"}),
+            ],
+            self._contract_row,
+            inputs=self.inputs
+        )
 
         self.console.print("\n" * 2)
-        self.console.print(table)
+        pager.display(contracts)
         self.console.print("\n" * 2)
 
+    @staticmethod
+    def _contract_row(contract):
+        """Cellules d'une ligne du tableau des contrats (ligne de Contract.row_query)"""
+        if contract.is_signed:
+            status_formatted = Text("Signé", style="green")
+        else:
+            status_formatted = Text("Non signé", style="red")
+
+        return [
+            str(contract.id),
+            contract.client_name or "",
+            contract.commercial_name or "",
+            f"{contract.total_amount}€",
+            f"{contract.remaining_amount}€",
+            status_formatted,
+            contract.created_at.strftime("%d-%m-%Y"),
+            contract.last_updated_at.strftime("%d-%m-%Y")
+        ]
+
     def research_contract(self):
         """Rechercher un contrat par ID"""
-        search_term = self.console.input("Entrez l'ID du contrat à rechercher : ")
+        search_term = self.inputs.text("Entrez l'ID du contrat à rechercher : ")
         return search_term.strip()
 
-    def get_date_filter(self):
-        """Obtenir une date pour filtrer les contrats"""
-        date_str = self.console.input("Entrez la date minimale (DD-MM-YYYY) : ")
-        try:
-            date_obj = datetime.strptime(date_str.strip(), "%d-%m-%Y")
-            return date_obj  # Retourne un objet datetime, pas une string
-        except ValueError:
-            self.console.print("[red]Format de date invalide. Utilisez DD-MM-YYYY[/red]")
-            return None
+    def get_date_filter(self, label="Entrez la date minimale (DD-MM-YYYY) : ", optional=False):
+        """
+        Obtenir une date pour filtrer les contrats
+
+        Si optional : une saisie vide ignore le critère et une date invalide est redemandée
+        """
+        while True:
+            date_str = self.inputs.text(label)
+            if optional and not date_str.strip():
+                return None
+            try:
+                date_obj = datetime.strptime(date_str.strip(), "%d-%m-%Y")
+                return date_obj  # Retourne un objet datetime, pas une string
+            except ValueError:
+                self.console.print("[red]Format de date invalide. Utilisez DD-MM-YYYY[/red]")
+                if not optional:
+                    return None
+
+    def get_amount_filter(self, label="Entrez le montant minimal : ", optional=False):
+        """
+        Obtenir un montant pour filtrer les contrats
+
+        Si optional : une saisie vide ignore le critère et un montant invalide est redemandé
+        """
+        while True:
+            amount_str = self.inputs.text(label)
+            if optional and not amount_str.strip():
+                return None
+            try:
+                return float(amount_str.strip())
+            except ValueError:
+                self.console.print("[red]Montant invalide. Veuillez entrer un nombre.[/red]")
+                if not optional:
+                    return None
+
+    def get_contract_filter_form(self, user_id, role):
+        """
+        Formulaire de filtres combinés sur les contrats
+
+        Chaque critère laissé vide est ignoré, une valeur invalide est redemandée.
+        Retourne les arguments de Contract.filter_by_criteria, ou None si la sélection du client est annulée
+        """
+        self.console.print("[blue]Filtrer les contrats[/blue] (laisser vide pour ignorer un critère)\n")
+
+        created_from = self.get_date_filter("Créé à partir du (DD-MM-YYYY) : ", optional=True)
+        date_to = self.get_date_filter("Créé jusqu'au (DD-MM-YYYY) : ", optional=True)
+        criteria = {
+            "created_from": created_from,
+            # Date maximale incluse : borne exclusive au lendemain
+            "created_until": date_to + timedelta(days=1) if date_to else None,
+            "min_total": self.get_amount_filter("Montant total minimal : ", optional=True),
+            "max_total": self.get_amount_filter("Montant total maximal : ", optional=True),
+            "min_remaining": self.get_amount_filter("Montant restant minimal : ", optional=True),
+            "max_remaining": self.get_amount_filter("Montant restant maximal : ", optional=True),
+        }
 
-    def get_amount_filter(self):
-        """Obtenir un montant pour filtrer les contrats"""
-        try:
-            amount_str = self.console.input("Entrez le montant minimal : ")
-            return float(amount_str.strip())
-        except ValueError:
-            self.console.print("[red]Montant invalide. Veuillez entrer un nombre.[/red]")
-            return None
+        status = self.inputs.ask("Statut", choices=["tous", "signé", "non signé"], default="tous")
+        criteria["is_signed"] = None if status == "tous" else status == "signé"
+
+        if self.inputs.confirm("Filtrer sur un client ?", default=False):
+            client_id = self.pick_client(user_id, role)
+            if client_id is None:
+                return None
+            criteria["client_id"] = int(client_id)
+
+        return {key: value for key, value in criteria.items() if value is not None}
 
     def get_commercial_id(self):
         """Demande l'ID du commercial"""
-        UserCommands().list_users(filter_by_department="commercial")
-        return Prompt.ask("ID du commercial responsable")
+        commercials = User.get_by_department("commercial")
+
+        table = Table(title="[bold blue]Commerciaux[/bold blue]")
+        table.add_column("ID", style="cyan", no_wrap=True)
+        table.add_column("Nom", style="magenta")
+        for commercial in commercials:
+            table.add_row(str(commercial.id), commercial.name)
+        self.console.print(table)
+
+        return self.inputs.ask("ID du commercial responsable")
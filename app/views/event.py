@@ -1,24 +1,28 @@
 from rich.console import Console
-from rich.prompt import Prompt
 from rich.table import Table
+from rich.text import Text
+from app.views.inputs import InteractiveInput
+from app.views.pager import TablePager
 from datetime import datetime
 
 
 class EventView:
     """Vue liées aux événements"""
-    def __init__(self, contract_id):
-        self.console = Console()
+    def __init__(self, contract_id=None, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
         self.contract_id = contract_id
 
-    def get_event_creation_form(self):
+    def get_event_creation_form(self, contract_id=None):
         """Affiche le formulaire de création d'événement et retourne les données"""
+        contract_id = contract_id if contract_id is not None else self.contract_id
 
         self.console.print("[bold blue]Création d'un nouvel événement[/bold blue]\n")
 
-        event_name = Prompt.ask("Nom de l'événement ")
+        event_name = self.inputs.ask("Nom de l'événement ")
 
         while True:
-            date_start_input = Prompt.ask("Date/heure de début (DD-MM-YYYY HH:MM)")
+            date_start_input = self.inputs.ask("Date/heure de début (DD-MM-YYYY HH:MM)")
 
             try:
                 date_start = datetime.strptime(date_start_input, "%d-%m-%Y %H:%M")
@@ -32,7 +36,7 @@ class EventView:
                 self.console.print("[red]Format de date invalide ! Utilisez DD-MM-YYYY HH:MM[/red]")
 
         while True:
-            date_end_input = Prompt.ask("Date/heure de fin (DD-MM-YYYY HH:MM)")
+            date_end_input = self.inputs.ask("Date/heure de fin (DD-MM-YYYY HH:MM)")
 
             try:
                 date_end = datetime.strptime(date_end_input, "%d-%m-%Y %H:%M")
@@ -50,12 +54,12 @@ class EventView:
             except ValueError:
                 self.console.print("[red]Format de date invalide ! Utilisez DD-MM-YYYY HH:MM[/red]")
 
-        event_location = Prompt.ask("Localisation de l'événement ")
-        event_attendees = Prompt.ask("Nombre de participants ")
-        event_notes = Prompt.ask("Notes supplémentaires ")
+        event_location = self.inputs.ask("Localisation de l'événement ")
+        event_attendees = self.inputs.ask("Nombre de participants ")
+        event_notes = self.inputs.ask("Notes supplémentaires ")
 
         return {
-            'contract_id': self.contract_id,
+            'contract_id': contract_id,
             'name': event_name,
             'date_start': date_start,
             'date_end': date_end,
@@ -65,58 +69,65 @@ class EventView:
         }
 
     def display_event_list(self, events):
-        """Affiche une liste d'événements"""
+        """Affiche une liste d'événements page par page"""
         if not events:
             self.console.print("[red]Aucun événement trouvé.[/red]")
             return
 
-        table = Table(title="Liste des événements")
-
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Nom", style="magenta")
-        table.add_column("Contrat ID", justify="right", style="green")
-        table.add_column("Début", style="yellow")
-        table.add_column("Fin", style="yellow")
-        table.add_column("Localisation", style="white")
-        table.add_column("Participants", justify="right", style="blue")
-        table.add_column("Notes", style="white")
-        table.add_column("Support", style="red")
-
-        for event in events:
-            # Récupération du nom du support
-            support_name = f"[green]{event.support_contact.name}[/green]" if event.support_contact else "[red]NON ASSIGNÉ[/red]"
-
-            table.add_row(
-                str(event.id),
-                event.name,
-                str(event.contract_id),
-                event.date_start.strftime("%d-%m-%Y %H:%M"),
-                event.date_end.strftime("%d-%m-%Y %H:%M"),
-                event.location,
-                str(event.attendees),
-                event.notes or "",
-                support_name
-            )
+        pager = TablePager(
+            self.console,
+            "Liste des événements",
+            [
+                ("ID", {"justify": "right", "style": "cyan", "no_wrap": True}),
+                ("Nom", {"style": "magenta"}),
+                ("Contrat ID", {"justify": "right", "style": "green"}),
+                ("Début", {"style": "yellow"}),
+                ("Fin", {"style": "yellow"}),
+                ("Localisation", {"style": "white"}),
+                ("Participants", {"justify": "right", "style": "blue"}),
+                ("Notes", {"style": "white"}),
+                ("Support", {"style": "red"}),
+            ],
+            self._event_row,
+            inputs=self.inputs
+        )
 
-        self.console.print(table)
+        pager.display(events)
+
+    @staticmethod
+    def _event_row(event):
+        """Cellules d'une ligne du tableau des événements (ligne de Event.row_query)"""
+        support_name = Text(event.support_name, style="green") if event.support_name else Text("NON ASSIGNÉ", style="red")
+
+        return [
+            str(event.id),
+            event.name,
+            str(event.contract_id),
+            event.date_start.strftime("%d-%m-%Y %H:%M"),
+            event.date_end.strftime("%d-%m-%Y %H:%M"),
+            event.location,
+            str(event.attendees),
+            event.notes or "",
+            support_name
+        ]
 
     def get_event_update_form(self, event):
         """Affiche le formulaire de mise à jour d'événement et retourne les données"""
 
         self.console.print("[blue]Mise à jour d'un événement[/blue]\n")
 
-        event_name = Prompt.ask("Nom de l'événement: ", default=event.name)
-        date_start_input = Prompt.ask(
+        event_name = self.inputs.ask("Nom de l'événement: ", default=event.name)
+        date_start_input = self.inputs.ask(
             "Date/heure de début (DD-MM-YYYY HH:MM)",
             default=event.date_start.strftime("%d-%m-%Y %H:%M")
         )
-        date_end_input = Prompt.ask(
+        date_end_input = self.inputs.ask(
             "Date/heure de fin (DD-MM-YYYY HH:MM)",
             default=event.date_end.strftime("%d-%m-%Y %H:%M")
         )
-        event_location = Prompt.ask("Localisation de l'événement", default=event.location)
-        event_attendees = Prompt.ask("Nombre de participants", default=event.attendees)
-        event_notes = Prompt.ask("Notes supplémentaires", default=event.notes)
+        event_location = self.inputs.ask("Localisation de l'événement", default=event.location)
+        event_attendees = self.inputs.ask("Nombre de participants", default=event.attendees)
+        event_notes = self.inputs.ask("Notes supplémentaires", default=event.notes)
 
         # Validation des dates
         date_start = self._parse_date(date_start_input, "début")
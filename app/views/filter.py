@@ -0,0 +1,18 @@
+from rich.console import Console
+from app.views.inputs import InteractiveInput
+from app.services.query_filter import describe_fields
+
+
+class FilterView:
+    """Saisie d'une expression de filtre et de tri pour les listes"""
+
+    def __init__(self, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
+
+    def get_filter_expression(self, resource):
+        """Affiche les champs disponibles et retourne l'expression saisie"""
+        self.console.print("[blue]Recherche[/blue] ex : [cyan]signed:false remaining>0 created>=2026-01-01 sort:-remaining[/cyan]")
+        self.console.print(f"[dim]Champs : {describe_fields(resource)}[/dim]")
+        self.console.print("[dim]Opérateurs : champ:valeur (préfixe pour le texte), =, !=, >, >=, <, <=, valeur null, sort:-champ[/dim]\n")
+        return self.inputs.text("Filtre : ").strip()
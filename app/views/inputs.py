@@ -0,0 +1,106 @@
+from collections import deque
+from pathlib import Path
+from rich.console import Console
+from rich.prompt import Confirm, Prompt
+from app.services.profiler import input_pause
+import getpass
+
+
+class EndOfInput(BaseException):
+    """
+    Plus aucune réponse dans le script
+
+    Hérite de BaseException (comme KeyboardInterrupt) : la fin d'un script termine la session
+    au lieu d'être traitée comme une erreur par les menus et les commandes.
+    """
+
+
+class InteractiveInput:
+    """
+    Saisies au clavier (mode normal)
+
+    Les vues, les commandes et l'authentification lisent toutes leurs saisies via un fournisseur
+    exposant text(), ask(), confirm() et secret(). Un QueueInput ou un ScriptedInput les remplace
+    pour rejouer des parcours complets sans terminal (tests de bout en bout, génération de charge).
+    L'attente de l'utilisateur est exclue du profilage des commandes (--profile).
+    """
+    def __init__(self, console=None):
+        self.console = console or Console()
+
+    def text(self, prompt):
+        """Saisie libre"""
+        with input_pause():
+            return self.console.input(prompt)
+
+    def ask(self, prompt, choices=None, default=..., show_choices=True, password=False):
+        """Saisie avec valeur par défaut (Entrée) et choix autorisés, comme Prompt.ask"""
+        with input_pause():
+            return Prompt.ask(prompt, console=self.console, choices=choices, default=default,
+                              show_choices=show_choices, password=password)
+
+    def confirm(self, prompt, default=False):
+        """Réponse oui / non"""
+        with input_pause():
+            return Confirm.ask(prompt, console=self.console, default=default)
+
+    def secret(self, prompt):
+        """Saisie masquée (mot de passe)"""
+        with input_pause():
+            return getpass.getpass(prompt)
+
+
+class QueueInput:
+    """
+    Réponses prises dans une liste, dans l'ordre des questions
+
+    Une réponse vide retourne la valeur par défaut de la question ; une réponse hors des choix
+    proposés lève ValueError (un script invalide échoue au lieu de boucler).
+    Les questions posées sont conservées dans prompts.
+    """
+    def __init__(self, answers=()):
+        self.answers = deque(answers)
+        self.prompts = []
+
+    def feed(self, *answers):
+        """Ajoute des réponses à la fin de la file"""
+        self.answers.extend(answers)
+
+    def _next(self, prompt):
+        self.prompts.append(prompt)
+        if not self.answers:
+            raise EndOfInput(f"Aucune réponse pour : {prompt}")
+        return str(self.answers.popleft())
+
+    def text(self, prompt):
+        return self._next(prompt)
+
+    def ask(self, prompt, choices=None, default=..., show_choices=True, password=False):
+        answer = self._next(prompt)
+        if answer == "" and default is not ...:
+            return default
+        if choices is not None and answer not in choices:
+            raise ValueError(f"Réponse '{answer}' hors des choix {choices} pour : {prompt}")
+        return answer
+
+    def confirm(self, prompt, default=False):
+        answer = self._next(prompt).strip().lower()
+        if answer == "":
+            return default
+        if answer not in ("y", "yes", "o", "oui", "n", "no", "non"):
+            raise ValueError(f"Réponse '{answer}' invalide (oui/non) pour : {prompt}")
+        return answer in ("y", "yes", "o", "oui")
+
+    def secret(self, prompt):
+        return self._next(prompt)
+
+
+class ScriptedInput(QueueInput):
+    """
+    Réponses lues dans un fichier texte, une par ligne
+
+    Une ligne vide correspond à Entrée ; les lignes commençant par # sont ignorées.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        super().__init__(line for line in lines if not line.startswith("#"))
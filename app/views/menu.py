@@ -1,15 +1,33 @@
 from rich.console import Console
+from rich.segment import Segments
 from rich.table import Table
+from app.views.inputs import InteractiveInput
 from app.utils.constants import MENU, SUBMENUS
 
 
 class MenuManager:
-    def __init__(self):
-        self.console = Console()
+    # Rendus des menus déjà calculés, partagés entre toutes les instances
+    # Clé : (options du menu, largeur de la console)
+    _render_cache = {}
+
+    def __init__(self, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
         self.items = []
 
     def display(self):
-        """Affiche le menu"""
+        """Affiche le menu (rendu une seule fois puis réutilisé)"""
+        key = (tuple((item["option"], item["title"]) for item in self.items), self.console.width)
+        segments = self._render_cache.get(key)
+
+        if segments is None:
+            segments = list(self.console.render(self._build_table()))
+            self._render_cache[key] = segments
+
+        self.console.print(Segments(segments), end="")
+
+    def _build_table(self):
+        """Construit le tableau des options"""
         table = Table()
         table.add_column("Option", style="cyan", width=8)
         table.add_column("Description", style="white")
@@ -17,11 +35,11 @@ class MenuManager:
         for item in self.items:
             table.add_row(item["option"], item["title"])
 
-        self.console.print(table)
+        return table
 
     def get_choice(self):
         """Récupère le choix de l'utilisateur"""
-        return self.console.input("\n[bold yellow]Choisissez une option: [/bold yellow]")
+        return self.inputs.text("\n[bold yellow]Choisissez une option: [/bold yellow]")
 
     def is_valid_choice(self, choice):
         """Vérifie si le choix est valide"""
@@ -31,8 +49,8 @@ class MenuManager:
 class Menu(MenuManager):
     """Classe pour les menus principaux"""
 
-    def __init__(self, department):
-        super().__init__()
+    def __init__(self, department, console=None, inputs=None):
+        super().__init__(console, inputs)
         self.department = department
         self.items = MENU[department]
 
@@ -40,7 +58,7 @@ class Menu(MenuManager):
 class Submenu(MenuManager):
     """Classe pour les sous-menus"""
 
-    def __init__(self, submenu_key):
-        super().__init__()
+    def __init__(self, submenu_key, console=None, inputs=None):
+        super().__init__(console, inputs)
         self.submenu_key = submenu_key
         self.items = SUBMENUS[submenu_key]
@@ -0,0 +1,103 @@
+import math
+from rich.table import Table
+from rich.text import Text
+from app.views.inputs import InteractiveInput
+
+
+class TablePager:
+    """
+    Affichage paginé d'un tableau Rich
+
+    Une seule page est chargée et rendue à la fois. Les largeurs de colonnes
+    sont calculées une seule fois sur un échantillon borné de lignes, ce qui
+    garde une mise en page stable d'une page à l'autre.
+    """
+    PAGE_SIZE = 20
+    SAMPLE_SIZE = 100
+    MAX_COLUMN_WIDTH = 40
+
+    def __init__(self, console, title, columns, row_builder, page_size=None, inputs=None):
+        """
+        columns : liste de tuples (en-tête, options de colonne Rich)
+        row_builder : fonction transformant un élément en liste de cellules ; les chaînes
+        sont affichées telles quelles (jamais interprétées comme balisage Rich), seules les
+        cellules déjà construites en Text gardent leur style
+        inputs : fournisseur des saisies (clavier par défaut)
+        """
+        self.console = console
+        self.title = title
+        self.columns = columns
+        self.row_builder = row_builder
+        self.page_size = page_size or self.PAGE_SIZE
+        self.inputs = inputs or InteractiveInput(console)
+
+    def display(self, rows):
+        """Affiche les lignes page par page avec navigation"""
+        total = len(rows)
+        if not total:
+            return
+
+        page_count = math.ceil(total / self.page_size)
+        widths = self._measure_widths(rows[0:min(total, max(self.SAMPLE_SIZE, self.page_size))])
+        page = 0
+
+        while True:
+            start = page * self.page_size
+            items = rows[start:start + self.page_size]
+            self.console.print(self._build_table(items, widths, page, page_count, total))
+
+            if page_count == 1:
+                return
+
+            page = self._next_page(page, page_count)
+            if page is None:
+                return
+
+    def _next_page(self, page, page_count):
+        """Demande la page suivante à afficher, None pour quitter"""
+        while True:
+            choice = self.inputs.text(
+                "[dim][Entrée/n] suivante, [p] précédente, numéro de page, [q] quitter : [/dim]"
+            ).strip().lower()
+
+            if choice in ("", "n"):
+                return page + 1 if page + 1 < page_count else None
+            if choice == "p":
+                return max(page - 1, 0)
+            if choice == "q":
+                return None
+            if choice.isdigit() and 1 <= int(choice) <= page_count:
+                return int(choice) - 1
+
+            self.console.print(f"[red]Choix invalide (pages 1 à {page_count})[/red]")
+
+    def _measure_widths(self, sample):
+        """Calcule la largeur de chaque colonne à partir d'un échantillon"""
+        widths = [Text.from_markup(header).cell_len for header, _ in self.columns]
+
+        for item in sample:
+            for index, cell in enumerate(self.row_builder(item)):
+                cell_width = self._cell(cell).cell_len
+                if cell_width > widths[index]:
+                    widths[index] = cell_width
+
+        return [min(width, self.MAX_COLUMN_WIDTH) for width in widths]
+
+    def _build_table(self, items, widths, page, page_count, total):
+        """Construit le tableau Rich d'une seule page"""
+        table = Table(title=self.title)
+        if page_count > 1:
+            table.caption = f"Page {page + 1}/{page_count} - {total} lignes"
+
+        for (header, options), width in zip(self.columns, widths):
+            table.add_column(header, width=width, **options)
+
+        for item in items:
+            table.add_row(*[self._cell(cell) for cell in self.row_builder(item)])
+
+        return table
+
+    @staticmethod
+    def _cell(value):
+        """Cellule en texte brut : des crochets dans les données ne sont pas du balisage"""
+        return value if isinstance(value, Text) else Text(str(value))
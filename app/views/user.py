@@ -1,21 +1,22 @@
 from rich.console import Console
-from rich.prompt import Prompt
-from rich.table import Table
+from app.views.inputs import InteractiveInput
+from app.views.pager import TablePager
 
 
 class userView:
     """Vue liées aux collaborateurs"""
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console=None, inputs=None):
+        self.console = console or Console()
+        self.inputs = inputs or InteractiveInput(self.console)
 
     def get_user_creation_form(self):
         """Affiche le formulaire de création d'utilisateur et retourne les données"""
         self.console.print("[bold blue]Création d'un nouveau collaborateur[/bold blue]\n")
-        name = Prompt.ask("Nom complet")
-        mail = Prompt.ask("Email")
-        username = Prompt.ask("Nom d'utilisateur")
-        password = Prompt.ask("Mot de passe", password=True)
-        department = Prompt.ask("Département", choices=["commercial", "support", "gestion"])
+        name = self.inputs.ask("Nom complet")
+        mail = self.inputs.ask("Email")
+        username = self.inputs.ask("Nom d'utilisateur")
+        password = self.inputs.ask("Mot de passe", password=True)
+        department = self.inputs.ask("Département", choices=["commercial", "support", "gestion"])
 
         return {
             'name': name,
@@ -27,16 +28,16 @@ class userView:
 
     def get_user_id(self):
         """Demande l'ID utilisateur pour les opérations de mise à jour ou de suppression"""
-        user_id = Prompt.ask("Entrez l'ID du collaborateur")
+        user_id = self.inputs.ask("Entrez l'ID du collaborateur")
         return int(user_id)
 
     def get_user_update_form(self, user):
         """Affiche le formulaire de mise à jour d'utilisateur et retourne les données"""
         self.console.print(f"[blue]Mise à jour du collaborateur {user.name}[/blue]\n")
-        name = Prompt.ask("Nom complet", default=user.name)
-        mail = Prompt.ask("Email", default=user.mail)
-        username = Prompt.ask("Nom d'utilisateur", default=user.username)
-        department = Prompt.ask("Département", choices=["commercial", "support", "gestion"], default=user.department.name)
+        name = self.inputs.ask("Nom complet", default=user.name)
+        mail = self.inputs.ask("Email", default=user.mail)
+        username = self.inputs.ask("Nom d'utilisateur", default=user.username)
+        department = self.inputs.ask("Département", choices=["commercial", "support", "gestion"], default=user.department.name)
 
         return {
             'name': name,
@@ -46,37 +47,42 @@ class userView:
         }
 
     def display_user_list(self, users):
-        """Affiche une liste d'utilisateurs dans un tableau"""
+        """Affiche une liste d'utilisateurs dans un tableau paginé"""
         if not users:
             self.console.print("[yellow]Aucun collaborateur trouvé.[/yellow]")
             return
 
-        # Créer le tableau
-        table = Table(title="[bold blue]Liste des collaborateurs[/bold blue]")
-
-        # Ajouter les colonnes
-        table.add_column("ID", style="cyan", no_wrap=True)
-        table.add_column("Numéro", style="cyan", no_wrap=True)
-        table.add_column("Nom", style="magenta")
-        table.add_column("Email", style="green")
-        table.add_column("Département", style="yellow")
-        table.add_column("Créé le", style="dim")
-
-        # Ajouter les lignes
-        for user in users:
-            dept_name = user.department.name if user.department else "N/A"
-            created_date = user.created_at.strftime('%d/%m/%Y') if user.created_at else "N/A"
-
-            table.add_row(
-                str(user.id),
-                user.employee_number,
-                user.name,
-                user.mail,
-                dept_name,
-                created_date
-            )
+        pager = TablePager(
+            self.console,
+            "[bold blue]Liste des collaborateurs[/bold blue]",
+            [
+                ("ID", {"style": "cyan", "no_wrap": True}),
+                ("Numéro", {"style": "cyan", "no_wrap": True}),
+                ("Nom", {"style": "magenta"}),
+                ("Email", {"style": "green"}),
+                ("Département", {"style": "yellow"}),
+                ("Créé le", {"style": "dim"}),
+            ],
+            self._user_row,
+            inputs=self.inputs
+        )
 
         # Afficher le tableau
         self.console.print("\n" * 2)
-        self.console.print(table)
+        pager.display(users)
         self.console.print("\n" * 2)
+
+    @staticmethod
+    def _user_row(user):
+        """Cellules d'une ligne du tableau des collaborateurs (ligne de User.row_query)"""
+        dept_name = user.department_name or "N/A"
+        created_date = user.created_at.strftime('%d/%m/%Y') if user.created_at else "N/A"
+
+        return [
+            str(user.id),
+            user.employee_number,
+            user.name,
+            user.mail,
+            dept_name,
+            created_date
+        ]